@@ -5,10 +5,12 @@
 конфигурационных параметров из config.jsonc и secrets.json.
 """
 
+import copy
 import os
 import locale
 import sys
-from typing import List, Optional
+import threading
+from typing import List, Optional, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 from core.prompt_defaults import get_default_transcript_prompt
@@ -308,6 +310,9 @@ class Config:
         log_file (str): Путь к файлу логов
     """
     
+    # Снимок из Config.snapshot() доступен только для чтения
+    _frozen: bool = False
+    
     def __init__(self):
         """Инициализирует конфигурацию со значениями по умолчанию."""
         # AI Provider параметры
@@ -319,6 +324,7 @@ class Config:
         self.custom_base_url: str = ""
         self.custom_model: str = ""  # Используется для всех провайдеров если указано
         self.transcription_model: str = ""  # Модель для транскрипции (если пусто - используется дефолтная для провайдера)
+        self.prewarm_connections: bool = True  # Открывать соединение с API в начале записи
         
         # Параметры приложения
         self.app_user_model_id: str = "RapidWhisper.VoiceTranscription.App.1.0"  # Windows App User Model ID
@@ -363,6 +369,25 @@ class Config:
         # Ручная остановка записи
         self.manual_stop: bool = False  # По умолчанию автоматическая остановка по тишине
         
+        # Потоковая запись WAV файла на диск во время записи
+        self.stream_to_disk: bool = False
+        
+        # Формат аудио для отправки на транскрипцию (wav, flac, opus)
+        self.upload_format: str = "wav"
+        
+        # Записи длиннее этого значения (секунды) транскрибируются параллельно по частям (0 = выключено)
+        self.chunk_max_seconds: float = 120
+        
+        # Спекулятивная транскрипция: сегменты, закрытые паузой, отправляются во время записи
+        self.speculative_transcription: bool = False
+        self.speculative_pause_seconds: float = 0.6
+        
+        # VAD бэкенд для определения тишины: rms (порог громкости) или spectral
+        self.vad_backend: str = "rms"
+        
+        # Калибровка уровня шума по первым N мс записи и его отслеживание (0 - выключено)
+        self.noise_calibration_ms: int = 500
+        
         # Постобработка транскрипции
         self.enable_post_processing: bool = False  # Включить дополнительную обработку текста
         self.post_processing_provider: str = "groq"  # Провайдер для постобработки (groq, openai, glm, llm)
@@ -670,6 +695,7 @@ class Config:
         config.custom_base_url = config_loader.get("ai_provider.custom.base_url", "")
         config.custom_model = config_loader.get("ai_provider.custom.model", "")
         config.transcription_model = config_loader.get("ai_provider.transcription_model", "")
+        config.prewarm_connections = config_loader.get("ai_provider.prewarm_connections", True)
         
         # Параметры приложения
         config.hotkey = config_loader.get("application.hotkey", "ctrl+space")
@@ -683,6 +709,13 @@ class Config:
         config.chunk_size = config_loader.get("audio.chunk_size", 1024)
         config.silence_padding = config_loader.get("audio.silence_padding", 650)
         config.manual_stop = config_loader.get("audio.manual_stop", False)
+        config.stream_to_disk = config_loader.get("audio.stream_to_disk", False)
+        config.upload_format = config_loader.get("audio.upload_format", "wav")
+        config.chunk_max_seconds = config_loader.get("audio.chunk_max_seconds", 120)
+        config.speculative_transcription = config_loader.get("audio.speculative_transcription", False)
+        config.speculative_pause_seconds = config_loader.get("audio.speculative_pause_seconds", 0.6)
+        config.vad_backend = config_loader.get("audio.vad_backend", "rms")
+        config.noise_calibration_ms = config_loader.get("audio.noise_calibration_ms", 500)
         
         # Параметры окна
         config.auto_hide_delay = config_loader.get("window.auto_hide_delay", 2.5)
@@ -726,6 +759,60 @@ class Config:
         
         return config
     
+    @staticmethod
+    def snapshot() -> 'Config':
+        """
+        Возвращает общий неизменяемый снимок конфигурации.
+        
+        Снимок перечитывается из config.jsonc и secrets.json только если
+        у одного из файлов изменились mtime или размер, либо после
+        Config.invalidate_snapshot() (сохранение настроек). Иначе
+        возвращается готовый объект без чтения и разбора файлов.
+        
+        Returns:
+            Config: Снимок конфигурации (изменение атрибутов вызывает AttributeError,
+            для изменяемой копии используйте copy())
+        """
+        global _snapshot, _snapshot_signature
+        
+        signature = _config_files_signature()
+        with _snapshot_lock:
+            if _snapshot is None or signature != _snapshot_signature:
+                config = Config.load_from_config()
+                object.__setattr__(config, "_frozen", True)
+                _snapshot = config
+                # Подпись до загрузки: изменение во время чтения приведет к повторной загрузке
+                _snapshot_signature = signature
+            return _snapshot
+    
+    @staticmethod
+    def invalidate_snapshot() -> None:
+        """Сбрасывает снимок конфигурации - следующий snapshot() перечитает файлы."""
+        global _snapshot, _snapshot_signature
+        with _snapshot_lock:
+            _snapshot = None
+            _snapshot_signature = None
+    
+    def copy(self) -> 'Config':
+        """
+        Создает изменяемую копию конфигурации.
+        
+        Списки и словари копируются глубоко: изменение копии на месте
+        не затрагивает общий снимок из snapshot().
+        
+        Returns:
+            Config: Копия (в том числе снимка из snapshot())
+        """
+        clone = Config.__new__(Config)
+        clone.__dict__.update(copy.deepcopy(self.__dict__))
+        clone.__dict__.pop("_frozen", None)
+        return clone
+    
+    def __setattr__(self, name, value) -> None:
+        if self._frozen:
+            raise AttributeError(f"Снимок конфигурации только для чтения: {name}")
+        super().__setattr__(name, value)
+    
     def validate(self) -> List[str]:
         """
         Валидирует конфигурацию и возвращает список ошибок.
@@ -880,3 +967,29 @@ class Config:
             f"sample_rate={self.sample_rate}, "
             f"log_level='{self.log_level}')"
         )
+
+
+# Общий снимок конфигурации (Config.snapshot)
+_snapshot_lock = threading.Lock()
+_snapshot: Optional[Config] = None
+_snapshot_signature: Optional[Tuple] = None
+
+
+def _config_files_signature() -> Tuple:
+    """
+    Возвращает (mtime, размер) файлов config.jsonc и secrets.json.
+    
+    Returns:
+        Кортеж с подписью каждого файла (None если файла нет)
+    """
+    from core.config_loader import get_config_loader
+    
+    config_loader = get_config_loader()
+    signature = []
+    for path in (config_loader.config_path, config_loader.secrets_path):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            signature.append(None)
+    return tuple(signature)
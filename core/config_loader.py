@@ -7,6 +7,7 @@ and provides backward compatibility with .env format.
 
 import json
 import os
+import re
 import sys
 import shutil
 from pathlib import Path
@@ -86,6 +87,7 @@ def _create_minimal_config(config_path: Path):
         "ai_provider": {
             "provider": "groq",
             "transcription_model": "",
+            "prewarm_connections": True,
             "api_keys": {
                 "groq": "",
                 "openai": "",
@@ -108,7 +110,14 @@ def _create_minimal_config(config_path: Path):
             "sample_rate": 16000,
             "chunk_size": 1024,
             "silence_padding": 650,
-            "manual_stop": False
+            "manual_stop": False,
+            "stream_to_disk": False,
+            "upload_format": "wav",
+            "chunk_max_seconds": 120,
+            "speculative_transcription": False,
+            "speculative_pause_seconds": 0.6,
+            "vad_backend": "rms",
+            "noise_calibration_ms": 500
         },
         "window": {
             "auto_hide_delay": 2.5,
@@ -344,6 +353,30 @@ def _ensure_prompts_exist(prompts_dir: Path):
                 logger.warning(f"Source prompt not found: {source_path}")
 
 
+# One token of JSONC outside comments: a run of plain characters, a string
+# literal (escapes may skip line breaks, an unterminated string runs to EOF)
+# or a lone slash. Runs are matched as a whole, so re.sub() only calls back
+# for comments.
+_JSONC_KEEP = (
+    r'(?:[^"/]++'
+    r'|"[^"\\]*+(?:\\\n*+[^\n]?+[^"\\]*+)*+"?+'
+    r'|/(?![/*]))++'
+)
+_JSONC_TOKEN_RE = re.compile(
+    r'(' + _JSONC_KEEP + r')'
+    r'|//[^\n]*+'
+    r'|/\*(?:[^*]++|\*(?!/))*+(?:\*/)?+'
+)
+
+
+def _replace_jsonc_token(match: re.Match) -> str:
+    """Keep code and strings, replace a comment with the line breaks it spans"""
+    kept = match.group(1)
+    if kept is not None:
+        return kept
+    return '\n' * match.group().count('\n')
+
+
 def strip_json_comments(json_str: str) -> str:
     """
     Remove comments from JSONC string.
@@ -352,80 +385,21 @@ def strip_json_comments(json_str: str) -> str:
     - Single-line comments: // comment
     - Multi-line comments: /* comment */
     
+    Comment markers inside strings (URLs, escaped quotes) are kept.
+    Lines left empty after removing comments are dropped.
+    
+    The whole input is tokenized by a single regex pass, so the cost is
+    per comment rather than per character.
+    
     Args:
         json_str: JSONC string with comments
         
     Returns:
         JSON string without comments
     """
-    lines = []
-    in_multiline_comment = False
-    in_string = False
-    escape_next = False
-    
-    for line in json_str.split('\n'):
-        cleaned_line = []
-        i = 0
-        
-        while i < len(line):
-            char = line[i]
-            
-            # Handle escape sequences in strings
-            if escape_next:
-                cleaned_line.append(char)
-                escape_next = False
-                i += 1
-                continue
-            
-            if char == '\\' and in_string:
-                escape_next = True
-                cleaned_line.append(char)
-                i += 1
-                continue
-            
-            # Handle string boundaries
-            if char == '"' and not in_multiline_comment:
-                in_string = not in_string
-                cleaned_line.append(char)
-                i += 1
-                continue
-            
-            # Skip content inside strings
-            if in_string:
-                cleaned_line.append(char)
-                i += 1
-                continue
-            
-            # Handle multi-line comments
-            if in_multiline_comment:
-                if i + 1 < len(line) and line[i:i+2] == '*/':
-                    in_multiline_comment = False
-                    i += 2
-                    continue
-                i += 1
-                continue
-            
-            # Check for comment start
-            if i + 1 < len(line):
-                two_chars = line[i:i+2]
-                
-                # Single-line comment
-                if two_chars == '//':
-                    break  # Skip rest of line
-                
-                # Multi-line comment start
-                if two_chars == '/*':
-                    in_multiline_comment = True
-                    i += 2
-                    continue
-            
-            cleaned_line.append(char)
-            i += 1
-        
-        if cleaned_line:
-            lines.append(''.join(cleaned_line))
-    
-    return '\n'.join(lines)
+    if '/' in json_str:
+        json_str = _JSONC_TOKEN_RE.sub(_replace_jsonc_token, json_str)
+    return '\n'.join(filter(None, json_str.split('\n')))
 
 
 def load_jsonc(file_path: str) -> Dict[str, Any]:
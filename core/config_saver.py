@@ -13,6 +13,14 @@ from utils.logger import get_logger
 logger = get_logger()
 
 
+def _invalidate_config_snapshot():
+    """Reset the cached Config snapshot and hooks config after a config file is written"""
+    from core.config import Config
+    from services.hooks_manager import invalidate_hooks_config
+    Config.invalidate_snapshot()
+    invalidate_hooks_config()
+
+
 class ConfigSaver:
     """
     Configuration saver for JSONC format.
@@ -64,6 +72,9 @@ class ConfigSaver:
                 f.write(header)
                 f.write(json_str)
             
+            # Cached Config.snapshot() is stale now
+            _invalidate_config_snapshot()
+            
             logger.info(f"✓ Saved configuration to {self.config_path}")
             
         except Exception as e:
@@ -81,6 +92,8 @@ class ConfigSaver:
             with open(self.secrets_path, 'w', encoding='utf-8') as f:
                 json.dump(secrets, f, indent=2, ensure_ascii=False)
             
+            _invalidate_config_snapshot()
+            
             logger.info(f"✓ Saved secrets to {self.secrets_path}")
             
         except Exception as e:
@@ -0,0 +1,31 @@
+"""
+Recording context captured when a recording starts.
+
+The target window (where the dictated text is going) is snapshotted at
+record start and travels with the session through StateManager, so
+formatting does not probe the window system after transcription and is
+not confused by the user switching focus while waiting.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RecordingContext:
+    """
+    Target window of a recording session.
+
+    Attributes:
+        session_id: Recording session the context belongs to
+        window_title: Active window title at record start
+        process_name: Process name of the active window
+        process_id: Process ID of the active window
+        format_type: Format resolved from the window by automatic detection
+                     (None if the window matches no configured application)
+    """
+    session_id: Optional[str]
+    window_title: str
+    process_name: str
+    process_id: int
+    format_type: Optional[str]
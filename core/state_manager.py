@@ -9,6 +9,7 @@ import uuid
 from enum import Enum
 from typing import Optional, Callable
 from PyQt6.QtCore import QObject, pyqtSignal
+from core.recording_context import RecordingContext
 from utils.logger import get_logger
 
 logger = get_logger()
@@ -54,6 +55,8 @@ class StateManager(QObject):
         # Manual format selection storage (Requirements 3.1, 8.1, 8.3)
         self._manual_format_selection: Optional[str] = None
         self._current_session_id: Optional[str] = None
+        # Target window captured at record start
+        self._recording_context: Optional[RecordingContext] = None
         
         # Callbacks для действий при переходах состояний
         self._on_show_window: Optional[Callable] = None
@@ -337,6 +340,35 @@ class StateManager(QObject):
             logger.error(f"Failed to retrieve manual format selection: {e}")
             return None  # Continue with normal detection
     
+    def set_recording_context(self, context: RecordingContext) -> None:
+        """
+        Store the target window captured for a recording session.
+        
+        Contexts captured for a session that is no longer current
+        (capture finished after the session ended) are ignored.
+        
+        Args:
+            context: Recording context to attach to the current session
+        """
+        if context.session_id != self._current_session_id:
+            logger.info(f"Ignoring recording context of finished session: {context.session_id}")
+            return
+        self._recording_context = context
+        logger.info(f"Recording context captured: {context.process_name} - {context.window_title} "
+                    f"(format: {context.format_type})")
+    
+    def get_recording_context(self) -> Optional[RecordingContext]:
+        """
+        Get the target window captured for the current session.
+        
+        Returns:
+            RecordingContext or None if it has not been captured (yet)
+        """
+        context = self._recording_context
+        if context is None or context.session_id != self._current_session_id:
+            return None
+        return context
+    
     def clear_manual_format_selection(self) -> None:
         """
         Clear manual format selection.
@@ -350,6 +382,7 @@ class StateManager(QObject):
                 logger.info(f"Clearing manual format selection: {self._manual_format_selection}")
             self._manual_format_selection = None
             self._current_session_id = None
+            self._recording_context = None
         except Exception as e:
             logger.error(f"Failed to clear manual format selection: {e}")
             # Attempt to force clear even if logging fails
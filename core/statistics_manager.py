@@ -3,14 +3,39 @@
 This module provides the core functionality for collecting, storing, and retrieving
 usage statistics for the RapidWhisper application. Statistics are stored locally
 in JSON format for privacy and offline functionality.
+
+In memory, events are kept column by column in NumPy arrays (EventColumns)
+rather than as one object per event. New events are appended to a JSON-lines
+journal (statistics.jsonl), which is periodically compacted into the columnar
+statistics.json. Per-day rollups of the events
+are kept in memory and saved to statistics_rollups.json on compaction, so
+period queries sum day buckets instead of scanning every event.
 """
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+import threading
+from collections import deque
+from dataclasses import astuple, dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 from enum import Enum
 
+import numpy as np
+
+
+# statistics.json format version
+# (1 = indented event list, 2 = compact event list, 3 = columns)
+STORAGE_VERSION = 3
+
+# Journal size (events) at which it is compacted into statistics.json
+JOURNAL_COMPACT_EVENTS = 500
+
+# statistics_rollups.json format version
+ROLLUPS_VERSION = 1
+
+# Seconds the background writer waits to batch events into one write
+FLUSH_DELAY_SECONDS = 0.5
+
 
 class EventType(Enum):
     """Types of statistics events."""
@@ -70,18 +95,253 @@ class AggregatedStats:
     total_removed_silence_seconds: float = 0.0
 
 
+# Event type codes in EventColumns (index in this list)
+EVENT_TYPES = [EventType.RECORDING, EventType.TRANSCRIPTION, EventType.SILENCE_REMOVED]
+
+# Timestamps are stored as microseconds of local time since this moment
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+class EventColumns:
+    """Columnar in-memory storage of statistics events.
+    
+    Each event field is a NumPy array, so years of history take a few
+    dozen bytes per event instead of a Python object per event, and
+    loading and aggregation are vectorized.
+    
+    Missing optional values (durations, counts) are stored as -1.
+    
+    Attributes:
+        types: Event type codes (index in EVENT_TYPES)
+        timestamps: Local time in microseconds since 1970-01-01
+        durations: duration_seconds values
+        character_counts: character_count values
+        word_counts: word_count values
+        removed_durations: removed_duration_seconds values
+    """
+    
+    # JSON column name -> (attribute, dtype)
+    COLUMNS = {
+        'type': ('types', np.int8),
+        'timestamp': ('timestamps', np.int64),
+        'duration_seconds': ('durations', np.float64),
+        'character_count': ('character_counts', np.int32),
+        'word_count': ('word_counts', np.int32),
+        'removed_duration_seconds': ('removed_durations', np.float64),
+    }
+    
+    def __init__(self, capacity: int = 0):
+        """Create empty columns.
+        
+        Args:
+            capacity: Number of events to reserve space for
+        """
+        self._size = 0
+        for attribute, dtype in self.COLUMNS.values():
+            setattr(self, attribute, np.empty(capacity, dtype=dtype))
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @classmethod
+    def from_events(cls, events: List[StatisticsEvent]) -> 'EventColumns':
+        """Build columns from event objects.
+        
+        Args:
+            events: Events to store
+            
+        Returns:
+            Columns holding the events
+        """
+        columns = cls(len(events))
+        for event in events:
+            columns.append(event)
+        return columns
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'EventColumns':
+        """Build columns from the 'columns' object of statistics.json.
+        
+        Rows with an unknown event type are dropped.
+        
+        Args:
+            data: Column name -> list of values
+            
+        Returns:
+            Columns holding the events
+            
+        Raises:
+            ValueError: If a column is missing, malformed or of a different length
+        """
+        arrays = {}
+        for name, (attribute, dtype) in cls.COLUMNS.items():
+            values = data.get(name)
+            if not isinstance(values, list):
+                raise ValueError(f"Column '{name}' is not a list")
+            try:
+                arrays[attribute] = np.asarray(values, dtype=dtype)
+            except (TypeError, OverflowError) as e:
+                raise ValueError(f"Invalid values in column '{name}': {e}")
+            if arrays[attribute].shape != (len(data['type']),):
+                raise ValueError(f"Column '{name}' has a different length")
+        
+        valid = (arrays['types'] >= 0) & (arrays['types'] < len(EVENT_TYPES))
+        columns = cls()
+        for attribute, array in arrays.items():
+            setattr(columns, attribute, array if valid.all() else array[valid])
+        columns._size = int(valid.sum())
+        return columns
+    
+    def to_json(self) -> Dict[str, list]:
+        """Convert columns to JSON-serializable lists.
+        
+        Returns:
+            Column name -> list of values
+        """
+        return {
+            name: getattr(self, attribute)[:self._size].tolist()
+            for name, (attribute, _) in self.COLUMNS.items()
+        }
+    
+    def append(self, event: StatisticsEvent) -> None:
+        """Append an event, growing the arrays if needed.
+        
+        Args:
+            event: The event to append
+        """
+        if self._size == len(self.types):
+            capacity = max(1024, self._size * 2)
+            for attribute, _ in self.COLUMNS.values():
+                array = getattr(self, attribute)
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:self._size] = array[:self._size]
+                setattr(self, attribute, grown)
+        
+        i = self._size
+        self.types[i] = EVENT_TYPES.index(event.type)
+        self.timestamps[i] = (event.timestamp - _EPOCH) // _MICROSECOND
+        self.durations[i] = _or_missing(event.duration_seconds)
+        self.character_counts[i] = _or_missing(event.character_count)
+        self.word_counts[i] = _or_missing(event.word_count)
+        self.removed_durations[i] = _or_missing(event.removed_duration_seconds)
+        self._size += 1
+    
+    def event(self, i: int) -> StatisticsEvent:
+        """Materialize a single event object.
+        
+        Args:
+            i: Event index
+            
+        Returns:
+            The StatisticsEvent at index i
+        """
+        return StatisticsEvent(
+            type=EVENT_TYPES[self.types[i]],
+            timestamp=_EPOCH + timedelta(microseconds=int(self.timestamps[i])),
+            duration_seconds=_or_none(float(self.durations[i])),
+            character_count=_or_none(int(self.character_counts[i])),
+            word_count=_or_none(int(self.word_counts[i])),
+            removed_duration_seconds=_or_none(float(self.removed_durations[i]))
+        )
+    
+    def to_events(self) -> List[StatisticsEvent]:
+        """Materialize all events as objects (oldest first)."""
+        return [self.event(i) for i in range(self._size)]
+    
+    def daily_rollups(self) -> Dict[date, AggregatedStats]:
+        """Aggregate events per day with masked sums.
+        
+        Returns:
+            Day -> aggregated statistics of that day
+        """
+        if self._size == 0:
+            return {}
+        
+        types = self.types[:self._size]
+        durations = self.durations[:self._size]
+        character_counts = self.character_counts[:self._size]
+        word_counts = self.word_counts[:self._size]
+        removed_durations = self.removed_durations[:self._size]
+        
+        days = self.timestamps[:self._size] // _MICROSECONDS_PER_DAY
+        first_day = int(days.min())
+        days = days - first_day
+        n_days = int(days.max()) + 1
+        
+        recording = types == EVENT_TYPES.index(EventType.RECORDING)
+        transcription = types == EVENT_TYPES.index(EventType.TRANSCRIPTION)
+        silence = types == EVENT_TYPES.index(EventType.SILENCE_REMOVED)
+        
+        def count(mask):
+            return np.bincount(days[mask], minlength=n_days)
+        
+        def total(mask, values):
+            # Missing (-1) and negative values are not counted
+            mask = mask & (values > 0)
+            return np.bincount(days[mask], weights=values[mask], minlength=n_days)
+        
+        columns = zip(
+            count(recording),
+            count(transcription),
+            total(recording, durations),
+            total(transcription, durations),
+            total(transcription, character_counts).astype(np.int64),
+            total(transcription, word_counts).astype(np.int64),
+            total(silence, removed_durations)
+        )
+        
+        rollups = {}
+        for offset, values in enumerate(columns):
+            if values[0] or values[1] or values[6]:
+                day = date.fromordinal(_EPOCH.toordinal() + first_day + offset)
+                rollups[day] = AggregatedStats(*(value.item() for value in values))
+        return rollups
+
+
+def _or_missing(value) -> float:
+    """Map an optional value to its column value (-1 if missing)."""
+    return -1 if value is None else value
+
+
+def _or_none(value):
+    """Map a column value back to an optional value."""
+    return None if value == -1 else value
+
+
+def _optional(value, cast):
+    """Cast an optional stored number (None stays None).
+    
+    Raises:
+        TypeError, ValueError: If the value is not a number
+    """
+    return None if value is None else cast(value)
+
+
 class StatisticsManager:
     """Manages statistics collection, storage, and retrieval.
     
     The StatisticsManager is responsible for:
     - Tracking events (recordings, transcriptions, silence removal)
-    - Persisting events to local JSON storage
+    - Persisting events to an append-only journal with periodic compaction
     - Loading events from storage
-    - Filtering events by time period
-    - Aggregating statistics from events
+    - Maintaining per-day rollups of the events
+    - Aggregating statistics for a time period from the rollups
+    
+    Statistics are stored in statistics.json (compacted events) and
+    statistics.jsonl (events added since the last compaction) in the
+    application's config directory.
+    The storage is loaded by the background writer thread as soon as the
+    manager is constructed.
     
-    Statistics are stored in a JSON file in the application's config directory.
-    The manager uses lazy loading - data is only loaded from disk when first accessed.
+    The track_* methods are non-blocking and safe to call from any thread:
+    they only queue the event. A background writer thread applies queued
+    events and appends them to the journal in batches. Readers see queued
+    events immediately; call flush() to force them to disk and close()
+    on shutdown. Readers aggregate from memory and never wait for file
+    writes: files are guarded by their own lock, and the in-memory lock is
+    only held to apply events and to take a snapshot for compaction.
     """
     
     def __init__(self, config_dir: Path):
@@ -93,8 +353,51 @@ class StatisticsManager:
         """
         self.config_dir = config_dir
         self.storage_path = config_dir / "statistics.json"
-        self.events: List[StatisticsEvent] = []
+        self.journal_path = config_dir / "statistics.jsonl"
+        self.rollups_path = config_dir / "statistics_rollups.json"
+        self._columns = EventColumns()
         self._loaded = False
+        self._journal_id: Optional[str] = None
+        self._journal_events = 0
+        
+        # Per-day aggregates and their running total
+        self._daily: Dict[date, AggregatedStats] = {}
+        self._totals = AggregatedStats()
+        self._last_day: Optional[date] = None
+        
+        # Guards the events and rollups in memory (never held during I/O)
+        self._lock = threading.RLock()
+        # Guards the storage files and the initial load
+        self._io_lock = threading.RLock()
+        # Tracked events not yet applied (filled from any thread)
+        self._pending: deque = deque()
+        # Applied events not yet written to the journal
+        self._unwritten: List[StatisticsEvent] = []
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closing = threading.Event()
+        
+        # Load the storage off the calling (GUI) thread
+        self._start_writer()
+    
+    @property
+    def events(self) -> List[StatisticsEvent]:
+        """All tracked events as objects, oldest first.
+        
+        Events are materialized from the columns on every access; the
+        manager itself only uses the columns.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._apply_pending()
+            return self._columns.to_events()
+    
+    @events.setter
+    def events(self, events: List[StatisticsEvent]) -> None:
+        self._ensure_loaded()
+        with self._lock:
+            self._columns = EventColumns.from_events(events)
+            self._rebuild_rollups()
     
     def track_recording(self, duration_seconds: float) -> None:
         """Track a recording event.
@@ -161,29 +464,184 @@ class StatisticsManager:
         self._add_event(event)
     
     def _add_event(self, event: StatisticsEvent) -> None:
-        """Add an event and save to storage.
+        """Queue an event for the background writer.
+        
+        Does no I/O and does not wait for the storage lock, so it is safe
+        to call from the GUI thread.
         
         Args:
             event: The StatisticsEvent to add
         """
-        self._ensure_loaded()
-        self.events.append(event)
-        self._save_to_storage()
+        self._pending.append(event)
+        self._start_writer()
+    
+    def _start_writer(self) -> None:
+        """Start the background writer unless it is already running."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run_writer,
+                    name="StatisticsWriter",
+                    daemon=True
+                )
+                self._writer.start()
+    
+    def _run_writer(self) -> None:
+        """Background writer: load the storage, batch queued events and flush them.
+        
+        The thread exits once the queue is empty and is started again by
+        the next tracked event. An unexpected error is logged and ends the
+        thread the same way, so the next event starts a new writer.
+        """
+        try:
+            self._ensure_loaded()
+            while True:
+                with self._writer_lock:
+                    if not self._pending:
+                        return
+                # Events tracked during the delay go into the same write
+                self._closing.wait(FLUSH_DELAY_SECONDS)
+                self.flush()
+        except Exception as e:
+            print(f"Error in statistics writer: {e}")
+        finally:
+            with self._writer_lock:
+                if self._writer is threading.current_thread():
+                    self._writer = None
+    
+    def flush(self) -> None:
+        """Apply queued events and append them to the journal.
+        
+        Once the journal holds JOURNAL_COMPACT_EVENTS events it is
+        compacted into statistics.json.
+        """
+        with self._io_lock:
+            self._ensure_loaded()
+            with self._lock:
+                if not self._pending and not self._unwritten:
+                    return
+                self._apply_pending()
+                unwritten, self._unwritten = self._unwritten, []
+            self._append_to_journal(unwritten)
+            if self._journal_events >= JOURNAL_COMPACT_EVENTS:
+                self._save_to_storage()
+    
+    def close(self) -> None:
+        """Stop the background writer and write all queued events.
+        
+        Called on application shutdown.
+        """
+        self._closing.set()
+        with self._writer_lock:
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+        self.flush()
+    
+    def _apply_pending(self) -> None:
+        """Move queued events into the columns and rollups.
+        
+        Must be called with self._lock held, after the storage is loaded.
+        """
+        while self._pending:
+            event = self._pending.popleft()
+            self._columns.append(event)
+            self._add_to_rollups(event)
+            self._unwritten.append(event)
     
     def _ensure_loaded(self) -> None:
-        """Ensure statistics are loaded from storage."""
-        if not self._loaded:
-            self._load_from_storage()
-            self._loaded = True
+        """Ensure statistics are loaded from storage.
+        
+        Returns at once after the first load; before it, waits for the
+        writer thread to finish loading. Must not be called with
+        self._lock held.
+        """
+        if self._loaded:
+            return
+        with self._io_lock:
+            if not self._loaded:
+                try:
+                    self._load_from_storage()
+                except Exception as e:
+                    self._recover_from_failed_load(e)
+                self._loaded = True
+    
+    def _recover_from_failed_load(self, error: Exception) -> None:
+        """Keep what was loaded after an unexpected load error.
+        
+        The storage files are backed up, since the next write starts a
+        new journal and compaction rewrites statistics.json. Events loaded
+        before the error are kept; if even those are unusable, statistics
+        start empty.
+        
+        Args:
+            error: The exception raised while loading
+        """
+        import shutil
+        
+        print(f"Error loading statistics: {error}")
+        for path, suffix in ((self.storage_path, '.json.backup'), (self.journal_path, '.jsonl.backup')):
+            if path.exists():
+                try:
+                    shutil.copy2(path, path.with_suffix(suffix))
+                except IOError as backup_error:
+                    print(f"Failed to create backup: {backup_error}")
+        try:
+            self._rebuild_rollups()
+        except Exception:
+            self._columns = EventColumns()
+            self._rebuild_rollups()
+        self._journal_id = None
+        self._journal_events = 0
     
     def _load_from_storage(self) -> None:
-        """Load statistics from JSON file."""
+        """Load statistics from statistics.json and replay the journal.
+        
+        A statistics.json in the old format (indented, without a version)
+        is migrated by compacting it on first load. The storage is also
+        compacted if the journal was left torn or stale by a crash.
+        """
+        with self._io_lock:
+            self._load_storage_files()
+    
+    def _load_storage_files(self) -> None:
+        """Load statistics.json and the journal (self._io_lock must be held)."""
+        absorbed_journal_id, needs_compaction = self._load_snapshot()
+        if needs_compaction or not self._load_rollups(absorbed_journal_id):
+            self._rebuild_rollups()
+        
+        journal_events, journal_id, journal_clean = self._read_journal()
+        if journal_id is not None and journal_id == absorbed_journal_id:
+            # Crash after compaction, before the journal was reset:
+            # its events are already in statistics.json
+            journal_events = []
+            needs_compaction = True
+        
+        for event in journal_events:
+            self._columns.append(event)
+            self._add_to_rollups(event)
+        self._journal_id = journal_id
+        self._journal_events = len(journal_events)
+        
+        if needs_compaction or not journal_clean or self._journal_events >= JOURNAL_COMPACT_EVENTS:
+            self._save_to_storage()
+    
+    def _load_snapshot(self) -> Tuple[Optional[str], bool]:
+        """Load compacted events from statistics.json into the columns.
+        
+        Files in the older event-list formats are read event by event and
+        flagged for compaction, which migrates them to columns.
+        
+        Returns:
+            Tuple of (id of the journal already merged into the file,
+            whether the file has to be rewritten in the current format)
+        """
         import json
         import shutil
         
+        self._columns = EventColumns()
         if not self.storage_path.exists():
-            self.events = []
-            return
+            return None, False
         
         try:
             with open(self.storage_path, 'r', encoding='utf-8') as f:
@@ -192,8 +650,19 @@ class StatisticsManager:
                 # Validate that data is a dictionary
                 if not isinstance(data, dict):
                     print(f"Warning: JSON root is not a dictionary, got {type(data).__name__}")
-                    self.events = []
-                    return
+                    return None, True
+                
+                if data.get('version') == STORAGE_VERSION:
+                    columns_data = data.get('columns')
+                    if not isinstance(columns_data, dict):
+                        print(f"Warning: 'columns' is not a dictionary, got {type(columns_data).__name__}")
+                        return None, True
+                    try:
+                        self._columns = EventColumns.from_json(columns_data)
+                    except ValueError as e:
+                        print(f"Warning: invalid statistics columns: {e}")
+                        return None, True
+                    return data.get('journal_id'), False
                 
                 events_data = data.get('events', [])
                 
@@ -202,7 +671,9 @@ class StatisticsManager:
                     print(f"Warning: 'events' is not a list, got {type(events_data).__name__}")
                     events_data = []
                 
-                self.events = self._deserialize_events(events_data)
+                self._columns = EventColumns.from_events(self._deserialize_events(events_data))
+                print(f"Migrating {len(self._columns)} statistics events to the columnar format")
+                return None, True
         except UnicodeDecodeError as e:
             # Binary file or encoding issue - create backup and start fresh
             backup_path = self.storage_path.with_suffix('.json.backup')
@@ -212,7 +683,8 @@ class StatisticsManager:
             except IOError as backup_error:
                 print(f"Failed to create backup: {backup_error}")
             print(f"Error loading statistics: {e}")
-            self.events = []
+            self._columns = EventColumns()
+            return None, True
         except json.JSONDecodeError as e:
             # Create backup of corrupted file and start with empty statistics
             backup_path = self.storage_path.with_suffix('.json.backup')
@@ -222,25 +694,231 @@ class StatisticsManager:
             except IOError as backup_error:
                 print(f"Failed to create backup: {backup_error}")
             print(f"Error loading statistics: {e}")
-            self.events = []
+            self._columns = EventColumns()
+            return None, True
         except IOError as e:
             # Log error and start with empty statistics
             print(f"Error loading statistics: {e}")
-            self.events = []
+            self._columns = EventColumns()
+            return None, False
     
-    def _save_to_storage(self) -> None:
-        """Save statistics to JSON file."""
+    def _read_journal(self) -> Tuple[List[StatisticsEvent], Optional[str], bool]:
+        """Read events appended to the journal since the last compaction.
+        
+        Lines that cannot be parsed (a write torn by a crash) are skipped.
+        
+        Returns:
+            Tuple of (events, journal id from the header line, whether
+            every line was intact)
+        """
+        import json
+        import shutil
+        
+        if not self.journal_path.exists():
+            return [], None, True
+        
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except UnicodeDecodeError as e:
+            backup_path = self.journal_path.with_suffix('.jsonl.backup')
+            try:
+                shutil.copy2(self.journal_path, backup_path)
+                print(f"Unicode decode error: {e}. Created backup at {backup_path}")
+            except IOError as backup_error:
+                print(f"Failed to create backup: {backup_error}")
+            return [], None, False
+        except IOError as e:
+            print(f"Error loading statistics journal: {e}")
+            return [], None, False
+        
+        journal_id = None
+        clean = not content or content.endswith('\n')
+        events_data = []
+        for line in content.split('\n'):
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping damaged journal line: {line[:80]!r}")
+                clean = False
+                continue
+            if not isinstance(item, dict):
+                clean = False
+            elif 'journal_id' in item:
+                journal_id = item['journal_id']
+            else:
+                events_data.append(item)
+        
+        return self._deserialize_events(events_data), journal_id, clean
+    
+    def _append_to_journal(self, events: List[StatisticsEvent]) -> None:
+        """Append events to the journal, one JSON line each, in one write.
+        
+        Args:
+            events: The StatisticsEvents to append
+        """
         import json
         
         try:
             self.config_dir.mkdir(parents=True, exist_ok=True)
-            data = {'events': self._serialize_events(self.events)}
+            if self._journal_id is None:
+                self._start_journal()
             
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            lines = ''.join(
+                json.dumps(item, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for item in self._serialize_events(events)
+            )
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+            self._journal_events += len(events)
         except IOError as e:
             print(f"Error saving statistics: {e}")
     
+    def _start_journal(self) -> None:
+        """Atomically replace the journal with an empty one under a new id."""
+        import json
+        import uuid
+        
+        journal_id = uuid.uuid4().hex
+        self._write_atomic(self.journal_path, json.dumps({'journal_id': journal_id}) + '\n')
+        self._journal_id = journal_id
+        self._journal_events = 0
+    
+    def _save_to_storage(self) -> None:
+        """Compact all events into statistics.json and start a new journal.
+        
+        statistics.json is replaced atomically and records the id of the
+        journal it absorbed, so a crash before the journal is reset does
+        not replay those events twice. The events are copied under
+        self._lock and written without it, so readers are not blocked.
+        """
+        import json
+        
+        with self._io_lock:
+            with self._lock:
+                columns = self._columns.to_json()
+                days = {day.isoformat(): astuple(stats) for day, stats in self._daily.items()}
+                # Applied events not yet in the journal go into the snapshot
+                absorbed, self._unwritten = self._unwritten, []
+            try:
+                self.config_dir.mkdir(parents=True, exist_ok=True)
+                data = {
+                    'version': STORAGE_VERSION,
+                    'journal_id': self._journal_id,
+                    'columns': columns
+                }
+                self._write_atomic(
+                    self.storage_path,
+                    json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+                )
+                self._save_rollups(days, len(columns['type']))
+                self._start_journal()
+            except IOError as e:
+                print(f"Error saving statistics: {e}")
+                with self._lock:
+                    self._unwritten[:0] = absorbed
+    
+    def _save_rollups(self, days: Dict[str, tuple], event_count: int) -> None:
+        """Save per-day rollups for the events in statistics.json.
+        
+        The file is tagged with the same journal id and event count as
+        statistics.json, so a stale file is detected on load.
+        
+        Args:
+            days: ISO day -> rollup values, copied with the columns
+            event_count: Number of events in statistics.json
+        """
+        import json
+        
+        data = {
+            'version': ROLLUPS_VERSION,
+            'journal_id': self._journal_id,
+            'events': event_count,
+            'days': days
+        }
+        self._write_atomic(self.rollups_path, json.dumps(data, separators=(',', ':')))
+    
+    def _load_rollups(self, journal_id: Optional[str]) -> bool:
+        """Load per-day rollups saved for the events in statistics.json.
+        
+        Args:
+            journal_id: Id of the journal absorbed by statistics.json
+            
+        Returns:
+            True if the rollups match the loaded events, False if they
+            have to be rebuilt
+        """
+        import json
+        
+        if not self.rollups_path.exists():
+            return False
+        
+        try:
+            with open(self.rollups_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if (data.get('version') != ROLLUPS_VERSION
+                    or data.get('journal_id') != journal_id
+                    or data.get('events') != len(self._columns)):
+                return False
+            
+            daily = {
+                date.fromisoformat(day): AggregatedStats(*values)
+                for day, values in data['days'].items()
+            }
+        except (IOError, UnicodeDecodeError, ValueError, TypeError, KeyError, AttributeError) as e:
+            print(f"Rebuilding statistics rollups: {e}")
+            return False
+        
+        self._daily = daily
+        self._totals = AggregatedStats()
+        for stats in daily.values():
+            self._merge_stats(self._totals, stats)
+        self._last_day = max(daily, default=None)
+        return True
+    
+    def _rebuild_rollups(self) -> None:
+        """Recompute per-day rollups from the columns."""
+        self._daily = self._columns.daily_rollups()
+        self._totals = AggregatedStats()
+        for stats in self._daily.values():
+            self._merge_stats(self._totals, stats)
+        self._last_day = max(self._daily, default=None)
+    
+    def _add_to_rollups(self, event: StatisticsEvent) -> None:
+        """Add an event to its day bucket and to the running total.
+        
+        Args:
+            event: The StatisticsEvent to add
+        """
+        day = event.timestamp.date()
+        bucket = self._daily.get(day)
+        if bucket is None:
+            bucket = self._daily[day] = AggregatedStats()
+            if self._last_day is None or day > self._last_day:
+                self._last_day = day
+        self._accumulate(bucket, event)
+        self._accumulate(self._totals, event)
+    
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        """Write a file through a temporary file and an atomic rename.
+        
+        Args:
+            path: Destination file
+            content: Text to write
+        """
+        import os
+        
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
     def _serialize_events(self, events: List[StatisticsEvent]) -> List[dict]:
         """Convert events to JSON-serializable format.
         
@@ -265,6 +943,10 @@ class StatisticsManager:
     def _deserialize_events(self, data: List[dict]) -> List[StatisticsEvent]:
         """Convert JSON data to StatisticsEvent objects.
         
+        Rows that do not fit the columns (missing fields, non-numeric
+        values, a timestamp that is not an ISO string) are skipped.
+        Timestamps with a timezone are converted to naive local time.
+        
         Args:
             data: List of dictionaries representing events
             
@@ -274,16 +956,19 @@ class StatisticsManager:
         events = []
         for item in data:
             try:
+                timestamp = datetime.fromisoformat(item['timestamp'])
+                if timestamp.tzinfo is not None:
+                    timestamp = timestamp.astimezone().replace(tzinfo=None)
                 event = StatisticsEvent(
                     type=EventType(item['type']),
-                    timestamp=datetime.fromisoformat(item['timestamp']),
-                    duration_seconds=item.get('duration_seconds'),
-                    character_count=item.get('character_count'),
-                    word_count=item.get('word_count'),
-                    removed_duration_seconds=item.get('removed_duration_seconds')
+                    timestamp=timestamp,
+                    duration_seconds=_optional(item.get('duration_seconds'), float),
+                    character_count=_optional(item.get('character_count'), int),
+                    word_count=_optional(item.get('word_count'), int),
+                    removed_duration_seconds=_optional(item.get('removed_duration_seconds'), float)
                 )
                 events.append(event)
-            except (KeyError, ValueError) as e:
+            except (KeyError, TypeError, ValueError, OverflowError) as e:
                 # Skip invalid events
                 print(f"Skipping invalid event: {e}")
                 continue
@@ -299,31 +984,42 @@ class StatisticsManager:
             Aggregated statistics for the specified period
         """
         self._ensure_loaded()
-        filtered_events = self._filter_events_by_period(period)
-        return self._aggregate_events(filtered_events)
+        with self._lock:
+            self._apply_pending()
+            return self._aggregate_period(period)
     
-    def _filter_events_by_period(
-        self, 
-        period: TimePeriod
-    ) -> List[StatisticsEvent]:
-        """Filter events by time period.
+    def _aggregate_period(self, period: TimePeriod) -> AggregatedStats:
+        """Sum the day buckets of a period (self._lock must be held).
         
         Args:
-            period: The time period to filter by
+            period: The time period to aggregate
             
         Returns:
-            List of events within the specified period
+            Aggregated statistics for the period
         """
+        stats = AggregatedStats()
         if period == TimePeriod.ALL_TIME:
-            return self.events
+            self._merge_stats(stats, self._totals)
+            return stats
         
+        # Periods start at midnight, so they are made of whole day buckets:
+        # at most 365 lookups whatever the number of events
         now = datetime.now()
-        cutoff_time = self._get_cutoff_time(now, period)
+        today = now.date()
+        day = self._get_cutoff_time(now, period).date()
+        while day <= today:
+            bucket = self._daily.get(day)
+            if bucket is not None:
+                self._merge_stats(stats, bucket)
+            day += timedelta(days=1)
         
-        return [
-            event for event in self.events 
-            if event.timestamp >= cutoff_time
-        ]
+        # Events dated after today (clock skew, imports) still count, but
+        # only their own buckets are visited, not the calendar up to them
+        if self._last_day is not None and self._last_day > today:
+            for day, bucket in self._daily.items():
+                if day > today:
+                    self._merge_stats(stats, bucket)
+        return stats
     
     def _get_cutoff_time(self, now: datetime, period: TimePeriod) -> datetime:
         """Calculate the cutoff time for a period.
@@ -333,52 +1029,60 @@ class StatisticsManager:
             period: The time period
             
         Returns:
-            The cutoff datetime for filtering
+            The cutoff datetime for filtering (midnight of the first day
+            of the period; a period of N days includes today)
         """
-        from datetime import timedelta
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         if period == TimePeriod.TODAY:
-            return now.replace(hour=0, minute=0, second=0, microsecond=0)
+            return midnight
         elif period == TimePeriod.LAST_7_DAYS:
-            return now - timedelta(days=7)
+            return midnight - timedelta(days=6)
         elif period == TimePeriod.LAST_30_DAYS:
-            return now - timedelta(days=30)
+            return midnight - timedelta(days=29)
         elif period == TimePeriod.LAST_365_DAYS:
-            return now - timedelta(days=365)
+            return midnight - timedelta(days=364)
         else:
             return datetime.min
     
-    def _aggregate_events(
-        self, 
-        events: List[StatisticsEvent]
-    ) -> AggregatedStats:
-        """Aggregate statistics from events.
+    @staticmethod
+    def _accumulate(stats: AggregatedStats, event: StatisticsEvent) -> None:
+        """Add a single event to aggregated statistics.
         
         Args:
-            events: List of events to aggregate
-            
-        Returns:
-            Aggregated statistics
+            stats: Aggregated statistics to update in place
+            event: The event to add
         """
-        stats = AggregatedStats()
+        if event.type == EventType.RECORDING:
+            stats.recordings_count += 1
+            if event.duration_seconds and event.duration_seconds >= 0:
+                stats.total_recording_time_seconds += event.duration_seconds
         
-        for event in events:
-            if event.type == EventType.RECORDING:
-                stats.recordings_count += 1
-                if event.duration_seconds and event.duration_seconds >= 0:
-                    stats.total_recording_time_seconds += event.duration_seconds
-            
-            elif event.type == EventType.TRANSCRIPTION:
-                stats.transcriptions_count += 1
-                if event.duration_seconds and event.duration_seconds >= 0:
-                    stats.total_transcribed_audio_time_seconds += event.duration_seconds
-                if event.character_count and event.character_count >= 0:
-                    stats.total_character_count += event.character_count
-                if event.word_count and event.word_count >= 0:
-                    stats.total_word_count += event.word_count
-            
-            elif event.type == EventType.SILENCE_REMOVED:
-                if event.removed_duration_seconds and event.removed_duration_seconds >= 0:
-                    stats.total_removed_silence_seconds += event.removed_duration_seconds
+        elif event.type == EventType.TRANSCRIPTION:
+            stats.transcriptions_count += 1
+            if event.duration_seconds and event.duration_seconds >= 0:
+                stats.total_transcribed_audio_time_seconds += event.duration_seconds
+            if event.character_count and event.character_count >= 0:
+                stats.total_character_count += event.character_count
+            if event.word_count and event.word_count >= 0:
+                stats.total_word_count += event.word_count
         
-        return stats
+        elif event.type == EventType.SILENCE_REMOVED:
+            if event.removed_duration_seconds and event.removed_duration_seconds >= 0:
+                stats.total_removed_silence_seconds += event.removed_duration_seconds
+    
+    @staticmethod
+    def _merge_stats(target: AggregatedStats, other: AggregatedStats) -> None:
+        """Add aggregated statistics to another aggregate.
+        
+        Args:
+            target: Aggregated statistics to update in place
+            other: Aggregated statistics to add
+        """
+        target.recordings_count += other.recordings_count
+        target.transcriptions_count += other.transcriptions_count
+        target.total_recording_time_seconds += other.total_recording_time_seconds
+        target.total_transcribed_audio_time_seconds += other.total_transcribed_audio_time_seconds
+        target.total_character_count += other.total_character_count
+        target.total_word_count += other.total_word_count
+        target.total_removed_silence_seconds += other.total_removed_silence_seconds
@@ -13,6 +13,7 @@ and distribution are prohibited without written permission.
 """
 
 import sys
+import threading
 from typing import Optional
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer, Qt
@@ -22,10 +23,16 @@ from core.config import Config, get_config_dir
 from core.state_manager import StateManager, AppState
 from core.statistics_manager import StatisticsManager
 from services.hotkey_manager import HotkeyManager
+from services.api_client_pool import get_client_pool
 from services.audio_engine import AudioRecordingThread
+from services.audio_payload import AudioPayload
 from services.transcription_client import TranscriptionThread, ProcessingThread
 from services.clipboard_manager import ClipboardManager
+from services.connection_prewarm import ConnectionPrewarmer
+from services.noise_floor import NoiseFloorEstimator
 from services.silence_detector import SilenceDetector
+from services.speculative_transcription import PauseSegmenter, SpeculativeTranscriber
+from services.voice_activity import VoiceActivityDetector, create_vad_backend
 from ui.floating_window import FloatingWindow
 from ui.tray_icon import TrayIcon
 from utils.logger import get_logger
@@ -68,6 +75,9 @@ class RapidWhisperApp(QObject):
     # Сигнал для отмены записи (ESC)
     _cancel_recording_signal = pyqtSignal()
     
+    # Сигнал с контекстом записи, снятым в фоновом потоке
+    _recording_context_signal = pyqtSignal(object)
+    
     def __init__(self):
         """Инициализирует приложение."""
         super().__init__()
@@ -92,6 +102,23 @@ class RapidWhisperApp(QObject):
         self.transcription_thread: TranscriptionThread = None
         self.processing_thread = None  # ProcessingThread for formatting/post-processing
         
+        # Аудио последней записи (в памяти или на диске) и путь к файлу, если он есть
+        self._audio_payload: Optional[AudioPayload] = None
+        self._audio_file_path: Optional[str] = None
+        
+        # Монитор окон для снимка целевого окна записи (создается при первой записи)
+        self._window_monitor = None
+        self._window_monitor_lock = threading.Lock()
+        
+        # Транскрипция сегментов текущей записи, отправленных до остановки
+        self._speculative: Optional[SpeculativeTranscriber] = None
+        
+        # Снимок конфигурации, из которого создан self.config
+        self._config_snapshot: Optional[Config] = None
+        
+        # Прогрев соединений с API на время записи
+        self._prewarmer: Optional[ConnectionPrewarmer] = None
+        
         # Окно настроек (единственный экземпляр)
         self.settings_window = None
         
@@ -205,10 +232,7 @@ class RapidWhisperApp(QObject):
         self.clipboard_manager = ClipboardManager()
         
         # Silence Detector
-        self.silence_detector = SilenceDetector(
-            threshold=self.config.silence_threshold,
-            silence_duration=self.config.silence_duration
-        )
+        self.silence_detector = self._create_silence_detector(self.config)
         
         # Hotkey Manager (создается без callback, callback устанавливается позже)
         # Временно создаем с пустым callback
@@ -255,6 +279,9 @@ class RapidWhisperApp(QObject):
         # Подключаем сигнал отмены записи
         self._cancel_recording_signal.connect(self._handle_cancel_recording)
         
+        # Контекст записи передается в StateManager в главном потоке
+        self._recording_context_signal.connect(self.state_manager.set_recording_context)
+        
         self.logger.info("Сигналы подключены")
     
     def _register_hotkey(self) -> None:
@@ -351,6 +378,8 @@ class RapidWhisperApp(QObject):
             if self.recording_thread and self.recording_thread.isRunning():
                 self.recording_thread.cancel()  # Используем cancel вместо stop
                 self.logger.info("Поток записи отменен (без сохранения)")
+            self._discard_speculative()
+            self._stop_connection_prewarm()
             
             # Скрыть окно
             self._hide_window_signal.emit()
@@ -533,10 +562,14 @@ class RapidWhisperApp(QObject):
         try:
             self.logger.info("_start_recording вызван")
             
-            # ВАЖНО: Перезагрузить конфигурацию перед записью
-            # чтобы применить последние изменения настроек
-            self.config = Config.load_from_config()
-            self.logger.info(f"Конфигурация перезагружена: manual_stop={self.config.manual_stop}")
+            # ВАЖНО: Применить последние изменения настроек перед записью.
+            # Снимок перечитывается с диска только если файлы конфигурации изменились
+            snapshot = Config.snapshot()
+            if snapshot is not self._config_snapshot:
+                self._config_snapshot = snapshot
+                # Изменяемая копия: окно настроек меняет self.config для live preview
+                self.config = snapshot.copy()
+                self.logger.info(f"Конфигурация перезагружена: manual_stop={self.config.manual_stop}")
             
             # Показать info panel при начале записи
             self.floating_window.show_info_panel()
@@ -558,15 +591,33 @@ class RapidWhisperApp(QObject):
             self.logger.info("Отправка сигнала запуска анимации...")
             self._start_recording_animation_signal.emit()
             
+            # Запомнить целевое окно в фоне, не задерживая GUI поток
+            threading.Thread(
+                target=self._capture_recording_context,
+                args=(self.state_manager.get_current_session_id(),),
+                name="RecordingContext",
+                daemon=True
+            ).start()
+            
             # Сбросить детектор тишины
             self.silence_detector.reset()
             
+            # Открыть соединения с API, пока пользователь говорит
+            self._start_connection_prewarm()
+            
+            # Спекулятивная транскрипция фраз во время записи (если включена)
+            segmenter = self._create_speculative_transcriber()
+            
             # Создать и запустить поток записи
             # Передать флаг enable_silence_detection в зависимости от режима
             enable_silence = not self.config.manual_stop
             self.recording_thread = AudioRecordingThread(
                 self.silence_detector, 
-                enable_silence_detection=enable_silence
+                enable_silence_detection=enable_silence,
+                stream_to_disk=self.config.stream_to_disk,
+                segmenter=segmenter,
+                vad=self._create_vad_backend() if enable_silence else None,
+                noise_floor=self.silence_detector.noise_floor if enable_silence else None
             )
             self.logger.info(f"AudioRecordingThread создан: enable_silence_detection={enable_silence}")
             
@@ -575,6 +626,8 @@ class RapidWhisperApp(QObject):
                 self.floating_window.get_waveform_widget().update_rms
             )
             
+            self.recording_thread.noise_floor_updated.connect(self._on_noise_floor_updated)
+            
             # Подключить сигнал тишины только если НЕ включен ручной режим
             if not self.config.manual_stop:
                 self.logger.info("Режим автоматической остановки: подключаем сигнал тишины")
@@ -590,6 +643,8 @@ class RapidWhisperApp(QObject):
             self.recording_thread.recording_error.connect(
                 self._on_recording_error
             )
+            if segmenter is not None:
+                self.recording_thread.segment_ready.connect(self._on_segment_ready)
             
             # Запустить поток
             self.recording_thread.start()
@@ -602,6 +657,172 @@ class RapidWhisperApp(QObject):
             self.logger.error(traceback.format_exc())
             self.state_manager.on_error(e)
     
+    def _start_connection_prewarm(self) -> None:
+        """
+        Запускает прогрев соединений с провайдером транскрипции
+        и провайдером постобработки (если она включена).
+        """
+        self._stop_connection_prewarm()
+        if not self.config.prewarm_connections:
+            return
+        
+        post_provider = self.config.post_processing_provider if self.config.enable_post_processing else None
+        post_api_keys = {
+            "groq": self.config.groq_api_key,
+            "openai": self.config.openai_api_key,
+            "glm": self.config.glm_api_key,
+            "zai": self.config.glm_api_key,  # Z.AI использует GLM_API_KEY
+            "llm": self.config.llm_api_key,
+        }
+        
+        self._prewarmer = ConnectionPrewarmer(
+            provider=self.config.ai_provider,
+            api_key=self._get_api_key_for_provider(),
+            base_url=self.config.custom_base_url if self.config.ai_provider == "custom" else None,
+            model=self._get_transcription_model_for_provider(),
+            post_processing_provider=post_provider,
+            post_processing_api_key=post_api_keys.get(post_provider),
+            post_processing_base_url=self.config.llm_base_url,
+            use_coding_plan=self.config.glm_use_coding_plan
+        )
+        self._prewarmer.start()
+    
+    def _stop_connection_prewarm(self) -> None:
+        """Останавливает прогрев соединений (запись завершена или отменена)."""
+        if self._prewarmer is not None:
+            self._prewarmer.stop()
+            self._prewarmer = None
+    
+    def _create_speculative_transcriber(self) -> Optional[PauseSegmenter]:
+        """
+        Создает транскрайбер сегментов для новой записи.
+        
+        Returns:
+            PauseSegmenter для потока записи или None, если режим выключен
+        """
+        self._discard_speculative()
+        
+        if not self.config.speculative_transcription:
+            return None
+        if self.config.stream_to_disk:
+            self.logger.warning("speculative_transcription не работает вместе с stream_to_disk, отключено")
+            return None
+        
+        self._speculative = SpeculativeTranscriber(
+            provider=self.config.ai_provider,
+            api_key=self._get_api_key_for_provider(),
+            base_url=self.config.custom_base_url if self.config.ai_provider == "custom" else None,
+            model=self._get_transcription_model_for_provider(),
+            upload_format=self.config.upload_format,
+            trim_threshold=self.config.silence_threshold if self.config.manual_stop else None,
+            padding_ms=self.config.silence_padding,
+            silence_threshold=self.config.silence_threshold
+        )
+        self.logger.info("Спекулятивная транскрипция включена")
+        return PauseSegmenter(
+            threshold=self.config.silence_threshold,
+            pause_seconds=self.config.speculative_pause_seconds
+        )
+    
+    def _get_window_monitor(self):
+        """Возвращает монитор активного окна (создается один раз, из любого потока)."""
+        with self._window_monitor_lock:
+            if self._window_monitor is None:
+                from services.window_monitor import WindowMonitor
+                self._window_monitor = WindowMonitor.create()
+            return self._window_monitor
+    
+    def _capture_recording_context(self, session_id: Optional[str]) -> None:
+        """
+        Запоминает окно, в которое диктуется текст, и его формат.
+        
+        Контекст едет с сессией в StateManager, поэтому форматирование
+        после транскрипции не опрашивает оконную систему и не зависит от
+        того, куда пользователь переключился, пока ждал результат.
+        
+        Выполняется в фоновом потоке: окно читается без иконки, а
+        результат передается в StateManager через сигнал.
+        
+        Args:
+            session_id: Сессия записи, для которой снимается контекст
+        """
+        from services.formatting_module import FormattingModule
+        from services.formatting_config import FormattingConfig
+        from core.config_loader import get_config_loader
+        
+        try:
+            formatting_config = FormattingConfig.from_config(get_config_loader())
+            # Формат не зависит от окна - опрашивать его незачем
+            if not formatting_config.enabled or formatting_config.use_fixed_format:
+                return
+            
+            formatting_module = FormattingModule(
+                config_manager=formatting_config,
+                window_monitor=self._get_window_monitor()
+            )
+            context = formatting_module.capture_recording_context(session_id)
+            if context is not None:
+                self._recording_context_signal.emit(context)
+        except Exception as e:
+            self.logger.error(f"Failed to capture recording context: {e}")
+    
+    def _create_silence_detector(self, config) -> SilenceDetector:
+        """
+        Создает детектор тишины по конфигурации.
+        
+        Args:
+            config: Конфигурация приложения
+        
+        Returns:
+            SilenceDetector с живой оценкой шума, если она включена
+        """
+        noise_floor = None
+        if config.noise_calibration_ms > 0:
+            noise_floor = NoiseFloorEstimator(calibration_ms=config.noise_calibration_ms)
+        return SilenceDetector(
+            threshold=config.silence_threshold,
+            silence_duration=config.silence_duration,
+            noise_floor=noise_floor
+        )
+    
+    def _on_noise_floor_updated(self, level: float) -> None:
+        """
+        Обрабатывает новый уровень фонового шума записи.
+        
+        Args:
+            level: RMS уровня шума
+        """
+        self.logger.debug(f"Уровень фонового шума записи: {level:.4f}")
+    
+    def _create_vad_backend(self) -> Optional[VoiceActivityDetector]:
+        """
+        Создает VAD бэкенд для определения тишины в новой записи.
+        
+        Returns:
+            VAD бэкенд из audio.vad_backend (детектор тишины для "rms")
+        """
+        try:
+            return create_vad_backend(self.config.vad_backend, self.silence_detector)
+        except ValueError as e:
+            self.logger.warning(f"{e}, используется rms")
+            return self.silence_detector
+    
+    def _discard_speculative(self) -> None:
+        """Отменяет транскрипцию сегментов текущей записи."""
+        if self._speculative is not None:
+            self._speculative.cancel()
+            self._speculative = None
+    
+    def _on_segment_ready(self, segment) -> None:
+        """
+        Обработчик сегмента, закрытого паузой во время записи.
+        
+        Args:
+            segment: AudioPayload сегмента
+        """
+        if self._speculative is not None:
+            self._speculative.submit(segment)
+    
     def _stop_recording(self) -> None:
         """
         Останавливает запись аудио.
@@ -617,43 +838,62 @@ class RapidWhisperApp(QObject):
             self.logger.error(f"Ошибка остановки записи: {e}")
             self.state_manager.on_error(e)
     
-    def _on_recording_stopped(self, audio_file_path: str) -> None:
+    def _on_recording_stopped(self, audio) -> None:
         """
         Обработчик завершения записи.
         
+        Аудио остается в памяти; файл создается только если есть
+        активные хуки after_recording, которым нужен audio_file_path.
+        
         Args:
-            audio_file_path: Путь к сохраненному аудио файлу
+            audio: AudioPayload с записью или путь к сохраненному аудио файлу
         """
-        self.logger.info(f"Запись сохранена: {audio_file_path}")
+        payload = AudioPayload.coerce(audio)
+        self.logger.info(f"Запись завершена: {payload}")
         
-        # Сохранить путь для транскрипции
-        self._audio_file_path = audio_file_path
+        # Соединения прогреты - дальше их использует сам запрос
+        self._stop_connection_prewarm()
+        
+        # Сохранить аудио для транскрипции
+        self._audio_payload = payload
+        self._audio_file_path = payload.path
+
+        # Длительность берем до хуков - они могут заменить файл
+        try:
+            duration_seconds = payload.duration
+        except Exception as e:
+            duration_seconds = None
+            self.logger.error(f"Failed to read recording duration: {e}")
 
         try:
             from services.hooks_manager import get_hook_manager, build_hook_options
-            options = build_hook_options(
-                "after_recording",
-                session_id=self.state_manager.get_current_session_id() if self.state_manager else None,
-                data={"audio_file_path": self._audio_file_path}
-            )
-            options = get_hook_manager().run_event("after_recording", options)
-            new_path = options.get("data", {}).get("audio_file_path")
-            if new_path:
-                self._audio_file_path = new_path
+            hook_manager = get_hook_manager()
+            if hook_manager.has_active_hooks("after_recording"):
+                # Хук может изменить аудио - сегменты, отправленные во время записи, неактуальны
+                self._discard_speculative()
+                # Хукам нужен путь - записать аудио на диск только сейчас
+                self._audio_file_path = payload.ensure_file()
+                options = build_hook_options(
+                    "after_recording",
+                    session_id=self.state_manager.get_current_session_id() if self.state_manager else None,
+                    data={"audio_file_path": self._audio_file_path}
+                )
+                options = hook_manager.run_event("after_recording", options)
+                new_path = options.get("data", {}).get("audio_file_path")
+                if new_path:
+                    self._audio_file_path = new_path
+                # Хук мог изменить файл - дальше работаем с ним, а не с копией в памяти
+                self._audio_payload = AudioPayload.coerce(self._audio_file_path)
         except Exception as e:
             self.logger.error(f"Hook after_recording failed: {e}")
         
         # Track recording statistics
-        try:
-            import wave
-            with wave.open(audio_file_path, 'rb') as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                duration_seconds = frames / float(rate)
+        if duration_seconds is not None:
+            try:
                 self.statistics_manager.track_recording(duration_seconds)
                 self.logger.info(f"Recording statistics tracked: {duration_seconds:.2f} seconds")
-        except Exception as e:
-            self.logger.error(f"Failed to track recording statistics: {e}")
+            except Exception as e:
+                self.logger.error(f"Failed to track recording statistics: {e}")
         
         # Если мы в состоянии PROCESSING (остановлено вручную или по тишине),
         # запустить транскрипцию
@@ -676,6 +916,8 @@ class RapidWhisperApp(QObject):
             error: Исключение
         """
         self.logger.error(f"Ошибка записи: {error}")
+        self._discard_speculative()
+        self._stop_connection_prewarm()
         self.state_manager.on_error(error)
     
     def _start_transcription(self) -> None:
@@ -687,13 +929,14 @@ class RapidWhisperApp(QObject):
         Requirements: 6.3, 7.1
         """
         try:
-            # Проверить что файл существует
-            if not hasattr(self, '_audio_file_path') or not self._audio_file_path:
+            # Проверить что есть аудио для транскрипции
+            audio = self._audio_payload if self._audio_payload is not None else self._audio_file_path
+            if not audio:
                 self.logger.error("Нет аудио файла для транскрипции!")
                 self.state_manager.on_error(Exception("Аудио файл не найден"))
                 return
             
-            self.logger.info(f"_start_transcription вызван, файл: {self._audio_file_path}")
+            self.logger.info(f"_start_transcription вызван, аудио: {audio}")
             
             # СКРЫТЬ ОКНО при обработке
             self._hide_window_signal.emit()
@@ -719,14 +962,17 @@ class RapidWhisperApp(QObject):
             
             # Создать и запустить поток транскрипции
             self.transcription_thread = TranscriptionThread(
-                self._audio_file_path,
+                audio,
                 provider=self.config.ai_provider,
                 api_key=self._get_api_key_for_provider(),
                 base_url=self.config.custom_base_url if self.config.ai_provider == "custom" else None,
                 model=transcription_model,
                 statistics_manager=self.statistics_manager,
-                state_manager=self.state_manager
+                state_manager=self.state_manager,
+                speculative=self._speculative
             )
+            # Сегменты этой записи теперь собирает поток транскрипции
+            self._speculative = None
             
             self.logger.info("TranscriptionThread создан")
             
@@ -774,18 +1020,28 @@ class RapidWhisperApp(QObject):
         
         # Track transcription statistics
         try:
-            import wave
-            with wave.open(self._audio_file_path, 'rb') as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                audio_duration = frames / float(rate)
-                self.statistics_manager.track_transcription(audio_duration, text)
-                self.logger.info(f"Transcription statistics tracked: {audio_duration:.2f} seconds, {len(text)} characters")
+            audio_duration = self._get_audio_duration()
+            self.statistics_manager.track_transcription(audio_duration, text)
+            self.logger.info(f"Transcription statistics tracked: {audio_duration:.2f} seconds, {len(text)} characters")
         except Exception as e:
             self.logger.error(f"Failed to track transcription statistics: {e}")
         
         self.state_manager.on_transcription_complete(text)
     
+    def _get_audio_duration(self) -> float:
+        """
+        Возвращает длительность последней записи в секундах.
+        
+        Берется из AudioPayload без обращения к диску; файл читается
+        только если известен лишь путь.
+        
+        Returns:
+            Длительность аудио в секундах
+        """
+        if self._audio_payload is not None:
+            return self._audio_payload.duration
+        return AudioPayload.from_file(self._audio_file_path).duration
+    
     def _on_transcription_error(self, error: Exception) -> None:
         """
         Обработчик ошибки транскрипции.
@@ -902,22 +1158,21 @@ class RapidWhisperApp(QObject):
         Args:
             raw_text: Сырой транскрибированный текст
         """
-        from services.window_monitor import WindowMonitor
         from services.formatting_module import FormattingModule
         from services.formatting_config import FormattingConfig
         from core.config_loader import get_config_loader
 
         try:
-            # Load configuration
-            config = Config.load_from_config()
+            # Load configuration (cached snapshot, re-read only when files change)
+            config = Config.snapshot()
             formatting_config = FormattingConfig.from_config(get_config_loader())
 
-            # Create window monitor and formatting module
-            window_monitor = WindowMonitor.create()
+            # Target window comes from the recording context in StateManager;
+            # the monitor is only probed if the context was not captured
             formatting_module = FormattingModule(
                 config_manager=None,
                 ai_client_factory=None,
-                window_monitor=window_monitor,
+                window_monitor=self._get_window_monitor(),
                 state_manager=self.state_manager
             )
             formatting_module.config = formatting_config
@@ -979,13 +1234,9 @@ class RapidWhisperApp(QObject):
 
         # Track transcription statistics with final text
         try:
-            import wave
-            with wave.open(self._audio_file_path, 'rb') as wav_file:
-                frames = wav_file.getnframes()
-                rate = wav_file.getframerate()
-                audio_duration = frames / float(rate)
-                self.statistics_manager.track_transcription(audio_duration, text)
-                self.logger.info(f"Transcription statistics tracked: {audio_duration:.2f}s, {len(text)} chars")
+            audio_duration = self._get_audio_duration()
+            self.statistics_manager.track_transcription(audio_duration, text)
+            self.logger.info(f"Transcription statistics tracked: {audio_duration:.2f}s, {len(text)} chars")
         except Exception as e:
             self.logger.error(f"Failed to track transcription statistics: {e}")
 
@@ -1490,8 +1741,10 @@ class RapidWhisperApp(QObject):
         try:
             self.logger.info("Перезагрузка настроек...")
             
-            # Загрузить новую конфигурацию из config.jsonc
-            new_config = Config.load_from_config()
+            # Загрузить новую конфигурацию из config.jsonc (снимок пересоздается)
+            Config.invalidate_snapshot()
+            new_snapshot = Config.snapshot()
+            new_config = new_snapshot.copy()
             errors = new_config.validate()
             
             if errors:
@@ -1510,6 +1763,7 @@ class RapidWhisperApp(QObject):
             # Сохранить старую конфигурацию для сравнения
             old_config = self.config
             self.config = new_config
+            self._config_snapshot = new_snapshot
             self.config.window_opacity = 255
 
             # Rebind config/theme to all active windows immediately.
@@ -1517,14 +1771,15 @@ class RapidWhisperApp(QObject):
             
             # Обновить компоненты которые можно обновить без перезапуска
             
+            # Ключи, URL и таймауты могли измениться - клиенты API создаются заново
+            get_client_pool().invalidate()
+            
             # 1. Обновить детектор тишины
             if (old_config.silence_threshold != new_config.silence_threshold or
-                old_config.silence_duration != new_config.silence_duration):
+                old_config.silence_duration != new_config.silence_duration or
+                old_config.noise_calibration_ms != new_config.noise_calibration_ms):
                 try:
-                    self.silence_detector = SilenceDetector(
-                        threshold=new_config.silence_threshold,
-                        silence_duration=new_config.silence_duration
-                    )
+                    self.silence_detector = self._create_silence_detector(new_config)
                     self.logger.info(f"Детектор тишины обновлен: threshold={new_config.silence_threshold}, duration={new_config.silence_duration}")
                 except Exception as e:
                     self.logger.error(f"Ошибка обновления детектора тишины: {e}")
@@ -1729,6 +1984,13 @@ class RapidWhisperApp(QObject):
             if self.state_manager:
                 self.state_manager.cleanup_resources()
             
+            # Записать накопленную статистику на диск
+            if self.statistics_manager:
+                self.statistics_manager.close()
+            
+            # Закрыть keep-alive соединения с API
+            get_client_pool().close()
+            
             self.logger.info("RapidWhisper завершен")
             
         except Exception as e:
@@ -1743,7 +2005,7 @@ def main():
         import ctypes
         # Загрузить конфигурацию из config.jsonc для AppUserModelID
         from core.config import Config
-        temp_config = Config.load_from_config()
+        temp_config = Config.snapshot()
         
         # Установить AppUserModelID для правильного отображения в Windows уведомлениях
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(temp_config.app_user_model_id)
@@ -0,0 +1,338 @@
+"""
+Общий реестр клиентов API для транскрипции и постобработки.
+
+Каждый клиент OpenAI/Anthropic SDK держит собственный пул HTTP соединений.
+Если создавать клиент на каждую диктовку, каждый запрос платит за новое
+TCP и TLS соединение. Реестр хранит клиентов на весь процесс по ключу
+(класс клиента, провайдер, base_url, api_key, timeout), чтобы keep-alive
+соединения переиспользовались между диктовками. Реестр сбрасывается
+только при изменении настроек, а клиенты закрываются при следующем
+сбросе или при завершении приложения.
+
+Соединение можно прогреть заранее (prewarm): пока идет запись, HEAD
+запрос открывает TCP и TLS соединение, и загрузка аудио уходит уже
+по готовому сокету. Клиенты держат простаивающее соединение
+KEEPALIVE_EXPIRY секунд (у httpx по умолчанию 5), поэтому одного
+прогрева хватает на обычную диктовку.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Сколько секунд простаивающее keep-alive соединение остается в пуле клиента
+KEEPALIVE_EXPIRY = 60.0
+
+# Время жизни простаивающего соединения в httpx по умолчанию
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
+# Лимиты пула как у SDK, но с долгим keep-alive
+CONNECTION_LIMITS = (
+    httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=KEEPALIVE_EXPIRY)
+    if HTTPX_AVAILABLE else None
+)
+
+
+def _close_clients(clients) -> None:
+    """Закрывает клиентов SDK вместе с их HTTP клиентами."""
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Не удалось закрыть клиент API: {e}")
+
+
+def _timeout_key(timeout) -> Hashable:
+    """
+    Приводит таймаут к хешируемому значению для ключа реестра.
+
+    Args:
+        timeout: Число секунд, None или объект Timeout (httpx/openai)
+
+    Returns:
+        Хешируемое представление таймаута
+    """
+    if timeout is None or isinstance(timeout, (int, float)):
+        return timeout
+    return tuple(getattr(timeout, name, None) for name in ("connect", "read", "write", "pool"))
+
+
+class ApiClientPool:
+    """
+    Реестр клиентов API с подсчетом переиспользования соединений.
+
+    Счетчики:
+        client_hits: Запросов клиента, обслуженных из реестра
+        client_misses: Созданных клиентов
+        invalidations: Сбросов реестра
+        requests: HTTP запросов к API через клиентов реестра
+        reused_connections: Запросов к API по уже открытому соединению
+        new_connections: Новых TCP соединений (включая прогрев)
+        tls_handshakes: TLS рукопожатий (включая прогрев)
+        prewarms: Соединений, открытых заранее
+        prewarm_hits: Запросов к API по заранее открытому соединению
+        prewarm_saved_seconds: Время установки соединения, сэкономленное этими запросами
+    """
+
+    def __init__(self):
+        """Инициализирует пустой реестр."""
+        self._clients: Dict[Tuple, Any] = {}
+        # Клиенты, сброшенные invalidate() и еще не закрытые
+        self._retired: List[Any] = []
+        self._lock = threading.Lock()
+
+        self.client_hits = 0
+        self.client_misses = 0
+        self.invalidations = 0
+        self.requests = 0
+        self.reused_connections = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.prewarms = 0
+        self.prewarm_hits = 0
+        self.prewarm_saved_seconds = 0.0
+
+        # id HTTP клиента -> время установки прогретого соединения
+        self._warm_connections: Dict[int, float] = {}
+        # id HTTP клиента -> время последнего ответа (time.monotonic)
+        self._last_used: Dict[int, float] = {}
+
+    @property
+    def keepalive_expiry(self) -> float:
+        """Сколько секунд простаивающее соединение клиентов реестра остается открытым."""
+        return KEEPALIVE_EXPIRY if HTTPX_AVAILABLE else DEFAULT_KEEPALIVE_EXPIRY
+
+    def get(self, client_class, provider: str, api_key: str, base_url: Optional[str], timeout) -> Any:
+        """
+        Возвращает клиент из реестра или создает новый.
+
+        Args:
+            client_class: Класс клиента SDK (OpenAI или Anthropic)
+            provider: Провайдер
+            api_key: API ключ
+            base_url: URL endpoint
+            timeout: Таймаут клиента
+
+        Returns:
+            Экземпляр client_class
+        """
+        key = (client_class, provider, base_url, api_key, _timeout_key(timeout))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.client_hits += 1
+                return client
+
+            kwargs = {}
+            if HTTPX_AVAILABLE:
+                # Собственный HTTP клиент с долгим keep-alive: прогретое
+                # соединение доживает до запроса без постоянного освежения
+                kwargs["http_client"] = httpx.Client(
+                    timeout=timeout,
+                    limits=CONNECTION_LIMITS,
+                    follow_redirects=True
+                )
+            client = client_class(api_key=api_key, base_url=base_url, timeout=timeout, **kwargs)
+            self._instrument(client)
+            self._clients[key] = client
+            self.client_misses += 1
+
+        logger.info(f"Создан клиент API для {provider} ({base_url}), клиентов в реестре: {len(self._clients)}")
+        return client
+
+    def invalidate(self) -> None:
+        """
+        Сбрасывает реестр после изменения настроек.
+
+        Сброшенные клиенты не закрываются сразу: запрос, который уже
+        выполняется (например, транскрипция в фоне), должен завершиться.
+        Они закрываются при следующем сбросе или в close(). Клиенты,
+        сброшенные прошлым вызовом, закрываются сейчас.
+        """
+        with self._lock:
+            count = len(self._clients)
+            to_close, self._retired = self._retired, list(self._clients.values())
+            self._clients.clear()
+            # Ключи - id() HTTP клиентов, новый клиент может получить тот же id
+            self._warm_connections.clear()
+            self._last_used.clear()
+            self.invalidations += 1
+        _close_clients(to_close)
+        logger.info(f"Реестр клиентов API сброшен ({count} клиентов), статистика: {self.stats()}")
+
+    def close(self) -> None:
+        """Закрывает все клиенты и их соединения (при завершении приложения)."""
+        with self._lock:
+            to_close = self._retired + list(self._clients.values())
+            self._retired = []
+            self._clients.clear()
+            self._warm_connections.clear()
+            self._last_used.clear()
+        _close_clients(to_close)
+
+    def prewarm(self, client, url: str) -> Optional[float]:
+        """
+        Открывает соединение с API заранее, до первого запроса.
+
+        Отправляет HEAD запрос на url через HTTP клиент SDK. Ответ не
+        важен (обычно 401/404), важно что TCP и TLS соединение остается
+        в keep-alive пуле клиента. Вызывается из фонового потока.
+
+        Args:
+            client: Клиент SDK из реестра
+            url: Адрес API (base_url клиента)
+
+        Returns:
+            Время установки соединения в секундах (0.0 если соединение
+            уже было открыто) или None, если прогрев не удался
+        """
+        http_client = getattr(client, "_client", None)
+        if not callable(getattr(http_client, "request", None)):
+            return None
+
+        timings: Dict[str, float] = {}
+
+        def trace(event_name: str, info: dict) -> None:
+            timings[event_name] = time.perf_counter()
+
+        try:
+            response = http_client.request("HEAD", url, extensions={"trace": trace})
+            response.close()
+        except Exception as e:
+            logger.debug(f"Не удалось прогреть соединение с {url}: {e}")
+            return None
+
+        started = timings.get("connection.connect_tcp.started")
+        established = timings.get("connection.start_tls.complete", timings.get("connection.connect_tcp.complete"))
+        if started is None or established is None:
+            return 0.0
+
+        handshake = established - started
+        with self._lock:
+            self.prewarms += 1
+            self._warm_connections[id(http_client)] = handshake
+        logger.info(f"Соединение с {url} прогрето заранее ({handshake * 1000:.0f}ms на TCP/TLS)")
+        return handshake
+
+    def last_used(self, client) -> Optional[float]:
+        """
+        Возвращает время последнего ответа по соединениям клиента.
+
+        Args:
+            client: Клиент SDK из реестра
+
+        Returns:
+            Время по time.monotonic() (включая прогрев) или None, если
+            клиент еще не получал ответов
+        """
+        with self._lock:
+            return self._last_used.get(id(getattr(client, "_client", None)))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает счетчики реестра и соединений.
+
+        Returns:
+            Словарь счетчиков, включая среднее время, сэкономленное
+            на запрос прогревом соединения (prewarm_saved_ms_avg)
+        """
+        with self._lock:
+            saved_ms = self.prewarm_saved_seconds * 1000
+            return {
+                "clients": len(self._clients),
+                "client_hits": self.client_hits,
+                "client_misses": self.client_misses,
+                "invalidations": self.invalidations,
+                "requests": self.requests,
+                "reused_connections": self.reused_connections,
+                "new_connections": self.new_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "prewarms": self.prewarms,
+                "prewarm_hits": self.prewarm_hits,
+                "prewarm_saved_ms": saved_ms,
+                "prewarm_saved_ms_avg": saved_ms / self.prewarm_hits if self.prewarm_hits else 0.0,
+            }
+
+    def _instrument(self, client) -> None:
+        """
+        Подключает подсчет соединений к HTTP клиенту SDK.
+
+        SDK хранят httpx клиент в атрибуте _client. Если его нет
+        (другая версия SDK или тестовая заглушка), счетчики соединений
+        просто не растут.
+        """
+        http_client = getattr(client, "_client", None)
+        hooks = getattr(http_client, "event_hooks", None)
+        if not isinstance(hooks, dict):
+            return
+        client_id = id(http_client)
+        hooks.setdefault("request", []).append(self._on_request)
+        hooks.setdefault("response", []).append(lambda response: self._on_response(client_id, response))
+        http_client.event_hooks = hooks
+
+    def _on_request(self, request) -> None:
+        """Включает трассировку соединения httpcore для запроса."""
+        outer_trace = request.extensions.get("trace")
+
+        def trace(event_name: str, info: dict) -> None:
+            if event_name == "connection.connect_tcp.complete":
+                trace.connected = True
+                with self._lock:
+                    self.new_connections += 1
+            elif event_name == "connection.start_tls.complete":
+                with self._lock:
+                    self.tls_handshakes += 1
+            if outer_trace is not None:
+                outer_trace(event_name, info)
+
+        trace.connected = False
+        request.extensions["trace"] = trace
+
+    def _on_response(self, client_id: int, response) -> None:
+        """Считает запрос к API и переиспользование соединения."""
+        with self._lock:
+            self._last_used[client_id] = time.monotonic()
+        request = response.request
+        if request.method == "HEAD":
+            # Запрос прогрева, не запрос к API
+            return
+
+        trace = request.extensions.get("trace")
+        reused = not getattr(trace, "connected", True)
+        with self._lock:
+            self.requests += 1
+            if not reused:
+                # Прогретое соединение не использовано (истекло или закрыто)
+                self._warm_connections.pop(client_id, None)
+                return
+            self.reused_connections += 1
+            saved = self._warm_connections.pop(client_id, None)
+            if saved is not None:
+                self.prewarm_hits += 1
+                self.prewarm_saved_seconds += saved
+        if saved is not None:
+            logger.info(f"Запрос ушел по прогретому соединению, сэкономлено {saved * 1000:.0f}ms")
+
+
+_client_pool_instance: Optional[ApiClientPool] = None
+_client_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ApiClientPool:
+    global _client_pool_instance
+    if _client_pool_instance is None:
+        # Вызывается из потоков прогрева и транскрипции одновременно
+        with _client_pool_lock:
+            if _client_pool_instance is None:
+                _client_pool_instance = ApiClientPool()
+    return _client_pool_instance
@@ -0,0 +1,219 @@
+"""
+Предвыделенный буфер для захвата аудио.
+
+Этот модуль реализует AudioBuffer - непрерывную арену int16 сэмплов,
+в которую callback PyAudio копирует чанки без создания новых объектов
+на каждый чанк. Читатели (RMS, детектор тишины, экспорт WAV) получают
+срезы без копирования через numpy view / memoryview.
+
+Модель доступа: один писатель (callback аудио потока) и один читатель
+(поток записи). Писатель сначала копирует данные, затем публикует новую
+длину; при расширении новый массив публикуется до обновления длины.
+Читатель берет длину, а затем массив - поэтому все сэмплы в пределах
+прочитанной длины гарантированно присутствуют в полученном массиве.
+
+Индексы сэмплов абсолютные (от начала записи). Читатель, который уже
+сохранил данные (например, StreamingWavWriter), может освободить их
+через release() - тогда при следующем расширении писатель перенесет
+только неосвобожденный хвост, и память не растет с длиной записи.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class AudioBuffer:
+    """
+    Растущий предвыделенный буфер int16 сэмплов.
+
+    Память выделяется один раз под initial_seconds аудио. При переполнении
+    емкость удваивается (амортизированно O(1)), поэтому в обычном режиме
+    запись чанка не выделяет память.
+
+    Attributes:
+        sample_rate: Частота дискретизации (для вычисления длительности)
+        chunk_count: Количество записанных чанков
+    """
+
+    def __init__(self, sample_rate: int = 16000, initial_seconds: float = 60.0):
+        """
+        Инициализирует буфер.
+
+        Args:
+            sample_rate: Частота дискретизации в Hz
+            initial_seconds: Начальная емкость буфера в секундах аудио
+        """
+        self.sample_rate: int = sample_rate
+        self._initial_capacity: int = max(1, int(sample_rate * initial_seconds))
+        # (абсолютный индекс первого сэмпла в массиве, массив) -
+        # публикуется одним присваиванием, чтобы читатель видел согласованную пару
+        self._store: Tuple[int, np.ndarray] = (
+            0, np.empty(self._initial_capacity, dtype=np.int16)
+        )
+        self._length: int = 0
+        self._released: int = 0
+        self.chunk_count: int = 0
+
+    def __len__(self) -> int:
+        """Возвращает количество записанных сэмплов."""
+        return self._length
+
+    @property
+    def _data(self) -> np.ndarray:
+        """Текущий нижележащий массив."""
+        return self._store[1]
+
+    @property
+    def capacity(self) -> int:
+        """Текущая емкость буфера в сэмплах."""
+        return len(self._store[1])
+
+    @property
+    def base(self) -> int:
+        """Абсолютный индекс первого сэмпла, доступного для чтения."""
+        return self._store[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Размер записанных данных в байтах."""
+        return self._length * 2
+
+    @property
+    def duration(self) -> float:
+        """Длительность записанного аудио в секундах."""
+        return self._length / self.sample_rate
+
+    def write(self, data) -> int:
+        """
+        Копирует чанк сырых int16 данных в конец буфера.
+
+        Args:
+            data: bytes-like объект с int16 сэмплами
+
+        Returns:
+            Индекс первого записанного сэмпла
+        """
+        samples = np.frombuffer(data, dtype=np.int16)
+        start = self._length
+        end = start + len(samples)
+
+        base, array = self._store
+        if end - base > len(array):
+            base, array = self._grow(end)
+
+        array[start - base:end - base] = samples
+        # Публикуем длину только после копирования данных
+        self._length = end
+        self.chunk_count += 1
+        return start
+
+    def samples(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        Возвращает numpy view на записанные сэмплы без копирования.
+
+        View остается валидным до следующего clear(); после расширения
+        буфера он ссылается на старый массив, в котором уже есть все
+        сэмплы на момент вызова.
+
+        Args:
+            start: Абсолютный индекс первого сэмпла
+            end: Индекс после последнего сэмпла (по умолчанию - конец данных)
+
+        Returns:
+            Массив int16 (view)
+
+        Raises:
+            ValueError: Если запрошенные сэмплы уже освобождены через release()
+        """
+        length = self._length
+        base, data = self._store
+        if end is None or end > length:
+            end = length
+        start = max(0, min(start, end))
+        if start < base:
+            raise ValueError(
+                f"Samples before {base} were released and are no longer buffered"
+            )
+        return data[start - base:end - base]
+
+    def tail(self, count: int) -> np.ndarray:
+        """
+        Возвращает view на последние count сэмплов.
+
+        Args:
+            count: Количество сэмплов
+
+        Returns:
+            Массив int16 (view)
+        """
+        length = self._length
+        return self.samples(length - count, length)
+
+    def as_bytes(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """
+        Возвращает байтовый memoryview на записанные сэмплы без копирования.
+
+        Подходит для wave.writeframes и записи в файл.
+
+        Args:
+            start: Индекс первого сэмпла
+            end: Индекс после последнего сэмпла
+
+        Returns:
+            memoryview формата 'B'
+        """
+        return memoryview(self.samples(start, end)).cast('B')
+
+    def release(self, upto: int) -> None:
+        """
+        Помечает сэмплы до upto как ненужные буферу (уже сохранены читателем).
+
+        Память освобождается лениво - при следующем расширении буфера.
+        Вызывается только читателем.
+
+        Args:
+            upto: Абсолютный индекс, до которого данные можно отбросить
+        """
+        self._released = max(self._released, min(upto, self._length))
+
+    def clear(self) -> None:
+        """
+        Сбрасывает буфер, сохраняя выделенную память.
+
+        Если буфер сильно вырос за прошлую запись, возвращает его
+        к начальной емкости, чтобы не удерживать память между записями.
+        """
+        self._length = 0
+        self._released = 0
+        self.chunk_count = 0
+        data = self._store[1]
+        if len(data) > self._initial_capacity:
+            data = np.empty(self._initial_capacity, dtype=np.int16)
+        self._store = (0, data)
+
+    def _grow(self, required: int) -> Tuple[int, np.ndarray]:
+        """
+        Переносит данные в новый массив, вмещающий сэмплы до required.
+
+        Освобожденные читателем сэмплы не копируются. Емкость удваивается
+        только если неосвобожденных данных больше текущей емкости.
+
+        Args:
+            required: Абсолютный индекс, до которого нужна емкость
+
+        Returns:
+            Новая пара (base, массив)
+        """
+        old_base, old_data = self._store
+        new_base = max(old_base, self._released)
+        capacity = len(old_data)
+        if required - new_base > capacity:
+            capacity = max(capacity * 2, required - new_base)
+
+        new_data = np.empty(capacity, dtype=np.int16)
+        live = self._length - new_base
+        new_data[:live] = old_data[new_base - old_base:self._length - old_base]
+        # Публикуем новый массив до обновления длины (см. write)
+        self._store = (new_base, new_data)
+        return self._store
@@ -0,0 +1,201 @@
+"""
+Кодирование записанного аудио в сжатые форматы перед отправкой в API.
+
+Сырой WAV 16 kHz int16 занимает ~32 KB на секунду речи, и на медленных
+каналах загрузка - самая долгая часть транскрипции. Этот модуль кодирует
+PCM из AudioPayload в FLAC (без потерь) или Opus/OGG в рабочем потоке
+и выбирает формат с учетом того, что принимает провайдер.
+
+Кодирование требует опциональной зависимости soundfile (libsndfile).
+Если она не установлена, аудио отправляется как WAV.
+"""
+
+import io
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Dict, FrozenSet, Optional
+
+import numpy as np
+
+from services.audio_payload import AudioPayload
+from utils.logger import get_logger
+
+logger = get_logger()
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError - пакет установлен, но не найдена библиотека libsndfile
+    soundfile = None
+    SOUNDFILE_AVAILABLE = False
+
+
+# Поддерживаемые значения audio.upload_format
+UPLOAD_FORMATS = ("wav", "flac", "opus")
+
+# Форматы загрузки, которые принимает API транскрипции каждого провайдера.
+# OpenAI и Groq принимают flac/ogg; GLM-ASR - только wav/mp3.
+# Для custom endpoint доверяем выбору пользователя.
+PROVIDER_UPLOAD_FORMATS: Dict[str, FrozenSet[str]] = {
+    "openai": frozenset({"wav", "flac", "opus"}),
+    "groq": frozenset({"wav", "flac", "opus"}),
+    "glm": frozenset({"wav"}),
+    "custom": frozenset(UPLOAD_FORMATS),
+}
+
+# (формат soundfile, подтип, расширение имени файла для API)
+_SOUNDFILE_PARAMS = {
+    "flac": ("FLAC", "PCM_16", "flac"),
+    "opus": ("OGG", "OPUS", "ogg"),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class EncodedAudio:
+    """
+    Закодированное аудио, готовое к отправке в API.
+
+    Attributes:
+        data: Содержимое файла (WAV, FLAC или OGG)
+        format: Формат (wav, flac, opus)
+        filename: Имя файла для multipart запроса
+        source_bytes: Размер исходного WAV в байтах
+        encode_seconds: Время кодирования
+        duration: Длительность аудио в секундах
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        format: str,
+        filename: str,
+        source_bytes: int,
+        encode_seconds: float,
+        duration: float
+    ):
+        self.data = data
+        self.format = format
+        self.filename = filename
+        self.source_bytes = source_bytes
+        self.encode_seconds = encode_seconds
+        self.duration = duration
+
+    @property
+    def bytes_saved(self) -> int:
+        """Сколько байт сэкономлено по сравнению с WAV."""
+        return self.source_bytes - len(self.data)
+
+    def open_for_upload(self) -> BinaryIO:
+        """
+        Возвращает файловый объект в памяти с именем файла для SDK.
+
+        Returns:
+            BytesIO, позиционированный на начало
+        """
+        buffer = io.BytesIO(self.data)
+        buffer.name = self.filename
+        return buffer
+
+
+def resolve_upload_format(provider: str, requested) -> str:
+    """
+    Выбирает формат загрузки, который примет провайдер.
+
+    Args:
+        provider: Провайдер транскрипции
+        requested: Формат из настройки audio.upload_format
+
+    Returns:
+        Формат из UPLOAD_FORMATS; "wav" если запрошенный формат
+        не поддерживается провайдером или недоступен кодировщик
+    """
+    fmt = requested.strip().lower() if isinstance(requested, str) else "wav"
+    if fmt == "ogg":
+        fmt = "opus"
+
+    if fmt not in UPLOAD_FORMATS:
+        logger.warning(f"Неизвестный audio.upload_format '{requested}', используется wav")
+        return "wav"
+
+    if fmt == "wav":
+        return fmt
+
+    supported = PROVIDER_UPLOAD_FORMATS.get(provider, frozenset({"wav"}))
+    if fmt not in supported:
+        logger.info(f"Провайдер {provider} не принимает {fmt}, используется wav")
+        return "wav"
+
+    if not SOUNDFILE_AVAILABLE:
+        logger.warning(f"Для upload_format={fmt} нужен пакет soundfile, используется wav")
+        return "wav"
+
+    return fmt
+
+
+def encode_payload(payload: AudioPayload, fmt: str) -> EncodedAudio:
+    """
+    Кодирует аудио в заданный формат.
+
+    Args:
+        payload: Аудио для кодирования
+        fmt: Формат из UPLOAD_FORMATS (уже проверенный resolve_upload_format)
+
+    Returns:
+        EncodedAudio
+    """
+    start_time = time.perf_counter()
+    pcm = payload.load_pcm()
+    # Размер WAV файла, который отправлялся бы без сжатия (44 байта заголовок)
+    source_bytes = len(pcm) + 44
+
+    if fmt == "wav":
+        upload = payload.open_for_upload()
+        data = upload.getvalue() if isinstance(upload, io.BytesIO) else upload.read()
+        upload.close()
+        extension = "wav"
+    else:
+        sf_format, subtype, extension = _SOUNDFILE_PARAMS[fmt]
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, payload.channels)
+        buffer = io.BytesIO()
+        soundfile.write(buffer, samples, payload.sample_rate, format=sf_format, subtype=subtype)
+        data = buffer.getvalue()
+
+    encode_seconds = time.perf_counter() - start_time
+    encoded = EncodedAudio(
+        data=data,
+        format=fmt,
+        filename=f"audio.{extension}",
+        source_bytes=source_bytes,
+        encode_seconds=encode_seconds,
+        duration=payload.duration
+    )
+
+    if fmt != "wav":
+        ratio = len(data) / source_bytes if source_bytes else 1.0
+        logger.info(
+            f"Аудио закодировано в {fmt}: {source_bytes} -> {len(data)} байт "
+            f"(сэкономлено {encoded.bytes_saved} байт, {ratio:.0%} от WAV), "
+            f"время кодирования {encode_seconds * 1000:.1f}ms"
+        )
+    return encoded
+
+
+def encode_payload_async(payload: AudioPayload, fmt: str) -> Future:
+    """
+    Запускает кодирование в рабочем потоке.
+
+    Позволяет кодировать аудио параллельно с подготовкой клиента API.
+
+    Args:
+        payload: Аудио для кодирования
+        fmt: Формат из UPLOAD_FORMATS
+
+    Returns:
+        Future с EncodedAudio
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="AudioEncoder")
+    return _executor.submit(encode_payload, payload, fmt)
@@ -7,13 +7,18 @@
 Requirements: 3.1, 3.2, 3.3, 3.4, 3.5
 """
 
+import queue
 import wave
-import time
 import tempfile
-from typing import List, Optional
+from typing import NamedTuple, Optional, Union
 import pyaudio
 import numpy as np
 
+from services.audio_buffer import AudioBuffer
+from services.audio_payload import AudioPayload
+from services.streaming_wav_writer import StreamingWavWriter
+from services.voice_activity import SpeechTimeline, VoiceActivityDetector
+
 from utils.exceptions import (
     MicrophoneUnavailableError,
     RecordingTooShortError,
@@ -22,6 +27,24 @@ from utils.exceptions import (
 )
 
 
+class ChunkLevel(NamedTuple):
+    """
+    Результат анализа одного чанка в callback.
+    
+    Attributes:
+        rms: RMS громкости чанка в диапазоне [0.0, 1.0]
+        peak: Пиковая амплитуда чанка в диапазоне [0.0, 1.0]
+        is_speech: Была ли речь в чанке по VAD бэкенду (None без VAD)
+        timestamp: Время конца чанка от начала записи в секундах (по сэмплам)
+        position: Количество записанных сэмплов после чанка
+    """
+    rms: float
+    peak: float
+    is_speech: Optional[bool]
+    timestamp: float
+    position: int
+
+
 class AudioEngine:
     """
     Движок для записи и обработки аудио с микрофона.
@@ -34,13 +57,20 @@ class AudioEngine:
         sample_rate: Частота дискретизации (16000 Hz)
         channels: Количество каналов (1 - моно)
         chunk_size: Размер аудио чанка в фреймах (1024)
-        audio_buffer: Буфер для хранения записанных аудио данных
+        audio_buffer: Предвыделенный буфер int16 сэмплов (AudioBuffer)
         stream: Поток PyAudio для записи
         is_recording: Флаг активной записи
         pyaudio_instance: Экземпляр PyAudio
+        stream_to_disk: Писать WAV файл во время записи (StreamingWavWriter)
+        vad: VAD бэкенд, классифицирующий каждый чанк в callback
+        speech_timeline: Решения VAD по фреймам записи (SpeechTimeline)
+        levels: Ограниченная очередь ChunkLevel от callback к потоку записи
     """
     
-    def __init__(self):
+    # Сколько чанков (по 64 мс) очередь levels держит без читателя
+    LEVEL_QUEUE_SIZE = 256
+    
+    def __init__(self, stream_to_disk: bool = False, vad: Optional[VoiceActivityDetector] = None):
         """
         Инициализирует AudioEngine с параметрами для записи речи.
         
@@ -48,6 +78,11 @@ class AudioEngine:
         - 16000 Hz - стандартная частота для речевых моделей
         - Моно - достаточно для речи, экономит память
         - int16 - 16-битный формат, баланс качества и размера
+        
+        Args:
+            stream_to_disk: Дописывать аудио во временный файл в фоновом
+                потоке во время записи вместо сохранения после остановки
+            vad: VAD бэкенд для покадрового определения речи (по умолчанию None)
         """
         # Параметры записи (Requirements 3.2, 3.3)
         self.sample_rate: int = 16000  # Hz
@@ -55,17 +90,35 @@ class AudioEngine:
         self.chunk_size: int = 1024  # Фреймов
         self.format = pyaudio.paInt16  # 16-bit
         
-        # Буфер для аудио данных (Requirement 3.4)
-        self.audio_buffer: List[bytes] = []
+        # Буфер для аудио данных (Requirement 3.4).
+        # Память выделяется один раз, callback копирует чанки в арену
+        self.audio_buffer: AudioBuffer = AudioBuffer(self.sample_rate)
+        
+        # Рабочий массив для вычисления RMS без выделения памяти на чанк
+        self._rms_scratch: np.ndarray = np.empty(self.chunk_size, dtype=np.float64)
         
         # Состояние записи
         self.stream: Optional[pyaudio.Stream] = None
         self.is_recording: bool = False
         self.pyaudio_instance: Optional[pyaudio.PyAudio] = None
         
+        # Потоковая запись на диск
+        self.stream_to_disk: bool = stream_to_disk
+        self._wav_writer: Optional[StreamingWavWriter] = None
+        
         # Текущее RMS значение
         self._current_rms: float = 0.0
         
+        # Анализ каждого чанка для потока записи. При переполнении
+        # callback вытесняет самый старый элемент и никогда не блокируется
+        self.levels: "queue.Queue[Optional[ChunkLevel]]" = queue.Queue(maxsize=self.LEVEL_QUEUE_SIZE)
+        
+        # Покадровое определение речи по всем захваченным сэмплам
+        self.vad: Optional[VoiceActivityDetector] = vad
+        self.speech_timeline: Optional[SpeechTimeline] = (
+            SpeechTimeline(vad.frame_samples, self.sample_rate) if vad is not None else None
+        )
+        
     def start_recording(self) -> None:
         """
         Начинает запись с микрофона по умолчанию.
@@ -87,8 +140,21 @@ class AudioEngine:
             self.pyaudio_instance = pyaudio.PyAudio()
             
             # Очистить буфер перед новой записью
-            self.audio_buffer = []
+            self.audio_buffer.clear()
             self._current_rms = 0.0
+            self._drain_levels()
+            if self.vad is not None:
+                self.vad.reset()
+                self.speech_timeline.clear()
+            
+            # Запустить фоновую запись файла до открытия потока
+            if self.stream_to_disk:
+                self._wav_writer = StreamingWavWriter(
+                    self.audio_buffer,
+                    self._create_temp_wav_path(),
+                    channels=self.channels
+                )
+                self._wav_writer.start()
             
             # Открыть поток для записи
             self.stream = self.pyaudio_instance.open(
@@ -105,6 +171,8 @@ class AudioEngine:
             self.is_recording = True
             
         except OSError as e:
+            self._abort_wav_writer()
+            
             # Обработка ошибок доступа к микрофону
             error_msg = str(e).lower()
             if "device unavailable" in error_msg or "invalid device" in error_msg:
@@ -115,6 +183,8 @@ class AudioEngine:
                 raise AudioDeviceError(str(e))
                 
         except Exception as e:
+            self._abort_wav_writer()
+            
             # Другие непредвиденные ошибки
             raise AudioDeviceError(error=f"Не удалось начать запись: {e}")
     
@@ -134,6 +204,31 @@ class AudioEngine:
             
         Requirements: 3.5
         """
+        return self._finish_recording(in_memory=False)
+    
+    def stop_recording_payload(self) -> AudioPayload:
+        """
+        Останавливает запись и возвращает аудио в памяти (без записи файла).
+        
+        В режиме stream_to_disk файл уже записан в фоне, поэтому
+        возвращается payload, ссылающийся на этот файл.
+        
+        Returns:
+            AudioPayload с PCM данными записи
+            
+        Raises:
+            EmptyRecordingError: Если буфер пустой
+            RecordingTooShortError: Если запись короче 0.5 секунды
+        """
+        return self._finish_recording(in_memory=True)
+    
+    def _finish_recording(self, in_memory: bool) -> Union[str, AudioPayload]:
+        """
+        Общая логика остановки записи для stop_recording и stop_recording_payload.
+        
+        Args:
+            in_memory: Вернуть AudioPayload вместо пути к временному файлу
+        """
         if not self.is_recording:
             from utils.exceptions import RapidWhisperError
             raise RapidWhisperError(
@@ -156,36 +251,73 @@ class AudioEngine:
             self.is_recording = False
             
             # Проверить, что буфер не пустой
-            if not self.audio_buffer:
+            if len(self.audio_buffer) == 0:
                 raise EmptyRecordingError()
             
             # Вычислить длительность записи
-            total_frames = sum(len(chunk) for chunk in self.audio_buffer) // 2  # 2 bytes per sample
-            duration = total_frames / self.sample_rate
+            duration = self.audio_buffer.duration
             
             # Проверить минимальную длительность (0.5 секунды)
             if duration < 0.5:
                 raise RecordingTooShortError(duration)
             
+            # Файл уже записан в фоне - осталось дописать хвост и заголовок
+            if self._wav_writer is not None:
+                writer = self._wav_writer
+                self._wav_writer = None
+                filepath = writer.finish()
+                if in_memory:
+                    return AudioPayload.from_file(filepath)
+                return filepath
+            
+            if in_memory:
+                # Копия нужна, так как буфер переиспользуется следующей записью
+                return AudioPayload(
+                    pcm=bytes(self.audio_buffer.as_bytes()),
+                    sample_rate=self.sample_rate,
+                    channels=self.channels
+                )
+            
             # Сохранить в временный файл
-            temp_file = tempfile.NamedTemporaryFile(
-                suffix='.wav',
-                delete=False
-            )
-            filepath = temp_file.name
-            temp_file.close()
+            filepath = self._create_temp_wav_path()
             
             self._save_to_wav(filepath)
             
             return filepath
             
         except (EmptyRecordingError, RecordingTooShortError):
+            self._abort_wav_writer()
             # Пробросить ошибки валидации
             raise
             
         except Exception as e:
+            self._abort_wav_writer()
             raise AudioDeviceError(error=f"Ошибка при остановке записи: {e}")
     
+    def _create_temp_wav_path(self) -> str:
+        """
+        Создает пустой временный .wav файл и возвращает путь к нему.
+        
+        Returns:
+            Путь к временному файлу
+        """
+        temp_file = tempfile.NamedTemporaryFile(
+            suffix='.wav',
+            delete=False
+        )
+        filepath = temp_file.name
+        temp_file.close()
+        return filepath
+    
+    def _abort_wav_writer(self) -> None:
+        """
+        Останавливает потоковую запись и удаляет незавершенный файл.
+        """
+        if self._wav_writer is not None:
+            writer = self._wav_writer
+            self._wav_writer = None
+            writer.abort()
+    
     def get_current_rms(self) -> float:
         """
         Возвращает текущее RMS значение громкости.
@@ -212,7 +344,9 @@ class AudioEngine:
         Callback для обработки аудио потока в реальном времени.
         
         Вызывается PyAudio для каждого чанка аудио данных.
-        Добавляет данные в буфер и вычисляет RMS громкости.
+        Добавляет данные в буфер, вычисляет RMS громкости и, если задан
+        VAD бэкенд, дописывает решения по фреймам в speech_timeline.
+        Результат анализа чанка (ChunkLevel) публикуется в очередь levels.
         
         Args:
             in_data: Сырые аудио данные (bytes)
@@ -225,16 +359,79 @@ class AudioEngine:
             
         Requirements: 3.4, 4.3
         """
-        # Добавить данные в буфер (Requirement 3.4)
-        self.audio_buffer.append(in_data)
-        
-        # Вычислить RMS для визуализации (Requirement 4.3)
-        self._current_rms = self._calculate_rms(in_data)
+        # Скопировать данные в буфер (Requirement 3.4)
+        start = self.audio_buffer.write(in_data)
+        samples = self.audio_buffer.samples(start)
+        
+        # Вычислить RMS по срезу буфера без копирования (Requirement 4.3)
+        self._current_rms = self._calculate_rms(samples)
+        
+        # Классифицировать фреймы чанка - решения не теряются между чанками
+        is_speech = None
+        if self.vad is not None:
+            flags = self.vad.process(samples)
+            self.speech_timeline.append(flags)
+            # Чанк короче фрейма - повторяем решение по последнему фрейму
+            timeline = self.speech_timeline
+            is_speech = bool(flags.any()) if len(flags) else timeline.has_speech(len(timeline) - 1)
+        
+        self._publish_level(ChunkLevel(
+            rms=self._current_rms,
+            peak=self._calculate_peak(samples),
+            is_speech=is_speech,
+            timestamp=(start + len(samples)) / self.sample_rate,
+            position=start + len(samples)
+        ))
         
         # Продолжить запись
         return (in_data, pyaudio.paContinue)
     
-    def _calculate_rms(self, audio_data: bytes) -> float:
+    def _publish_level(self, level: ChunkLevel) -> None:
+        """
+        Кладет анализ чанка в очередь levels без блокировки callback.
+        
+        Если читатель отстал и очередь заполнена, самый старый элемент
+        вытесняется: свежие данные важнее для определения тишины.
+        
+        Args:
+            level: Результат анализа чанка
+        """
+        try:
+            self.levels.put_nowait(level)
+        except queue.Full:
+            try:
+                self.levels.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.levels.put_nowait(level)
+            except queue.Full:
+                pass
+    
+    def _drain_levels(self) -> None:
+        """Очищает очередь levels от чанков предыдущей записи."""
+        while True:
+            try:
+                self.levels.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _calculate_peak(self, audio_data: np.ndarray) -> float:
+        """
+        Вычисляет пиковую амплитуду int16 сэмплов.
+        
+        Args:
+            audio_data: Аудио данные int16 (numpy view)
+            
+        Returns:
+            Пиковое значение в диапазоне [0.0, 1.0]
+        """
+        if len(audio_data) == 0:
+            return 0.0
+        # abs(-32768) не помещается в int16, поэтому берем max и -min отдельно
+        return max(int(audio_data.max()), -int(audio_data.min())) / 32768.0
+    
+    def _calculate_rms(self, audio_data: Union[bytes, memoryview, np.ndarray]) -> float:
         """
         Вычисляет RMS (Root Mean Square) громкости аудио данных.
         
@@ -245,25 +442,32 @@ class AudioEngine:
         максимальное значение int16 (32768).
         
         Args:
-            audio_data: Сырые аудио данные в формате int16
+            audio_data: Аудио данные int16 (bytes, memoryview или numpy view)
             
         Returns:
             RMS значение в диапазоне [0.0, 1.0]
             
         Requirements: 4.3
         """
-        # Преобразовать bytes в numpy array int16
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
+        # Преобразовать в numpy array int16 (без копирования)
+        if isinstance(audio_data, np.ndarray):
+            audio_array = audio_data
+        else:
+            audio_array = np.frombuffer(audio_data, dtype=np.int16)
         
         # Вычислить RMS: sqrt(mean(samples^2)) / 32768.0
-        if len(audio_array) == 0:
+        count = len(audio_array)
+        if count == 0:
             return 0.0
         
-        # Преобразовать в float для точных вычислений
-        audio_float = audio_array.astype(np.float64)
+        # Квадраты в float64 пишем в переиспользуемый рабочий массив
+        if count > len(self._rms_scratch):
+            self._rms_scratch = np.empty(count, dtype=np.float64)
+        squares = self._rms_scratch[:count]
+        np.multiply(audio_array, audio_array, out=squares, dtype=np.float64)
         
         # Вычислить среднеквадратичное значение
-        rms = np.sqrt(np.mean(audio_float ** 2))
+        rms = np.sqrt(squares.sum() / count)
         
         # Нормализовать в диапазон [0.0, 1.0]
         normalized_rms = rms / 32768.0
@@ -294,9 +498,8 @@ class AudioEngine:
                 wav_file.setsampwidth(2)  # 2 bytes = 16 bit
                 wav_file.setframerate(self.sample_rate)  # 16000 Hz
                 
-                # Записать все данные из буфера
-                for chunk in self.audio_buffer:
-                    wav_file.writeframes(chunk)
+                # Записать все данные из буфера одним memoryview (без копирования)
+                wav_file.writeframes(self.audio_buffer.as_bytes())
                     
         except Exception as e:
             raise AudioDeviceError(error=f"Не удалось сохранить WAV файл: {e}")
@@ -327,9 +530,13 @@ class AudioEngine:
                 # Игнорировать ошибки при очистке
                 pass
         
+        # Незавершенный потоковый файл больше не нужен
+        self._abort_wav_writer()
+        
         # Очистить буфер
-        self.audio_buffer = []
+        self.audio_buffer.clear()
         self._current_rms = 0.0
+        self._drain_levels()
 
 
 
@@ -346,40 +553,59 @@ class AudioRecordingThread(QThread):
     
     Signals:
         rms_updated: Сигнал с текущим RMS значением (float)
-        recording_stopped: Сигнал при остановке записи с путем к файлу (str)
+        recording_stopped: Сигнал при остановке записи с аудио в памяти (AudioPayload)
         recording_error: Сигнал при ошибке записи (Exception)
         silence_detected: Сигнал при обнаружении тишины
+        segment_ready: Сигнал с сегментом, закрытым паузой (AudioPayload)
+        noise_floor_updated: Сигнал с новым уровнем фонового шума (float)
+    
+    Поток просыпается на каждый чанк из очереди AudioEngine.levels:
+    детектор тишины и сегментатор получают каждый чанк (с решением VAD
+    бэкенда, если он задан), а сигнал rms_updated отправляется не чаще
+    раза в 50 мс.
     
     Requirements: 4.7, 9.1
     """
     
     # Сигналы
     rms_updated = pyqtSignal(float)  # RMS значение для визуализации
-    recording_stopped = pyqtSignal(str)  # Путь к сохраненному файлу
+    recording_stopped = pyqtSignal(object)  # AudioPayload с записанным аудио
     recording_error = pyqtSignal(Exception)  # Ошибка записи
     silence_detected = pyqtSignal()  # Обнаружена тишина
+    segment_ready = pyqtSignal(object)  # AudioPayload сегмента для спекулятивной транскрипции
+    noise_floor_updated = pyqtSignal(float)  # Уровень фонового шума после калибровки и при изменении
     
-    def __init__(self, silence_detector=None, enable_silence_detection=True):
+    def __init__(self, silence_detector=None, enable_silence_detection=True, stream_to_disk=False, segmenter=None, vad=None,
+                 noise_floor=None):
         """
         Инициализирует поток записи.
         
         Args:
             silence_detector: Экземпляр SilenceDetector для определения тишины
             enable_silence_detection: Включить автоматическое определение тишины (по умолчанию True)
+            stream_to_disk: Писать WAV файл в фоне во время записи (по умолчанию False)
+            segmenter: PauseSegmenter для спекулятивной транскрипции (по умолчанию None)
+            vad: VAD бэкенд для определения речи по фреймам (по умолчанию None - порог RMS)
+            noise_floor: NoiseFloorEstimator, получающий RMS каждого чанка (по умолчанию None)
         """
         super().__init__()
-        self.audio_engine = AudioEngine()
+        self.audio_engine = AudioEngine(stream_to_disk=stream_to_disk, vad=vad)
         self.silence_detector = silence_detector
         self.enable_silence_detection = enable_silence_detection
+        # Потоковая запись освобождает буфер, сегменты из него уже не вырезать
+        self.segmenter = segmenter if not stream_to_disk else None
+        self.noise_floor = noise_floor
         self._should_stop = False
         self._cancelled = False  # Флаг отмены (не сохранять файл)
-        self._update_interval = 0.05  # 50ms между обновлениями RMS
+        self._update_interval = 0.05  # 50ms между обновлениями RMS в UI
+        self._last_emit_time: Optional[float] = None  # Время последнего rms_updated (по аудио)
+        self._peak_rms = 0.0  # Максимальный RMS с последнего rms_updated
     
     def run(self) -> None:
         """
         Главный цикл потока записи.
         
-        Запускает запись, периодически обновляет RMS значения
+        Запускает запись, обрабатывает каждый чанк из очереди анализа
         и проверяет условие остановки (тишина или ручная остановка).
         
         Requirements: 4.7, 9.1
@@ -387,32 +613,26 @@ class AudioRecordingThread(QThread):
         try:
             # Начать запись
             self.audio_engine.start_recording()
+            levels = self.audio_engine.levels
             
-            # Главный цикл записи
+            # Главный цикл записи: просыпаемся на каждый чанк (или на stop())
             while not self._should_stop:
-                # Получить текущее RMS значение
-                rms = self.audio_engine.get_current_rms()
-                
-                # Отправить сигнал для визуализации
-                self.rms_updated.emit(rms)
-                
-                # Проверить тишину если детектор доступен И включено определение тишины
-                if self.silence_detector and self.enable_silence_detection:
-                    current_time = time.time()
-                    is_silent = self.silence_detector.update(rms, current_time)
-                    
-                    if is_silent:
-                        # Обнаружена тишина - отправить сигнал
-                        self.silence_detected.emit()
-                        break
+                try:
+                    level = levels.get(timeout=self._update_interval)
+                except queue.Empty:
+                    continue
+                if level is None:
+                    continue
                 
-                # Небольшая задержка между обновлениями
-                time.sleep(self._update_interval)
+                if self._process_level(level):
+                    # Обнаружена тишина - отправить сигнал
+                    self.silence_detected.emit()
+                    break
             
             # Остановить запись и сохранить файл ТОЛЬКО если не отменено
             if not self._cancelled:
-                filepath = self.audio_engine.stop_recording()
-                self.recording_stopped.emit(filepath)
+                payload = self.audio_engine.stop_recording_payload()
+                self.recording_stopped.emit(payload)
             else:
                 # Просто остановить без сохранения
                 self.audio_engine.cleanup()
@@ -425,13 +645,81 @@ class AudioRecordingThread(QThread):
             # Очистить ресурсы
             self.audio_engine.cleanup()
     
+    def _process_level(self, level: ChunkLevel) -> bool:
+        """
+        Обрабатывает анализ одного чанка.
+        
+        Args:
+            level: Результат анализа чанка из очереди
+        
+        Returns:
+            True если детектор обнаружил тишину и запись нужно остановить
+        """
+        self._emit_rms(level)
+        
+        # Уровень шума обновляется до решения детектора - порог уже учитывает этот чанк
+        if self.noise_floor is not None and self.noise_floor.update(level.rms, level.timestamp):
+            self.noise_floor_updated.emit(self.noise_floor.level)
+        
+        # Закрыть сегмент на паузе и отдать его на транскрипцию
+        if self.segmenter is not None:
+            self._check_segment(level.rms, level.timestamp, level.position)
+        
+        # Проверить тишину если детектор доступен И включено определение тишины
+        if not (self.silence_detector and self.enable_silence_detection):
+            return False
+        if level.is_speech is not None:
+            return self.silence_detector.update_speech(level.is_speech, level.timestamp)
+        return self.silence_detector.update(level.rms, level.timestamp)
+    
+    def _emit_rms(self, level: ChunkLevel) -> None:
+        """
+        Отправляет rms_updated не чаще раза в _update_interval.
+        
+        Между отправками копится максимальный RMS, чтобы короткий
+        всплеск был виден на визуализации.
+        
+        Args:
+            level: Результат анализа чанка
+        """
+        self._peak_rms = max(self._peak_rms, level.rms)
+        if (self._last_emit_time is not None
+                and level.timestamp - self._last_emit_time < self._update_interval):
+            return
+        self.rms_updated.emit(self._peak_rms)
+        self._last_emit_time = level.timestamp
+        self._peak_rms = 0.0
+    
+    def _check_segment(self, rms: float, timestamp: float, position: int) -> None:
+        """
+        Передает уровень громкости сегментатору и отправляет закрытый сегмент.
+        
+        Args:
+            rms: Значение RMS чанка
+            timestamp: Временная метка в секундах
+            position: Количество записанных сэмплов после чанка
+        """
+        buffer = self.audio_engine.audio_buffer
+        segment = self.segmenter.update(rms, timestamp, position)
+        if segment is None:
+            return
+        
+        start, end = segment
+        payload = AudioPayload(
+            pcm=bytes(buffer.as_bytes(start, end)),
+            sample_rate=self.audio_engine.sample_rate,
+            channels=self.audio_engine.channels
+        )
+        self.segment_ready.emit(payload)
+    
     def stop(self) -> None:
         """
         Останавливает запись.
         
-        Устанавливает флаг остановки, который прерывает главный цикл.
+        Устанавливает флаг остановки и будит главный цикл.
         """
         self._should_stop = True
+        self._wake()
     
     def cancel(self) -> None:
         """
@@ -441,3 +729,12 @@ class AudioRecordingThread(QThread):
         """
         self._cancelled = True
         self._should_stop = True
+        self._wake()
+    
+    def _wake(self) -> None:
+        """Будит главный цикл, ожидающий очередной чанк."""
+        try:
+            self.audio_engine.levels.put_nowait(None)
+        except queue.Full:
+            # Очередь полна - цикл и так не ждет
+            pass
@@ -0,0 +1,224 @@
+"""
+Аудио данные записи, передаваемые по конвейеру в памяти.
+
+Этот модуль реализует AudioPayload - объект, который несет PCM данные,
+частоту дискретизации и длительность от AudioRecordingThread через
+main до TranscriptionThread и отправляется в API как файловый объект
+в памяти. Диск используется только когда путь действительно нужен
+(keep_recordings, хуки с audio_file_path, потоковая запись на диск).
+"""
+
+import io
+import os
+import tempfile
+import wave
+from typing import BinaryIO, Optional, Union
+
+from utils.wav_io import map_wav, read_wav_info
+
+
+class AudioPayload:
+    """
+    PCM аудио в памяти или ссылка на WAV файл на диске.
+
+    Payload либо хранит PCM данные (pcm), либо ссылается на файл (path),
+    либо и то, и другое - после сохранения на диск через save().
+
+    Attributes:
+        pcm: Сырые PCM данные (None для payload, хранящегося только на диске)
+        sample_rate: Частота дискретизации в Hz
+        channels: Количество каналов
+        sample_width: Ширина сэмпла в байтах
+        path: Путь к WAV файлу на диске (None, если данные только в памяти)
+    """
+
+    def __init__(
+        self,
+        pcm: Optional[bytes] = None,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        sample_width: int = 2,
+        path: Optional[str] = None,
+        n_frames: Optional[int] = None
+    ):
+        """
+        Инициализирует payload.
+
+        Args:
+            pcm: Сырые PCM данные
+            sample_rate: Частота дискретизации в Hz
+            channels: Количество каналов
+            sample_width: Ширина сэмпла в байтах
+            path: Путь к WAV файлу с теми же данными
+            n_frames: Количество фреймов (для payload без pcm)
+        """
+        if pcm is None and path is None:
+            raise ValueError("AudioPayload requires pcm data or a file path")
+
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.path = path
+        self._n_frames = n_frames
+
+    @classmethod
+    def from_file(cls, path: str) -> 'AudioPayload':
+        """
+        Создает payload, ссылающийся на WAV файл (читается только заголовок).
+
+        Args:
+            path: Путь к WAV файлу
+
+        Returns:
+            AudioPayload без загруженных PCM данных
+        """
+        info = read_wav_info(path)
+        return cls(
+            sample_rate=info.sample_rate,
+            channels=info.channels,
+            sample_width=info.sample_width,
+            path=path,
+            n_frames=info.n_frames
+        )
+
+    @classmethod
+    def coerce(cls, audio: Union[str, 'AudioPayload']) -> 'AudioPayload':
+        """
+        Приводит путь к файлу или payload к AudioPayload.
+
+        Для путей заголовок не читается - длительность определяется лениво.
+
+        Args:
+            audio: Путь к WAV файлу или AudioPayload
+
+        Returns:
+            AudioPayload
+        """
+        if isinstance(audio, AudioPayload):
+            return audio
+        return cls(path=str(audio))
+
+    @property
+    def in_memory(self) -> bool:
+        """True если PCM данные доступны без чтения диска."""
+        return self.pcm is not None
+
+    @property
+    def frame_size(self) -> int:
+        """Размер одного фрейма в байтах."""
+        return self.channels * self.sample_width
+
+    @property
+    def n_frames(self) -> int:
+        """Количество фреймов аудио."""
+        if self.pcm is not None:
+            return len(self.pcm) // self.frame_size
+        if self._n_frames is None:
+            loaded = AudioPayload.from_file(self.path)
+            self.sample_rate = loaded.sample_rate
+            self.channels = loaded.channels
+            self.sample_width = loaded.sample_width
+            self._n_frames = loaded._n_frames
+        return self._n_frames
+
+    @property
+    def duration(self) -> float:
+        """Длительность аудио в секундах."""
+        return self.n_frames / float(self.sample_rate)
+
+    def with_pcm(self, pcm: bytes) -> 'AudioPayload':
+        """
+        Возвращает новый payload в памяти с теми же параметрами и другими данными.
+
+        Args:
+            pcm: Новые PCM данные
+
+        Returns:
+            AudioPayload без пути к файлу
+        """
+        return AudioPayload(
+            pcm=pcm,
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            sample_width=self.sample_width
+        )
+
+    def load_pcm(self) -> bytes:
+        """
+        Возвращает PCM данные, при необходимости читая их из файла.
+
+        Returns:
+            Сырые PCM данные
+        """
+        if self.pcm is None:
+            info, samples = map_wav(self.path)
+            self.sample_rate = info.sample_rate
+            self.channels = info.channels
+            self.sample_width = info.sample_width
+            self._n_frames = info.n_frames
+            self.pcm = samples.tobytes()
+        return self.pcm
+
+    def open_for_upload(self, filename: str = "audio.wav") -> BinaryIO:
+        """
+        Открывает аудио как файловый объект для отправки в API.
+
+        Данные в памяти упаковываются в WAV внутри BytesIO без записи на диск.
+        Атрибут name нужен SDK, чтобы передать имя файла с расширением.
+
+        Args:
+            filename: Имя файла для multipart запроса
+
+        Returns:
+            Файловый объект, позиционированный на начало
+        """
+        if self.pcm is None:
+            return open(self.path, 'rb')
+
+        buffer = io.BytesIO()
+        self._write_wav(buffer)
+        buffer.seek(0)
+        buffer.name = filename
+        return buffer
+
+    def save(self, path: str) -> str:
+        """
+        Записывает аудио в WAV файл и запоминает путь.
+
+        Args:
+            path: Путь к создаваемому файлу
+
+        Returns:
+            Путь к файлу
+        """
+        with open(path, 'wb') as file:
+            self._write_wav(file)
+        self.path = path
+        return path
+
+    def ensure_file(self) -> str:
+        """
+        Возвращает путь к WAV файлу, создавая временный файл при необходимости.
+
+        Returns:
+            Путь к файлу
+        """
+        if self.path and os.path.exists(self.path):
+            return self.path
+
+        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        temp_file.close()
+        return self.save(temp_file.name)
+
+    def _write_wav(self, file: BinaryIO) -> None:
+        """Пишет WAV заголовок и PCM данные в открытый файловый объект."""
+        with wave.open(file, 'wb') as wav_file:
+            wav_file.setnchannels(self.channels)
+            wav_file.setsampwidth(self.sample_width)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(self.load_pcm())
+
+    def __repr__(self) -> str:
+        location = "memory" if self.pcm is not None else self.path
+        return f"AudioPayload({location}, {self.sample_rate} Hz)"
@@ -0,0 +1,220 @@
+"""
+Параллельная транскрипция длинных записей по частям.
+
+Длинная запись, отправленная одним запросом, транскрибируется тем дольше,
+чем она длиннее, и может упереться в лимит размера файла провайдера
+(например, 25 MB у OpenAI). Этот модуль режет аудио по паузам (RMS анализ
+из utils.audio_utils), транскрибирует части параллельно в ограниченном
+пуле потоков и склеивает результат по порядку, удаляя слова, которые
+попали в перекрытие частей, разрезанных посреди речи.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from services.audio_encoder import encode_payload
+from services.audio_payload import AudioPayload
+from utils.audio_utils import find_split_points
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Максимум одновременных запросов транскрипции на провайдера
+PROVIDER_MAX_CONCURRENCY = {
+    "openai": 4,
+    "groq": 4,
+    "glm": 2,
+    "custom": 2,
+}
+
+# Перекрытие частей, разрезанных посреди речи
+OVERLAP_SECONDS = 1.0
+
+# Максимальная длина перекрытия, которую ищем при склейке (в словах)
+MAX_OVERLAP_WORDS = 12
+
+_WORD_NORMALIZE_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+_WORD_RE = re.compile(r"\S+")
+
+# Письменности без пробелов между словами (CJK иероглифы, кана,
+# полноширинная пунктуация): части склеиваются без пробела
+_NO_SPACE_SCRIPT_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def split_payload(
+    payload: AudioPayload,
+    max_chunk_seconds: float,
+    threshold: float = 0.02,
+    overlap_seconds: float = OVERLAP_SECONDS
+) -> Tuple[List[AudioPayload], List[bool]]:
+    """
+    Разбивает аудио на части не длиннее max_chunk_seconds (плюс перекрытие).
+
+    Args:
+        payload: Аудио для разбиения
+        max_chunk_seconds: Максимальная длина части
+        threshold: Порог RMS для поиска пауз
+        overlap_seconds: Перекрытие частей, разрезанных посреди речи
+
+    Returns:
+        Кортеж (части в порядке следования, для каждого стыка - разрезан
+        ли он в тишине). Одна часть и пустой список, если резать не нужно
+    """
+    if payload.duration <= max_chunk_seconds:
+        return [payload], []
+
+    pcm = payload.load_pcm()
+    splits = find_split_points(
+        pcm,
+        payload.sample_rate,
+        max_chunk_seconds,
+        threshold=threshold,
+        channels=payload.channels,
+        sample_width=payload.sample_width
+    )
+
+    frame_size = payload.frame_size
+    total_frames = len(pcm) // frame_size
+    overlap_frames = int(overlap_seconds * payload.sample_rate)
+
+    # Часть после разреза посреди речи начинается на overlap раньше,
+    # чтобы слово на стыке целиком попало хотя бы в одну часть
+    boundaries: List[Tuple[int, int]] = []
+    start = 0
+    for split_frame, is_silent in splits:
+        boundaries.append((start, split_frame))
+        start = split_frame if is_silent else max(0, split_frame - overlap_frames)
+    boundaries.append((start, total_frames))
+
+    parts = [
+        payload.with_pcm(pcm[part_start * frame_size:part_end * frame_size])
+        for part_start, part_end in boundaries
+    ]
+    return parts, [is_silent for _, is_silent in splits]
+
+
+def _normalize_word(word: str) -> str:
+    """Приводит слово к виду для сравнения (без регистра и пунктуации)."""
+    return _WORD_NORMALIZE_RE.sub("", word).lower()
+
+
+def _needs_space(left: str, right: str) -> bool:
+    """Нужен ли пробел между склеиваемыми текстами."""
+    if not left or not right or left[-1].isspace() or right[0].isspace():
+        return False
+    return not (_NO_SPACE_SCRIPT_RE.match(left[-1]) or _NO_SPACE_SCRIPT_RE.match(right[0]))
+
+
+def stitch_transcripts(
+    texts: List[str],
+    max_overlap_words: int = MAX_OVERLAP_WORDS,
+    silent_seams: Optional[List[bool]] = None
+) -> str:
+    """
+    Склеивает тексты частей, удаляя повтор слов на стыках посреди речи.
+
+    На стыке, разрезанном посреди речи, ищется самый длинный хвост
+    предыдущего текста, совпадающий с началом следующего (без учета
+    регистра и пунктуации), и он удаляется из следующего текста. На
+    стыках в тишине аудио не перекрывается, и совпадающие слова
+    действительно были сказаны дважды. Пробельные символы частей
+    сохраняются, пробел добавляется только между словами письменностей,
+    которые разделяют слова пробелами.
+
+    Args:
+        texts: Тексты частей по порядку
+        max_overlap_words: Максимальная длина удаляемого перекрытия
+        silent_seams: Для каждого стыка - разрезан ли он в тишине
+            (None - перекрытие ищется на всех стыках)
+
+    Returns:
+        Итоговый текст
+    """
+    result = ""
+    result_words: List[str] = []
+    for index, text in enumerate(texts):
+        words = _WORD_RE.findall(text)
+        if not words:
+            continue
+
+        overlap = 0
+        if silent_seams is None or (index > 0 and not silent_seams[index - 1]):
+            limit = min(max_overlap_words, len(result_words), len(words))
+            for size in range(limit, 0, -1):
+                tail = [_normalize_word(w) for w in result_words[-size:]]
+                head = [_normalize_word(w) for w in words[:size]]
+                if tail == head and any(tail):
+                    overlap = size
+                    break
+        if overlap == len(words):
+            continue
+        if overlap:
+            # Текст после последнего слова перекрытия, с его пробелами
+            text = text[list(_WORD_RE.finditer(text))[overlap - 1].end():]
+
+        if _needs_space(result, text):
+            result += " "
+        result += text
+        result_words.extend(words[overlap:])
+
+    return result.strip()
+
+
+class ChunkedTranscriber:
+    """
+    Транскрибирует части записи параллельно и склеивает результат.
+
+    Attributes:
+        client: TranscriptionClient для запросов
+        provider: Провайдер (для лимита параллельности)
+        upload_format: Формат отправки (wav, flac, opus)
+    """
+
+    def __init__(self, client, provider: str, upload_format: str = "wav", max_workers: Optional[int] = None):
+        """
+        Инициализирует транскрайбер.
+
+        Args:
+            client: TranscriptionClient
+            provider: Провайдер транскрипции
+            upload_format: Формат отправки, уже проверенный resolve_upload_format
+            max_workers: Ограничение параллельности (по умолчанию из PROVIDER_MAX_CONCURRENCY)
+        """
+        self.client = client
+        self.provider = provider
+        self.upload_format = upload_format
+        self.max_workers = max_workers or PROVIDER_MAX_CONCURRENCY.get(provider, 1)
+
+    def transcribe(self, parts: List[AudioPayload], silent_seams: Optional[List[bool]] = None) -> str:
+        """
+        Транскрибирует части параллельно и возвращает склеенный текст.
+
+        Args:
+            parts: Части записи по порядку
+            silent_seams: Для каждого стыка - разрезан ли он в тишине
+                (из split_payload; None - перекрытие ищется на всех стыках)
+
+        Returns:
+            Итоговый текст
+
+        Raises:
+            Exception: Первая ошибка транскрипции любой из частей
+        """
+        workers = max(1, min(self.max_workers, len(parts)))
+        logger.info(f"Транскрипция {len(parts)} частей, параллельно: {workers}")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ChunkTranscriber") as executor:
+            futures = [executor.submit(self._transcribe_part, index, part) for index, part in enumerate(parts)]
+            # Результаты собираются в исходном порядке частей
+            texts = [future.result() for future in futures]
+
+        return stitch_transcripts(texts, silent_seams=silent_seams)
+
+    def _transcribe_part(self, index: int, part: AudioPayload) -> str:
+        """Кодирует и транскрибирует одну часть."""
+        upload = part if self.upload_format == "wav" else encode_payload(part, self.upload_format)
+        logger.info(f"Часть {index + 1}: {part.duration:.1f}с")
+        return self.client.transcribe_audio(upload)
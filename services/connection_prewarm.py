@@ -0,0 +1,193 @@
+"""
+Прогрев соединений с API во время записи.
+
+Когда начинается запись, через несколько секунд точно будет запрос
+транскрипции (и, если включена, постобработки). Прогрев открывает
+TCP и TLS соединение с провайдером в фоновом потоке, пока пользователь
+говорит. Клиенты реестра держат простаивающее соединение долго
+(KEEPALIVE_EXPIRY), поэтому обычно хватает одного прогрева; в длинной
+записи соединение освежается, только когда подходит к истечению и
+не использовалось (например, спекулятивной транскрипцией).
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.api_client_pool import get_client_pool
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Доля времени жизни простаивающего соединения, после которой оно освежается
+KEEPALIVE_REFRESH_RATIO = 0.8
+
+
+class ConnectionPrewarmer:
+    """
+    Открывает и держит соединения с API, пока идет запись.
+
+    Клиенты берутся из общего реестра с теми же ключами, что и при
+    транскрипции/постобработке, поэтому запросы уходят по прогретому
+    соединению.
+
+    Attributes:
+        keepalive_interval: Сколько секунд простоя соединения до освежения
+            (None - KEEPALIVE_REFRESH_RATIO от времени жизни в реестре)
+        max_duration: Сколько секунд после старта соединение освежается
+        handshake_seconds: Время установки соединений в первом раунде
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        post_processing_provider: Optional[str] = None,
+        post_processing_api_key: Optional[str] = None,
+        post_processing_base_url: Optional[str] = None,
+        use_coding_plan: bool = False,
+        keepalive_interval: Optional[float] = None,
+        max_duration: float = 120.0
+    ):
+        """
+        Инициализирует прогрев.
+
+        Args:
+            provider: Провайдер транскрипции
+            api_key: API ключ провайдера транскрипции
+            base_url: Кастомный URL (для custom провайдера)
+            model: Модель транскрипции
+            post_processing_provider: Провайдер постобработки (None - не прогревать)
+            post_processing_api_key: API ключ постобработки
+            post_processing_base_url: URL локальной LLM (для llm провайдера)
+            use_coding_plan: Coding Plan endpoint для GLM
+            keepalive_interval: Простой соединения до освежения (None - по реестру)
+            max_duration: Сколько секунд после старта освежать соединение
+        """
+        self.provider = provider
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.post_processing_provider = post_processing_provider
+        self.post_processing_api_key = post_processing_api_key
+        self.post_processing_base_url = post_processing_base_url
+        self.use_coding_plan = use_coding_plan
+        self.keepalive_interval = keepalive_interval
+        self.max_duration = max_duration
+        self.handshake_seconds: List[float] = []
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Запускает прогрев в фоновом потоке."""
+        self._thread = threading.Thread(target=self._run, name="ConnectionPrewarm", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Прекращает освежать соединения (запрос вот-вот уйдет)."""
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Ожидает завершения фонового потока."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Главный цикл: прогрев, затем освежение истекающих соединений до остановки."""
+        targets = self._resolve_targets()
+        if not targets:
+            return
+
+        pool = get_client_pool()
+        interval = self.keepalive_interval
+        if interval is None:
+            interval = pool.keepalive_expiry * KEEPALIVE_REFRESH_RATIO
+        deadline = time.monotonic() + self.max_duration
+
+        # id клиента -> когда соединение последний раз прогревалось
+        warmed: Dict[int, float] = {}
+        for client, url in targets:
+            handshake = pool.prewarm(client, url)
+            warmed[id(client)] = time.monotonic()
+            if handshake:
+                self.handshake_seconds.append(handshake)
+
+        def refresh_at(client) -> float:
+            # Запрос по соединению (прогрев или API) продлевает его жизнь
+            return max(warmed[id(client)], pool.last_used(client) or 0.0) + interval
+
+        while True:
+            next_refresh = min(refresh_at(client) for client, _ in targets)
+            if next_refresh > deadline:
+                break
+            if self._stop_event.wait(max(0.0, next_refresh - time.monotonic())):
+                break
+            now = time.monotonic()
+            for client, url in targets:
+                if refresh_at(client) <= now:
+                    pool.prewarm(client, url)
+                    warmed[id(client)] = now
+
+    def _resolve_targets(self) -> List[Tuple[Any, str]]:
+        """
+        Получает клиентов из реестра для прогрева.
+
+        Returns:
+            Список (клиент SDK, URL для прогрева)
+        """
+        from services.transcription_client import (
+            ANTHROPIC_AVAILABLE,
+            POST_PROCESSING_BASE_URLS,
+            POST_PROCESSING_TIMEOUT,
+            ZAI_TIMEOUT,
+            Anthropic,
+            OpenAI,
+            TranscriptionClient,
+        )
+
+        targets: List[Tuple[Any, str]] = []
+        pool = get_client_pool()
+
+        # Z.AI не транскрибирует аудио - прогревать нечего
+        if self.provider != "zai":
+            try:
+                transcription_client = TranscriptionClient(
+                    provider=self.provider,
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    model=self.model
+                )
+                targets.append((transcription_client.client, transcription_client.base_url))
+            except Exception as e:
+                logger.debug(f"Прогрев соединения транскрипции пропущен: {e}")
+
+        provider = self.post_processing_provider
+        if provider and self.post_processing_api_key is not None:
+            try:
+                if provider == "zai":
+                    if ANTHROPIC_AVAILABLE:
+                        url = POST_PROCESSING_BASE_URLS["zai"]
+                        client = pool.get(Anthropic, provider, self.post_processing_api_key, url, ZAI_TIMEOUT)
+                        targets.append((client, url))
+                else:
+                    if provider == "llm":
+                        url = self.post_processing_base_url
+                    elif provider == "glm" and self.use_coding_plan:
+                        url = POST_PROCESSING_BASE_URLS["glm_coding_plan"]
+                    else:
+                        url = POST_PROCESSING_BASE_URLS.get(provider)
+                    if url:
+                        client = pool.get(OpenAI, provider, self.post_processing_api_key, url, POST_PROCESSING_TIMEOUT)
+                        targets.append((client, url))
+            except Exception as e:
+                logger.debug(f"Прогрев соединения постобработки пропущен: {e}")
+
+        # Один и тот же клиент (общий провайдер) прогревается один раз
+        unique: List[Tuple[Any, str]] = []
+        for client, url in targets:
+            if all(client is not other for other, _ in unique):
+                unique.append((client, url))
+        return unique
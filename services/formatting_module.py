@@ -7,7 +7,10 @@ active and applies appropriate formatting rules using AI-powered text
 transformation.
 """
 
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+from core.recording_context import RecordingContext
 from services.formatting_config import FormattingConfig
 from services.window_monitor import WindowMonitor, WindowInfo
 from utils.logger import get_logger
@@ -26,6 +29,11 @@ BROWSER_PROCESSES = [
     "safari", "safari.app",
 ]
 
+_BROWSER_PATTERN = re.compile("|".join(re.escape(browser) for browser in BROWSER_PROCESSES))
+
+# Number of (window title, app name) pairs remembered by a KeywordMatcher
+MATCH_CACHE_SIZE = 256
+
 
 def is_browser(app_name: str) -> bool:
     """
@@ -37,8 +45,80 @@ def is_browser(app_name: str) -> bool:
     Returns:
         bool: True if application is a browser
     """
-    app_lower = app_name.lower()
-    return any(browser in app_lower for browser in BROWSER_PROCESSES)
+    return _BROWSER_PATTERN.search(app_name.lower()) is not None
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher for application keywords.
+    
+    Each format's keywords are compiled into one alternation regex, and the
+    regexes are tried in the order of the keywords map, so the first format
+    with a matching keyword wins exactly as with a plain substring scan.
+    Results are memoized per (window title, app name) pair.
+    """
+    
+    def __init__(self, keywords_map: dict):
+        """
+        Compile the keywords.
+        
+        Args:
+            keywords_map: Dictionary of format_type -> keywords mapping from config
+        """
+        self._patterns = [
+            (format_type, re.compile("|".join(re.escape(pattern.lower()) for pattern in patterns)))
+            for format_type, patterns in keywords_map.items()
+            if patterns
+        ]
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+    
+    def _search(self, text: str) -> Optional[Tuple[str, str]]:
+        """Return (format_type, keyword) of the first format matching text."""
+        for format_type, pattern in self._patterns:
+            found = pattern.search(text)
+            if found:
+                return format_type, found.group(0)
+        return None
+    
+    def _match(self, window_title: str, app_name: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Match a window against the keywords.
+        
+        Args:
+            window_title: Window/tab title
+            app_name: Application process name
+        
+        Returns:
+            Optional[Tuple[str, str, str]]: (format_type, "app" or "title", matched keyword)
+                                            or None if no match
+        """
+        # Application name FIRST (priority for messengers), then window title
+        for source, text in (("app", app_name), ("title", window_title)):
+            found = self._search(text.lower())
+            if found:
+                return found[0], source, found[1]
+        return None
+
+
+@lru_cache(maxsize=1)
+def _compile_keywords(keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> KeywordMatcher:
+    """Build the matcher for a keywords snapshot (rebuilt only when keywords change)."""
+    return KeywordMatcher(dict(keywords))
+
+
+def get_keyword_matcher(keywords_map: dict) -> KeywordMatcher:
+    """
+    Get the compiled matcher for a keywords map.
+    
+    Args:
+        keywords_map: Dictionary of format_type -> keywords mapping from config
+    
+    Returns:
+        KeywordMatcher: Matcher for the current keywords (shared while they are unchanged)
+    """
+    return _compile_keywords(tuple(
+        (format_type, tuple(patterns)) for format_type, patterns in keywords_map.items()
+    ))
 
 
 def match_window_to_format(window_title: str, app_name: str, keywords_map: dict) -> Optional[str]:
@@ -59,36 +139,16 @@ def match_window_to_format(window_title: str, app_name: str, keywords_map: dict)
     Returns:
         Optional[str]: Format identifier or None if no match
     """
-    title_lower = window_title.lower()
-    app_lower = app_name.lower()
-    
-    # STEP 1: Check application name FIRST (priority for messengers)
-    # This ensures Telegram/WhatsApp/Discord are detected even if chat name doesn't contain keywords
-    for format_type, patterns in keywords_map.items():
-        for pattern in patterns:
-            pattern_lower = pattern.lower()
-            
-            # Check application name
-            if pattern_lower in app_lower:
-                logger.info(f"  ✅ Найдено совпадение в имени приложения: '{pattern}' → формат '{format_type}'")
-                return format_type
-    
-    # STEP 2: Check window title (for browsers and other apps where title matters)
-    for format_type, patterns in keywords_map.items():
-        for pattern in patterns:
-            pattern_lower = pattern.lower()
-            
-            # Check window title
-            if pattern_lower in title_lower:
-                logger.info(f"  ✅ Найдено совпадение в заголовке: '{pattern}' → формат '{format_type}'")
-                return format_type
-            
-            # Check file extension in window title
-            if pattern.startswith(".") and pattern_lower in title_lower:
-                logger.info(f"  ✅ Найдено совпадение расширения: '{pattern}' → формат '{format_type}'")
-                return format_type
+    match = get_keyword_matcher(keywords_map).match(window_title, app_name)
+    if match is None:
+        return None
     
-    return None
+    format_type, source, keyword = match
+    if source == "app":
+        logger.info(f"  ✅ Найдено совпадение в имени приложения: '{keyword}' → формат '{format_type}'")
+    else:
+        logger.info(f"  ✅ Найдено совпадение в заголовке: '{keyword}' → формат '{format_type}'")
+    return format_type
 
 
 class FormattingModule:
@@ -139,8 +199,9 @@ class FormattingModule:
         PRIORITY ORDER (highest to lowest):
         1. Manual format selection (from StateManager)
         2. Fixed format setting (use_fixed_format)
-        3. Automatic application detection
-        4. Fallback/universal format
+        3. Recording context captured at record start (from StateManager)
+        4. Automatic application detection
+        5. Fallback/universal format
         
         Returns:
             Optional[str]: Format identifier (e.g., "notion", "obsidian", "markdown")
@@ -160,6 +221,12 @@ class FormattingModule:
                 logger.info("  🔒 Фиксированный формат включен - используется универсальный промпт")
                 return "_fallback"
             
+            # PRIORITY 3: Target window captured at record start (no window probing)
+            context = self.state_manager.get_recording_context() if self.state_manager else None
+            if isinstance(context, RecordingContext):
+                logger.info(f"  📌 Окно на момент начала записи: {context.process_name} - {context.window_title}")
+                return context.format_type
+            
             logger.info("  🔍 Определение активного окна...")
             
             # Get active window information
@@ -169,55 +236,97 @@ class FormattingModule:
                 logger.warning("  ⚠️ Не удалось получить информацию об активном окне")
                 return None
             
-            # Extract application name and window title
-            app_name = window_info.process_name
-            window_title = window_info.title
-            
-            logger.info(f"  📱 Активное окно:")
-            logger.info(f"    - Процесс: {app_name}")
-            logger.info(f"    - Заголовок: {window_title}")
-            
-            # Check if we have keywords configured
-            if not self.config.web_app_keywords:
-                logger.warning("  ⚠️ Ключевые слова приложений не настроены")
-                return None
+            return self.match_application_format(window_info)
             
-            # Try to match window title or app name against keywords
-            logger.info(f"  🔎 Поиск соответствия в ключевых словах...")
-            format_type = match_window_to_format(
-                window_title=window_title,
-                app_name=app_name,
-                keywords_map=self.config.web_app_keywords
-            )
+        except Exception as e:
+            logger.error(f"  ❌ Ошибка при определении активного приложения: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+    
+    def match_application_format(self, window_info: WindowInfo) -> Optional[str]:
+        """
+        Match a window against configured application formats.
+        
+        Args:
+            window_info: Window to match
+        
+        Returns:
+            Optional[str]: Configured application name or None if no match
+        """
+        # Extract application name and window title
+        app_name = window_info.process_name
+        window_title = window_info.title
+        
+        logger.info(f"  📱 Активное окно:")
+        logger.info(f"    - Процесс: {app_name}")
+        logger.info(f"    - Заголовок: {window_title}")
+        
+        # Check if we have keywords configured
+        if not self.config.web_app_keywords:
+            logger.warning("  ⚠️ Ключевые слова приложений не настроены")
+            return None
+        
+        # Try to match window title or app name against keywords
+        logger.info(f"  🔎 Поиск соответствия в ключевых словах...")
+        format_type = match_window_to_format(
+            window_title=window_title,
+            app_name=app_name,
+            keywords_map=self.config.web_app_keywords
+        )
+        
+        if format_type:
+            logger.info(f"  ✅ Найдено соответствие: {format_type}")
             
-            if format_type:
-                logger.info(f"  ✅ Найдено соответствие: {format_type}")
-                
-                # Check if this format is in the configured applications list
-                logger.info(f"  🔎 Проверка в списке настроенных приложений: {self.config.applications}")
+            # Check if this format is in the configured applications list
+            logger.info(f"  🔎 Проверка в списке настроенных приложений: {self.config.applications}")
 
-                # Match application key case-insensitively to avoid config/UI case drift
-                app_lookup = {app.lower(): app for app in self.config.applications}
-                matched_app_name = app_lookup.get(format_type.lower())
+            # Match application key case-insensitively to avoid config/UI case drift
+            app_lookup = {app.lower(): app for app in self.config.applications}
+            matched_app_name = app_lookup.get(format_type.lower())
 
-                if matched_app_name:
-                    if matched_app_name != format_type:
-                        logger.info(
-                            f"  ℹ️ Формат '{format_type}' приведен к имени приложения '{matched_app_name}'"
-                        )
-                    logger.info(f"  ✅ Формат '{matched_app_name}' найден в списке приложений")
-                    return matched_app_name
+            if matched_app_name:
+                if matched_app_name != format_type:
+                    logger.info(
+                        f"  ℹ️ Формат '{format_type}' приведен к имени приложения '{matched_app_name}'"
+                    )
+                logger.info(f"  ✅ Формат '{matched_app_name}' найден в списке приложений")
+                return matched_app_name
 
-                logger.warning(f"  ⚠️ Формат '{format_type}' не найден в списке настроенных приложений")
-                return None
-            
-            logger.warning(f"  ⚠️ Не найдено соответствие для приложения '{app_name}' и заголовка '{window_title}'")
+            logger.warning(f"  ⚠️ Формат '{format_type}' не найден в списке настроенных приложений")
             return None
+        
+        logger.warning(f"  ⚠️ Не найдено соответствие для приложения '{app_name}' и заголовка '{window_title}'")
+        return None
+    
+    def capture_recording_context(self, session_id: Optional[str]) -> Optional[RecordingContext]:
+        """
+        Snapshot the active window and its format at record start.
+        
+        Uses the icon-less window lookup, so it may run on a worker thread.
+        
+        Args:
+            session_id: Recording session the context belongs to
+        
+        Returns:
+            Optional[RecordingContext]: Captured context or None if the window is unknown
+        """
+        try:
+            window_info = self.window_monitor.get_active_window_target()
+            if not window_info:
+                logger.warning("  ⚠️ Не удалось получить информацию об активном окне")
+                return None
             
+            return RecordingContext(
+                session_id=session_id,
+                window_title=window_info.title,
+                process_name=window_info.process_name,
+                process_id=window_info.process_id,
+                format_type=self.match_application_format(window_info)
+            )
+        
         except Exception as e:
-            logger.error(f"  ❌ Ошибка при определении активного приложения: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.error(f"  ❌ Ошибка при сохранении контекста записи: {e}")
             return None
     
     def get_format_prompt(self, format_type: str) -> str:
@@ -2,6 +2,11 @@
 Hook manager for RapidWhisper processing pipeline.
 
 Discovers hook scripts, executes them by event, and logs results.
+
+The normalized hooks config and a per-event execution plan are cached,
+so running an event only walks a prepared list. Hook directories are
+watched (QFileSystemWatcher, inotify on Linux) or polled when no Qt event
+loop is available, and only added or changed scripts are re-imported.
 """
 
 from __future__ import annotations
@@ -10,13 +15,16 @@ import copy
 import logging
 import importlib.util
 import os
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
+from PyQt6.QtCore import QCoreApplication, QFileSystemWatcher, QThread, QTimer
+
 from core.config import get_config_dir
 from core.config_loader import get_config_loader
 from utils.logger import get_logger, get_hooks_logger, rotate_file_if_too_large
@@ -32,6 +40,11 @@ DEFAULT_EVENTS = [
     "task_completed",
 ]
 
+# Hook directories are rescanned this often (seconds) when they cannot be watched
+HOOKS_POLL_INTERVAL = 2.0
+# Delay before rescanning after a change notification, so a file being saved is complete
+HOOKS_RESCAN_DELAY_MS = 200
+
 
 @dataclass
 class HookMeta:
@@ -75,6 +88,17 @@ class HookManager:
         self.config_loader = get_config_loader()
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.hooks: Dict[str, HookMeta] = {}
+        self._lock = threading.RLock()
+        self._config: Optional[Dict[str, Any]] = None
+        self._config_source: Any = None
+        self._plans: Dict[str, List[Tuple[HookMeta, bool]]] = {}
+        self._hook_paths: List[Path] = []
+        self._hook_files: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._hook_dirs: Set[Path] = set()
+        self._last_poll = 0.0
+        self._watcher: Optional[QFileSystemWatcher] = None
+        self._rescan_timer: Optional[QTimer] = None
+        self._start_watcher()
         self.refresh_hooks()
 
     @staticmethod
@@ -98,11 +122,34 @@ class HookManager:
         return cfg
 
     def _load_config(self) -> Dict[str, Any]:
-        raw = self.config_loader.get("hooks", {})
-        cfg = self.normalize_config(raw)
-        self.log_store.set_max_entries(cfg["log"].get("max_entries", 500))
-        self._log_enabled = cfg["log"].get("enabled", True)
-        return cfg
+        """
+        Return the normalized hooks config.
+
+        Cached until invalidate_config() or until the config loader reloads the file.
+        """
+        raw = self.config_loader.get("hooks")
+        with self._lock:
+            if self._config is not None and raw is self._config_source:
+                return self._config
+            cfg = self.normalize_config(raw)
+            self.log_store.set_max_entries(cfg["log"].get("max_entries", 500))
+            self._log_enabled = cfg["log"].get("enabled", True)
+            self._config = cfg
+            self._config_source = raw
+            paths = self._resolve_paths(cfg.get("paths", []))
+            if paths != self._hook_paths:
+                self._hook_paths = paths
+                self._scan_hooks()
+                self._update_watched_paths()
+            self._plans = self._build_plans(cfg)
+            return cfg
+
+    def invalidate_config(self) -> None:
+        """
+        Drop the cached config (called when settings are saved).
+        """
+        with self._lock:
+            self._config = None
 
     def _resolve_paths(self, paths: List[str]) -> List[Path]:
         resolved: List[Path] = []
@@ -119,10 +166,16 @@ class HookManager:
         return resolved
 
     def refresh_hooks(self) -> None:
-        cfg = self._load_config()
-        paths = self._resolve_paths(cfg.get("paths", []))
-        discovered = self._discover_hooks(paths, max_depth=5)
-        self.hooks = discovered
+        """
+        Re-read the config and re-import every hook script.
+        """
+        with self._lock:
+            self.hooks = {}
+            self._hook_files = {}
+            self._hook_paths = []
+            self._config = None
+            self._last_poll = time.monotonic()
+            self._load_config()
         self.logger.info(f"Hooks discovered: {len(self.hooks)}")
 
     def get_available_hooks(self, event: Optional[str] = None) -> List[str]:
@@ -142,32 +195,152 @@ class HookManager:
     def get_hooks_meta(self) -> Dict[str, HookMeta]:
         return dict(self.hooks)
 
-    def _discover_hooks(self, paths: List[Path], max_depth: int = 5) -> Dict[str, HookMeta]:
-        hooks: Dict[str, HookMeta] = {}
-        for base in paths:
-            if not base.exists():
-                continue
-            for root, dirs, files in os.walk(base):
+    def has_active_hooks(self, event: str) -> bool:
+        """
+        Return True if running the event would execute at least one hook.
+        """
+        return bool(self._get_plan(event))
+
+    def _build_plans(self, cfg: Dict[str, Any]) -> Dict[str, List[Tuple[HookMeta, bool]]]:
+        """
+        Build the ordered (hook, background) list of every event.
+        """
+        plans: Dict[str, List[Tuple[HookMeta, bool]]] = {}
+        if not cfg.get("enabled", True):
+            return plans
+        for event in DEFAULT_EVENTS:
+            available = [name for name, meta in self.hooks.items() if meta.event == event]
+            order = [name for name in cfg["order"].get(event, []) if name in available]
+            for name in available:
+                if name not in order:
+                    order.append(name)
+            disabled = set(cfg["disabled"].get(event, []))
+            background = set(cfg["background"].get(event, []))
+            plans[event] = [
+                (self.hooks[name], name in background)
+                for name in order
+                if name not in disabled
+            ]
+        return plans
+
+    def _get_plan(self, event: str) -> List[Tuple[HookMeta, bool]]:
+        self._poll_hooks()
+        with self._lock:
+            self._load_config()
+            return self._plans.get(event, [])
+
+    def _iter_hook_files(self, base: Path, max_depth: int = 5) -> Iterator[Tuple[Path, str]]:
+        """
+        Yield (path, hook name) of hook scripts under base and record walked directories.
+        """
+        if not base.exists():
+            return
+        for root, dirs, files in os.walk(base):
+            self._hook_dirs.add(Path(root))
+            try:
+                depth = len(Path(root).relative_to(base).parts)
+            except ValueError:
+                depth = 0
+            # Skip cache directories
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            if depth >= max_depth:
+                dirs[:] = []
+            for filename in files:
+                if not filename.endswith(".py"):
+                    continue
+                if filename.startswith("__"):
+                    continue
+                path = Path(root) / filename
+                rel = path.relative_to(base).with_suffix("")
+                yield path, str(rel).replace("\\", "/")
+
+    def _scan_hooks(self) -> bool:
+        """
+        Import added or changed hook scripts and drop removed ones.
+
+        Returns True if any hook script changed since the previous scan.
+        """
+        files: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._hook_dirs = set()
+        for base in self._hook_paths:
+            for path, name in self._iter_hook_files(base, max_depth=5):
                 try:
-                    depth = len(Path(root).relative_to(base).parts)
-                except ValueError:
-                    depth = 0
-                # Skip cache directories
-                dirs[:] = [d for d in dirs if d != "__pycache__"]
-                if depth >= max_depth:
-                    dirs[:] = []
-                for filename in files:
-                    if not filename.endswith(".py"):
-                        continue
-                    if filename.startswith("__"):
-                        continue
-                    path = Path(root) / filename
-                    rel = path.relative_to(base).with_suffix("")
-                    name = str(rel).replace("\\", "/")
-                    meta = self._load_hook_meta(path, name)
-                    if meta:
-                        hooks[name] = meta
-        return hooks
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files[path] = ((stat.st_mtime_ns, stat.st_size), name)
+
+        changed = False
+        for path, (_, name) in self._hook_files.items():
+            if path not in files:
+                self._drop_hook(path, name)
+                changed = True
+        for path, (signature, name) in files.items():
+            previous = self._hook_files.get(path)
+            if previous is not None and previous[0] == signature:
+                continue
+            meta = self._load_hook_meta(path, name)
+            if meta:
+                self.hooks[name] = meta
+            else:
+                self._drop_hook(path, name)
+            changed = True
+        self._hook_files = files
+        return changed
+
+    def _drop_hook(self, path: Path, name: str) -> None:
+        meta = self.hooks.get(name)
+        if meta is not None and meta.path == path:
+            del self.hooks[name]
+
+    def _sync_hooks(self) -> None:
+        """
+        Rescan hook directories and update execution plans if scripts changed.
+        """
+        with self._lock:
+            cfg = self._load_config()
+            if not self._scan_hooks():
+                return
+            self._update_watched_paths()
+            self._plans = self._build_plans(cfg)
+            self.logger.info(f"Hooks updated: {len(self.hooks)}")
+
+    def _poll_hooks(self) -> None:
+        """
+        Rescan hook directories at most every HOOKS_POLL_INTERVAL when they are not watched.
+        """
+        if self._watcher is not None:
+            return
+        now = time.monotonic()
+        if now - self._last_poll < HOOKS_POLL_INTERVAL:
+            return
+        self._last_poll = now
+        self._sync_hooks()
+
+    def _start_watcher(self) -> None:
+        """
+        Watch hook directories when a Qt event loop runs in this thread, otherwise poll.
+        """
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() != app.thread():
+            return
+        self._rescan_timer = QTimer()
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(HOOKS_RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self._sync_hooks)
+        self._watcher = QFileSystemWatcher()
+        self._watcher.directoryChanged.connect(lambda path: self._rescan_timer.start())
+        self._watcher.fileChanged.connect(lambda path: self._rescan_timer.start())
+
+    def _update_watched_paths(self) -> None:
+        if self._watcher is None:
+            return
+        wanted = {str(path) for path in self._hook_dirs} | {str(path) for path in self._hook_files}
+        watched = set(self._watcher.directories()) | set(self._watcher.files())
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(list(wanted - watched))
 
     def _load_hook_meta(self, path: Path, name: str) -> Optional[HookMeta]:
         try:
@@ -194,30 +367,8 @@ class HookManager:
         return None
 
     def run_event(self, event: str, options: Dict[str, Any]) -> Dict[str, Any]:
-        cfg = self._load_config()
-        if not cfg.get("enabled", True):
-            return options
-        if event not in DEFAULT_EVENTS:
-            return options
-
-        available = [name for name, meta in self.hooks.items() if meta.event == event]
-        order = [name for name in cfg["order"].get(event, []) if name in available]
-        for name in available:
-            if name not in order:
-                order.append(name)
-
-        disabled = set(cfg["disabled"].get(event, []))
-        background = set(cfg["background"].get(event, []))
-
-        for name in order:
-            meta = self.hooks.get(name)
-            if not meta:
-                continue
-            if meta.event != event:
-                continue
-            if name in disabled:
-                continue
-            if name in background:
+        for meta, background in self._get_plan(event):
+            if background:
                 self._run_hook_async(event, meta, options)
                 continue
             options = self._run_hook_sync(event, meta, options)
@@ -331,3 +482,11 @@ def get_hook_manager() -> HookManager:
     if _hook_manager_instance is None:
         _hook_manager_instance = HookManager()
     return _hook_manager_instance
+
+
+def invalidate_hooks_config() -> None:
+    """
+    Drop the cached hooks config of the running manager after settings are saved.
+    """
+    if _hook_manager_instance is not None:
+        _hook_manager_instance.invalidate_config()
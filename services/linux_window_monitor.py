@@ -2,21 +2,183 @@
 Linux Window Monitor Module
 
 Provides Linux-specific implementation for monitoring active windows using X11/Wayland.
+
+With python-xlib installed and an X display available, focus changes are
+received as _NET_ACTIVE_WINDOW PropertyNotify events on a persistent X
+connection in a background thread. Otherwise the monitor falls back to
+polling xdotool/wmctrl every 200 ms.
 """
 
 import logging
+import os
+import select
 import subprocess
-from typing import Optional, Dict, Callable
-from PyQt6.QtCore import QTimer
+from typing import Optional, Callable, Tuple
+from PyQt6.QtCore import QThread, QTimer, Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QIcon
 
 from services.window_monitor import WindowMonitor, WindowInfo
 
 try:
-    import psutil
-    PSUTIL_AVAILABLE = True
+    from Xlib import display as xdisplay
+    XLIB_AVAILABLE = True
 except ImportError:
-    PSUTIL_AVAILABLE = False
+    XLIB_AVAILABLE = False
+
+# X11 protocol constants (X.h), fixed by the protocol
+_PROPERTY_NOTIFY = 28
+_PROPERTY_CHANGE_MASK = 1 << 22
+_ANY_PROPERTY_TYPE = 0
+
+
+class X11ActiveWindowWatcher(QThread):
+    """
+    Background thread that follows the active window through X11 events.
+    
+    Subscribes to PropertyNotify on the root window (_NET_ACTIVE_WINDOW)
+    and on the active window itself (title changes, e.g. browser tabs).
+    The thread sleeps in select() on the X connection between events, so
+    it costs no CPU while focus does not change.
+    
+    Signals:
+        window_changed: Emitted with (title, pid) when either changes
+        watch_failed: Emitted with the error when the X connection fails
+    """
+    
+    window_changed = pyqtSignal(str, int)
+    watch_failed = pyqtSignal(str)
+    
+    def __init__(self, x_display):
+        """
+        Initialize the watcher.
+        
+        Args:
+            x_display: Open Xlib display, used only by this thread from now on
+        """
+        super().__init__()
+        self._display = x_display
+        self._logger = logging.getLogger(__name__)
+        self._wake_read, self._wake_write = os.pipe()
+        self._stopping = False
+        self._active_window = None
+        self._last: Optional[Tuple[str, int]] = None
+        
+        atom = x_display.intern_atom
+        self._net_active_window = atom('_NET_ACTIVE_WINDOW')
+        self._net_wm_name = atom('_NET_WM_NAME')
+        self._net_wm_pid = atom('_NET_WM_PID')
+        self._wm_name = atom('WM_NAME')
+        self._root = x_display.screen().root
+    
+    def run(self) -> None:
+        """Wait for X events and publish active window changes"""
+        try:
+            self._root.change_attributes(event_mask=_PROPERTY_CHANGE_MASK)
+            self._display.flush()
+            self._publish()
+            
+            x_fd = self._display.fileno()
+            while not self._stopping:
+                # Property reads in _publish() read the whole socket: events that
+                # arrived meanwhile wait in Xlib's queue, not on the socket
+                if not self._display.pending_events():
+                    readable, _, _ = select.select([x_fd, self._wake_read], [], [])
+                    if self._wake_read in readable:
+                        break
+                if self._drain_events():
+                    self._publish()
+        except Exception as e:
+            if not self._stopping:
+                self._logger.error(f"X11 window watcher stopped: {e}")
+                self.watch_failed.emit(str(e))
+        finally:
+            self._close()
+    
+    def _drain_events(self) -> bool:
+        """Read queued events, returning True if the active window or its title may have changed"""
+        changed = False
+        while self._display.pending_events():
+            event = self._display.next_event()
+            if event.type != _PROPERTY_NOTIFY:
+                continue
+            if event.atom == self._net_active_window:
+                changed = True
+            elif event.atom in (self._net_wm_name, self._wm_name) and event.window == self._active_window:
+                changed = True
+        return changed
+    
+    def _publish(self) -> None:
+        """Read the active window and emit window_changed if it differs from the last one"""
+        window = self._read_active_window()
+        if window is None:
+            return
+        if window != self._active_window:
+            self._active_window = window
+            try:
+                window.change_attributes(event_mask=_PROPERTY_CHANGE_MASK)
+                self._display.flush()
+            except Exception as e:
+                # The window may already be gone
+                self._logger.debug(f"Cannot watch window title: {e}")
+        
+        current = (self._read_title(window), self._read_pid(window))
+        if current != self._last:
+            self._last = current
+            self.window_changed.emit(*current)
+    
+    @property
+    def latest(self) -> Optional[Tuple[str, int]]:
+        """Last published (title, pid), None before the first read; safe from any thread"""
+        return self._last
+    
+    def _read_property(self, window, atom):
+        """Read a window property, None if missing or the window is gone"""
+        try:
+            return window.get_full_property(atom, _ANY_PROPERTY_TYPE)
+        except Exception:
+            return None
+    
+    def _read_active_window(self):
+        """Get the active window object from the root window"""
+        prop = self._read_property(self._root, self._net_active_window)
+        if prop is None or not len(prop.value) or not prop.value[0]:
+            return None
+        return self._display.create_resource_object('window', int(prop.value[0]))
+    
+    def _read_title(self, window) -> str:
+        """Get the window title (_NET_WM_NAME, then WM_NAME)"""
+        for atom in (self._net_wm_name, self._wm_name):
+            prop = self._read_property(window, atom)
+            if prop is not None and prop.value:
+                value = prop.value
+                if isinstance(value, bytes):
+                    value = value.decode('utf-8', 'replace')
+                return str(value)
+        return "Unknown Window"
+    
+    def _read_pid(self, window) -> int:
+        """Get the window process ID from _NET_WM_PID"""
+        prop = self._read_property(window, self._net_wm_pid)
+        if prop is None or not len(prop.value):
+            return 0
+        return int(prop.value[0])
+    
+    def stop(self) -> None:
+        """Stop the thread, wait for it to finish and release the wake-up pipe"""
+        if self._stopping:
+            return
+        self._stopping = True
+        os.write(self._wake_write, b'\0')
+        self.wait()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+    
+    def _close(self) -> None:
+        """Close the X connection"""
+        try:
+            self._display.close()
+        except Exception:
+            pass
 
 
 class LinuxWindowMonitor(WindowMonitor):
@@ -24,13 +186,12 @@ class LinuxWindowMonitor(WindowMonitor):
     
     def __init__(self):
         """Initialize the Linux window monitor"""
+        super().__init__()
         self._timer: Optional[QTimer] = None
+        self._watcher: Optional[X11ActiveWindowWatcher] = None
         self._callback: Optional[Callable[[WindowInfo], None]] = None
-        self._icon_cache: Dict[str, QPixmap] = {}
         self._last_window_title: Optional[str] = None
         self._last_process_name: Optional[str] = None
-        self._cache_max_size = 50
-        self._cache_access_count: Dict[str, int] = {}
         self._logger = logging.getLogger(__name__)
         
         # Check if required tools are available
@@ -63,30 +224,45 @@ class LinuxWindowMonitor(WindowMonitor):
         Returns:
             WindowInfo if window is found, None on error
         """
+        target = self.get_active_window_target()
+        if target is None:
+            return None
+        
         try:
-            # Get window ID
-            window_id = self._get_active_window_id()
-            if not window_id:
-                return None
-            
-            # Get window title
-            title = self._get_window_title(window_id)
-            if not title:
-                title = "Unknown Window"
-            
-            # Get process ID
-            process_id = self._get_window_pid(window_id)
-            
-            # Get process name
-            process_name = self._get_process_name(process_id)
-            
-            # Get icon
-            icon = self._get_app_icon(process_name, process_id)
+            target.icon = self._get_app_icon(target.process_name, target.process_id)
+        except Exception as e:
+            self._logger.error(f"Error getting window icon: {e}")
+        return target
+    
+    def get_active_window_target(self) -> Optional[WindowInfo]:
+        """
+        Get the current active window without its icon.
+        
+        While the X11 watcher runs its last (title, pid) is used, so no
+        xdotool process is spawned. Safe to call from a worker thread.
+        
+        Returns:
+            WindowInfo with icon=None if window is found, None on error
+        """
+        try:
+            watcher = self._watcher
+            latest = watcher.latest if watcher is not None else None
+            if latest is not None:
+                title, process_id = latest
+            else:
+                # Get window ID
+                window_id = self._get_active_window_id()
+                if not window_id:
+                    return None
+                
+                # Get window title and process ID
+                title = self._get_window_title(window_id)
+                process_id = self._get_window_pid(window_id)
             
             return WindowInfo(
-                title=title,
-                process_name=process_name,
-                icon=icon,
+                title=title or "Unknown Window",
+                process_name=self._get_process_name(process_id),
+                icon=None,
                 process_id=process_id
             )
         
@@ -163,17 +339,6 @@ class LinuxWindowMonitor(WindowMonitor):
         
         return 0
     
-    def _get_process_name(self, process_id: int) -> str:
-        """Get process name by process ID"""
-        if not PSUTIL_AVAILABLE or process_id == 0:
-            return "Unknown Process"
-        
-        try:
-            process = psutil.Process(process_id)
-            return process.name()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return "Unknown Process"
-    
     def _get_app_icon(self, process_name: str, process_id: int) -> Optional[QPixmap]:
         """
         Get application icon with caching.
@@ -185,11 +350,10 @@ class LinuxWindowMonitor(WindowMonitor):
         Returns:
             QPixmap icon or None
         """
-        # Check cache
-        cache_key = f"{process_name}_{process_id}"
-        if cache_key in self._icon_cache:
-            self._cache_access_count[cache_key] += 1
-            return self._icon_cache[cache_key]
+        # Check cache (keyed by name: a restarted application has the same icon)
+        pixmap = self._icon_cache.get(process_name)
+        if pixmap is not None:
+            return pixmap
         
         try:
             # Try to get icon from Qt icon theme
@@ -197,7 +361,7 @@ class LinuxWindowMonitor(WindowMonitor):
             if not icon.isNull():
                 pixmap = icon.pixmap(32, 32)
                 if not pixmap.isNull():
-                    self._cache_icon(cache_key, pixmap)
+                    self._icon_cache.put(process_name, pixmap)
                     return pixmap
         
         except Exception as e:
@@ -205,39 +369,86 @@ class LinuxWindowMonitor(WindowMonitor):
         
         return None
     
-    def _cache_icon(self, cache_key: str, icon: QPixmap) -> None:
-        """
-        Cache icon with LRU management.
-        
-        Args:
-            cache_key: Cache key
-            icon: Icon to cache
-        """
-        # Check cache size
-        if len(self._icon_cache) >= self._cache_max_size:
-            # Remove least used icon
-            least_used = min(
-                self._cache_access_count.items(),
-                key=lambda x: x[1]
-            )[0]
-            del self._icon_cache[least_used]
-            del self._cache_access_count[least_used]
-        
-        self._icon_cache[cache_key] = icon
-        self._cache_access_count[cache_key] = 1
-    
     def start_monitoring(self, callback: Callable[[WindowInfo], None]) -> None:
         """
-        Start monitoring with 200ms interval.
+        Start monitoring with X11 events, or with a 200ms polling interval as a fallback.
         
         Args:
             callback: Function to call when active window changes
         """
         self._callback = callback
+        x_display = self._open_display()
+        if x_display is not None:
+            self._watcher = X11ActiveWindowWatcher(x_display)
+            # Queued: the callback and icon lookup run in the GUI thread
+            self._watcher.window_changed.connect(
+                self._on_window_changed, Qt.ConnectionType.QueuedConnection
+            )
+            self._watcher.watch_failed.connect(
+                self._on_watch_failed, Qt.ConnectionType.QueuedConnection
+            )
+            self._watcher.start()
+            return
+        
+        self._start_polling()
+    
+    def _start_polling(self) -> None:
+        """Poll the active window with a 200ms interval"""
         self._timer = QTimer()
         self._timer.timeout.connect(self._check_active_window)
         self._timer.start(200)  # 200ms interval
     
+    def _on_watch_failed(self, error: str) -> None:
+        """
+        Fall back to polling when the X11 watcher loses its connection.
+        
+        Args:
+            error: Error that stopped the watcher
+        """
+        if self._watcher is None or self._callback is None:
+            return
+        self._logger.warning(f"X11 events lost, polling active window instead: {error}")
+        self._watcher.stop()
+        self._watcher = None
+        self._start_polling()
+    
+    def _open_display(self):
+        """Open an X connection for the event watcher, None if unavailable (no Xlib, Wayland)"""
+        if not XLIB_AVAILABLE or not os.environ.get('DISPLAY'):
+            return None
+        try:
+            return xdisplay.Display()
+        except Exception as e:
+            self._logger.warning(f"X11 events unavailable, polling active window instead: {e}")
+            return None
+    
+    def _on_window_changed(self, title: str, process_id: int) -> None:
+        """
+        Handle an active window change reported by the X11 watcher.
+        
+        Args:
+            title: Window title
+            process_id: Window process ID (0 if unknown)
+        """
+        try:
+            process_name = self._get_process_name(process_id)
+            if title == self._last_window_title and process_name == self._last_process_name:
+                return
+            
+            self._last_window_title = title
+            self._last_process_name = process_name
+            
+            if self._callback:
+                self._callback(WindowInfo(
+                    title=title,
+                    process_name=process_name,
+                    icon=self._get_app_icon(process_name, process_id),
+                    process_id=process_id
+                ))
+        
+        except Exception as e:
+            self._logger.error(f"Error handling active window change: {e}")
+    
     def _check_active_window(self) -> None:
         """Check active window and call callback on change"""
         try:
@@ -261,6 +472,9 @@ class LinuxWindowMonitor(WindowMonitor):
     
     def stop_monitoring(self) -> None:
         """Stop monitoring"""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
         if self._timer:
             self._timer.stop()
             self._timer = None
@@ -5,7 +5,7 @@ Provides macOS-specific implementation for monitoring active windows using AppKi
 """
 
 import logging
-from typing import Optional, Dict, Callable
+from typing import Optional, Callable
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QPixmap
 
@@ -31,13 +31,11 @@ class MacOSWindowMonitor(WindowMonitor):
         if not MACOS_AVAILABLE:
             raise ImportError("macOS window monitoring requires AppKit and Quartz (pyobjc)")
         
+        super().__init__()
         self._timer: Optional[QTimer] = None
         self._callback: Optional[Callable[[WindowInfo], None]] = None
-        self._icon_cache: Dict[str, QPixmap] = {}
         self._last_window_title: Optional[str] = None
         self._last_process_name: Optional[str] = None
-        self._cache_max_size = 50
-        self._cache_access_count: Dict[str, int] = {}
         self._logger = logging.getLogger(__name__)
         self._workspace = NSWorkspace.sharedWorkspace()
     
@@ -48,6 +46,23 @@ class MacOSWindowMonitor(WindowMonitor):
         Returns:
             WindowInfo if window is found, None on error
         """
+        target = self.get_active_window_target()
+        if target is None:
+            return None
+        
+        try:
+            target.icon = self._get_app_icon(target.process_name, target.process_id)
+        except Exception as e:
+            self._logger.error(f"Error getting window icon: {e}")
+        return target
+    
+    def get_active_window_target(self) -> Optional[WindowInfo]:
+        """
+        Get the current active window without its icon.
+        
+        Returns:
+            WindowInfo with icon=None if window is found, None on error
+        """
         try:
             # Get active application
             active_app = self._workspace.activeApplication()
@@ -63,13 +78,10 @@ class MacOSWindowMonitor(WindowMonitor):
             if not title:
                 title = process_name
             
-            # Get icon
-            icon = self._get_app_icon(process_name, process_id)
-            
             return WindowInfo(
                 title=title,
                 process_name=process_name,
-                icon=icon,
+                icon=None,
                 process_id=process_id
             )
         
@@ -118,11 +130,10 @@ class MacOSWindowMonitor(WindowMonitor):
         Returns:
             QPixmap icon or None
         """
-        # Check cache
-        cache_key = f"{process_name}_{process_id}"
-        if cache_key in self._icon_cache:
-            self._cache_access_count[cache_key] += 1
-            return self._icon_cache[cache_key]
+        # Check cache (keyed by name: a restarted application has the same icon)
+        pixmap = self._icon_cache.get(process_name)
+        if pixmap is not None:
+            return pixmap
         
         try:
             # Get running application
@@ -138,7 +149,7 @@ class MacOSWindowMonitor(WindowMonitor):
             # Convert NSImage to QPixmap
             pixmap = self._nsimage_to_qpixmap(ns_image)
             if pixmap:
-                self._cache_icon(cache_key, pixmap)
+                self._icon_cache.put(process_name, pixmap)
                 return pixmap
         
         except Exception as e:
@@ -175,27 +186,6 @@ class MacOSWindowMonitor(WindowMonitor):
             self._logger.warning(f"Error converting NSImage: {e}")
             return None
     
-    def _cache_icon(self, cache_key: str, icon: QPixmap) -> None:
-        """
-        Cache icon with LRU management.
-        
-        Args:
-            cache_key: Cache key
-            icon: Icon to cache
-        """
-        # Check cache size
-        if len(self._icon_cache) >= self._cache_max_size:
-            # Remove least used icon
-            least_used = min(
-                self._cache_access_count.items(),
-                key=lambda x: x[1]
-            )[0]
-            del self._icon_cache[least_used]
-            del self._cache_access_count[least_used]
-        
-        self._icon_cache[cache_key] = icon
-        self._cache_access_count[cache_key] = 1
-    
     def start_monitoring(self, callback: Callable[[WindowInfo], None]) -> None:
         """
         Start monitoring with 200ms interval.
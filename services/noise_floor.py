@@ -0,0 +1,195 @@
+"""
+Адаптивная оценка уровня фонового шума во время записи.
+
+Порог тишины из конфигурации один для любой комнаты: в шумной комнате
+шум выше порога и запись не останавливается, а в тихой тихие окончания
+фраз оказываются ниже порога и запись обрывается раньше времени.
+NoiseFloorEstimator калибруется по первым N мс записи и дальше
+непрерывно отслеживает нижний перцентиль RMS чанков. Перцентиль
+считается алгоритмом P² (Jain & Chlamtac) за O(1) памяти и времени на
+значение, без хранения и сортировки истории.
+"""
+
+from bisect import insort
+from typing import List, Optional
+
+
+class P2Quantile:
+    """
+    Инкрементальная оценка квантиля алгоритмом P².
+
+    Хранит пять маркеров (минимум, p/2, p, (1+p)/2 и максимум) и сдвигает
+    их параболической интерполяцией по мере поступления значений.
+    Первые пять значений хранятся как есть, и квантиль по ним точный.
+
+    Attributes:
+        p: Оцениваемый квантиль (0-1)
+        count: Количество полученных значений
+    """
+
+    def __init__(self, p: float):
+        """
+        Инициализирует оценку.
+
+        Args:
+            p: Оцениваемый квантиль (0-1)
+        """
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"Квантиль должен быть в интервале (0, 1): {p}")
+        self.p = p
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """
+        Добавляет значение.
+
+        Args:
+            value: Очередное наблюдение
+        """
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            insort(heights, value)
+            return
+
+        positions = self._positions
+        # Найти ячейку значения и сдвинуть позиции маркеров над ней
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Подвинуть средние маркеры к желаемым позициям
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Параболическая (P²) интерполяция высоты маркера i при сдвиге на step."""
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        """Текущая оценка квантиля (None до первого значения)."""
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return self._heights[int(self.p * (self.count - 1) + 0.5)]
+        return self._heights[2]
+
+
+class NoiseFloorEstimator:
+    """
+    Непрерывная оценка уровня фонового шума по RMS чанков.
+
+    Первые calibration_ms записи только собирают статистику, после этого
+    уровень шума (нижний перцентиль RMS) доступен и обновляется с каждым
+    чанком. Чтобы уровень следовал за изменением обстановки, перцентиль
+    считается по окнам window_seconds: оценка текущего окна плавно
+    заменяет оценку предыдущего по мере накопления значений.
+
+    Attributes:
+        calibration_ms: Длительность начальной калибровки в мс
+        percentile: Оцениваемый нижний перцентиль RMS (0-1)
+        window_seconds: Длина окна отслеживания в секундах
+        change_ratio: Относительное изменение уровня, о котором сообщает update
+        level: Текущий уровень шума (None до окончания калибровки)
+    """
+
+    def __init__(
+        self,
+        calibration_ms: int = 500,
+        percentile: float = 0.1,
+        window_seconds: float = 10.0,
+        change_ratio: float = 0.05
+    ):
+        """
+        Инициализирует оценку уровня шума.
+
+        Args:
+            calibration_ms: Длительность начальной калибровки в мс
+            percentile: Оцениваемый нижний перцентиль RMS (0-1)
+            window_seconds: Длина окна отслеживания в секундах
+            change_ratio: Относительное изменение уровня, о котором сообщает update
+        """
+        self.calibration_ms = calibration_ms
+        self.percentile = percentile
+        self.window_seconds = window_seconds
+        self.change_ratio = change_ratio
+        self.reset()
+
+    @property
+    def calibrated(self) -> bool:
+        """True после окончания начальной калибровки."""
+        return self.level is not None
+
+    def update(self, rms: float, timestamp: float) -> bool:
+        """
+        Учитывает RMS очередного чанка.
+
+        Args:
+            rms: RMS чанка (0.0 - 1.0)
+            timestamp: Время чанка в секундах
+
+        Returns:
+            True если уровень шума впервые определен или заметно изменился
+        """
+        if self._start_time is None:
+            self._start_time = self._window_start = timestamp
+
+        if timestamp - self._window_start >= self.window_seconds:
+            self._previous = self._current
+            self._current = P2Quantile(self.percentile)
+            self._window_start = timestamp
+        self._current.add(rms)
+
+        if self.level is None and (timestamp - self._start_time) * 1000 < self.calibration_ms:
+            return False
+
+        level = self._estimate()
+        if self.level is None or abs(level - self.level) > self.change_ratio * self.level:
+            self.level = level
+            return True
+        return False
+
+    def _estimate(self) -> float:
+        """Оценка перцентиля с плавным переходом от предыдущего окна к текущему."""
+        current = self._current.value
+        if self._previous is None or current is None:
+            return current if current is not None else self._previous.value
+        weight = min(1.0, self._current.count / self._previous.count)
+        return (1.0 - weight) * self._previous.value + weight * current
+
+    def reset(self) -> None:
+        """Сбрасывает оценку для новой записи."""
+        self.level: Optional[float] = None
+        self._current = P2Quantile(self.percentile)
+        self._previous: Optional[P2Quantile] = None
+        self._start_time: Optional[float] = None
+        self._window_start = 0.0
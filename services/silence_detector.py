@@ -3,18 +3,28 @@
 
 Детектор анализирует уровень громкости (RMS) аудио потока и определяет,
 когда наступает тишина достаточной длительности для остановки записи.
+Решение речь/тишина может приниматься самим детектором по порогу RMS
+или другим VAD бэкендом (services.voice_activity) через update_speech.
 """
 
 from typing import Optional, List
-import time
 
+import numpy as np
 
-class SilenceDetector:
+from services.noise_floor import NoiseFloorEstimator, P2Quantile
+from services.voice_activity import VoiceActivityDetector
+
+
+class SilenceDetector(VoiceActivityDetector):
     """
     Детектор тишины в аудио потоке.
     
     Анализирует RMS значения громкости и определяет моменты тишины
     с учетом адаптивного порога и debouncing для игнорирования коротких пауз.
+    Как VAD бэкенд классифицирует фреймы по тому же порогу RMS: речь
+    начинается после onset_frames громких фреймов подряд и удерживается
+    hangover_frames фреймов после них, поэтому одиночный щелчок клавиатуры
+    не сбрасывает отсчет тишины.
     
     Attributes:
         threshold: Базовый порог RMS для определения тишины
@@ -24,13 +34,21 @@ class SilenceDetector:
         background_noise_level: Уровень фонового шума для адаптивного порога
         last_speech_time: Время последнего обнаружения речи
         adaptive_multiplier: Множитель для адаптивного порога
+        noise_floor: Живая оценка уровня шума во время записи (None - только ручная калибровка)
+        min_threshold_ratio: Во сколько раз живая оценка может опустить базовый порог в тихой комнате
+        onset_frames: Сколько фреймов выше порога подряд нужно, чтобы началась речь
+        hangover_frames: Сколько фреймов удерживать речь после нее
     """
     
     def __init__(
         self,
         threshold: float = 0.02,
         silence_duration: float = 1.5,
-        min_speech_duration: float = 0.5
+        min_speech_duration: float = 0.5,
+        sample_rate: int = 16000,
+        noise_floor: Optional[NoiseFloorEstimator] = None,
+        onset_frames: int = 3,
+        hangover_frames: int = 5
     ):
         """
         Инициализирует детектор тишины.
@@ -39,7 +57,12 @@ class SilenceDetector:
             threshold: Базовый порог RMS для определения тишины (по умолчанию 0.02)
             silence_duration: Длительность тишины в секундах для срабатывания (по умолчанию 1.5)
             min_speech_duration: Минимальная длительность речи для debouncing (по умолчанию 0.5)
+            sample_rate: Частота дискретизации для покадровой классификации
+            noise_floor: Живая оценка уровня шума, которую кормит поток записи
+            onset_frames: Сколько фреймов выше порога подряд нужно, чтобы началась речь
+            hangover_frames: Сколько фреймов удерживать речь после нее
         """
+        super().__init__(sample_rate)
         self.threshold = threshold
         self.silence_duration = silence_duration
         self.min_speech_duration = min_speech_duration
@@ -48,6 +71,12 @@ class SilenceDetector:
         self.background_noise_level: float = 0.0
         self.last_speech_time: Optional[float] = None
         self.adaptive_multiplier: float = 2.0
+        self.noise_floor = noise_floor
+        self.min_threshold_ratio: float = 0.5
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self._run = 0
+        self._hangover = 0
         
         # Для отслеживания начала записи
         self._first_update = True
@@ -64,6 +93,20 @@ class SilenceDetector:
             rms: Текущее значение RMS громкости (0.0 - 1.0)
             timestamp: Временная метка в секундах
         
+        Returns:
+            True если обнаружена тишина достаточной длительности, иначе False
+        """
+        # Проверяем, является ли текущий уровень тишиной по адаптивному порогу
+        return self.update_speech(rms >= self._get_effective_threshold(), timestamp)
+    
+    def update_speech(self, is_speech: bool, timestamp: float) -> bool:
+        """
+        Обновляет состояние детектора по готовому решению VAD бэкенда.
+        
+        Args:
+            is_speech: Была ли речь с момента предыдущего обновления
+            timestamp: Временная метка в секундах
+        
         Returns:
             True если обнаружена тишина достаточной длительности, иначе False
         """
@@ -72,13 +115,7 @@ class SilenceDetector:
             self._recording_start_time = timestamp
             self._first_update = False
         
-        # Вычисляем адаптивный порог
-        effective_threshold = self._get_effective_threshold()
-        
-        # Проверяем, является ли текущий уровень тишиной
-        is_silent = rms < effective_threshold
-        
-        if is_silent:
+        if not is_speech:
             # Начинаем отсчет тишины, если еще не начали
             if self.silence_start_time is None:
                 self.silence_start_time = timestamp
@@ -116,8 +153,8 @@ class SilenceDetector:
         """
         Калибрует порог тишины на основе фонового шума.
         
-        Анализирует набор RMS значений и вычисляет средний уровень
-        фонового шума для адаптивного определения порога тишины.
+        Анализирует набор RMS значений и вычисляет уровень фонового
+        шума (нижний квартиль) для адаптивного определения порога тишины.
         
         Args:
             rms_samples: Список RMS значений для анализа фонового шума
@@ -125,16 +162,12 @@ class SilenceDetector:
         if not rms_samples:
             return
         
-        # Вычисляем средний уровень как фоновый шум
-        # Используем среднее значение нижних 50% значений
-        # чтобы исключить выбросы от речи
-        sorted_samples = sorted(rms_samples)
-        lower_half = sorted_samples[:len(sorted_samples) // 2]
-        
-        if lower_half:
-            self.background_noise_level = sum(lower_half) / len(lower_half)
-        else:
-            self.background_noise_level = sum(sorted_samples) / len(sorted_samples)
+        # Нижний квартиль отбрасывает выбросы от речи;
+        # считается инкрементально, без сортировки значений
+        quantile = P2Quantile(0.25)
+        for rms in rms_samples:
+            quantile.add(rms)
+        self.background_noise_level = quantile.value
     
     def reset(self) -> None:
         """
@@ -143,18 +176,67 @@ class SilenceDetector:
         Очищает все временные метки и счетчики, возвращая детектор
         в начальное состояние для новой записи.
         """
+        super().reset()
+        if self.noise_floor is not None:
+            self.noise_floor.reset()
         self.silence_start_time = None
         self.last_speech_time = None
         self._first_update = True
         self._recording_start_time = None
+        self._run = 0
+        self._hangover = 0
+    
+    def classify_frames(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Классифицирует фреймы по адаптивному порогу RMS.
+        
+        Args:
+            frames: Массив (n, frame_samples) сэмплов в диапазоне [-1, 1]
+        
+        Returns:
+            Массив bool длины n (True - речь)
+        """
+        rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frames.shape[1])
+        loud = rms >= self._get_effective_threshold()
+        
+        # Начало речи и удержание зависят от предыдущих фреймов
+        # (в том числе из прошлых чанков), поэтому считаются последовательно
+        result = np.empty(len(frames), dtype=bool)
+        run = self._run
+        hangover = self._hangover
+        for i, is_loud in enumerate(loud.tolist()):
+            if is_loud:
+                run += 1
+                # Короткий всплеск (щелчок, удар по столу) речь не начинает
+                if hangover > 0 or run >= self.onset_frames:
+                    hangover = self.hangover_frames
+                    result[i] = True
+                else:
+                    result[i] = False
+            else:
+                run = 0
+                result[i] = hangover > 0
+                hangover = max(0, hangover - 1)
+        self._run = run
+        self._hangover = hangover
+        return result
     
     def _get_effective_threshold(self) -> float:
         """
         Вычисляет эффективный порог с учетом фонового шума.
         
+        Живая оценка шума (после калибровки) задает порог в обе стороны:
+        в шумной комнате выше базового, в тихой - до min_threshold_ratio
+        от базового, чтобы тихие окончания фраз не считались тишиной.
+        
         Returns:
             Адаптивный порог тишины
         """
+        if self.noise_floor is not None and self.noise_floor.calibrated:
+            return max(
+                self.threshold * self.min_threshold_ratio,
+                self.noise_floor.level * self.adaptive_multiplier
+            )
         if self.background_noise_level > 0:
             # Адаптивный порог: фоновый шум * множитель
             adaptive_threshold = self.background_noise_level * self.adaptive_multiplier
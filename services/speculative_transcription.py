@@ -0,0 +1,240 @@
+"""
+Спекулятивная транскрипция во время записи.
+
+Обычно транскрипция начинается только после остановки записи, и задержка
+растет с длиной диктовки. В спекулятивном режиме запись делится на
+сегменты по паузам в речи (SilenceDetector с короткой длительностью
+паузы), и каждый закрытый сегмент сразу отправляется на транскрипцию
+в фоне, пока пользователь продолжает говорить. После остановки остается
+транскрибировать только последний сегмент.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from services.audio_encoder import encode_payload, resolve_upload_format
+from services.audio_payload import AudioPayload
+from services.chunked_transcription import PROVIDER_MAX_CONCURRENCY, stitch_transcripts
+from services.silence_detector import SilenceDetector
+from utils.audio_utils import contains_sound, trim_silence_pcm
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class PauseSegmenter:
+    """
+    Делит запись на сегменты по паузам в речи.
+
+    Сегмент закрывается, когда после речи наступает пауза длиной
+    pause_seconds. Точка разреза ставится в середину паузы, чтобы
+    конец последнего слова не попал в следующий сегмент.
+
+    Attributes:
+        detector: SilenceDetector с длительностью тишины pause_seconds
+        sample_rate: Частота дискретизации записи
+        segment_start: Индекс первого сэмпла текущего сегмента
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.02,
+        pause_seconds: float = 0.6,
+        min_segment_seconds: float = 1.0,
+        sample_rate: int = 16000
+    ):
+        """
+        Инициализирует сегментатор.
+
+        Args:
+            threshold: Порог RMS для определения тишины
+            pause_seconds: Длительность паузы, закрывающей сегмент
+            min_segment_seconds: Минимальная длина сегмента
+            sample_rate: Частота дискретизации записи
+        """
+        self.detector = SilenceDetector(
+            threshold=threshold,
+            silence_duration=pause_seconds,
+            min_speech_duration=0.0
+        )
+        self.sample_rate = sample_rate
+        self.segment_start = 0
+        self._pause_samples = int(pause_seconds * sample_rate)
+        self._min_segment_samples = int(min_segment_seconds * sample_rate)
+
+    def update(self, rms: float, timestamp: float, position: int) -> Optional[Tuple[int, int]]:
+        """
+        Обновляет состояние по текущему уровню громкости.
+
+        Args:
+            rms: Текущее значение RMS
+            timestamp: Временная метка в секундах
+            position: Количество записанных сэмплов
+
+        Returns:
+            (начало, конец) закрытого сегмента в сэмплах или None
+        """
+        pause_closed = self.detector.update(rms, timestamp)
+        # last_speech_time сбрасывается вместе с детектором - пауза без речи
+        # после предыдущего сегмента не закрывает новый
+        if not pause_closed or self.detector.last_speech_time is None:
+            return None
+
+        end = position - self._pause_samples // 2
+        if end - self.segment_start < self._min_segment_samples:
+            return None
+
+        segment = (self.segment_start, end)
+        self.segment_start = end
+        self.detector.reset()
+        return segment
+
+    def reset(self) -> None:
+        """Сбрасывает состояние для новой записи."""
+        self.segment_start = 0
+        self.detector.reset()
+
+
+class SpeculativeTranscriber:
+    """
+    Транскрибирует сегменты записи в фоне и собирает итоговый текст.
+
+    Клиент транскрипции создается при первом сегменте в рабочем потоке.
+    Сегменты отправляются параллельно (не больше лимита провайдера),
+    результаты собираются в порядке сегментов.
+
+    Attributes:
+        provider: Провайдер транскрипции
+        upload_format: Формат отправки (wav, flac, opus)
+        committed_frames: Сколько фреймов записи уже отправлено сегментами
+        removed_silence: Сколько секунд тишины удалено из сегментов
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        upload_format: str = "wav",
+        trim_threshold: Optional[float] = None,
+        padding_ms: int = 300,
+        silence_threshold: float = 0.02
+    ):
+        """
+        Инициализирует транскрайбер.
+
+        Args:
+            provider: Провайдер транскрипции
+            api_key: API ключ
+            base_url: Кастомный URL для API (для custom провайдера)
+            model: Модель транскрипции
+            upload_format: Формат из настройки audio.upload_format
+            trim_threshold: Порог обрезки тишины в сегментах (None - не обрезать)
+            padding_ms: Отступ при обрезке тишины
+            silence_threshold: Порог, ниже которого сегмент считается тишиной
+        """
+        self.provider = provider
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.upload_format = resolve_upload_format(provider, upload_format)
+        self.trim_threshold = trim_threshold
+        self.padding_ms = padding_ms
+        self.silence_threshold = silence_threshold
+
+        self.committed_frames = 0
+        self.removed_silence = 0.0
+        self._client = None
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=PROVIDER_MAX_CONCURRENCY.get(provider, 1),
+            thread_name_prefix="SpeculativeTranscriber"
+        )
+
+    @property
+    def client(self):
+        """TranscriptionClient, общий для всех сегментов (создается лениво)."""
+        with self._lock:
+            if self._client is None:
+                from services.transcription_client import TranscriptionClient
+                self._client = TranscriptionClient(
+                    provider=self.provider,
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    model=self.model
+                )
+            return self._client
+
+    @property
+    def submitted(self) -> int:
+        """Количество отправленных сегментов."""
+        return len(self._futures)
+
+    def submit(self, segment: AudioPayload) -> None:
+        """
+        Отправляет закрытый сегмент на транскрипцию в фоне.
+
+        Сегменты должны идти подряд с начала записи.
+
+        Args:
+            segment: Аудио сегмента
+        """
+        self.committed_frames += segment.n_frames
+        index = len(self._futures)
+        logger.info(f"Спекулятивная транскрипция сегмента {index + 1}: {segment.duration:.1f}с")
+        self._futures.append(self._executor.submit(self._transcribe_segment, segment))
+
+    def finish(self, recording: AudioPayload) -> str:
+        """
+        Транскрибирует остаток записи и собирает итоговый текст.
+
+        Args:
+            recording: Полная запись (остаток берется после committed_frames)
+
+        Returns:
+            Текст всех сегментов по порядку
+
+        Raises:
+            Exception: Ошибка транскрипции любого из сегментов
+        """
+        pcm = recording.load_pcm()
+        remainder = recording.with_pcm(pcm[self.committed_frames * recording.frame_size:])
+        if contains_sound(remainder.pcm, self.silence_threshold, remainder.channels, remainder.sample_width):
+            logger.info(f"Транскрипция последнего сегмента: {remainder.duration:.1f}с")
+            self._futures.append(self._executor.submit(self._transcribe_segment, remainder))
+        else:
+            logger.info("Последний сегмент без речи, не отправляется")
+
+        try:
+            texts = [future.result() for future in self._futures]
+        finally:
+            self._executor.shutdown(wait=False)
+
+        # Сегменты разрезаны в паузах и не перекрываются
+        return stitch_transcripts(texts, max_overlap_words=0)
+
+    def cancel(self) -> None:
+        """Отменяет ожидающие сегменты (запись отменена или не нужна)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _transcribe_segment(self, segment: AudioPayload) -> str:
+        """Обрезает тишину, кодирует и транскрибирует один сегмент."""
+        if self.trim_threshold is not None:
+            trimmed_pcm, removed = trim_silence_pcm(
+                segment.pcm,
+                segment.sample_rate,
+                threshold=self.trim_threshold,
+                padding_ms=self.padding_ms,
+                channels=segment.channels,
+                sample_width=segment.sample_width
+            )
+            if trimmed_pcm is not segment.pcm:
+                segment = segment.with_pcm(trimmed_pcm)
+                with self._lock:
+                    self.removed_silence += removed
+
+        upload = segment if self.upload_format == "wav" else encode_payload(segment, self.upload_format)
+        return self.client.transcribe_audio(upload)
@@ -0,0 +1,147 @@
+"""
+Потоковая запись WAV файла во время записи.
+
+Этот модуль реализует StreamingWavWriter - фоновый поток, который
+периодически дописывает новые сэмплы из AudioBuffer во временный WAV
+файл. При остановке записи остается дописать только последний хвост
+и исправить размеры в RIFF заголовке, поэтому задержка между остановкой
+и отправкой не зависит от длины записи. Сохраненные сэмплы освобождаются
+в буфере (AudioBuffer.release), и пиковое потребление памяти не растет.
+"""
+
+import os
+import threading
+import wave
+from typing import Optional
+
+from services.audio_buffer import AudioBuffer
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class StreamingWavWriter:
+    """
+    Инкрементальный писатель WAV файла из AudioBuffer.
+
+    Является единственным читателем буфера: забирает сэмплы
+    [written, len(buffer)) и после записи освобождает их.
+
+    Attributes:
+        filepath: Путь к WAV файлу
+        frames_written: Количество сэмплов, записанных в файл
+    """
+
+    def __init__(
+        self,
+        buffer: AudioBuffer,
+        filepath: str,
+        channels: int = 1,
+        flush_interval: float = 0.25
+    ):
+        """
+        Инициализирует писатель.
+
+        Args:
+            buffer: Буфер захвата, из которого читаются сэмплы
+            filepath: Путь к создаваемому WAV файлу
+            channels: Количество каналов
+            flush_interval: Интервал дозаписи в секундах
+        """
+        self.buffer = buffer
+        self.filepath = filepath
+        self.channels = channels
+        self.flush_interval = flush_interval
+        self.frames_written: int = 0
+
+        self._wav_file: Optional[wave.Wave_write] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def start(self) -> None:
+        """
+        Открывает файл, пишет заголовок и запускает фоновый поток.
+
+        Размеры в заголовке временно нулевые и исправляются в finish().
+        """
+        self._wav_file = wave.open(self.filepath, 'wb')
+        self._wav_file.setnchannels(self.channels)
+        self._wav_file.setsampwidth(2)
+        self._wav_file.setframerate(self.buffer.sample_rate)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="StreamingWavWriter",
+            daemon=True
+        )
+        self._thread.start()
+
+    def finish(self) -> str:
+        """
+        Останавливает поток, дописывает остаток и исправляет RIFF заголовок.
+
+        Returns:
+            Путь к готовому WAV файлу
+
+        Raises:
+            Exception: Ошибка записи, возникшая в фоновом потоке
+        """
+        self._join()
+
+        if self._error is not None:
+            self.abort()
+            raise self._error
+
+        self._flush()
+        # wave пересчитывает размеры RIFF/data чанков в заголовке при закрытии
+        self._wav_file.close()
+        self._wav_file = None
+        return self.filepath
+
+    def abort(self) -> None:
+        """
+        Останавливает запись и удаляет частично записанный файл.
+        """
+        self._join()
+
+        if self._wav_file is not None:
+            try:
+                self._wav_file.close()
+            except Exception:
+                pass
+            self._wav_file = None
+
+        try:
+            if os.path.exists(self.filepath):
+                os.remove(self.filepath)
+        except OSError as e:
+            logger.warning(f"Не удалось удалить частичный WAV файл {self.filepath}: {e}")
+
+    def _join(self) -> None:
+        """Останавливает фоновый поток и ждет его завершения."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Главный цикл фонового потока: дозапись с интервалом flush_interval."""
+        try:
+            while not self._stop_event.wait(self.flush_interval):
+                self._flush()
+        except Exception as e:
+            logger.error(f"Ошибка потоковой записи WAV: {e}")
+            self._error = e
+
+    def _flush(self) -> None:
+        """Дописывает в файл все новые сэмплы из буфера."""
+        end = len(self.buffer)
+        if end <= self.frames_written:
+            return
+
+        # writeframesraw не трогает заголовок - он исправляется один раз в finish()
+        self._wav_file.writeframesraw(self.buffer.as_bytes(self.frames_written, end))
+        self.frames_written = end
+        self.buffer.release(end)
@@ -7,7 +7,7 @@
 
 import os
 import shutil
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Optional, Union
 from pathlib import Path
 from openai import OpenAI, AuthenticationError, APIConnectionError, APITimeoutError, Timeout, NotFoundError, BadRequestError, RateLimitError
 
@@ -39,11 +39,28 @@ from utils.exceptions import (
     APITimeoutError as CustomAPITimeoutError,
     InvalidAPIKeyError
 )
+from services.api_client_pool import get_client_pool
+from services.audio_payload import AudioPayload
+from services.audio_encoder import EncodedAudio, encode_payload_async, resolve_upload_format
 from services.processing_coordinator import ProcessingCoordinator
 from services.formatting_module import FormattingModule
 from services.formatting_config import FormattingConfig
 
 
+# Endpoints постобработки текста (OpenAI-совместимые, кроме Z.AI)
+POST_PROCESSING_BASE_URLS = {
+    "groq": "https://api.groq.com/openai/v1/",
+    "openai": "https://api.openai.com/v1/",
+    "glm": "https://open.bigmodel.cn/api/paas/v4/",
+    "glm_coding_plan": "https://api.z.ai/api/coding/paas/v4/",
+    "zai": "https://api.z.ai/api/anthropic",
+}
+
+# Таймауты клиентов постобработки
+POST_PROCESSING_TIMEOUT = Timeout(60.0, connect=10.0)  # 60 секунд на запрос, 10 на подключение
+ZAI_TIMEOUT = 130.0  # Z.AI использует увеличенный таймаут
+
+
 class TranscriptionClient:
     """
     Универсальный клиент для транскрипции аудио.
@@ -110,10 +127,8 @@ class TranscriptionClient:
             self.timeout = 130.0  # Z.AI использует увеличенный таймаут
             
             try:
-                self.anthropic_client = Anthropic(
-                    api_key=api_key,
-                    base_url=self.base_url,
-                    timeout=self.timeout
+                self.anthropic_client = get_client_pool().get(
+                    Anthropic, self.provider, api_key, self.base_url, self.timeout
                 )
             except Exception as e:
                 raise APIError(
@@ -143,12 +158,11 @@ class TranscriptionClient:
         
         self.timeout = 30
         
-        # Создать OpenAI клиент для всех провайдеров кроме Z.AI
+        # OpenAI клиент для всех провайдеров кроме Z.AI - общий на процесс,
+        # чтобы соединения с API переиспользовались между диктовками
         try:
-            self.client = OpenAI(
-                api_key=api_key,
-                base_url=self.base_url,
-                timeout=self.timeout
+            self.client = get_client_pool().get(
+                OpenAI, self.provider, api_key, self.base_url, self.timeout
             )
         except Exception as e:
             raise APIError(
@@ -158,7 +172,7 @@ class TranscriptionClient:
                 error=str(e)
             )
     
-    def transcribe_audio(self, audio_file_path: str) -> str:
+    def transcribe_audio(self, audio_file_path: Union[str, AudioPayload, EncodedAudio]) -> str:
         """
         Отправляет аудио файл на транскрипцию и возвращает текст.
         
@@ -166,7 +180,9 @@ class TranscriptionClient:
         Z.AI может использоваться только для постобработки текста.
         
         Args:
-            audio_file_path: Путь к аудио файлу (WAV формат)
+            audio_file_path: Путь к аудио файлу (WAV формат), AudioPayload или
+                EncodedAudio (FLAC/Opus). Аудио в памяти отправляется как
+                файловый объект без записи на диск
         
         Returns:
             Транскрибированный текст
@@ -197,7 +213,10 @@ class TranscriptionClient:
             logger.info(f"Подготовка аудио файла: {audio_file_path}")
             
             # Подготовить аудио файл
-            audio_file = self._prepare_audio_file(audio_file_path)
+            if isinstance(audio_file_path, (AudioPayload, EncodedAudio)):
+                audio_file = audio_file_path.open_for_upload()
+            else:
+                audio_file = self._prepare_audio_file(audio_file_path)
             logger.info("Аудио файл открыт успешно")
             
             # Отправить запрос на транскрипцию
@@ -363,18 +382,18 @@ class TranscriptionClient:
             
             # Настроить base_url в зависимости от провайдера
             if provider == "groq":
-                base_url = "https://api.groq.com/openai/v1/"
+                base_url = POST_PROCESSING_BASE_URLS["groq"]
             elif provider == "openai":
-                base_url = "https://api.openai.com/v1/"
+                base_url = POST_PROCESSING_BASE_URLS["openai"]
             elif provider == "glm":
                 # GLM: выбор endpoint в зависимости от use_coding_plan
                 if use_coding_plan:
                     # Попробуем Coding Plan endpoint
-                    base_url = "https://api.z.ai/api/coding/paas/v4/"
+                    base_url = POST_PROCESSING_BASE_URLS["glm_coding_plan"]
                     logger.info("Используется GLM Coding Plan endpoint")
                     logger.warning("⚠️ Если запрос зависает, попробуйте отключить Coding Plan")
                 else:
-                    base_url = "https://open.bigmodel.cn/api/paas/v4/"
+                    base_url = POST_PROCESSING_BASE_URLS["glm"]
                     logger.info("Используется обычный GLM endpoint")
             elif provider == "zai":
                 # Z.AI использует Anthropic SDK
@@ -384,17 +403,14 @@ class TranscriptionClient:
                         parameter="anthropic SDK (pip install anthropic>=0.18.0)"
                     )
                 
-                base_url = "https://api.z.ai/api/anthropic"
+                base_url = POST_PROCESSING_BASE_URLS["zai"]
                 logger.info("Используется Z.AI endpoint через Anthropic SDK")
                 
-                # Создать Anthropic клиент для Z.AI
-                logger.info("Создание Anthropic клиента для Z.AI...")
-                anthropic_client = Anthropic(
-                    api_key=api_key,
-                    base_url=base_url,
-                    timeout=130.0  # Z.AI использует увеличенный таймаут
+                # Anthropic клиент для Z.AI из общего реестра
+                anthropic_client = get_client_pool().get(
+                    Anthropic, provider, api_key, base_url, ZAI_TIMEOUT
                 )
-                logger.info("Anthropic клиент создан успешно с таймаутом 130 секунд")
+                logger.info("Anthropic клиент получен (таймаут 130 секунд)")
                 
                 # Отправить запрос через Anthropic API
                 logger.info("Отправка запроса на постобработку через Anthropic API...")
@@ -469,14 +485,11 @@ class TranscriptionClient:
             if provider != "zai":
                 logger.info(f"Base URL: {base_url}")
                 
-                # Создать клиент для постобработки с жестким таймаутом
-                logger.info("Создание OpenAI клиента...")
-                client = OpenAI(
-                    api_key=api_key,
-                    base_url=base_url,
-                    timeout=Timeout(60.0, connect=10.0)  # 60 секунд на запрос, 10 на подключение
+                # Клиент для постобработки с жестким таймаутом из общего реестра
+                client = get_client_pool().get(
+                    OpenAI, provider, api_key, base_url, POST_PROCESSING_TIMEOUT
                 )
-                logger.info("Клиент создан успешно с таймаутом 60 секунд")
+                logger.info("OpenAI клиент получен (таймаут 60 секунд)")
                 
                 # Отправить запрос на обработку
                 logger.info("Отправка запроса на постобработку...")
@@ -840,27 +853,31 @@ class TranscriptionThread(QThread):
     transcription_model_not_found = pyqtSignal(str, str)  # Модель не найдена в транскрипции (model, provider)
     api_error = pyqtSignal(str, str, str)  # Ошибка API (error_type, error_message, provider)
     
-    def __init__(self, audio_file_path: str, provider: str = "openai", api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None, statistics_manager=None, state_manager=None):
+    def __init__(self, audio_file_path: Union[str, AudioPayload], provider: str = "openai", api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None, statistics_manager=None, state_manager=None, speculative=None):
         """
         Инициализирует поток транскрипции.
         
         Args:
-            audio_file_path: Путь к аудио файлу для транскрипции
+            audio_file_path: Путь к аудио файлу или AudioPayload с аудио в памяти
             provider: Провайдер AI (openai, groq, glm, custom)
             api_key: API ключ (опционально)
             base_url: Кастомный URL для API (для custom провайдера)
             model: Кастомная модель (для custom провайдера)
             statistics_manager: StatisticsManager для отслеживания статистики (опционально)
             state_manager: StateManager для manual format selection (опционально)
+            speculative: SpeculativeTranscriber с сегментами, отправленными во время записи (опционально)
         """
         super().__init__()
-        self.audio_file_path = audio_file_path
+        self.audio_payload = AudioPayload.coerce(audio_file_path)
+        # Путь есть только у payload, записанного на диск
+        self.audio_file_path = self.audio_payload.path
         self.provider = provider
         self.api_key = api_key
         self.base_url = base_url
         self.model = model
         self.statistics_manager = statistics_manager
         self.state_manager = state_manager
+        self.speculative = speculative
         self.transcription_client: Optional[TranscriptionClient] = None
     
     def run(self) -> None:
@@ -869,7 +886,7 @@ class TranscriptionThread(QThread):
         
         Создает GLMClient, отправляет аудио на транскрипцию
         и отправляет сигнал с результатом или ошибкой.
-        Удаляет временный файл после завершения.
+        Удаляет временный файл после завершения (если аудио было на диске).
         
         Requirements: 9.2
         """
@@ -879,53 +896,17 @@ class TranscriptionThread(QThread):
         transcribed_text = None
         
         try:
-            logger.info(f"TranscriptionThread.run() начат для файла: {self.audio_file_path}")
+            logger.info(f"TranscriptionThread.run() начат для аудио: {self.audio_payload}")
             logger.info(f"Провайдер: {self.provider}")
             
-            # Проверить настройку manual_stop и обрезать тишину если нужно
             from core.config import Config
-            config = Config.load_from_config()
-            
-            removed_silence_duration = 0.0
-            if config.manual_stop:
-                logger.info("Режим ручной остановки: обрезка тишины...")
-                from utils.audio_utils import trim_silence
-                self.audio_file_path, removed_silence_duration = trim_silence(
-                    self.audio_file_path, 
-                    threshold=config.silence_threshold,
-                    padding_ms=config.silence_padding
-                )
-                logger.info(f"Удалено тишины: {removed_silence_duration:.2f} секунд")
-                
-                # Track silence removal statistics if statistics_manager is available
-                if self.statistics_manager and removed_silence_duration > 0:
-                    logger.info(f"Отслеживание статистики удаления тишины: {removed_silence_duration:.2f}с")
-                    self.statistics_manager.track_silence_removal(removed_silence_duration)
+            config = Config.snapshot()
             
-            # Создать клиент транскрипции
-            logger.info(f"Создание TranscriptionClient для {self.provider}...")
-            logger.info(f"Параметры: api_key={'***' if self.api_key else 'None'}, base_url={self.base_url}, model={self.model}")
-            self.transcription_client = TranscriptionClient(
-                provider=self.provider, 
-                api_key=self.api_key,
-                base_url=self.base_url,
-                model=self.model
-            )
-            logger.info(f"TranscriptionClient создан успешно (модель: {self.transcription_client.model})")
-            
-            # Выполнить транскрипцию
-            logger.info("Начало транскрипции...")
-            try:
-                text = self.transcription_client.transcribe_audio(self.audio_file_path)
-                transcribed_text = text
-                logger.info(f"Транскрипция завершена: {text[:50]}...")
-            except NotFoundError as nf_error:
-                logger.error(f"❌ Модель транскрипции не найдена: {nf_error}")
-                logger.info("Отправка сигнала transcription_model_not_found для уведомления пользователя")
-                # Отправить специальный сигнал для уведомления
-                self.transcription_model_not_found.emit(self.transcription_client.model, self.provider)
-                # Пробросить ошибку дальше чтобы остановить обработку
-                raise
+            # Сегменты, отправленные во время записи, ждут только сборки
+            if self.speculative is not None:
+                transcribed_text = self._finish_speculative(logger)
+            if transcribed_text is None:
+                transcribed_text = self._transcribe(config, logger)
             
             # Отправить сигнал с результатом (сырой текст)
             # Форматирование и постобработка выполняются в отдельном потоке ProcessingThread
@@ -942,52 +923,188 @@ class TranscriptionThread(QThread):
         finally:
             # Удалить или сохранить временный файл в зависимости от настроек
             try:
-                if os.path.exists(self.audio_file_path):
-                    # Загрузить конфигурацию для проверки настройки
-                    from core.config import Config, get_audio_recordings_dir, get_transcriptions_dir
-                    from datetime import datetime
+                from core.config import Config, get_audio_recordings_dir, get_transcriptions_dir
+                from datetime import datetime
+                
+                has_file = bool(self.audio_file_path) and os.path.exists(self.audio_file_path)
+                config = Config.snapshot()
+                
+                if config.keep_recordings:
+                    # Создать имя файла с timestamp
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    base_filename = f"recording_{timestamp}"
                     
-                    config = Config.load_from_config()
+                    # Сохранить аудио файл в recordings/audio
+                    audio_dir = get_audio_recordings_dir()
+                    audio_filename = f"{base_filename}.wav"
+                    audio_dest_path = audio_dir / audio_filename
                     
-                    if config.keep_recordings:
-                        # Создать имя файла с timestamp
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        base_filename = f"recording_{timestamp}"
-                        
-                        # Сохранить аудио файл в recordings/audio
-                        audio_dir = get_audio_recordings_dir()
-                        audio_filename = f"{base_filename}.wav"
-                        audio_dest_path = audio_dir / audio_filename
-                        
+                    if self.audio_payload.path and self.audio_payload.path == self.audio_file_path and has_file:
                         # Переместить аудио файл
                         shutil.move(self.audio_file_path, str(audio_dest_path))
-                        logger.info(f"Запись сохранена: {audio_dest_path}")
-                        
-                        # Сохранить транскрипцию в recordings/transcriptions (если есть)
-                        if transcribed_text:
-                            transcriptions_dir = get_transcriptions_dir()
-                            transcription_filename = f"{base_filename}.txt"
-                            transcription_path = transcriptions_dir / transcription_filename
-                            
-                            # Записать текст в файл
-                            transcription_path.write_text(transcribed_text, encoding='utf-8')
-                            logger.info(f"Транскрипция сохранена: {transcription_path}")
                     else:
-                        # Удалить временный файл с повторными попытками
-                        import time
-                        max_attempts = 3
-                        for attempt in range(max_attempts):
-                            try:
-                                time.sleep(0.2 * (attempt + 1))  # Увеличивающаяся задержка: 0.2, 0.4, 0.6 сек
-                                os.remove(self.audio_file_path)
-                                logger.info(f"Временный файл удален: {self.audio_file_path}")
-                                break
-                            except PermissionError as pe:
-                                if attempt < max_attempts - 1:
-                                    logger.debug(f"Попытка {attempt + 1}/{max_attempts}: файл еще используется, ждем...")
-                                    continue
-                                else:
-                                    raise pe
+                        # Аудио в памяти - записать на диск только сейчас
+                        self.audio_payload.save(str(audio_dest_path))
+                        if has_file:
+                            os.remove(self.audio_file_path)
+                    logger.info(f"Запись сохранена: {audio_dest_path}")
+                    
+                    # Сохранить транскрипцию в recordings/transcriptions (если есть)
+                    if transcribed_text:
+                        transcriptions_dir = get_transcriptions_dir()
+                        transcription_filename = f"{base_filename}.txt"
+                        transcription_path = transcriptions_dir / transcription_filename
+                        
+                        # Записать текст в файл
+                        transcription_path.write_text(transcribed_text, encoding='utf-8')
+                        logger.info(f"Транскрипция сохранена: {transcription_path}")
+                elif has_file:
+                    # Удалить временный файл с повторными попытками
+                    import time
+                    max_attempts = 3
+                    for attempt in range(max_attempts):
+                        try:
+                            time.sleep(0.2 * (attempt + 1))  # Увеличивающаяся задержка: 0.2, 0.4, 0.6 сек
+                            os.remove(self.audio_file_path)
+                            logger.info(f"Временный файл удален: {self.audio_file_path}")
+                            break
+                        except PermissionError as pe:
+                            if attempt < max_attempts - 1:
+                                logger.debug(f"Попытка {attempt + 1}/{max_attempts}: файл еще используется, ждем...")
+                                continue
+                            else:
+                                raise pe
             except Exception as e:
                 # Игнорировать ошибки удаления/перемещения файла
                 logger.debug(f"Не удалось обработать временный файл: {e}")
+    
+    def _transcribe(self, config, logger) -> str:
+        """
+        Транскрибирует запись целиком: обрезка тишины, разбиение на части, отправка.
+        
+        Args:
+            config: Текущая конфигурация
+            logger: Логгер
+        
+        Returns:
+            Транскрибированный текст
+        """
+        # Проверить настройку manual_stop и обрезать тишину если нужно
+        removed_silence_duration = 0.0
+        if config.manual_stop:
+            logger.info("Режим ручной остановки: обрезка тишины...")
+            if self.audio_payload.in_memory:
+                # Обрезка в памяти - без чтения и перезаписи файла
+                from utils.audio_utils import trim_silence_pcm
+                trimmed_pcm, removed_silence_duration = trim_silence_pcm(
+                    self.audio_payload.pcm,
+                    self.audio_payload.sample_rate,
+                    threshold=config.silence_threshold,
+                    padding_ms=config.silence_padding,
+                    channels=self.audio_payload.channels,
+                    sample_width=self.audio_payload.sample_width
+                )
+                if trimmed_pcm is not self.audio_payload.pcm:
+                    # Новый payload, чтобы не менять аудио, на которое ссылается main
+                    self.audio_payload = self.audio_payload.with_pcm(trimmed_pcm)
+            else:
+                from utils.audio_utils import trim_silence
+                self.audio_file_path, removed_silence_duration = trim_silence(
+                    self.audio_file_path, 
+                    threshold=config.silence_threshold,
+                    padding_ms=config.silence_padding
+                )
+                # Заголовок файла изменился: длительность до обрезки больше не верна
+                self.audio_payload = AudioPayload.from_file(self.audio_file_path)
+            logger.info(f"Удалено тишины: {removed_silence_duration:.2f} секунд")
+            
+            # Track silence removal statistics if statistics_manager is available
+            if self.statistics_manager and removed_silence_duration > 0:
+                logger.info(f"Отслеживание статистики удаления тишины: {removed_silence_duration:.2f}с")
+                self.statistics_manager.track_silence_removal(removed_silence_duration)
+        
+        # Кодирование в сжатый формат идет в рабочем потоке,
+        # параллельно с созданием клиента
+        upload_format = resolve_upload_format(self.provider, getattr(config, "upload_format", "wav"))
+        
+        # Длинные записи режутся по паузам и транскрибируются параллельно
+        parts = [self.audio_payload]
+        silent_seams = []
+        chunk_max_seconds = getattr(config, "chunk_max_seconds", 0)
+        if isinstance(chunk_max_seconds, (int, float)) and chunk_max_seconds > 0:
+            from services.chunked_transcription import split_payload
+            parts, silent_seams = split_payload(
+                self.audio_payload,
+                chunk_max_seconds,
+                threshold=config.silence_threshold
+            )
+        
+        encode_future = None
+        if upload_format != "wav" and len(parts) == 1:
+            encode_future = encode_payload_async(self.audio_payload, upload_format)
+        
+        # Создать клиент транскрипции
+        logger.info(f"Создание TranscriptionClient для {self.provider}...")
+        logger.info(f"Параметры: api_key={'***' if self.api_key else 'None'}, base_url={self.base_url}, model={self.model}")
+        self.transcription_client = TranscriptionClient(
+            provider=self.provider, 
+            api_key=self.api_key,
+            base_url=self.base_url,
+            model=self.model
+        )
+        logger.info(f"TranscriptionClient создан успешно (модель: {self.transcription_client.model})")
+        
+        upload = self.audio_payload
+        if encode_future is not None:
+            try:
+                upload = encode_future.result()
+            except Exception as encode_error:
+                logger.warning(f"Не удалось закодировать аудио в {upload_format}, отправляем WAV: {encode_error}")
+        
+        # Выполнить транскрипцию
+        logger.info("Начало транскрипции...")
+        try:
+            if len(parts) > 1:
+                from services.chunked_transcription import ChunkedTranscriber
+                text = ChunkedTranscriber(
+                    self.transcription_client,
+                    self.provider,
+                    upload_format
+                ).transcribe(parts, silent_seams)
+            else:
+                text = self.transcription_client.transcribe_audio(upload)
+            logger.info(f"Транскрипция завершена: {text[:50]}...")
+            return text
+        except NotFoundError as nf_error:
+            logger.error(f"❌ Модель транскрипции не найдена: {nf_error}")
+            logger.info("Отправка сигнала transcription_model_not_found для уведомления пользователя")
+            # Отправить специальный сигнал для уведомления
+            self.transcription_model_not_found.emit(self.transcription_client.model, self.provider)
+            # Пробросить ошибку дальше чтобы остановить обработку
+            raise
+    
+    def _finish_speculative(self, logger) -> Optional[str]:
+        """
+        Собирает текст из сегментов, транскрибированных во время записи.
+        
+        Args:
+            logger: Логгер
+        
+        Returns:
+            Транскрибированный текст или None, если запись нужно
+            транскрибировать целиком (ошибка одного из сегментов)
+        """
+        logger.info(f"Спекулятивная транскрипция: {self.speculative.submitted} сегментов уже отправлено")
+        try:
+            text = self.speculative.finish(self.audio_payload)
+        except Exception as e:
+            logger.warning(f"Спекулятивная транскрипция не удалась, транскрибируем запись целиком: {e}")
+            return None
+        
+        self.transcription_client = self.speculative.client
+        removed = self.speculative.removed_silence
+        if self.statistics_manager and removed > 0:
+            logger.info(f"Отслеживание статистики удаления тишины: {removed:.2f}с")
+            self.statistics_manager.track_silence_removal(removed)
+        logger.info(f"Транскрипция завершена: {text[:50]}...")
+        return text
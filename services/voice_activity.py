@@ -0,0 +1,384 @@
+"""
+Определение речевой активности (VAD) по сырым PCM фреймам.
+
+Детектор тишины раньше сравнивал с порогом одно значение RMS, которое
+опрашивалось раз в 50 мс: короткие всплески терялись, а вентилятор или
+клавиатура считались речью. Здесь определен общий интерфейс VAD бэкенда,
+который классифицирует каждый фрейм (по умолчанию 20 мс) захваченного
+аудио, и шкала речи SpeechTimeline с точностью до фрейма.
+
+Реализации:
+- SilenceDetector (services.silence_detector) - порог RMS, как раньше
+- SpectralVAD - энергия в речевой полосе, спектральная плоскостность и
+  частота переходов через ноль с адаптивным уровнем шума (только CPU)
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Имена бэкендов для audio.vad_backend в config.jsonc
+VAD_BACKENDS = ("rms", "spectral")
+
+
+class VoiceActivityDetector(ABC):
+    """
+    Базовый класс VAD бэкенда.
+
+    Бэкенд получает чанки int16 сэмплов произвольной длины, режет их на
+    фреймы фиксированного размера (остаток переносится в следующий чанк)
+    и возвращает решение речь/не речь для каждого полного фрейма.
+    Сэмплы преобразуются в заранее выделенный буфер, поэтому callback
+    аудио потока не выделяет память на каждый чанк.
+
+    Attributes:
+        sample_rate: Частота дискретизации в Hz
+        frame_samples: Размер фрейма в сэмплах
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20):
+        """
+        Инициализирует бэкенд.
+
+        Args:
+            sample_rate: Частота дискретизации в Hz
+            frame_ms: Длительность фрейма в миллисекундах
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        # Начало буфера занимает остаток неполного фрейма из прошлого чанка
+        self._buffer = np.empty(0, dtype=np.float32)
+        self._pending = 0
+
+    @property
+    def frame_seconds(self) -> float:
+        """Длительность одного фрейма в секундах."""
+        return self.frame_samples / self.sample_rate
+
+    def process(self, samples: Union[bytes, memoryview, np.ndarray]) -> np.ndarray:
+        """
+        Классифицирует очередной чанк аудио.
+
+        Args:
+            samples: int16 сэмплы моно (bytes, memoryview или numpy view)
+
+        Returns:
+            Массив bool по одному значению на каждый завершенный фрейм
+        """
+        if not isinstance(samples, np.ndarray):
+            samples = np.frombuffer(samples, dtype=np.int16)
+        pending = self._pending
+        total = pending + len(samples)
+        if total > len(self._buffer):
+            # Буфер растет только при первом чанке или при росте размера чанка;
+            # остаток всегда короче фрейма, поэтому место под него есть
+            grown = np.empty(len(samples) + self.frame_samples, dtype=np.float32)
+            grown[:pending] = self._buffer[:pending]
+            self._buffer = grown
+        buffer = self._buffer
+        np.multiply(samples, np.float32(1.0 / 32768.0), out=buffer[pending:total])
+
+        n_frames = total // self.frame_samples
+        used = n_frames * self.frame_samples
+        flags = (
+            self.classify_frames(buffer[:used].reshape(n_frames, self.frame_samples))
+            if n_frames else np.zeros(0, dtype=bool)
+        )
+        # Остаток короче фрейма, поэтому не пересекается с местом назначения
+        self._pending = total - used
+        buffer[:self._pending] = buffer[used:total]
+        return flags
+
+    @abstractmethod
+    def classify_frames(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Классифицирует фреймы.
+
+        Фреймы - представление внутреннего буфера, которое перезаписывается
+        следующим чанком: сохранять их нельзя.
+
+        Args:
+            frames: Массив (n, frame_samples) сэмплов в диапазоне [-1, 1]
+
+        Returns:
+            Массив bool длины n (True - речь)
+        """
+
+    def reset(self) -> None:
+        """Сбрасывает состояние для новой записи."""
+        self._pending = 0
+
+
+class SpectralVAD(VoiceActivityDetector):
+    """
+    VAD по спектральным признакам фрейма.
+
+    Фрейм считается речью, если одновременно:
+    - энергия в речевой полосе выше адаптивного уровня шума на margin_db;
+    - большая часть энергии лежит в речевой полосе 250-4000 Hz
+      (гул вентилятора сосредоточен ниже);
+    - спектр в полосе неплоский (у голоса есть гармоники, у щелчков
+      клавиатуры и шипения спектр близок к плоскому);
+    - частота переходов через ноль ниже max_zcr (шипящий шум).
+
+    Речь начинается после onset_frames таких фреймов подряд, а после
+    речи решение удерживается hangover_frames фреймов, чтобы глухие
+    согласные и концы слов не разрывали речь.
+
+    Attributes:
+        margin_db: Превышение уровня шума для речи в dB
+        min_energy_db: Абсолютный минимум энергии речи в dBFS
+        min_band_ratio: Минимальная доля энергии в речевой полосе
+        max_flatness: Максимальная спектральная плоскостность речи
+        max_zcr: Максимальная частота переходов через ноль
+        onset_frames: Сколько фреймов подряд нужно, чтобы началась речь
+        hangover_frames: Сколько фреймов удерживать речь после нее
+        noise_floor_db: Текущий уровень шума в речевой полосе в dBFS
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        margin_db: float = 9.0,
+        min_energy_db: float = -50.0,
+        min_band_ratio: float = 0.5,
+        max_flatness: float = 0.4,
+        max_zcr: float = 0.3,
+        onset_frames: int = 2,
+        hangover_frames: int = 8,
+        noise_adapt: float = 0.1
+    ):
+        """
+        Инициализирует спектральный VAD.
+
+        Args:
+            sample_rate: Частота дискретизации в Hz
+            frame_ms: Длительность фрейма в миллисекундах
+            margin_db: Превышение уровня шума для речи в dB
+            min_energy_db: Абсолютный минимум энергии речи в dBFS
+            min_band_ratio: Минимальная доля энергии в полосе 250-4000 Hz
+            max_flatness: Максимальная спектральная плоскостность речи (0-1)
+            max_zcr: Максимальная доля переходов через ноль на сэмпл
+            onset_frames: Сколько фреймов подряд нужно, чтобы началась речь
+            hangover_frames: Сколько фреймов удерживать речь после нее
+            noise_adapt: Доля, на которую уровень шума догоняет энергию фрейма без речи
+        """
+        super().__init__(sample_rate, frame_ms)
+        self.margin_db = margin_db
+        self.min_energy_db = min_energy_db
+        self.min_band_ratio = min_band_ratio
+        self.max_flatness = max_flatness
+        self.max_zcr = max_zcr
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.noise_adapt = noise_adapt
+
+        self._window = np.hanning(self.frame_samples).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.frame_samples, 1.0 / sample_rate)
+        self._band = (freqs >= 250) & (freqs <= 4000)
+
+        self.noise_floor_db: float = min_energy_db
+        self._hangover = 0
+        self._run = 0
+
+    def features(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Вычисляет признаки фреймов.
+
+        Args:
+            frames: Массив (n, frame_samples) сэмплов в диапазоне [-1, 1]
+
+        Returns:
+            (энергия в dBFS, доля энергии в полосе, плоскостность, ZCR)
+        """
+        energy_db = 10.0 * np.log10(np.einsum('ij,ij->i', frames, frames) / frames.shape[1] + 1e-10)
+
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + 1e-12
+        band = power[:, self._band]
+        band_energy = band.sum(axis=1)
+        band_ratio = band_energy / power.sum(axis=1)
+        flatness = np.exp(np.log(band).mean(axis=1)) / (band_energy / band.shape[1])
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+
+        return energy_db, band_ratio, flatness, zcr
+
+    def classify_frames(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Классифицирует фреймы по спектральным признакам.
+
+        Args:
+            frames: Массив (n, frame_samples) сэмплов в диапазоне [-1, 1]
+
+        Returns:
+            Массив bool длины n (True - речь)
+        """
+        energy_db, band_ratio, flatness, zcr = self.features(frames)
+        voiced = (
+            (band_ratio >= self.min_band_ratio)
+            & (flatness <= self.max_flatness)
+            & (zcr <= self.max_zcr)
+            & (energy_db >= self.min_energy_db)
+        )
+
+        # Уровень шума, начало речи и удержание зависят от предыдущих
+        # фреймов, поэтому считаются последовательно (несколько фреймов на чанк)
+        result = np.empty(len(frames), dtype=bool)
+        floor = self.noise_floor_db
+        hangover = self._hangover
+        run = self._run
+        # Уровень шума отслеживается по энергии в речевой полосе:
+        # так низкочастотный гул почти не маскирует голос
+        band_db = energy_db + 10.0 * np.log10(band_ratio)
+        for i, energy in enumerate(band_db.tolist()):
+            if voiced[i] and energy >= floor + self.margin_db:
+                run += 1
+                # Одиночный фрейм вне речи (щелчок, всплеск гула) речь не начинает
+                if hangover > 0 or run >= self.onset_frames:
+                    hangover = self.hangover_frames
+                    result[i] = True
+                else:
+                    result[i] = False
+            else:
+                run = 0
+                # Уровень шума сразу опускается и плавно догоняет фон снизу.
+                # Во время речи и на тихих фреймах, похожих на голос, он
+                # растет медленнее, иначе уровень шума догонит саму речь
+                adapt = self.noise_adapt / 10 if voiced[i] or hangover > 0 else self.noise_adapt
+                floor = energy if energy < floor else floor + adapt * (energy - floor)
+                result[i] = hangover > 0
+                hangover = max(0, hangover - 1)
+            floor = max(floor, self.min_energy_db - self.margin_db)
+        self.noise_floor_db = floor
+        self._hangover = hangover
+        self._run = run
+        return result
+
+    def reset(self) -> None:
+        """Сбрасывает уровень шума и удержание для новой записи."""
+        super().reset()
+        self.noise_floor_db = self.min_energy_db
+        self._hangover = 0
+        self._run = 0
+
+
+class SpeechTimeline:
+    """
+    Шкала речи/не речи с точностью до фрейма.
+
+    Модель доступа как у AudioBuffer: один писатель (callback аудио
+    потока) и один читатель. Писатель сначала публикует массив, затем
+    длину, поэтому читатель, взявший длину, а затем массив, видит все
+    фреймы в пределах длины.
+
+    Attributes:
+        frame_samples: Размер фрейма в сэмплах
+        sample_rate: Частота дискретизации в Hz
+    """
+
+    def __init__(self, frame_samples: int, sample_rate: int = 16000, initial_frames: int = 4096):
+        """
+        Инициализирует шкалу.
+
+        Args:
+            frame_samples: Размер фрейма в сэмплах
+            sample_rate: Частота дискретизации в Hz
+            initial_frames: Начальная емкость в фреймах
+        """
+        self.frame_samples = frame_samples
+        self.sample_rate = sample_rate
+        self._flags = np.zeros(initial_frames, dtype=bool)
+        self._length = 0
+
+    def __len__(self) -> int:
+        """Возвращает количество фреймов."""
+        return self._length
+
+    def append(self, flags: np.ndarray) -> None:
+        """
+        Дописывает решения для очередных фреймов.
+
+        Args:
+            flags: Массив bool (True - речь)
+        """
+        count = len(flags)
+        if count == 0:
+            return
+        length = self._length
+        flags_array = self._flags
+        if length + count > len(flags_array):
+            grown = np.zeros(max(len(flags_array) * 2, length + count), dtype=bool)
+            grown[:length] = flags_array[:length]
+            flags_array = grown
+        flags_array[length:length + count] = flags
+        self._flags = flags_array
+        self._length = length + count
+
+    def flags(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """
+        Возвращает решения для фреймов [start, end) без копирования.
+
+        Args:
+            start: Индекс первого фрейма
+            end: Индекс за последним фреймом (по умолчанию - текущая длина)
+        """
+        length = self._length
+        flags = self._flags
+        if end is None or end > length:
+            end = length
+        return flags[start:end]
+
+    def has_speech(self, start: int = 0, end: Optional[int] = None) -> bool:
+        """Есть ли речь во фреймах [start, end)."""
+        return bool(self.flags(start, end).any())
+
+    def trailing_silence(self) -> float:
+        """Длительность тишины в конце шкалы в секундах."""
+        flags = self.flags()
+        speech = np.flatnonzero(flags)
+        silent_frames = len(flags) - (speech[-1] + 1 if len(speech) else 0)
+        return silent_frames * self.frame_samples / self.sample_rate
+
+    def segments(self) -> List[Tuple[int, int]]:
+        """
+        Возвращает участки речи.
+
+        Returns:
+            Список (начало, конец) участков речи в сэмплах
+        """
+        flags = self.flags().astype(np.int8)
+        edges = np.flatnonzero(np.diff(flags, prepend=0, append=0))
+        return [
+            (int(start) * self.frame_samples, int(end) * self.frame_samples)
+            for start, end in zip(edges[::2], edges[1::2])
+        ]
+
+    def clear(self) -> None:
+        """Очищает шкалу для новой записи."""
+        self._length = 0
+
+
+def create_vad_backend(name: str, silence_detector=None, sample_rate: int = 16000) -> Optional[VoiceActivityDetector]:
+    """
+    Создает VAD бэкенд по имени из конфигурации.
+
+    Args:
+        name: Имя бэкенда (rms, spectral)
+        silence_detector: SilenceDetector, используемый как бэкенд "rms"
+        sample_rate: Частота дискретизации в Hz
+
+    Returns:
+        Экземпляр бэкенда (None для "rms" без детектора)
+
+    Raises:
+        ValueError: Если имя бэкенда неизвестно
+    """
+    if name == "rms":
+        return silence_detector
+    if name == "spectral":
+        return SpectralVAD(sample_rate=sample_rate)
+    raise ValueError(f"Неизвестный VAD бэкенд: {name}")
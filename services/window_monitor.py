@@ -5,11 +5,23 @@ Provides abstract interface and factory for monitoring active windows across pla
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Callable
+from typing import Any, Callable, Dict, Hashable, Optional
 import platform
+import threading
+import time
 from PyQt6.QtGui import QPixmap
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+UNKNOWN_PROCESS = "Unknown Process"
+
 
 @dataclass
 class WindowInfo:
@@ -20,9 +32,174 @@ class WindowInfo:
     process_id: int
 
 
+class LRUCache:
+    """
+    Bounded least-recently-used cache with entry time-to-live.
+    
+    Safe to use from several threads (window lookups run off the GUI thread).
+    
+    Attributes:
+        max_size: Maximum number of entries
+        ttl: Entry lifetime in seconds (None if entries never expire)
+        hits: Number of lookups served from the cache
+        misses: Number of lookups that found no entry or an expired one
+    """
+    
+    def __init__(self, max_size: int, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries
+            ttl: Entry lifetime in seconds (None if entries never expire)
+            clock: Time source in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or self._clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry when full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0.0 before the first lookup)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with size, hits, misses and hit_rate
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or self._clock() < entry[1])
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class WindowMonitor(ABC):
     """Abstract base class for monitoring active windows"""
     
+    # Maximum number of cached process names and icons
+    CACHE_MAX_SIZE = 50
+    # Process IDs are reused by the OS, so cached names expire quickly
+    PROCESS_NAME_TTL = 60.0
+    # Icons only change when an application is updated
+    ICON_TTL = 600.0
+    
+    def __init__(self):
+        """Initialize the process name (pid -> name) and icon (name -> icon) caches"""
+        self._process_name_cache = LRUCache(self.CACHE_MAX_SIZE, self.PROCESS_NAME_TTL)
+        self._icon_cache = LRUCache(self.CACHE_MAX_SIZE, self.ICON_TTL)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get hit-rate counters of the process name and icon caches.
+        
+        Returns:
+            Dictionary with "process_names" and "icons" cache stats
+        """
+        return {
+            "process_names": self._process_name_cache.stats(),
+            "icons": self._icon_cache.stats(),
+        }
+    
+    def _get_process_name(self, process_id: int) -> str:
+        """
+        Get process name by process ID with caching.
+        
+        Args:
+            process_id: Process ID (0 if unknown)
+            
+        Returns:
+            Process name or "Unknown Process"
+        """
+        if not process_id:
+            return UNKNOWN_PROCESS
+        
+        process_name = self._process_name_cache.get(process_id)
+        if process_name is None:
+            process_name = self._query_process_name(process_id)
+            if process_name is None:
+                return UNKNOWN_PROCESS
+            self._process_name_cache.put(process_id, process_name)
+        return process_name
+    
+    def _query_process_name(self, process_id: int) -> Optional[str]:
+        """
+        Query process name from the OS.
+        
+        Args:
+            process_id: Process ID
+            
+        Returns:
+            Process name or None if the process is gone or inaccessible
+        """
+        if not PSUTIL_AVAILABLE:
+            return None
+        
+        try:
+            return psutil.Process(process_id).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    
     @abstractmethod
     def get_active_window_info(self) -> Optional[WindowInfo]:
         """
@@ -33,6 +210,22 @@ class WindowMonitor(ABC):
         """
         pass
     
+    def get_active_window_target(self) -> Optional[WindowInfo]:
+        """
+        Get the current active window without its icon.
+        
+        Unlike get_active_window_info() this creates no Qt objects and can be
+        called from a worker thread. Backends override it to skip the icon
+        lookup; the default drops the icon of get_active_window_info().
+        
+        Returns:
+            WindowInfo with icon=None if window is found, None on error
+        """
+        info = self.get_active_window_info()
+        if info is None:
+            return None
+        return WindowInfo(title=info.title, process_name=info.process_name, icon=None, process_id=info.process_id)
+    
     @abstractmethod
     def start_monitoring(self, callback: Callable[[WindowInfo], None]) -> None:
         """
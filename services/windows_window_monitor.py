@@ -5,7 +5,7 @@ Provides Windows-specific implementation for monitoring active windows using win
 """
 
 import logging
-from typing import Optional, Dict, Callable
+from typing import Optional, Callable, Tuple
 import win32gui
 import win32process
 import win32con
@@ -14,7 +14,7 @@ import psutil
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QPixmap, QImage
 
-from services.window_monitor import WindowMonitor, WindowInfo
+from services.window_monitor import UNKNOWN_PROCESS, WindowMonitor, WindowInfo
 
 
 class WindowsWindowMonitor(WindowMonitor):
@@ -22,13 +22,11 @@ class WindowsWindowMonitor(WindowMonitor):
     
     def __init__(self):
         """Initialize the Windows window monitor"""
+        super().__init__()
         self._timer: Optional[QTimer] = None
         self._callback: Optional[Callable[[WindowInfo], None]] = None
-        self._icon_cache: Dict[int, QPixmap] = {}
         self._last_window_handle: Optional[int] = None
         self._last_window_title: Optional[str] = None  # Добавлено для отслеживания изменений названия
-        self._cache_max_size = 50
-        self._cache_access_count: Dict[int, int] = {}
         self._logger = logging.getLogger(__name__)
     
     def get_active_window_info(self) -> Optional[WindowInfo]:
@@ -39,55 +37,81 @@ class WindowsWindowMonitor(WindowMonitor):
             WindowInfo if window is found, None on error
         """
         try:
-            # Get handle of active window
-            hwnd = win32gui.GetForegroundWindow()
-            if not hwnd:
+            foreground = self._get_foreground_window()
+            if foreground is None:
                 return None
-            
-            # Get window title
-            title = win32gui.GetWindowText(hwnd)
-            if not title:
-                title = "Unknown Window"
-            
-            # Get process ID
-            _, process_id = win32process.GetWindowThreadProcessId(hwnd)
-            
-            # Get process name
-            try:
-                process = psutil.Process(process_id)
-                process_name = process.name()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                process_name = "Unknown Process"
+            hwnd, info = foreground
             
             # Get icon (with caching)
-            icon = self._get_window_icon(hwnd, process_id)
-            
-            return WindowInfo(
-                title=title,
-                process_name=process_name,
-                icon=icon,
-                process_id=process_id
-            )
+            info.icon = self._get_window_icon(hwnd, info.process_id, info.process_name)
+            return info
         
         except Exception as e:
             self._logger.error(f"Error getting window info: {e}")
             return None
     
-    def _get_window_icon(self, hwnd: int, process_id: int) -> Optional[QPixmap]:
+    def get_active_window_target(self) -> Optional[WindowInfo]:
+        """
+        Get the current active window without its icon.
+        
+        Returns:
+            WindowInfo with icon=None if window is found, None on error
+        """
+        try:
+            foreground = self._get_foreground_window()
+            return foreground[1] if foreground is not None else None
+        
+        except Exception as e:
+            self._logger.error(f"Error getting window info: {e}")
+            return None
+    
+    def _get_foreground_window(self) -> Optional[Tuple[int, WindowInfo]]:
+        """
+        Read the foreground window handle, title and process.
+        
+        Returns:
+            (hwnd, WindowInfo with icon=None), None if there is no foreground window
+        """
+        # Get handle of active window
+        hwnd = win32gui.GetForegroundWindow()
+        if not hwnd:
+            return None
+        
+        # Get window title
+        title = win32gui.GetWindowText(hwnd)
+        if not title:
+            title = "Unknown Window"
+        
+        # Get process ID
+        _, process_id = win32process.GetWindowThreadProcessId(hwnd)
+        
+        return hwnd, WindowInfo(
+            title=title,
+            process_name=self._get_process_name(process_id),
+            icon=None,
+            process_id=process_id
+        )
+    
+    def _get_window_icon(self, hwnd: int, process_id: int, process_name: Optional[str] = None) -> Optional[QPixmap]:
         """
         Get window icon with caching.
         
         Args:
             hwnd: Window handle
-            process_id: Process ID for caching
+            process_id: Process ID
+            process_name: Process name for caching (looked up by process ID if not given)
             
         Returns:
             QPixmap icon or None if extraction fails
         """
-        # Check cache
-        if process_id in self._icon_cache:
-            self._cache_access_count[process_id] += 1
-            return self._icon_cache[process_id]
+        # Check cache (keyed by name: a restarted application has the same icon)
+        if process_name is None:
+            process_name = self._get_process_name(process_id)
+        cache_key = process_name if process_name != UNKNOWN_PROCESS else None
+        if cache_key is not None:
+            pixmap = self._icon_cache.get(cache_key)
+            if pixmap is not None:
+                return pixmap
         
         # Extract icon
         try:
@@ -104,7 +128,7 @@ class WindowsWindowMonitor(WindowMonitor):
                 # Convert HICON to QPixmap
                 pixmap = self._hicon_to_qpixmap(icon_handle)
                 if pixmap:
-                    self._cache_icon(process_id, pixmap)
+                    self._cache_icon(cache_key, pixmap)
                     return pixmap
             
             # Attempt 3: Extract icon from executable file
@@ -113,7 +137,7 @@ class WindowsWindowMonitor(WindowMonitor):
                 exe_path = process.exe()
                 pixmap = self._extract_icon_from_exe(exe_path)
                 if pixmap:
-                    self._cache_icon(process_id, pixmap)
+                    self._cache_icon(cache_key, pixmap)
                     return pixmap
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
@@ -192,26 +216,16 @@ class WindowsWindowMonitor(WindowMonitor):
         
         return None
     
-    def _cache_icon(self, process_id: int, icon: QPixmap) -> None:
+    def _cache_icon(self, cache_key: Optional[str], icon: QPixmap) -> None:
         """
-        Cache icon with LRU management.
+        Cache icon unless the process is unknown.
         
         Args:
-            process_id: Process ID to use as cache key
+            cache_key: Process name to use as cache key (None if unknown)
             icon: Icon to cache
         """
-        # Check cache size
-        if len(self._icon_cache) >= self._cache_max_size:
-            # Remove least used icon
-            least_used = min(
-                self._cache_access_count.items(), 
-                key=lambda x: x[1]
-            )[0]
-            del self._icon_cache[least_used]
-            del self._cache_access_count[least_used]
-        
-        self._icon_cache[process_id] = icon
-        self._cache_access_count[process_id] = 1
+        if cache_key is not None:
+            self._icon_cache.put(cache_key, icon)
     
     def start_monitoring(self, callback: Callable[[WindowInfo], None]) -> None:
         """
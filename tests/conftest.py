@@ -2,6 +2,11 @@
 Pytest configuration and fixtures for RapidWhisper tests.
 """
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
 from hypothesis import settings, HealthCheck
 
 # Configure Hypothesis for property-based testing
@@ -15,3 +20,37 @@ settings.register_profile(
 
 # Load the profile
 settings.load_profile("rapidwhisper")
+
+
+class KeepAliveApiHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible endpoint that keeps connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._reply(404)
+
+    def do_GET(self):
+        self._reply(200, json.dumps({"object": "list", "data": []}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_api():
+    """Base URL of a local keep-alive API server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,159 @@
+"""
+Unit-тесты для общего реестра клиентов API.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openai import OpenAI, Timeout
+
+from services import api_client_pool
+from services.api_client_pool import ApiClientPool
+
+
+class TestApiClientPool:
+    """Тесты реестра клиентов."""
+
+    def test_same_key_returns_same_client(self):
+        pool = ApiClientPool()
+        client_class = MagicMock()
+
+        first = pool.get(client_class, "groq", "key", "https://api.groq.com/openai/v1/", 30)
+        second = pool.get(client_class, "groq", "key", "https://api.groq.com/openai/v1/", 30)
+
+        assert first is second
+        client_class.assert_called_once()
+        kwargs = client_class.call_args.kwargs
+        assert (kwargs["api_key"], kwargs["base_url"], kwargs["timeout"]) == ("key", "https://api.groq.com/openai/v1/", 30)
+        assert pool.stats()["client_hits"] == 1
+        assert pool.stats()["client_misses"] == 1
+
+    def test_different_key_or_timeout_creates_new_client(self):
+        pool = ApiClientPool()
+        client_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+
+        a = pool.get(client_class, "openai", "key1", "https://api.openai.com/v1/", 30)
+        b = pool.get(client_class, "openai", "key2", "https://api.openai.com/v1/", 30)
+        c = pool.get(client_class, "openai", "key1", "https://api.openai.com/v1/", 60)
+
+        assert len({id(a), id(b), id(c)}) == 3
+
+    def test_timeout_objects_are_compared_by_value(self):
+        pool = ApiClientPool()
+        client_class = MagicMock()
+
+        first = pool.get(client_class, "groq", "key", None, Timeout(60.0, connect=10.0))
+        second = pool.get(client_class, "groq", "key", None, Timeout(60.0, connect=10.0))
+
+        assert first is second
+
+    @pytest.mark.skipif(not api_client_pool.HTTPX_AVAILABLE, reason="httpx не установлен")
+    def test_clients_keep_idle_connections_long(self):
+        pool = ApiClientPool()
+        client_class = MagicMock()
+
+        with patch.object(api_client_pool.httpx, "Client") as http_client_class:
+            pool.get(client_class, "groq", "key", None, 30)
+
+        assert client_class.call_args.kwargs["http_client"] is http_client_class.return_value
+        limits = http_client_class.call_args.kwargs["limits"]
+        assert limits.keepalive_expiry == api_client_pool.KEEPALIVE_EXPIRY
+        assert pool.keepalive_expiry == api_client_pool.KEEPALIVE_EXPIRY
+
+    def test_invalidate_drops_clients(self):
+        pool = ApiClientPool()
+        client_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+
+        first = pool.get(client_class, "groq", "key", None, 30)
+        pool.invalidate()
+        second = pool.get(client_class, "groq", "key", None, 30)
+
+        assert first is not second
+        assert pool.stats()["invalidations"] == 1
+        assert pool.stats()["clients"] == 1
+
+    def test_dropped_clients_are_closed_on_next_invalidate(self):
+        pool = ApiClientPool()
+        client_class = MagicMock(side_effect=lambda **kwargs: MagicMock())
+
+        first = pool.get(client_class, "groq", "key", None, 30)
+        pool.invalidate()
+        # Запрос, начатый до сброса, может еще выполняться
+        first.close.assert_not_called()
+
+        second = pool.get(client_class, "groq", "key", None, 30)
+        pool.invalidate()
+        first.close.assert_called_once()
+        second.close.assert_not_called()
+
+        pool.close()
+        second.close.assert_called_once()
+
+    def test_invalidate_forgets_connection_state(self, local_api):
+        pool = ApiClientPool()
+        client = pool.get(OpenAI, "custom", "key", local_api, 5.0)
+        pool.prewarm(client, local_api)
+        assert pool.last_used(client) is not None
+
+        pool.invalidate()
+
+        assert pool.last_used(client) is None
+        assert pool._warm_connections == {}
+
+    def test_connections_are_reused_between_requests(self, local_api):
+        """Повторные запросы идут по уже открытому keep-alive соединению."""
+        pool = ApiClientPool()
+
+        for _ in range(3):
+            client = pool.get(OpenAI, "custom", "key", local_api, 5.0)
+            client.models.list()
+
+        stats = pool.stats()
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 2
+        assert stats["client_hits"] == 2
+
+
+class TestGetClientPool:
+    """Тесты общего экземпляра реестра."""
+
+    def test_concurrent_callers_share_one_pool(self, monkeypatch):
+        monkeypatch.setattr(api_client_pool, "_client_pool_instance", None)
+        original_init = ApiClientPool.__init__
+
+        def slow_init(self):
+            time.sleep(0.05)
+            original_init(self)
+
+        pools = []
+        with patch.object(ApiClientPool, "__init__", slow_init):
+            threads = [
+                threading.Thread(target=lambda: pools.append(api_client_pool.get_client_pool()))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(pools) == 4
+        assert all(pool is pools[0] for pool in pools)
+
+
+class TestTranscriptionClientUsesPool:
+    """Тесты использования реестра в TranscriptionClient."""
+
+    def test_clients_are_shared_between_instances(self):
+        from services import transcription_client
+
+        pool = ApiClientPool()
+        with patch.object(transcription_client, "get_client_pool", return_value=pool), \
+                patch.object(transcription_client, "OpenAI") as mock_openai:
+            first = transcription_client.TranscriptionClient(provider="groq", api_key="key")
+            second = transcription_client.TranscriptionClient(provider="groq", api_key="key")
+
+        assert first.client is second.client
+        mock_openai.assert_called_once()
@@ -0,0 +1,133 @@
+"""
+Unit-тесты для AudioBuffer.
+
+Тестирует предвыделенный буфер захвата: запись чанков, рост емкости
+и чтение срезов без копирования.
+"""
+
+import wave
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from services.audio_buffer import AudioBuffer
+
+
+class TestAudioBuffer:
+    """Тесты базового поведения AudioBuffer."""
+
+    def test_initial_state(self):
+        """Новый буфер пуст и имеет предвыделенную емкость."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=1.0)
+
+        assert len(buffer) == 0
+        assert buffer.nbytes == 0
+        assert buffer.chunk_count == 0
+        assert buffer.capacity == 16000
+
+    def test_write_does_not_reallocate_within_capacity(self):
+        """Запись в пределах емкости не меняет нижележащий массив."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=1.0)
+        backing = buffer._data
+        chunk = np.arange(1024, dtype=np.int16).tobytes()
+
+        for _ in range(10):
+            buffer.write(chunk)
+
+        assert buffer._data is backing
+        assert len(buffer) == 10240
+        assert buffer.chunk_count == 10
+
+    def test_grow_preserves_data(self):
+        """При переполнении буфер растет и сохраняет записанные данные."""
+        buffer = AudioBuffer(sample_rate=100, initial_seconds=1.0)
+        chunks = [np.full(64, i, dtype=np.int16) for i in range(5)]
+
+        for chunk in chunks:
+            buffer.write(chunk.tobytes())
+
+        assert buffer.capacity >= 320
+        np.testing.assert_array_equal(buffer.samples(), np.concatenate(chunks))
+
+    def test_views_are_zero_copy(self):
+        """samples() и as_bytes() возвращают view на данные буфера."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=1.0)
+        buffer.write(np.array([1, 2, 3, 4], dtype=np.int16).tobytes())
+
+        view = buffer.samples(1, 3)
+        assert np.shares_memory(view, buffer._data)
+        np.testing.assert_array_equal(view, [2, 3])
+        np.testing.assert_array_equal(buffer.tail(2), [3, 4])
+        assert bytes(buffer.as_bytes()) == np.array([1, 2, 3, 4], dtype=np.int16).tobytes()
+
+    def test_old_view_survives_growth(self):
+        """View, полученный до расширения, содержит прежние сэмплы."""
+        buffer = AudioBuffer(sample_rate=4, initial_seconds=1.0)
+        buffer.write(np.array([1, 2, 3], dtype=np.int16).tobytes())
+        view = buffer.samples()
+
+        buffer.write(np.array([4, 5, 6], dtype=np.int16).tobytes())
+
+        np.testing.assert_array_equal(view, [1, 2, 3])
+        np.testing.assert_array_equal(buffer.samples(), [1, 2, 3, 4, 5, 6])
+
+    def test_clear_resets_length_and_shrinks(self):
+        """clear() сбрасывает данные и возвращает начальную емкость."""
+        buffer = AudioBuffer(sample_rate=10, initial_seconds=1.0)
+        buffer.write(np.zeros(100, dtype=np.int16).tobytes())
+        assert buffer.capacity >= 100
+
+        buffer.clear()
+
+        assert len(buffer) == 0
+        assert buffer.chunk_count == 0
+        assert buffer.capacity == 10
+
+    def test_duration(self):
+        """Длительность вычисляется по количеству сэмплов."""
+        buffer = AudioBuffer(sample_rate=16000)
+        buffer.write(np.zeros(8000, dtype=np.int16).tobytes())
+
+        assert buffer.duration == 0.5
+
+    def test_as_bytes_writes_valid_wav(self, tmp_path):
+        """memoryview из as_bytes() можно передать напрямую в wave."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=0.1)
+        for _ in range(4):
+            buffer.write(np.ones(1024, dtype=np.int16).tobytes())
+
+        path = tmp_path / "buffer.wav"
+        with wave.open(str(path), 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(buffer.as_bytes())
+
+        with wave.open(str(path), 'rb') as wav_file:
+            assert wav_file.getnframes() == 4096
+
+
+class TestAudioBufferProperties:
+    """Property-based тесты для AudioBuffer."""
+
+    @given(st.lists(
+        st.lists(st.integers(min_value=-32768, max_value=32767), max_size=300),
+        max_size=20
+    ))
+    @settings(max_examples=100, deadline=None)
+    def test_property_contents_equal_concatenation(self, chunks):
+        """
+        Property: содержимое буфера равно конкатенации записанных чанков
+        независимо от количества расширений.
+        """
+        buffer = AudioBuffer(sample_rate=50, initial_seconds=1.0)
+        arrays = [np.array(chunk, dtype=np.int16) for chunk in chunks]
+
+        for array in arrays:
+            buffer.write(array.tobytes())
+
+        expected = np.concatenate(arrays) if arrays else np.array([], dtype=np.int16)
+        np.testing.assert_array_equal(buffer.samples(), expected)
+        assert buffer.chunk_count == len(chunks)
+        assert buffer.nbytes == expected.nbytes
@@ -0,0 +1,106 @@
+"""
+Unit-тесты для кодирования аудио перед отправкой (audio.upload_format).
+"""
+
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from services import audio_encoder
+from services.audio_encoder import (
+    EncodedAudio,
+    encode_payload,
+    encode_payload_async,
+    resolve_upload_format,
+)
+from services.audio_payload import AudioPayload
+
+
+def _speech_like_payload(seconds: float = 2.0) -> AudioPayload:
+    sample_rate = 16000
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    samples = (np.sin(2 * np.pi * 220 * t) * 8000).astype(np.int16)
+    return AudioPayload(pcm=samples.tobytes(), sample_rate=sample_rate)
+
+
+class TestResolveUploadFormat:
+    """Тесты выбора формата по таблице возможностей провайдеров."""
+
+    def test_wav_is_always_allowed(self):
+        assert resolve_upload_format("glm", "wav") == "wav"
+
+    def test_unknown_format_falls_back_to_wav(self):
+        assert resolve_upload_format("openai", "mp3") == "wav"
+
+    def test_non_string_falls_back_to_wav(self):
+        assert resolve_upload_format("openai", None) == "wav"
+
+    def test_provider_without_support_falls_back_to_wav(self):
+        with patch.object(audio_encoder, "SOUNDFILE_AVAILABLE", True):
+            assert resolve_upload_format("glm", "flac") == "wav"
+            assert resolve_upload_format("zai", "flac") == "wav"
+
+    def test_supported_format_is_kept(self):
+        with patch.object(audio_encoder, "SOUNDFILE_AVAILABLE", True):
+            assert resolve_upload_format("groq", "FLAC") == "flac"
+            assert resolve_upload_format("openai", "ogg") == "opus"
+            assert resolve_upload_format("custom", "opus") == "opus"
+
+    def test_missing_encoder_falls_back_to_wav(self):
+        with patch.object(audio_encoder, "SOUNDFILE_AVAILABLE", False):
+            assert resolve_upload_format("groq", "flac") == "wav"
+
+
+class TestEncodePayload:
+    """Тесты кодирования."""
+
+    def test_wav_encoding_matches_payload(self):
+        payload = _speech_like_payload(0.5)
+
+        encoded = encode_payload(payload, "wav")
+
+        assert encoded.filename == "audio.wav"
+        assert encoded.data[:4] == b"RIFF"
+        assert len(encoded.data) == encoded.source_bytes
+
+    @pytest.mark.skipif(not audio_encoder.SOUNDFILE_AVAILABLE, reason="soundfile is not installed")
+    def test_flac_is_lossless_and_smaller(self):
+        import soundfile
+
+        payload = _speech_like_payload()
+
+        encoded = encode_payload(payload, "flac")
+
+        assert encoded.filename == "audio.flac"
+        assert encoded.bytes_saved > 0
+        decoded, rate = soundfile.read(io.BytesIO(encoded.data), dtype="int16")
+        assert rate == 16000
+        np.testing.assert_array_equal(decoded, np.frombuffer(payload.pcm, dtype=np.int16))
+
+    @pytest.mark.skipif(not audio_encoder.SOUNDFILE_AVAILABLE, reason="soundfile is not installed")
+    def test_opus_uses_ogg_container(self):
+        payload = _speech_like_payload()
+
+        encoded = encode_payload(payload, "opus")
+
+        assert encoded.filename == "audio.ogg"
+        assert encoded.data[:4] == b"OggS"
+        assert len(encoded.data) < encoded.source_bytes / 4
+
+    def test_async_encoding_returns_future(self):
+        payload = _speech_like_payload(0.5)
+
+        encoded = encode_payload_async(payload, "wav").result(timeout=5)
+
+        assert isinstance(encoded, EncodedAudio)
+        assert encoded.duration == pytest.approx(0.5)
+
+    def test_open_for_upload_is_named(self):
+        encoded = EncodedAudio(b"data", "flac", "audio.flac", 100, 0.0, 1.0)
+
+        upload = encoded.open_for_upload()
+
+        assert upload.name == "audio.flac"
+        assert upload.read() == b"data"
@@ -40,7 +40,7 @@ class TestAudioEngineInitialization:
         
         # Проверить начальное состояние
         assert engine.is_recording is False, "Запись не должна быть активна"
-        assert engine.audio_buffer == [], "Буфер должен быть пустым"
+        assert len(engine.audio_buffer) == 0, "Буфер должен быть пустым"
         assert engine.stream is None, "Поток должен быть None"
         assert engine.pyaudio_instance is None, "PyAudio instance должен быть None"
 
@@ -94,13 +94,13 @@ class TestAudioEngineRecording:
         mock_pyaudio_class.return_value = mock_pyaudio
         
         engine = AudioEngine()
-        engine.audio_buffer = [b'old_data']
+        engine.audio_buffer.write(b'old_data')
         engine._current_rms = 0.5
         
         engine.start_recording()
         
         # Проверить что буфер был очищен
-        assert engine.audio_buffer == []
+        assert len(engine.audio_buffer) == 0
         assert engine._current_rms == 0.0
     
     @patch('pyaudio.PyAudio')
@@ -162,7 +162,7 @@ class TestAudioEngineStopRecording:
         
         # Добавить достаточно данных (1 секунда)
         sample_data = np.zeros(16000, dtype=np.int16).tobytes()
-        engine.audio_buffer = [sample_data]
+        engine.audio_buffer.write(sample_data)
         
         # Остановить запись
         filepath = engine.stop_recording()
@@ -203,7 +203,7 @@ class TestAudioEngineStopRecording:
         engine.start_recording()
         
         # Буфер остается пустым
-        engine.audio_buffer = []
+        engine.audio_buffer.clear()
         
         with pytest.raises(EmptyRecordingError):
             engine.stop_recording()
@@ -226,7 +226,7 @@ class TestAudioEngineStopRecording:
         
         # Добавить очень короткую запись (0.1 секунды)
         short_data = np.zeros(1600, dtype=np.int16).tobytes()
-        engine.audio_buffer = [short_data]
+        engine.audio_buffer.write(short_data)
         
         with pytest.raises(RecordingTooShortError) as exc_info:
             engine.stop_recording()
@@ -326,8 +326,8 @@ class TestAudioEngineCallback:
         result = engine._audio_callback(test_data, 1024, {}, 0)
         
         # Проверить что данные добавлены в буфер
-        assert len(engine.audio_buffer) == 1
-        assert engine.audio_buffer[0] == test_data
+        assert engine.audio_buffer.chunk_count == 1
+        assert bytes(engine.audio_buffer.as_bytes()) == test_data
         
         # Проверить возвращаемое значение
         assert result == (test_data, pyaudio.paContinue)
@@ -375,7 +375,7 @@ class TestAudioEngineCleanup:
         engine.start_recording()
         
         # Добавить данные в буфер
-        engine.audio_buffer = [b'test_data']
+        engine.audio_buffer.write(b'test_data!')
         engine._current_rms = 0.5
         
         # Очистить ресурсы
@@ -388,7 +388,7 @@ class TestAudioEngineCleanup:
         
         # Проверить что состояние сброшено
         assert engine.is_recording is False
-        assert engine.audio_buffer == []
+        assert len(engine.audio_buffer) == 0
         assert engine._current_rms == 0.0
     
     def test_cleanup_when_not_recording(self):
@@ -403,7 +403,7 @@ class TestAudioEngineCleanup:
         engine.cleanup()  # Не должно вызвать ошибку
         
         assert engine.is_recording is False
-        assert engine.audio_buffer == []
+        assert len(engine.audio_buffer) == 0
 
 
 class TestAudioEngineSaveToWav:
@@ -419,7 +419,7 @@ class TestAudioEngineSaveToWav:
         
         # Создать тестовые данные (1 секунда)
         sample_data = np.zeros(16000, dtype=np.int16).tobytes()
-        engine.audio_buffer = [sample_data]
+        engine.audio_buffer.write(sample_data)
         
         # Сохранить в файл
         filepath = tmp_path / "test_audio.wav"
@@ -447,7 +447,8 @@ class TestAudioEngineSaveToWav:
         chunk1 = np.zeros(1024, dtype=np.int16).tobytes()
         chunk2 = np.ones(1024, dtype=np.int16).tobytes()
         chunk3 = np.full(1024, 100, dtype=np.int16).tobytes()
-        engine.audio_buffer = [chunk1, chunk2, chunk3]
+        for chunk in (chunk1, chunk2, chunk3):
+            engine.audio_buffer.write(chunk)
         
         # Сохранить в файл
         filepath = tmp_path / "test_multi_chunk.wav"
@@ -669,7 +670,7 @@ class TestAudioEngineBufferGrowthProperties:
             engine._audio_callback(chunk, len(chunk) // 2, {}, 0)
             
             # Получить текущий размер буфера
-            current_buffer_size = len(engine.audio_buffer)
+            current_buffer_size = engine.audio_buffer.chunk_count
             
             # Проверить что размер буфера увеличился
             assert current_buffer_size > previous_buffer_size, \
@@ -686,9 +687,9 @@ class TestAudioEngineBufferGrowthProperties:
             previous_buffer_size = current_buffer_size
         
         # Проверить что финальный размер буфера равен количеству чанков
-        assert len(engine.audio_buffer) == len(audio_chunks), \
+        assert engine.audio_buffer.chunk_count == len(audio_chunks), \
             f"Финальный размер буфера должен равняться количеству чанков: " \
-            f"ожидалось {len(audio_chunks)}, получено {len(engine.audio_buffer)}"
+            f"ожидалось {len(audio_chunks)}, получено {engine.audio_buffer.chunk_count}"
     
     @given(st.integers(min_value=1, max_value=100))
     @settings(max_examples=100, deadline=None)
@@ -712,7 +713,7 @@ class TestAudioEngineBufferGrowthProperties:
         # Добавить чанки
         for i in range(num_chunks):
             engine._audio_callback(chunk, 1024, {}, 0)
-            buffer_sizes.append(len(engine.audio_buffer))
+            buffer_sizes.append(engine.audio_buffer.chunk_count)
         
         # Проверить монотонный рост
         for i in range(1, len(buffer_sizes)):
@@ -757,7 +758,7 @@ class TestAudioEngineBufferGrowthProperties:
             engine._audio_callback(chunk, size, {}, 0)
             
             # Проверить что количество элементов в буфере увеличилось
-            current_count = len(engine.audio_buffer)
+            current_count = engine.audio_buffer.chunk_count
             assert current_count == previous_count + 1, \
                 f"Количество элементов в буфере должно увеличиваться на 1: " \
                 f"итерация {i}, размер чанка {size}, " \
@@ -790,7 +791,7 @@ class TestAudioEngineBufferGrowthProperties:
             engine._audio_callback(chunk, chunk_size, {}, 0)
             
             # Вычислить общий размер данных в буфере
-            current_total_bytes = sum(len(c) for c in engine.audio_buffer)
+            current_total_bytes = engine.audio_buffer.nbytes
             
             # Проверить монотонный рост
             assert current_total_bytes > previous_total_bytes, \
@@ -839,3 +840,172 @@ class TestAudioEngineBufferGrowthProperties:
             
             # Обновить максимальный размер
             max_buffer_size = max(max_buffer_size, current_size)
+
+
+class TestAudioEngineStreamToDisk:
+    """Тесты потоковой записи WAV файла во время записи."""
+    
+    @patch('pyaudio.PyAudio')
+    def test_stream_to_disk_writes_file_during_recording(self, mock_pyaudio_class):
+        """
+        Тест что в режиме stream_to_disk файл пишется фоновым потоком
+        и финализируется при остановке.
+        """
+        mock_pyaudio = Mock()
+        mock_pyaudio.open.return_value = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio
+        
+        engine = AudioEngine(stream_to_disk=True)
+        engine.start_recording()
+        
+        samples = np.arange(16000, dtype=np.int16)
+        for start in range(0, 16000, 1024):
+            chunk = samples[start:start + 1024].tobytes()
+            engine._audio_callback(chunk, len(chunk) // 2, {}, 0)
+        
+        filepath = engine.stop_recording()
+        
+        with wave.open(filepath, 'rb') as wav_file:
+            assert wav_file.getnframes() == 16000
+            data = np.frombuffer(wav_file.readframes(16000), dtype=np.int16)
+        np.testing.assert_array_equal(data, samples)
+        
+        os.remove(filepath)
+    
+    @patch('pyaudio.PyAudio')
+    def test_stream_to_disk_removes_file_when_too_short(self, mock_pyaudio_class):
+        """
+        Тест что частичный файл удаляется, если запись слишком короткая.
+        """
+        mock_pyaudio = Mock()
+        mock_pyaudio.open.return_value = Mock()
+        mock_pyaudio_class.return_value = mock_pyaudio
+        
+        engine = AudioEngine(stream_to_disk=True)
+        engine.start_recording()
+        filepath = engine._wav_writer.filepath
+        
+        engine._audio_callback(np.zeros(1600, dtype=np.int16).tobytes(), 1600, {}, 0)
+        
+        with pytest.raises(RecordingTooShortError):
+            engine.stop_recording()
+        
+        assert not os.path.exists(filepath)
+
+
+class TestAudioEngineVoiceActivity:
+    """Тесты покадрового VAD в callback."""
+    
+    def test_callback_fills_speech_timeline(self):
+        """
+        Тест что каждый чанк классифицируется по фреймам, включая
+        короткий всплеск внутри чанка.
+        """
+        from services.silence_detector import SilenceDetector
+        
+        engine = AudioEngine(vad=SilenceDetector(threshold=0.02, onset_frames=1, hangover_frames=0))
+        samples = np.zeros(1024 * 4, dtype=np.int16)
+        samples[1920:2240] = 8000  # один фрейм 20 мс внутри второго чанка
+        
+        for start in range(0, len(samples), 1024):
+            engine._audio_callback(samples[start:start + 1024].tobytes(), 1024, {}, 0)
+        
+        timeline = engine.speech_timeline
+        assert len(timeline) == len(samples) // 320
+        assert timeline.segments() == [(1920, 2240)]
+
+
+class TestAudioEngineChunkLevels:
+    """Тесты очереди анализа чанков и событийного цикла потока записи."""
+    
+    def test_callback_publishes_chunk_level(self):
+        """Тест что callback публикует RMS, пик и время каждого чанка."""
+        engine = AudioEngine()
+        samples = np.zeros(1024, dtype=np.int16)
+        samples[10] = -32768
+        
+        engine._audio_callback(samples.tobytes(), 1024, {}, 0)
+        engine._audio_callback(samples.tobytes(), 1024, {}, 0)
+        
+        first = engine.levels.get_nowait()
+        second = engine.levels.get_nowait()
+        assert first.peak == 1.0
+        assert first.rms == pytest.approx(np.sqrt(1 / 1024))
+        assert first.is_speech is None
+        assert (first.position, second.position) == (1024, 2048)
+        assert second.timestamp == pytest.approx(2048 / 16000)
+    
+    def test_full_queue_drops_oldest_level(self):
+        """Тест что callback не блокируется на полной очереди."""
+        engine = AudioEngine()
+        chunk = np.zeros(1024, dtype=np.int16).tobytes()
+        
+        for _ in range(engine.LEVEL_QUEUE_SIZE + 10):
+            engine._audio_callback(chunk, 1024, {}, 0)
+        
+        assert engine.levels.qsize() == engine.LEVEL_QUEUE_SIZE
+        assert engine.levels.get_nowait().position == 11 * 1024
+    
+    @patch('pyaudio.PyAudio')
+    def test_silence_is_detected_on_first_silent_chunk_past_duration(self, mock_pyaudio_class):
+        """
+        Тест что детектор получает каждый чанк и останавливает запись
+        на первом чанке, после которого тишина длится silence_duration.
+        """
+        from services.audio_engine import AudioRecordingThread
+        from services.silence_detector import SilenceDetector
+        
+        thread = AudioRecordingThread(SilenceDetector(threshold=0.02, silence_duration=1.0))
+        engine = thread.audio_engine
+        
+        def feed():
+            speech = np.full(1024, 3000, dtype=np.int16).tobytes()
+            silence = np.zeros(1024, dtype=np.int16).tobytes()
+            for i in range(40):
+                engine._audio_callback(speech if i < 20 else silence, 1024, {}, 0)
+        
+        mock_pyaudio_class.return_value.open.return_value.start_stream.side_effect = feed
+        detected, rms_values, payloads = [], [], []
+        thread.silence_detected.connect(lambda: detected.append(engine.levels.qsize()))
+        thread.rms_updated.connect(rms_values.append)
+        thread.recording_stopped.connect(payloads.append)
+        
+        thread.run()
+        
+        # Тишина отсчитывается с конца чанка 20 (t=1.344с), 1с набирается
+        # на чанке 36 (t=2.368с) - остальные 3 чанка остаются в очереди
+        assert len(detected) == 1
+        assert detected[0] == 3
+        assert len(rms_values) == 37
+        assert payloads[0].duration == pytest.approx(40 * 1024 / 16000)
+    
+    def test_rms_signal_is_throttled(self):
+        """Тест что rms_updated отправляется не чаще раза в 50 мс с максимумом за интервал."""
+        from services.audio_engine import AudioRecordingThread, ChunkLevel
+        
+        thread = AudioRecordingThread(enable_silence_detection=False)
+        emitted = []
+        thread.rms_updated.connect(emitted.append)
+        
+        # Чанки по 10 мс, всплеск в одном из них
+        for i in range(100):
+            rms = 0.5 if i == 23 else 0.01
+            thread._process_level(ChunkLevel(rms, rms, None, (i + 1) * 0.01, (i + 1) * 160))
+        
+        assert 18 <= len(emitted) <= 20
+        assert 0.5 in emitted
+    
+    def test_noise_floor_signal(self):
+        """Тест что поток кормит оценку шума и сообщает о новом уровне."""
+        from services.audio_engine import AudioRecordingThread, ChunkLevel
+        from services.noise_floor import NoiseFloorEstimator
+        
+        thread = AudioRecordingThread(enable_silence_detection=False, noise_floor=NoiseFloorEstimator(calibration_ms=500))
+        levels = []
+        thread.noise_floor_updated.connect(levels.append)
+        
+        for i in range(20):
+            thread._process_level(ChunkLevel(0.01, 0.02, None, (i + 1) * 0.064, (i + 1) * 1024))
+        
+        # Уровень сообщается один раз - после калибровки, пока шум не меняется
+        assert levels == [pytest.approx(0.01)]
@@ -0,0 +1,197 @@
+"""
+Unit-тесты для AudioPayload.
+
+Тестирует передачу аудио в памяти: длительность, упаковку в WAV
+для загрузки в API, запись на диск по требованию и обрезку тишины
+в TranscriptionThread без временных файлов.
+"""
+
+import os
+import wave
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from services.audio_payload import AudioPayload
+from utils.audio_utils import trim_silence_pcm
+
+
+def _write_wav(path, samples, sample_rate=16000):
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+
+
+class TestAudioPayload:
+    """Тесты AudioPayload."""
+
+    def test_requires_pcm_or_path(self):
+        """Payload без данных и без пути недопустим."""
+        with pytest.raises(ValueError):
+            AudioPayload()
+
+    def test_duration_from_pcm(self):
+        """Длительность вычисляется по PCM данным без диска."""
+        payload = AudioPayload(pcm=np.zeros(24000, dtype=np.int16).tobytes(), sample_rate=16000)
+
+        assert payload.in_memory
+        assert payload.path is None
+        assert payload.duration == pytest.approx(1.5)
+
+    def test_open_for_upload_returns_named_wav_stream(self):
+        """Аудио в памяти отправляется как WAV в BytesIO с именем файла."""
+        samples = np.arange(1600, dtype=np.int16)
+        payload = AudioPayload(pcm=samples.tobytes(), sample_rate=16000)
+
+        upload = payload.open_for_upload()
+
+        assert upload.name == "audio.wav"
+        with wave.open(upload, 'rb') as wav_file:
+            assert wav_file.getframerate() == 16000
+            assert wav_file.getnchannels() == 1
+            data = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+        np.testing.assert_array_equal(data, samples)
+
+    def test_from_file_reads_header_only(self, tmp_path):
+        """from_file берет параметры из заголовка, не загружая PCM."""
+        path = tmp_path / "audio.wav"
+        _write_wav(path, np.zeros(8000, dtype=np.int16), sample_rate=8000)
+
+        payload = AudioPayload.from_file(str(path))
+
+        assert not payload.in_memory
+        assert payload.sample_rate == 8000
+        assert payload.duration == pytest.approx(1.0)
+
+    def test_coerce_path_is_lazy(self, tmp_path):
+        """coerce(str) не читает файл, пока не нужна длительность."""
+        path = tmp_path / "audio.wav"
+        payload = AudioPayload.coerce(str(path))
+        assert payload.path == str(path)
+
+        _write_wav(path, np.zeros(16000, dtype=np.int16))
+        assert payload.duration == pytest.approx(1.0)
+        assert AudioPayload.coerce(payload) is payload
+
+    def test_ensure_file_writes_only_once(self):
+        """ensure_file создает временный файл и затем переиспользует его."""
+        payload = AudioPayload(pcm=np.ones(16000, dtype=np.int16).tobytes())
+
+        path = payload.ensure_file()
+        try:
+            assert payload.ensure_file() == path
+            assert AudioPayload.from_file(path).duration == pytest.approx(1.0)
+        finally:
+            os.remove(path)
+
+    def test_with_pcm_keeps_format_and_drops_path(self, tmp_path):
+        """with_pcm создает новый payload в памяти с теми же параметрами."""
+        payload = AudioPayload(pcm=b"\x00\x00" * 10, sample_rate=8000, path=str(tmp_path / "x.wav"))
+
+        trimmed = payload.with_pcm(b"\x00\x00" * 4)
+
+        assert trimmed is not payload
+        assert trimmed.path is None
+        assert trimmed.sample_rate == 8000
+        assert trimmed.n_frames == 4
+        assert payload.n_frames == 10
+
+
+class TestTrimSilencePcm:
+    """Тесты обрезки тишины в памяти."""
+
+    def test_removes_silence_in_memory(self):
+        """Тишина по краям удаляется, длительность удаленного возвращается."""
+        sample_rate = 16000
+        silence = np.zeros(sample_rate, dtype=np.int16)
+        sound = np.full(sample_rate, 10000, dtype=np.int16)
+        pcm = np.concatenate([silence, sound, silence]).tobytes()
+
+        trimmed, removed = trim_silence_pcm(pcm, sample_rate, threshold=0.02, padding_ms=300)
+
+        assert removed > 1.0
+        assert len(trimmed) < len(pcm)
+
+    def test_returns_original_for_all_silence(self):
+        """Полная тишина не обрезается."""
+        pcm = np.zeros(16000, dtype=np.int16).tobytes()
+
+        trimmed, removed = trim_silence_pcm(pcm, 16000)
+
+        assert trimmed is pcm
+        assert removed == 0.0
+
+
+class TestTranscriptionThreadPayload:
+    """Тесты TranscriptionThread с аудио в памяти."""
+
+    def test_in_memory_payload_is_trimmed_and_sent_without_files(self, tmp_path):
+        """Payload в памяти обрезается и отправляется без записи на диск."""
+        from services.transcription_client import TranscriptionThread
+
+        sample_rate = 16000
+        silence = np.zeros(sample_rate, dtype=np.int16)
+        sound = np.full(sample_rate, 10000, dtype=np.int16)
+        payload = AudioPayload(pcm=np.concatenate([silence, sound, silence]).tobytes())
+
+        config = Mock()
+        config.manual_stop = True
+        config.silence_threshold = 0.02
+        config.silence_padding = 300
+        config.keep_recordings = False
+
+        with patch('core.config.Config.snapshot', return_value=config), \
+                patch('services.transcription_client.TranscriptionClient') as MockClient, \
+                patch('services.audio_payload.AudioPayload.save') as mock_save:
+            client = Mock()
+            client.transcribe_audio.return_value = "text"
+            MockClient.return_value = client
+
+            thread = TranscriptionThread(payload, provider="openai", api_key="key")
+            thread.run()
+
+        sent = client.transcribe_audio.call_args[0][0]
+        assert isinstance(sent, AudioPayload)
+        assert sent.in_memory
+        assert sent.duration < payload.duration
+        # Исходный payload (на который ссылается main) не изменен
+        assert payload.duration == pytest.approx(3.0)
+        mock_save.assert_not_called()
+
+    def test_file_payload_duration_is_updated_after_trim(self, tmp_path):
+        """После обрезки файла разбиение на части видит новую длительность."""
+        from services.transcription_client import TranscriptionThread
+
+        sample_rate = 16000
+        silence = np.zeros(sample_rate, dtype=np.int16)
+        sound = np.full(sample_rate, 10000, dtype=np.int16)
+        path = tmp_path / "recording.wav"
+        _write_wav(path, np.concatenate([silence, sound, silence]))
+        payload = AudioPayload.from_file(str(path))
+        assert payload.duration == pytest.approx(3.0)
+
+        config = Mock()
+        config.manual_stop = True
+        config.silence_threshold = 0.02
+        config.silence_padding = 300
+        config.keep_recordings = True
+        config.upload_format = "wav"
+        config.chunk_max_seconds = 2.5
+
+        with patch('core.config.Config.snapshot', return_value=config), \
+                patch('services.transcription_client.TranscriptionClient') as MockClient:
+            client = Mock()
+            client.transcribe_audio.return_value = "text"
+            MockClient.return_value = client
+
+            thread = TranscriptionThread(payload, provider="openai", api_key="key")
+            thread.run()
+
+        client.transcribe_audio.assert_called_once()
+        sent = client.transcribe_audio.call_args[0][0]
+        assert sent.duration < 2.5
+        # Короткая после обрезки запись не читается в память для разбиения
+        assert not sent.in_memory
@@ -0,0 +1,198 @@
+"""
+Unit-тесты для параллельной транскрипции длинных записей по частям.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from services.audio_payload import AudioPayload
+from services.chunked_transcription import (
+    ChunkedTranscriber,
+    split_payload,
+    stitch_transcripts,
+)
+from utils.audio_utils import find_split_points
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 200 * t) * 10000).astype(np.int16)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.int16)
+
+
+class TestFindSplitPoints:
+    """Тесты поиска точек разреза."""
+
+    def test_splits_inside_pause(self):
+        """Разрез попадает в паузу перед границей части."""
+        audio = np.concatenate([_tone(8), _silence(1), _tone(8)])
+
+        splits = find_split_points(audio.tobytes(), SAMPLE_RATE, max_chunk_seconds=10)
+
+        assert len(splits) == 1
+        frame, is_silent = splits[0]
+        assert is_silent
+        assert 8 * SAMPLE_RATE <= frame <= 9 * SAMPLE_RATE
+
+    def test_forced_split_in_speech(self):
+        """Без пауз разрез все равно делается и помечается как не тихий."""
+        audio = _tone(25)
+
+        splits = find_split_points(audio.tobytes(), SAMPLE_RATE, max_chunk_seconds=10)
+
+        assert len(splits) == 2
+        assert not any(is_silent for _, is_silent in splits)
+        assert all(frame <= 10 * SAMPLE_RATE * (i + 1) for i, (frame, _) in enumerate(splits))
+
+
+class TestSplitPayload:
+    """Тесты разбиения AudioPayload."""
+
+    def test_short_payload_is_not_split(self):
+        payload = AudioPayload(pcm=_tone(5).tobytes())
+
+        assert split_payload(payload, 10) == ([payload], [])
+
+    def test_parts_cover_audio_at_silence(self):
+        """При разрезе в паузе части точно покрывают запись без перекрытия."""
+        audio = np.concatenate([_tone(8), _silence(1), _tone(8), _silence(1), _tone(8)])
+        payload = AudioPayload(pcm=audio.tobytes())
+
+        parts, silent_seams = split_payload(payload, 10)
+
+        assert len(parts) == 3
+        assert silent_seams == [True, True]
+        assert b"".join(part.pcm for part in parts) == payload.pcm
+        assert all(part.duration <= 10 for part in parts)
+
+    def test_speech_split_adds_overlap(self):
+        """Часть после разреза посреди речи начинается с перекрытием."""
+        payload = AudioPayload(pcm=_tone(15).tobytes())
+
+        parts, silent_seams = split_payload(payload, 10, overlap_seconds=1.0)
+
+        assert len(parts) == 2
+        assert silent_seams == [False]
+        total = sum(part.duration for part in parts)
+        assert total == pytest.approx(16.0, abs=0.01)
+
+
+class TestStitchTranscripts:
+    """Тесты склейки текстов."""
+
+    def test_removes_overlapping_words(self):
+        text = stitch_transcripts(["Hello there, how are", "how are you doing today"])
+
+        assert text == "Hello there, how are you doing today"
+
+    def test_overlap_ignores_case_and_punctuation(self):
+        text = stitch_transcripts(["we went to the Store.", "the store and then home"])
+
+        assert text == "we went to the Store. and then home"
+
+    def test_keeps_text_without_overlap(self):
+        assert stitch_transcripts(["first part", "", "second part"]) == "first part second part"
+
+    def test_keeps_repeated_words_at_silent_seams(self):
+        """В паузе аудио не перекрывается: повтор действительно был сказан."""
+        texts = ["Ты уверен? Да.", "Да. Я уверен."]
+
+        assert stitch_transcripts(texts, silent_seams=[True]) == "Ты уверен? Да. Да. Я уверен."
+        assert stitch_transcripts(texts, silent_seams=[False]) == "Ты уверен? Да. Я уверен."
+
+    def test_cjk_parts_are_joined_without_space(self):
+        assert stitch_transcripts(["我们明天见。", "好的。"], silent_seams=[True]) == "我们明天见。好的。"
+
+    def test_keeps_whitespace_of_parts(self):
+        assert stitch_transcripts(["one two\n", "three"], silent_seams=[True]) == "one two\nthree"
+
+
+class TestChunkedTranscriber:
+    """Тесты параллельной транскрипции."""
+
+    def test_results_are_stitched_in_order(self):
+        """Части с разной задержкой склеиваются в исходном порядке."""
+        parts = [AudioPayload(pcm=bytes([i]) * 32) for i in range(4)]
+        delays = {0: 0.05, 1: 0.0, 2: 0.03, 3: 0.01}
+
+        def transcribe(part):
+            index = part.pcm[0]
+            time.sleep(delays[index])
+            return f"word{index}"
+
+        client = Mock()
+        client.transcribe_audio.side_effect = transcribe
+
+        text = ChunkedTranscriber(client, "groq").transcribe(parts)
+
+        assert text == "word0 word1 word2 word3"
+
+    def test_concurrency_is_bounded_per_provider(self):
+        """Одновременно выполняется не больше max_workers запросов."""
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def transcribe(part):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return "x"
+
+        client = Mock()
+        client.transcribe_audio.side_effect = transcribe
+        parts = [AudioPayload(pcm=b"\x00\x00") for _ in range(8)]
+
+        ChunkedTranscriber(client, "glm").transcribe(parts)
+
+        assert active["max"] <= 2
+
+    def test_error_in_part_propagates(self):
+        client = Mock()
+        client.transcribe_audio.side_effect = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            ChunkedTranscriber(client, "openai").transcribe([AudioPayload(pcm=b"\x00\x00")] * 2)
+
+
+class TestTranscriptionThreadChunking:
+    """Тесты интеграции в TranscriptionThread."""
+
+    def test_long_payload_is_transcribed_in_parts(self):
+        from services.transcription_client import TranscriptionThread
+
+        audio = np.concatenate([_tone(8), _silence(1), _tone(8)])
+        payload = AudioPayload(pcm=audio.tobytes())
+
+        config = Mock()
+        config.manual_stop = False
+        config.keep_recordings = False
+        config.upload_format = "wav"
+        config.chunk_max_seconds = 10
+        config.silence_threshold = 0.02
+
+        results = []
+        with patch('core.config.Config.snapshot', return_value=config), \
+                patch('services.transcription_client.TranscriptionClient') as MockClient:
+            client = Mock()
+            # Разрез в паузе: повтор слова на стыке не удаляется
+            client.transcribe_audio.side_effect = ["one two", "two three"]
+            MockClient.return_value = client
+
+            thread = TranscriptionThread(payload, provider="groq", api_key="key")
+            thread.transcription_raw_complete.connect(results.append)
+            thread.run()
+
+        assert client.transcribe_audio.call_count == 2
+        assert results == ["one two two three"]
@@ -0,0 +1,109 @@
+"""
+Unit-тесты для кешированного снимка конфигурации (Config.snapshot).
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from core.config import Config
+from core.config_loader import ConfigLoader
+from core.config_saver import ConfigSaver
+
+
+@pytest.fixture
+def config_files(tmp_path):
+    """Временные config.jsonc и secrets.json вместо пользовательских."""
+    config_path = tmp_path / "config.jsonc"
+    secrets_path = tmp_path / "secrets.json"
+    config_path.write_text(json.dumps({"audio": {"silence_duration": 2.5}}), encoding="utf-8")
+    secrets_path.write_text(json.dumps({"ai_provider": {"api_keys": {"groq": "key"}}}), encoding="utf-8")
+
+    loader = ConfigLoader(config_path=str(config_path), secrets_path=str(secrets_path))
+    Config.invalidate_snapshot()
+    with patch('core.config_loader._config_loader', loader):
+        yield config_path, secrets_path
+    Config.invalidate_snapshot()
+
+
+def _touch(path, content):
+    """Перезаписывает файл и сдвигает mtime (разрешение mtime бывает грубым)."""
+    path.write_text(content, encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestConfigSnapshot:
+    """Тесты снимка конфигурации."""
+
+    def test_unchanged_files_return_same_snapshot(self, config_files):
+        with patch.object(Config, 'load_from_config', wraps=Config.load_from_config) as load:
+            first = Config.snapshot()
+            second = Config.snapshot()
+
+        assert first is second
+        assert load.call_count == 1
+        assert first.silence_duration == 2.5
+        assert first.groq_api_key == "key"
+
+    def test_changed_config_file_reloads_snapshot(self, config_files):
+        config_path, _ = config_files
+        first = Config.snapshot()
+
+        _touch(config_path, json.dumps({"audio": {"silence_duration": 4.0}}))
+        second = Config.snapshot()
+
+        assert second is not first
+        assert second.silence_duration == 4.0
+
+    def test_changed_secrets_file_reloads_snapshot(self, config_files):
+        _, secrets_path = config_files
+        first = Config.snapshot()
+
+        _touch(secrets_path, json.dumps({"ai_provider": {"api_keys": {"groq": "new-key"}}}))
+
+        assert Config.snapshot().groq_api_key == "new-key"
+        assert first.groq_api_key == "key"
+
+    def test_invalidate_forces_reload(self, config_files):
+        first = Config.snapshot()
+
+        Config.invalidate_snapshot()
+
+        assert Config.snapshot() is not first
+
+    def test_snapshot_is_read_only(self, config_files):
+        snapshot = Config.snapshot()
+
+        with pytest.raises(AttributeError):
+            snapshot.silence_duration = 10.0
+
+    def test_copy_is_mutable_and_independent(self, config_files):
+        snapshot = Config.snapshot()
+
+        config = snapshot.copy()
+        config.silence_duration = 10.0
+
+        assert config.silence_duration == 10.0
+        assert snapshot.silence_duration == 2.5
+
+    def test_copy_does_not_share_nested_values(self):
+        original = Config()
+        original.format_apps = {"notes": ["notepad"]}
+
+        config = original.copy()
+        config.format_apps["notes"].append("gedit")
+
+        assert original.format_apps == {"notes": ["notepad"]}
+
+    def test_config_saver_invalidates_snapshot(self, config_files):
+        config_path, secrets_path = config_files
+        first = Config.snapshot()
+
+        ConfigSaver(config_path=str(config_path), secrets_path=str(secrets_path)).save_config(
+            {"audio": {"silence_duration": 3.0}}
+        )
+
+        assert Config.snapshot() is not first
@@ -0,0 +1,149 @@
+"""
+Unit-тесты для прогрева соединений с API во время записи.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from openai import OpenAI
+
+from services.api_client_pool import ApiClientPool
+from services.connection_prewarm import ConnectionPrewarmer
+
+
+class TestPoolPrewarm:
+    """Тесты прогрева соединения в реестре клиентов."""
+
+    def test_request_after_prewarm_uses_warm_connection(self, local_api):
+        pool = ApiClientPool()
+        client = pool.get(OpenAI, "custom", "key", local_api, 5.0)
+
+        handshake = pool.prewarm(client, local_api)
+        client.models.list()
+
+        stats = pool.stats()
+        assert handshake is not None and handshake > 0
+        assert stats["prewarms"] == 1
+        assert stats["new_connections"] == 1
+        assert stats["requests"] == 1
+        assert stats["reused_connections"] == 1
+        assert stats["prewarm_hits"] == 1
+        assert stats["prewarm_saved_ms"] == pytest.approx(handshake * 1000)
+
+    def test_prewarm_of_open_connection_saves_nothing_new(self, local_api):
+        pool = ApiClientPool()
+        client = pool.get(OpenAI, "custom", "key", local_api, 5.0)
+        client.models.list()
+
+        assert pool.prewarm(client, local_api) == 0.0
+        assert pool.stats()["prewarms"] == 0
+
+    def test_prewarm_failure_is_ignored(self):
+        pool = ApiClientPool()
+        client = pool.get(OpenAI, "custom", "key", "http://127.0.0.1:9/v1/", 0.5)
+
+        assert pool.prewarm(client, "http://127.0.0.1:9/v1/") is None
+
+
+class TestConnectionPrewarmer:
+    """Тесты фонового прогрева."""
+
+    def test_warms_transcription_and_post_processing(self, local_api):
+        pool = ApiClientPool()
+        with patch('services.connection_prewarm.get_client_pool', return_value=pool), \
+                patch('services.transcription_client.get_client_pool', return_value=pool):
+            prewarmer = ConnectionPrewarmer(
+                provider="custom",
+                api_key="key",
+                base_url=local_api,
+                model="whisper",
+                post_processing_provider="llm",
+                post_processing_api_key="local",
+                post_processing_base_url=local_api,
+                keepalive_interval=0.05
+            )
+            prewarmer.start()
+            prewarmer.stop()
+            prewarmer.join(timeout=5)
+
+        # Транскрипция и постобработка используют разных клиентов (разные таймауты)
+        assert len(prewarmer.handshake_seconds) == 2
+        assert pool.stats()["prewarms"] == 2
+
+    def test_keeps_refreshing_until_stopped(self, local_api):
+        pool = ApiClientPool()
+        calls = []
+        original = pool.prewarm
+        pool.prewarm = lambda client, url: calls.append(url) or original(client, url)
+
+        with patch('services.connection_prewarm.get_client_pool', return_value=pool), \
+                patch('services.transcription_client.get_client_pool', return_value=pool):
+            prewarmer = ConnectionPrewarmer(
+                provider="custom", api_key="key", base_url=local_api, model="whisper",
+                keepalive_interval=0.01
+            )
+            prewarmer.start()
+            threading.Event().wait(0.2)
+            prewarmer.stop()
+            prewarmer.join(timeout=5)
+
+        assert len(calls) > 2
+
+    def test_refreshes_only_near_expiry_until_max_duration(self, local_api):
+        pool = ApiClientPool()
+        calls = []
+        original = pool.prewarm
+        pool.prewarm = lambda client, url: calls.append(time.monotonic()) or original(client, url)
+
+        with patch('services.connection_prewarm.get_client_pool', return_value=pool), \
+                patch('services.transcription_client.get_client_pool', return_value=pool):
+            prewarmer = ConnectionPrewarmer(
+                provider="custom", api_key="key", base_url=local_api, model="whisper",
+                keepalive_interval=0.1, max_duration=0.25
+            )
+            prewarmer.start()
+            prewarmer.join(timeout=5)
+
+        # Прогрев и два освежения; после max_duration поток завершается сам
+        assert len(calls) == 3
+        assert all(later - earlier >= 0.09 for earlier, later in zip(calls, calls[1:]))
+
+    def test_recent_request_postpones_refresh(self, local_api):
+        pool = ApiClientPool()
+        calls = []
+        warmed = threading.Event()
+        original = pool.prewarm
+
+        def prewarm(client, url):
+            calls.append(url)
+            try:
+                return original(client, url)
+            finally:
+                warmed.set()
+
+        pool.prewarm = prewarm
+
+        with patch('services.connection_prewarm.get_client_pool', return_value=pool), \
+                patch('services.transcription_client.get_client_pool', return_value=pool):
+            prewarmer = ConnectionPrewarmer(
+                provider="custom", api_key="key", base_url=local_api, model="whisper",
+                keepalive_interval=0.4, max_duration=0.6
+            )
+            prewarmer.start()
+            assert warmed.wait(timeout=5)
+            # Без запроса освежение пришлось бы на момент прогрева + 0.4 с,
+            # запрос сдвигает его за max_duration
+            threading.Event().wait(0.2)
+            # Запрос по прогретому соединению (например, сегмент спекулятивной транскрипции)
+            for client in list(pool._clients.values()):
+                client.models.list()
+            prewarmer.join(timeout=5)
+
+        assert len(calls) == 1
+
+    def test_zai_transcription_is_skipped(self):
+        prewarmer = ConnectionPrewarmer(provider="zai", api_key="key")
+
+        assert prewarmer._resolve_targets() == []
@@ -10,6 +10,8 @@ from hypothesis import given, strategies as st, settings, assume
 from unittest.mock import Mock, MagicMock
 from services.formatting_module import (
     FormattingModule,
+    get_keyword_matcher,
+    is_browser,
     match_window_to_format
 )
 from services.formatting_config import FormattingConfig
@@ -249,3 +251,64 @@ class TestFormatDetectionProperties:
         if result is not None:
             # If it matched, it should be a valid format
             assert result in config.applications
+
+
+def _scan_keywords(window_title, app_name, keywords_map):
+    """Reference matching: plain substring scan, app name first, then title."""
+    for text in (app_name.lower(), window_title.lower()):
+        for format_type, patterns in keywords_map.items():
+            if any(pattern.lower() in text for pattern in patterns):
+                return format_type
+    return None
+
+
+keyword_strategy = st.text(alphabet="abcAB .ё+", max_size=4)
+
+
+class TestKeywordMatcher:
+    """Tests for the precompiled keyword matcher."""
+    
+    @given(
+        keywords_map=st.dictionaries(
+            st.sampled_from(["notion", "word", "markdown", "bbcode"]),
+            st.lists(keyword_strategy, max_size=4),
+            max_size=4
+        ),
+        window_title=st.text(alphabet="abcAB .ё+-", max_size=20),
+        app_name=st.text(alphabet="abcAB .ё+-", max_size=10)
+    )
+    @settings(max_examples=200)
+    def test_same_result_as_substring_scan(self, keywords_map, window_title, app_name):
+        """Format priority is the order of the keywords map, app name before title."""
+        result = match_window_to_format(window_title, app_name, keywords_map)
+        
+        assert result == _scan_keywords(window_title, app_name, keywords_map)
+    
+    def test_rebuilt_when_keywords_change(self):
+        keywords_map = {"notion": ["notion"]}
+        matcher = get_keyword_matcher(keywords_map)
+        
+        assert get_keyword_matcher({"notion": ["notion"]}) is matcher
+        assert match_window_to_format("Skype", "skype.exe", keywords_map) is None
+        
+        keywords_map["whatsapp"] = ["skype"]
+        
+        assert get_keyword_matcher(keywords_map) is not matcher
+        assert match_window_to_format("Skype", "skype.exe", keywords_map) == "whatsapp"
+    
+    def test_results_are_memoized(self):
+        matcher = get_keyword_matcher({"markdown": [".md"], "word": ["word"]})
+        matcher.match.cache_clear()
+        
+        assert matcher.match("README.md - Word", "winword.exe") == ("word", "app", "word")
+        assert matcher.match("README.md - Word", "winword.exe") == ("word", "app", "word")
+        assert matcher.match("README.md", "code") == ("markdown", "title", ".md")
+        
+        info = matcher.match.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+    
+    @pytest.mark.parametrize("app_name, expected", [
+        ("Google-Chrome", True), ("firefox.exe", True), ("Safari.app", True), ("telegram", False)
+    ])
+    def test_is_browser(self, app_name, expected):
+        assert is_browser(app_name) is expected
@@ -12,6 +12,7 @@ from unittest.mock import Mock, MagicMock
 from services.formatting_module import FormattingModule
 from services.formatting_config import FormattingConfig
 from services.window_monitor import WindowInfo
+from core.recording_context import RecordingContext
 
 
 def test_manual_selection_overrides_fixed_format():
@@ -343,3 +344,61 @@ def test_manual_selection_logging():
     assert result == "notion"
     # Note: Actual log verification would require capturing logger output,
     # but we verify the code path is executed correctly
+
+
+def test_recording_context_is_used_without_probing_window():
+    """
+    Test that the window captured at record start is used instead of the
+    window that is active at processing time.
+    """
+    config = FormattingConfig()
+    config.enabled = True
+    config.use_fixed_format = False
+    config.applications = ["notion", "markdown"]
+    config.web_app_keywords = {"notion": ["notion"], "markdown": ["markdown"]}
+    
+    window_monitor = Mock()
+    state_manager = Mock()
+    state_manager.get_manual_format_selection.return_value = None
+    state_manager.get_recording_context.return_value = RecordingContext(
+        session_id="session", window_title="Page - Notion", process_name="notion.exe",
+        process_id=1, format_type="notion"
+    )
+    
+    module = FormattingModule(config, window_monitor=window_monitor, state_manager=state_manager)
+    
+    assert module.get_active_application_format() == "notion"
+    window_monitor.get_active_window_info.assert_not_called()
+    
+    # Manual selection still wins over the captured window
+    state_manager.get_manual_format_selection.return_value = "markdown"
+    assert module.get_active_application_format() == "markdown"
+
+
+def test_capture_recording_context_resolves_format():
+    """
+    Test that capture_recording_context snapshots the window and its format
+    through the icon-less lookup, which is safe off the GUI thread.
+    """
+    config = FormattingConfig()
+    config.enabled = True
+    config.applications = ["notion"]
+    config.web_app_keywords = {"notion": ["notion"]}
+    
+    window_monitor = Mock()
+    window_monitor.get_active_window_target.return_value = WindowInfo(
+        title="Page - Notion", process_name="chrome.exe", icon=None, process_id=7
+    )
+    module = FormattingModule(config, window_monitor=window_monitor)
+    
+    context = module.capture_recording_context("session")
+    
+    assert context == RecordingContext(
+        session_id="session", window_title="Page - Notion", process_name="chrome.exe",
+        process_id=7, format_type="notion"
+    )
+    
+    window_monitor.get_active_window_info.assert_not_called()
+    
+    window_monitor.get_active_window_target.return_value = None
+    assert module.capture_recording_context("session") is None
@@ -0,0 +1,185 @@
+"""
+Unit-тесты для менеджера хуков (services.hooks_manager).
+
+Проверяет кэширование конфигурации хуков и сброс при сохранении, план
+выполнения по событиям (порядок, отключенные и фоновые хуки), повторный
+импорт только измененных скриптов и отслеживание каталога хуков.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from services import hooks_manager
+from services.hooks_manager import HookManager
+
+
+class FakeConfigLoader:
+    """ConfigLoader с конфигурацией в памяти."""
+
+    def __init__(self, hooks):
+        self.config = {"hooks": hooks}
+
+    def get(self, key_path, default=None):
+        return self.config.get(key_path, default)
+
+
+def _write_hook(directory, name, event, tag=None, mtime=None):
+    path = directory / f"{name}.py"
+    path.write_text(
+        f"HOOK_EVENT = {event!r}\n"
+        "def hookHandler(options):\n"
+        f"    options['data'].setdefault('calls', []).append({tag or name!r})\n"
+        "    return options\n",
+        encoding="utf-8",
+    )
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _calls(manager, event):
+    return manager.run_event(event, {"data": {}})["data"].get("calls", [])
+
+
+@pytest.fixture
+def hooks_dir(tmp_path):
+    directory = tmp_path / "hooks"
+    directory.mkdir()
+    _write_hook(directory, "first", "after_recording")
+    _write_hook(directory, "second", "after_recording")
+    _write_hook(directory, "other", "task_completed")
+    return directory
+
+
+@pytest.fixture
+def make_manager(hooks_dir):
+    managers = []
+
+    def make(watch=False, **hooks):
+        hooks.setdefault("paths", [str(hooks_dir)])
+        loader = FakeConfigLoader(hooks)
+        with patch.object(hooks_manager, "get_config_loader", return_value=loader):
+            if watch:
+                manager = HookManager()
+            else:
+                # Без Qt приложения каталог хуков опрашивается
+                with patch.object(hooks_manager.QCoreApplication, "instance", return_value=None):
+                    manager = HookManager()
+        managers.append(manager)
+        return manager, loader
+
+    yield make
+    for manager in managers:
+        manager.executor.shutdown(wait=True)
+
+
+class TestHookConfigCache:
+    """Тесты кэширования конфигурации хуков."""
+
+    def test_config_normalized_once(self, make_manager):
+        manager, _ = make_manager()
+
+        with patch.object(HookManager, "normalize_config", wraps=HookManager.normalize_config) as normalize:
+            for _ in range(6):
+                manager.run_event("after_recording", {"data": {}})
+
+        normalize.assert_not_called()
+
+    def test_saved_settings_invalidate_cache(self, make_manager):
+        manager, loader = make_manager()
+        assert _calls(manager, "after_recording") == ["first", "second"]
+
+        # Настройки меняют конфигурацию на месте, затем сохраняют файл
+        loader.config["hooks"]["order"]["after_recording"] = ["second", "first"]
+        assert _calls(manager, "after_recording") == ["first", "second"]
+
+        with patch.object(hooks_manager, "_hook_manager_instance", manager):
+            hooks_manager.invalidate_hooks_config()
+
+        assert _calls(manager, "after_recording") == ["second", "first"]
+
+    def test_reloaded_config_is_picked_up(self, make_manager):
+        manager, loader = make_manager()
+
+        loader.config = {"hooks": {"paths": loader.config["hooks"]["paths"], "enabled": False}}
+
+        assert not manager.has_active_hooks("after_recording")
+        assert _calls(manager, "after_recording") == []
+
+
+class TestExecutionPlan:
+    """Тесты плана выполнения хуков."""
+
+    def test_order_disabled_and_background(self, make_manager):
+        manager, _ = make_manager(
+            order={"after_recording": ["second"]},
+            disabled={"task_completed": ["other"]},
+            background={"after_recording": ["first"]},
+        )
+
+        plan = [(meta.name, background) for meta, background in manager._get_plan("after_recording")]
+
+        assert plan == [("second", False), ("first", True)]
+        assert not manager.has_active_hooks("task_completed")
+        assert manager._get_plan("unknown_event") == []
+
+    def test_run_event_walks_plan(self, make_manager):
+        manager, _ = make_manager(order={"after_recording": ["second", "first"]})
+
+        result = manager.run_event("after_recording", {"data": {}})
+
+        assert result["data"]["calls"] == ["second", "first"]
+        assert [hook["name"] for hook in result["hooks"]] == ["second", "first"]
+
+
+class TestHookRescan:
+    """Тесты повторного импорта скриптов хуков."""
+
+    def test_only_changed_scripts_reimported(self, make_manager, hooks_dir):
+        manager, _ = make_manager()
+
+        _write_hook(hooks_dir, "second", "after_recording", tag="second v2", mtime=1_000_000)
+        _write_hook(hooks_dir, "third", "after_recording")
+        (hooks_dir / "other.py").unlink()
+
+        with patch.object(HookManager, "_load_hook_meta", wraps=manager._load_hook_meta) as load, \
+                patch.object(hooks_manager, "HOOKS_POLL_INTERVAL", 0.0):
+            calls = _calls(manager, "after_recording")
+
+        assert sorted(call.args[1] for call in load.call_args_list) == ["second", "third"]
+        assert calls == ["first", "second v2", "third"]
+        assert manager.get_available_hooks("task_completed") == []
+
+    def test_polling_is_throttled(self, make_manager, hooks_dir):
+        manager, _ = make_manager()
+
+        _write_hook(hooks_dir, "third", "after_recording")
+
+        assert manager._watcher is None
+        assert "third" not in _calls(manager, "after_recording")
+
+    def test_refresh_reimports_everything(self, make_manager):
+        manager, _ = make_manager()
+
+        with patch.object(HookManager, "_load_hook_meta", wraps=manager._load_hook_meta) as load:
+            manager.refresh_hooks()
+
+        assert load.call_count == 3
+
+
+class TestHookWatcher:
+    """Тесты отслеживания каталога хуков в GUI потоке."""
+
+    def test_new_and_edited_hooks_are_loaded(self, qtbot, make_manager, hooks_dir):
+        manager, _ = make_manager(watch=True)
+        assert manager._watcher is not None
+
+        _write_hook(hooks_dir, "third", "after_recording")
+        qtbot.waitUntil(lambda: "third" in manager.get_available_hooks(), timeout=3000)
+
+        _write_hook(hooks_dir, "first", "after_recording", tag="first v2", mtime=1_000_000)
+        qtbot.waitUntil(lambda: "first v2" in _calls(manager, "after_recording"), timeout=3000)
+
+        assert _calls(manager, "after_recording") == ["first v2", "second", "third"]
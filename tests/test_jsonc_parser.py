@@ -0,0 +1,165 @@
+"""
+Тесты для удаления комментариев из JSONC (strip_json_comments).
+
+Новая реализация сравнивается с прежним посимвольным парсером,
+который оставлен здесь как эталон поведения.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from core.config_loader import strip_json_comments
+
+
+def _reference_strip_json_comments(json_str: str) -> str:
+    """Прежняя посимвольная реализация strip_json_comments."""
+    lines = []
+    in_multiline_comment = False
+    in_string = False
+    escape_next = False
+
+    for line in json_str.split('\n'):
+        cleaned_line = []
+        i = 0
+
+        while i < len(line):
+            char = line[i]
+
+            if escape_next:
+                cleaned_line.append(char)
+                escape_next = False
+                i += 1
+                continue
+
+            if char == '\\' and in_string:
+                escape_next = True
+                cleaned_line.append(char)
+                i += 1
+                continue
+
+            if char == '"' and not in_multiline_comment:
+                in_string = not in_string
+                cleaned_line.append(char)
+                i += 1
+                continue
+
+            if in_string:
+                cleaned_line.append(char)
+                i += 1
+                continue
+
+            if in_multiline_comment:
+                if i + 1 < len(line) and line[i:i+2] == '*/':
+                    in_multiline_comment = False
+                    i += 2
+                    continue
+                i += 1
+                continue
+
+            if i + 1 < len(line):
+                two_chars = line[i:i+2]
+                if two_chars == '//':
+                    break
+                if two_chars == '/*':
+                    in_multiline_comment = True
+                    i += 2
+                    continue
+
+            cleaned_line.append(char)
+            i += 1
+
+        if cleaned_line:
+            lines.append(''.join(cleaned_line))
+
+    return '\n'.join(lines)
+
+
+def _large_config(apps: int = 2000, sites: int = 300) -> str:
+    """Большой config.jsonc с множеством app_prompts и web_keywords."""
+    lines = ['// RapidWhisper configuration', '{', '  /* Промпты для приложений */', '  "app_prompts": {']
+    for i in range(apps):
+        comma = ',' if i < apps - 1 else ''
+        lines.append(f'    // Приложение {i}')
+        lines.append(
+            f'    "app{i}.exe": {{"enabled": true, '
+            f'"prompt": "Format text for app {i}, see https://example.com/{i} \\"quoted\\" /* literal */"}}{comma}'
+        )
+    lines.append('  },')
+    lines.append('  "web_keywords": {  // ключевые слова сайтов')
+    for i in range(sites):
+        comma = ',' if i < sites - 1 else ''
+        keywords = ', '.join(f'"site{i}-kw{j}"' for j in range(10))
+        lines.append(f'    "site{i}": [{keywords}]{comma}')
+    lines.append('  }')
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+class TestStripJsonComments:
+    """Тесты удаления комментариев."""
+
+    def test_removes_line_and_block_comments(self):
+        content = '{\n  // comment\n  "a": 1, /* inline */ "b": 2\n  /* multi\n     line */\n}'
+
+        assert json.loads(strip_json_comments(content)) == {"a": 1, "b": 2}
+
+    def test_comment_markers_inside_strings_are_kept(self):
+        content = '{"url": "https://api.groq.com/openai/v1/", "glob": "/* not a comment */"}'
+
+        assert strip_json_comments(content) == content
+
+    def test_escaped_quotes_do_not_end_string(self):
+        content = '{"text": "say \\"//hi\\"", // comment\n "b": "\\\\"} // tail'
+
+        assert json.loads(strip_json_comments(content)) == {"text": 'say "//hi"', "b": "\\"}
+
+    def test_block_comment_keeps_line_structure(self):
+        content = '{"a": 1, /* start\n end */ "b": 2}'
+
+        assert strip_json_comments(content) == '{"a": 1, \n "b": 2}'
+
+    def test_example_config_matches_reference(self):
+        content = (Path(__file__).parent.parent / "config.jsonc.example").read_text(encoding="utf-8")
+
+        assert strip_json_comments(content) == _reference_strip_json_comments(content)
+
+    def test_large_config_matches_reference(self):
+        content = _large_config()
+
+        assert strip_json_comments(content) == _reference_strip_json_comments(content)
+
+    @given(st.lists(
+        st.sampled_from(['"', '\\', '/', '*', '\n', ' ', 'a', '{', '}', ':', ',', '//', '/*', '*/', '\r']),
+        max_size=60
+    ).map(''.join))
+    @settings(max_examples=500, deadline=None)
+    def test_matches_reference_on_arbitrary_input(self, content):
+        """Поведение совпадает с эталоном, в том числе на некорректном JSONC."""
+        assert strip_json_comments(content) == _reference_strip_json_comments(content)
+
+
+@pytest.mark.benchmark
+class TestStripJsonCommentsBenchmark:
+    """Время разбора большого конфига."""
+
+    def test_large_config_parse_time(self):
+        content = _large_config()
+        assert len(content) > 300_000
+
+        def best_of(func, runs=5):
+            best = float("inf")
+            for _ in range(runs):
+                started = time.perf_counter()
+                func(content)
+                best = min(best, time.perf_counter() - started)
+            return best
+
+        fast = best_of(strip_json_comments)
+        reference = best_of(_reference_strip_json_comments, runs=2)
+
+        assert fast * 3 < reference
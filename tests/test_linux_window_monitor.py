@@ -0,0 +1,333 @@
+"""
+Unit-тесты для мониторинга активного окна в Linux.
+
+X сервер в тестах заменяется двойником Xlib дисплея: события
+PropertyNotify приходят через pipe, как через сокет X соединения, и,
+как в python-xlib, чтение свойств забирает пришедшие события из сокета
+во внутреннюю очередь.
+Проверяет отслеживание фокуса и заголовка, доставку изменений в GUI
+поток, переход на опрос xdotool и стоимость CPU на минуту мониторинга.
+"""
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from services import linux_window_monitor
+from services.linux_window_monitor import LinuxWindowMonitor, X11ActiveWindowWatcher
+
+
+class FakeWindow:
+    """Окно X11 со свойствами."""
+
+    def __init__(self, display, window_id):
+        self.display = display
+        self.id = window_id
+        self.properties = {}
+        self.event_mask = 0
+
+    def __eq__(self, other):
+        return isinstance(other, FakeWindow) and other.id == self.id
+
+    def __hash__(self):
+        return self.id
+
+    def get_full_property(self, atom, property_type):
+        value = self.properties.get(atom)
+        self.display.property_read(self, atom)
+        return None if value is None else SimpleNamespace(value=value)
+
+    def change_attributes(self, event_mask):
+        self.event_mask = event_mask
+
+
+class FakeDisplay:
+    """Двойник Xlib Display: очередь событий и pipe вместо сокета."""
+
+    def __init__(self):
+        self._atoms = {}
+        self._socket = []
+        self._event_queue = []
+        self._lock = threading.Lock()
+        self._read_fd, self._write_fd = os.pipe()
+        self.windows = {}
+        self.root = self.window(1)
+        self.closed = False
+        self.broken = False
+        self.on_property_read = None
+
+    def window(self, window_id, title=None, pid=None):
+        window = self.windows.setdefault(window_id, FakeWindow(self, window_id))
+        if title is not None:
+            window.properties[self.intern_atom('_NET_WM_NAME')] = title.encode('utf-8')
+        if pid is not None:
+            window.properties[self.intern_atom('_NET_WM_PID')] = [pid]
+        return window
+
+    def intern_atom(self, name):
+        return self._atoms.setdefault(name, len(self._atoms) + 100)
+
+    def screen(self):
+        return SimpleNamespace(root=self.root)
+
+    def create_resource_object(self, kind, window_id):
+        return self.window(window_id)
+
+    def fileno(self):
+        return self._read_fd
+
+    def flush(self):
+        pass
+
+    def _read_socket(self):
+        """Забирает все пришедшие события из сокета в очередь."""
+        with self._lock:
+            while self._socket:
+                os.read(self._read_fd, 1)
+                self._event_queue.append(self._socket.pop(0))
+
+    def property_read(self, window, atom):
+        """Ответ на запрос свойства читается вместе с пришедшими событиями."""
+        callback, self.on_property_read = self.on_property_read, None
+        if callback is not None and not callback(window, atom):
+            self.on_property_read = callback
+        self._read_socket()
+
+    def pending_events(self):
+        if self.broken:
+            raise ConnectionError("X connection lost")
+        self._read_socket()
+        return len(self._event_queue)
+
+    def next_event(self):
+        if not self._event_queue:
+            os.read(self._read_fd, 1)
+            with self._lock:
+                self._event_queue.append(self._socket.pop(0))
+        return self._event_queue.pop(0)
+
+    def break_connection(self):
+        self.broken = True
+        os.write(self._write_fd, b'\0')
+
+    def close(self):
+        self.closed = True
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+    def send_property_event(self, window, name):
+        with self._lock:
+            self._socket.append(SimpleNamespace(type=28, atom=self.intern_atom(name), window=window))
+            os.write(self._write_fd, b'\0')
+
+    def focus(self, window_id, title, pid):
+        self.window(window_id, title, pid)
+        self.root.properties[self.intern_atom('_NET_ACTIVE_WINDOW')] = [window_id]
+        self.send_property_event(self.root, '_NET_ACTIVE_WINDOW')
+
+    def rename(self, window_id, title):
+        window = self.window(window_id, title)
+        self.send_property_event(window, '_NET_WM_NAME')
+
+
+@pytest.fixture
+def display():
+    fake = FakeDisplay()
+    fake.window(10, "Editor", 1000)
+    fake.root.properties[fake.intern_atom('_NET_ACTIVE_WINDOW')] = [10]
+    return fake
+
+
+class TestX11ActiveWindowWatcher:
+    """Тесты потока событий X11."""
+
+    def _changes(self, watcher):
+        changes = []
+        watcher.window_changed.connect(lambda title, pid: changes.append((title, pid)),
+                                       linux_window_monitor.Qt.ConnectionType.DirectConnection)
+        return changes
+
+    def _wait_for(self, changes, count):
+        deadline = time.monotonic() + 2
+        while len(changes) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_focus_and_title_changes_are_emitted(self, qapp, display):
+        watcher = X11ActiveWindowWatcher(display)
+        changes = self._changes(watcher)
+        watcher.start()
+        self._wait_for(changes, 1)
+
+        display.focus(20, "Browser", 2000)
+        self._wait_for(changes, 2)
+        display.rename(20, "Browser - new tab")
+        self._wait_for(changes, 3)
+        watcher.stop()
+
+        assert changes == [("Editor", 1000), ("Browser", 2000), ("Browser - new tab", 2000)]
+        assert display.root.event_mask and display.windows[20].event_mask
+        assert display.closed
+
+    def test_only_real_changes_are_emitted(self, qapp, display):
+        watcher = X11ActiveWindowWatcher(display)
+        changes = self._changes(watcher)
+        watcher.start()
+        self._wait_for(changes, 1)
+
+        # Фокус на то же окно, заголовок неактивного окна, чужое свойство
+        display.focus(10, "Editor", 1000)
+        display.rename(30, "Background window")
+        display.send_property_event(display.root, '_NET_CLIENT_LIST')
+        display.focus(20, "Browser", 2000)
+        self._wait_for(changes, 2)
+        watcher.stop()
+
+        assert changes == [("Editor", 1000), ("Browser", 2000)]
+
+    def test_focus_change_during_property_reads(self, qapp, display):
+        """Событие, прочитанное вместе с ответом на запрос свойства, не теряется."""
+        watcher = X11ActiveWindowWatcher(display)
+        changes = self._changes(watcher)
+        watcher.start()
+        self._wait_for(changes, 1)
+
+        pid_atom = display.intern_atom('_NET_WM_PID')
+
+        def alt_tab(window, atom):
+            # Пока читается PID нового окна, фокус уходит дальше
+            if window.id != 20 or atom != pid_atom:
+                return False
+            display.focus(30, "Terminal", 3000)
+            return True
+
+        display.on_property_read = alt_tab
+        display.focus(20, "Browser", 2000)
+        self._wait_for(changes, 3)
+        watcher.stop()
+
+        assert changes == [("Editor", 1000), ("Browser", 2000), ("Terminal", 3000)]
+
+
+class TestLinuxWindowMonitorBackends:
+    """Тесты выбора бэкенда и доставки изменений."""
+
+    def test_events_are_delivered_in_gui_thread(self, qtbot, display):
+        monitor = LinuxWindowMonitor()
+        received = []
+
+        def callback(info):
+            received.append((info.title, info.process_id, threading.current_thread() is threading.main_thread()))
+
+        with patch.object(monitor, '_open_display', return_value=display):
+            monitor.start_monitoring(callback)
+        qtbot.waitUntil(lambda: len(received) == 1)
+        display.focus(20, "Browser", 2000)
+        qtbot.waitUntil(lambda: len(received) == 2)
+        monitor.stop_monitoring()
+
+        assert received == [("Editor", 1000, True), ("Browser", 2000, True)]
+        assert monitor._timer is None
+
+    def test_falls_back_to_polling_when_connection_fails(self, qtbot, display):
+        monitor = LinuxWindowMonitor()
+        monitor._check_active_window = lambda: None
+
+        with patch.object(monitor, '_open_display', return_value=display):
+            monitor.start_monitoring(lambda info: None)
+        display.break_connection()
+        qtbot.waitUntil(lambda: monitor._timer is not None)
+
+        assert monitor._watcher is None
+        assert monitor._timer.interval() == 200
+        assert display.closed
+        monitor.stop_monitoring()
+
+    def test_falls_back_to_polling_without_xlib(self, qapp):
+        monitor = LinuxWindowMonitor()
+
+        with patch.object(linux_window_monitor, 'XLIB_AVAILABLE', False):
+            monitor.start_monitoring(lambda info: None)
+
+        assert monitor._watcher is None
+        assert monitor._timer is not None and monitor._timer.interval() == 200
+        monitor.stop_monitoring()
+
+    def test_target_read_from_watcher_in_worker_thread(self, qtbot, display):
+        monitor = LinuxWindowMonitor()
+        received = []
+        targets = []
+
+        with patch.object(monitor, '_open_display', return_value=display), \
+                patch.object(monitor, '_query_process_name', return_value="browser"), \
+                patch.object(linux_window_monitor.subprocess, 'run') as run:
+            monitor.start_monitoring(received.append)
+            qtbot.waitUntil(lambda: len(received) == 1)
+            display.focus(20, "Browser", 2000)
+            qtbot.waitUntil(lambda: len(received) == 2)
+            worker = threading.Thread(target=lambda: targets.append(monitor.get_active_window_target()))
+            worker.start()
+            worker.join()
+            monitor.stop_monitoring()
+
+        run.assert_not_called()
+        assert [(t.title, t.process_name, t.process_id, t.icon) for t in targets] == [
+            ("Browser", "browser", 2000, None)
+        ]
+
+    def test_process_name_and_icon_cached_across_events(self, qtbot, display):
+        monitor = LinuxWindowMonitor()
+        received = []
+
+        with patch.object(monitor, '_open_display', return_value=display), \
+                patch.object(monitor, '_query_process_name', return_value="editor") as query:
+            monitor.start_monitoring(received.append)
+            qtbot.waitUntil(lambda: len(received) == 1)
+            for i in range(3):
+                display.rename(10, f"Editor - file{i}")
+                qtbot.waitUntil(lambda: len(received) == i + 2)
+            monitor.stop_monitoring()
+
+        query.assert_called_once_with(1000)
+        assert monitor.get_cache_stats()["process_names"]["hits"] == 3
+
+
+@pytest.mark.benchmark
+class TestMonitoringBenchmark:
+    """CPU на минуту мониторинга: события X11 против опроса xdotool."""
+
+    def test_cpu_per_minute(self, qapp, display, tmp_path, monkeypatch):
+        # xdotool, который сразу отвечает: стоимость опроса - только запуск процессов
+        script = tmp_path / "xdotool"
+        script.write_text('#!/bin/sh\ncase "$1" in\n  getactivewindow) echo 10 ;;\n'
+                          '  getwindowname) echo Editor ;;\n  getwindowpid) echo 1000 ;;\nesac\n')
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+        polling = LinuxWindowMonitor()
+        polling._get_app_icon = lambda name, pid: None
+        ticks = 20
+        cpu_before, children_before = time.process_time(), os.times()
+        for _ in range(ticks):
+            polling._check_active_window()
+        children_after = os.times()
+        polling_cpu = (time.process_time() - cpu_before
+                       + children_after.children_user - children_before.children_user
+                       + children_after.children_system - children_before.children_system)
+        polling_per_minute = polling_cpu / ticks * 300  # 5 опросов в секунду
+
+        watcher = X11ActiveWindowWatcher(display)
+        watcher.start()
+        idle_seconds = 1.0
+        cpu_before = time.process_time()
+        for i in range(2):
+            display.focus(20 + i, f"Window {i}", 2000 + i)
+            time.sleep(idle_seconds / 2)
+        events_cpu = time.process_time() - cpu_before
+        watcher.stop()
+        events_per_minute = events_cpu / idle_seconds * 60
+
+        assert events_per_minute * 10 < polling_per_minute
@@ -0,0 +1,144 @@
+"""
+Unit-тесты для оценки уровня фонового шума (services.noise_floor).
+
+Проверяет точность P² квантиля, калибровку и отслеживание уровня шума,
+адаптивный порог SilenceDetector и сигнал noise_floor_updated.
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from services.noise_floor import NoiseFloorEstimator, P2Quantile
+from services.silence_detector import SilenceDetector
+
+CHUNK_SECONDS = 1024 / 16000
+
+
+def _feed(estimator: NoiseFloorEstimator, levels, start: float = 0.0) -> float:
+    """Подает RMS чанков с шагом в один чанк и возвращает время последнего."""
+    timestamp = start
+    for rms in levels:
+        timestamp += CHUNK_SECONDS
+        estimator.update(float(rms), timestamp)
+    return timestamp
+
+
+class TestP2Quantile:
+    """Тесты инкрементального квантиля."""
+
+    @pytest.mark.parametrize("p", [0.1, 0.25, 0.5, 0.9])
+    def test_close_to_exact_quantile(self, p):
+        values = np.random.default_rng(0).lognormal(size=5000)
+        quantile = P2Quantile(p)
+        for value in values:
+            quantile.add(value)
+
+        assert quantile.value == pytest.approx(np.quantile(values, p), rel=0.05)
+
+    @given(st.lists(st.floats(min_value=0, max_value=1, allow_nan=False), min_size=1, max_size=200))
+    @settings(max_examples=100, deadline=None)
+    def test_estimate_within_observed_range(self, values):
+        quantile = P2Quantile(0.1)
+        for value in values:
+            quantile.add(value)
+
+        assert min(values) <= quantile.value <= max(values)
+
+    def test_invalid_quantile(self):
+        with pytest.raises(ValueError):
+            P2Quantile(1.0)
+
+
+class TestNoiseFloorEstimator:
+    """Тесты калибровки и отслеживания уровня шума."""
+
+    def test_calibrates_after_first_milliseconds(self):
+        estimator = NoiseFloorEstimator(calibration_ms=500)
+        rng = np.random.default_rng(1)
+
+        _feed(estimator, 0.01 + rng.random(7) * 0.002)
+        assert not estimator.calibrated
+
+        _feed(estimator, 0.01 + rng.random(2) * 0.002, start=7 * CHUNK_SECONDS)
+        assert estimator.calibrated
+        assert estimator.level == pytest.approx(0.0105, abs=0.001)
+
+    def test_ignores_speech(self):
+        estimator = NoiseFloorEstimator()
+        rng = np.random.default_rng(2)
+        # Речь 80% времени, паузы с шумом 0.005
+        levels = np.where(rng.random(300) < 0.8, rng.uniform(0.05, 0.3, 300), 0.005)
+
+        _feed(estimator, levels)
+
+        assert estimator.level == pytest.approx(0.005, rel=0.2)
+
+    def test_follows_changing_noise(self):
+        estimator = NoiseFloorEstimator(window_seconds=5.0)
+        end = _feed(estimator, np.full(100, 0.004))
+        assert estimator.level == pytest.approx(0.004)
+
+        # Включили вентилятор
+        _feed(estimator, np.full(400, 0.03), start=end)
+
+        assert estimator.level == pytest.approx(0.03, rel=0.05)
+
+    def test_update_reports_changes_only(self):
+        estimator = NoiseFloorEstimator(calibration_ms=0)
+
+        assert estimator.update(0.01, 0.0)
+        assert not estimator.update(0.0101, 0.064)
+
+    def test_reset(self):
+        estimator = NoiseFloorEstimator()
+        _feed(estimator, np.full(20, 0.02))
+
+        estimator.reset()
+
+        assert not estimator.calibrated
+
+
+class TestSilenceDetectorNoiseFloor:
+    """Тесты порога тишины по живой оценке шума."""
+
+    def test_threshold_follows_noisy_room(self):
+        detector = SilenceDetector(threshold=0.02, noise_floor=NoiseFloorEstimator())
+        assert detector._get_effective_threshold() == 0.02
+
+        _feed(detector.noise_floor, np.full(20, 0.03))
+
+        assert detector._get_effective_threshold() == pytest.approx(0.06)
+
+    def test_threshold_lowered_in_quiet_room(self):
+        detector = SilenceDetector(threshold=0.02, noise_floor=NoiseFloorEstimator())
+
+        _feed(detector.noise_floor, np.full(20, 0.001))
+
+        assert detector._get_effective_threshold() == pytest.approx(0.01)
+
+    def test_noisy_room_stops_after_speech(self):
+        """Шум выше базового порога больше не мешает остановке."""
+        detector = SilenceDetector(threshold=0.02, silence_duration=1.0, noise_floor=NoiseFloorEstimator())
+        rng = np.random.default_rng(3)
+        levels = np.concatenate([rng.uniform(0.025, 0.035, 10), np.full(30, 0.2), rng.uniform(0.025, 0.035, 40)])
+
+        stopped_at = None
+        for i, rms in enumerate(levels):
+            timestamp = (i + 1) * CHUNK_SECONDS
+            detector.noise_floor.update(rms, timestamp)
+            if detector.update(rms, timestamp):
+                stopped_at = timestamp
+                break
+
+        # Речь закончилась на 40-м чанке, тишина - 1 с после нее
+        assert stopped_at == pytest.approx(40 * CHUNK_SECONDS + 1.0, abs=2 * CHUNK_SECONDS)
+
+    def test_reset_restarts_calibration(self):
+        detector = SilenceDetector(noise_floor=NoiseFloorEstimator())
+        _feed(detector.noise_floor, np.full(20, 0.03))
+
+        detector.reset()
+
+        assert not detector.noise_floor.calibrated
+        assert detector._get_effective_threshold() == detector.threshold
@@ -0,0 +1,194 @@
+"""
+Unit-тесты для спекулятивной транскрипции сегментов во время записи.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from services.audio_payload import AudioPayload
+from services.speculative_transcription import PauseSegmenter, SpeculativeTranscriber
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 200 * t) * 10000).astype(np.int16)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.int16)
+
+
+def _feed(segmenter, levels, step=0.05):
+    """Подает уровни громкости с шагом step, возвращает закрытые сегменты."""
+    segments = []
+    for i, rms in enumerate(levels):
+        timestamp = i * step
+        position = int((i + 1) * step * SAMPLE_RATE)
+        segment = segmenter.update(rms, timestamp, position)
+        if segment is not None:
+            segments.append(segment)
+    return segments
+
+
+class TestPauseSegmenter:
+    """Тесты деления записи на сегменты по паузам."""
+
+    def test_pause_after_speech_closes_segment(self):
+        segmenter = PauseSegmenter(threshold=0.02, pause_seconds=0.5, min_segment_seconds=1.0)
+        levels = [0.1] * 40 + [0.0] * 12
+
+        segments = _feed(segmenter, levels)
+
+        assert len(segments) == 1
+        start, end = segments[0]
+        assert start == 0
+        # Разрез в середине паузы: после 2с речи, до конца 0.5с паузы
+        assert 2.0 * SAMPLE_RATE <= end <= 2.5 * SAMPLE_RATE
+        assert segmenter.segment_start == end
+
+    def test_continued_silence_does_not_close_new_segment(self):
+        segmenter = PauseSegmenter(threshold=0.02, pause_seconds=0.5, min_segment_seconds=1.0)
+        levels = [0.1] * 40 + [0.0] * 100
+
+        assert len(_feed(segmenter, levels)) == 1
+
+    def test_next_phrase_starts_where_previous_ended(self):
+        segmenter = PauseSegmenter(threshold=0.02, pause_seconds=0.5, min_segment_seconds=1.0)
+        levels = ([0.1] * 40 + [0.0] * 12) * 2
+
+        segments = _feed(segmenter, levels)
+
+        assert len(segments) == 2
+        assert segments[1][0] == segments[0][1]
+
+    def test_short_phrase_is_not_closed(self):
+        segmenter = PauseSegmenter(threshold=0.02, pause_seconds=0.5, min_segment_seconds=3.0)
+        levels = [0.1] * 20 + [0.0] * 12
+
+        assert _feed(segmenter, levels) == []
+
+
+class TestSpeculativeTranscriber:
+    """Тесты фоновой транскрипции сегментов."""
+
+    def _transcriber(self, client, **kwargs):
+        transcriber = SpeculativeTranscriber(provider="groq", api_key="key", **kwargs)
+        transcriber._client = client
+        return transcriber
+
+    def test_segments_are_sent_before_finish(self):
+        """Сегменты уходят на транскрипцию сразу, до остановки записи."""
+        sent = threading.Event()
+        client = Mock()
+        client.transcribe_audio.side_effect = lambda payload: sent.set() or "first"
+        transcriber = self._transcriber(client)
+
+        transcriber.submit(AudioPayload(pcm=_tone(1).tobytes()))
+
+        assert sent.wait(timeout=5)
+        assert transcriber.committed_frames == SAMPLE_RATE
+        transcriber.cancel()
+
+    def test_finish_sends_only_remainder(self):
+        """После остановки отправляется только остаток записи."""
+        first, second = _tone(2), _tone(1)
+        recording = AudioPayload(pcm=np.concatenate([first, second]).tobytes())
+        client = Mock()
+        client.transcribe_audio.side_effect = ["Hello there.", "How are you?"]
+        transcriber = self._transcriber(client)
+
+        transcriber.submit(recording.with_pcm(first.tobytes()))
+        text = transcriber.finish(recording)
+
+        assert text == "Hello there. How are you?"
+        remainder = client.transcribe_audio.call_args_list[1][0][0]
+        assert remainder.pcm == second.tobytes()
+
+    def test_silent_remainder_is_skipped(self):
+        speech = _tone(2)
+        recording = AudioPayload(pcm=np.concatenate([speech, _silence(1)]).tobytes())
+        client = Mock()
+        client.transcribe_audio.return_value = "only phrase"
+        transcriber = self._transcriber(client)
+
+        transcriber.submit(recording.with_pcm(speech.tobytes()))
+
+        assert transcriber.finish(recording) == "only phrase"
+        assert client.transcribe_audio.call_count == 1
+
+    def test_segments_are_trimmed_when_requested(self):
+        client = Mock()
+        client.transcribe_audio.return_value = "text"
+        transcriber = self._transcriber(client, trim_threshold=0.02, padding_ms=100)
+        segment = np.concatenate([_tone(1), _silence(1)])
+
+        transcriber.submit(AudioPayload(pcm=segment.tobytes()))
+        transcriber.finish(AudioPayload(pcm=segment.tobytes()))
+
+        assert transcriber.removed_silence > 0.5
+        assert client.transcribe_audio.call_args[0][0].duration < 2.0
+
+    def test_segment_error_is_raised_on_finish(self):
+        client = Mock()
+        client.transcribe_audio.side_effect = RuntimeError("boom")
+        transcriber = self._transcriber(client)
+        recording = AudioPayload(pcm=_tone(1).tobytes())
+
+        transcriber.submit(recording)
+
+        with pytest.raises(RuntimeError):
+            transcriber.finish(recording)
+
+
+class TestTranscriptionThreadSpeculative:
+    """Тесты сборки результата в TranscriptionThread."""
+
+    def _run_thread(self, speculative, payload):
+        from services.transcription_client import TranscriptionThread
+
+        config = Mock()
+        config.manual_stop = False
+        config.keep_recordings = False
+        config.upload_format = "wav"
+        config.chunk_max_seconds = 0
+
+        results = []
+        with patch('core.config.Config.snapshot', return_value=config), \
+                patch('services.transcription_client.TranscriptionClient') as MockClient:
+            full_client = Mock()
+            full_client.transcribe_audio.return_value = "full recording"
+            MockClient.return_value = full_client
+
+            thread = TranscriptionThread(payload, provider="groq", api_key="key", speculative=speculative)
+            thread.transcription_raw_complete.connect(results.append)
+            thread.run()
+        return results, full_client, thread
+
+    def test_assembled_text_feeds_raw_complete(self):
+        payload = AudioPayload(pcm=_tone(2).tobytes())
+        speculative = Mock()
+        speculative.submitted = 1
+        speculative.removed_silence = 0.0
+        speculative.finish.return_value = "assembled text"
+
+        results, full_client, thread = self._run_thread(speculative, payload)
+
+        assert results == ["assembled text"]
+        full_client.transcribe_audio.assert_not_called()
+        assert thread.transcription_client is speculative.client
+
+    def test_falls_back_to_full_recording_on_error(self):
+        payload = AudioPayload(pcm=_tone(2).tobytes())
+        speculative = Mock()
+        speculative.submitted = 1
+        speculative.finish.side_effect = RuntimeError("segment failed")
+
+        results, full_client, _ = self._run_thread(speculative, payload)
+
+        assert results == ["full recording"]
+        full_client.transcribe_audio.assert_called_once()
@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import Mock, MagicMock
 from hypothesis import given, strategies as st, settings
 from PyQt6.QtCore import QObject
+from core.recording_context import RecordingContext
 from core.state_manager import StateManager, AppState
 
 
@@ -757,6 +758,50 @@ class TestSessionLifecycle:
         assert manager.get_current_session_id() is None
 
 
+class TestRecordingContext:
+    """Tests for the target window captured at record start"""
+    
+    def _context(self, session_id):
+        return RecordingContext(
+            session_id=session_id,
+            window_title="Notes - Notion",
+            process_name="notion.exe",
+            process_id=42,
+            format_type="notion"
+        )
+    
+    def test_context_travels_with_session(self):
+        """Test that the context is available until the session ends"""
+        manager = StateManager()
+        session_id = manager.start_recording_session()
+        
+        manager.set_recording_context(self._context(session_id))
+        assert manager.get_recording_context().format_type == "notion"
+        
+        manager.end_recording_session()
+        assert manager.get_recording_context() is None
+    
+    def test_context_of_finished_session_is_ignored(self):
+        """Test that a late capture does not leak into the next session"""
+        manager = StateManager()
+        old_session = manager.start_recording_session()
+        manager.end_recording_session()
+        manager.start_recording_session()
+        
+        manager.set_recording_context(self._context(old_session))
+        
+        assert manager.get_recording_context() is None
+    
+    def test_new_session_does_not_see_previous_context(self):
+        """Test that a new session starts without a context"""
+        manager = StateManager()
+        manager.set_recording_context(self._context(manager.start_recording_session()))
+        
+        manager.start_recording_session()
+        
+        assert manager.get_recording_context() is None
+
+
 class TestStorageErrorHandling:
     """Tests for error handling in storage operations (Task 2.5)"""
     
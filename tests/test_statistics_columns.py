@@ -0,0 +1,206 @@
+"""
+Unit tests for the columnar storage of statistics events.
+
+Covers conversion between events and columns, vectorized daily rollups
+and a load time / memory benchmark against the event-list format.
+"""
+
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core import statistics_manager
+from core.statistics_manager import (
+    AggregatedStats,
+    EventColumns,
+    EventType,
+    StatisticsEvent,
+    StatisticsManager,
+    TimePeriod,
+)
+
+
+def _sample_events():
+    now = datetime(2025, 3, 10, 14, 30, 15, 123456)
+    return [
+        StatisticsEvent(type=EventType.RECORDING, timestamp=now, duration_seconds=12.5),
+        StatisticsEvent(
+            type=EventType.TRANSCRIPTION,
+            timestamp=now + timedelta(seconds=3),
+            duration_seconds=12.5,
+            character_count=0,
+            word_count=0
+        ),
+        StatisticsEvent(
+            type=EventType.SILENCE_REMOVED,
+            timestamp=now - timedelta(days=400),
+            removed_duration_seconds=1.25
+        ),
+    ]
+
+
+def _columns_json(count):
+    """Columns of statistics.json with synthetic events over two years."""
+    start = int((datetime(2024, 1, 1) - datetime(1970, 1, 1)).total_seconds() * 1_000_000)
+    rng = np.random.default_rng(0)
+    types = rng.integers(0, 3, count)
+    return {
+        'type': types.tolist(),
+        'timestamp': (start + np.sort(rng.integers(0, 2 * 365 * 86_400_000_000, count))).tolist(),
+        'duration_seconds': np.where(types < 2, rng.uniform(1, 60, count).round(3), -1).tolist(),
+        'character_count': np.where(types == 1, rng.integers(0, 500, count), -1).tolist(),
+        'word_count': np.where(types == 1, rng.integers(0, 80, count), -1).tolist(),
+        'removed_duration_seconds': np.where(types == 2, rng.uniform(0, 5, count).round(3), -1).tolist(),
+    }
+
+
+class TestEventColumns:
+    """Tests for EventColumns."""
+
+    def test_events_round_trip(self):
+        events = _sample_events()
+
+        columns = EventColumns.from_events(events)
+
+        assert len(columns) == 3
+        assert columns.to_events() == events
+
+    def test_json_round_trip(self):
+        columns = EventColumns.from_events(_sample_events())
+
+        restored = EventColumns.from_json(json.loads(json.dumps(columns.to_json())))
+
+        assert restored.to_events() == _sample_events()
+
+    def test_append_grows_columns(self):
+        columns = EventColumns()
+        event = _sample_events()[0]
+        for _ in range(3000):
+            columns.append(event)
+
+        assert len(columns) == 3000
+        assert columns.event(2999) == event
+
+    def test_unknown_event_types_are_dropped(self):
+        data = EventColumns.from_events(_sample_events()).to_json()
+        data['type'][1] = 7
+
+        columns = EventColumns.from_json(data)
+
+        assert [event.type for event in columns.to_events()] == [EventType.RECORDING, EventType.SILENCE_REMOVED]
+
+    @pytest.mark.parametrize("column, values", [
+        ('word_count', None),
+        ('duration_seconds', [1.0]),
+        ('type', ['recording', 'transcription', 'silence_removed']),
+    ])
+    def test_malformed_columns_raise(self, column, values):
+        data = EventColumns.from_events(_sample_events()).to_json()
+        data[column] = values
+
+        with pytest.raises(ValueError):
+            EventColumns.from_json(data)
+
+    def test_daily_rollups_match_event_aggregation(self):
+        columns = EventColumns.from_json(_columns_json(5000))
+
+        expected = {}
+        for event in columns.to_events():
+            stats = expected.setdefault(event.timestamp.date(), AggregatedStats())
+            StatisticsManager._accumulate(stats, event)
+
+        rollups = columns.daily_rollups()
+
+        assert rollups.keys() == expected.keys()
+        for day, stats in expected.items():
+            assert rollups[day].recordings_count == stats.recordings_count
+            assert rollups[day].total_word_count == stats.total_word_count
+            assert rollups[day].total_recording_time_seconds == pytest.approx(stats.total_recording_time_seconds)
+            assert rollups[day].total_removed_silence_seconds == pytest.approx(stats.total_removed_silence_seconds)
+
+
+class TestColumnarStorage:
+    """Tests for the columnar statistics.json."""
+
+    def test_invalid_columns_start_empty(self, tmp_path):
+        (tmp_path / "statistics.json").write_text(json.dumps({
+            'version': statistics_manager.STORAGE_VERSION,
+            'columns': {'type': [0]}
+        }), encoding='utf-8')
+
+        manager = StatisticsManager(tmp_path)
+
+        assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 0
+        manager.track_recording(1.0)
+        manager.flush()
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+
+    def test_rows_that_do_not_fit_columns_are_skipped(self, tmp_path):
+        def row(timestamp, duration=2.0):
+            return {'type': 'recording', 'timestamp': timestamp, 'duration_seconds': duration}
+
+        aware = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        (tmp_path / "statistics.json").write_text(json.dumps({'events': [
+            row('2024-01-01T10:00:00'),
+            row(aware.isoformat()),
+            row('2024-01-01T11:00:00', duration='3.5'),
+            row('2024-01-01T12:00:00', duration='long'),
+            row(1704103200),
+            row('2024-01-01T13:00:00', duration=[1]),
+        ]}), encoding='utf-8')
+
+        manager = StatisticsManager(tmp_path)
+        events = manager.events
+
+        assert [event.duration_seconds for event in events] == [2.0, 2.0, 3.5]
+        assert events[1].timestamp == aware.astimezone().replace(tzinfo=None)
+        assert manager.get_statistics(TimePeriod.ALL_TIME).total_recording_time_seconds == 7.5
+
+    @pytest.mark.benchmark
+    def test_load_is_faster_and_smaller_than_event_list(self, tmp_path):
+        count = 200_000
+        columns_data = _columns_json(count)
+        columnar = EventColumns.from_json(columns_data)
+        (tmp_path / "statistics.json").write_text(json.dumps({
+            'version': statistics_manager.STORAGE_VERSION,
+            'journal_id': None,
+            'columns': columns_data
+        }), encoding='utf-8')
+        legacy_path = tmp_path / "legacy.json"
+        legacy_path.write_text(json.dumps({
+            'events': StatisticsManager._serialize_events(None, columnar.to_events())
+        }), encoding='utf-8')
+
+        # The initial load runs on the writer thread; time only the snapshot read
+        manager = StatisticsManager(tmp_path)
+        manager._ensure_loaded()
+
+        def load_columns():
+            manager._load_snapshot()
+            return manager._columns
+
+        def load_event_list():
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                return StatisticsManager._deserialize_events(None, json.load(f)['events'])
+
+        def measure(load):
+            started = time.perf_counter()
+            result = load()
+            elapsed = time.perf_counter() - started
+            del result
+            tracemalloc.start()
+            result = load()
+            retained = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return result, elapsed, retained
+
+        loaded, columns_time, columns_memory = measure(load_columns)
+        events, events_time, events_memory = measure(load_event_list)
+
+        assert len(loaded) == len(events) == count
+        assert columns_time * 3 < events_time
+        assert columns_memory * 5 < events_memory
@@ -0,0 +1,301 @@
+"""
+Unit tests for the Statistics Manager append-only journal.
+
+Covers appending without rewriting statistics.json, compaction,
+migration of the old statistics.json format and crash recovery.
+"""
+
+import json
+import threading
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from core import statistics_manager
+from core.statistics_manager import EventType, StatisticsManager, TimePeriod
+
+
+def _legacy_file(path, count):
+    """Write statistics.json in the old indented format."""
+    events = [
+        {
+            'type': 'recording',
+            'timestamp': datetime(2024, 1, 1, 12, 0, i).isoformat(),
+            'duration_seconds': 2.0,
+            'character_count': None,
+            'word_count': None,
+            'removed_duration_seconds': None
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps({'events': events}, indent=2), encoding='utf-8')
+
+
+def _journal_lines(manager):
+    return manager.journal_path.read_text(encoding='utf-8').splitlines()
+
+
+class TestStatisticsJournal:
+    """Tests for journal appends and compaction."""
+
+    def test_event_is_appended_without_rewriting_snapshot(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.flush()
+        manager._save_to_storage()
+        snapshot = manager.storage_path.read_bytes()
+
+        manager.track_recording(2.0)
+        manager.track_transcription(2.0, "hello world")
+        manager.flush()
+
+        assert manager.storage_path.read_bytes() == snapshot
+        lines = _journal_lines(manager)
+        assert 'journal_id' in json.loads(lines[0])
+        assert [json.loads(line)['type'] for line in lines[1:]] == ['recording', 'transcription']
+
+    def test_reload_combines_snapshot_and_journal(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.flush()
+        manager._save_to_storage()
+        manager.track_recording(2.0)
+        manager.track_silence_removal(0.5)
+        manager.flush()
+
+        stats = StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME)
+
+        assert stats.recordings_count == 2
+        assert stats.total_recording_time_seconds == pytest.approx(3.0)
+        assert stats.total_removed_silence_seconds == pytest.approx(0.5)
+
+    def test_journal_is_compacted_at_threshold(self, tmp_path):
+        with patch.object(statistics_manager, 'JOURNAL_COMPACT_EVENTS', 3):
+            manager = StatisticsManager(tmp_path)
+            for _ in range(4):
+                manager.track_recording(1.0)
+                manager.flush()
+
+        data = json.loads(manager.storage_path.read_text(encoding='utf-8'))
+        assert len(data['columns']['type']) == 3
+        assert len(_journal_lines(manager)) == 2
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 4
+
+
+class TestStatisticsMigration:
+    """Tests for migrating the old statistics.json format."""
+
+    def test_legacy_file_is_migrated_on_first_load(self, tmp_path):
+        _legacy_file(tmp_path / "statistics.json", 5)
+
+        manager = StatisticsManager(tmp_path)
+        stats = manager.get_statistics(TimePeriod.ALL_TIME)
+
+        data = json.loads(manager.storage_path.read_text(encoding='utf-8'))
+        assert stats.recordings_count == 5
+        assert data['version'] == statistics_manager.STORAGE_VERSION
+        assert len(data['columns']['type']) == 5
+        assert '\n' not in manager.storage_path.read_text(encoding='utf-8')
+
+    def test_migrated_history_keeps_new_events(self, tmp_path):
+        _legacy_file(tmp_path / "statistics.json", 2)
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.close()
+
+        stats = StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME)
+
+        assert stats.recordings_count == 3
+
+
+class TestStatisticsCrashRecovery:
+    """Tests for recovering from interrupted writes."""
+
+    def test_torn_last_line_is_skipped_and_repaired(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.track_recording(2.0)
+        manager.flush()
+        with open(manager.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "recording", "timest')
+
+        recovered = StatisticsManager(tmp_path)
+        assert recovered.get_statistics(TimePeriod.ALL_TIME).recordings_count == 2
+
+        recovered.track_recording(3.0)
+        recovered.flush()
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 3
+
+    def test_compaction_interrupted_before_journal_reset(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.track_recording(2.0)
+        manager.flush()
+        journal = manager.journal_path.read_bytes()
+
+        # Crash after statistics.json was replaced but before the journal was reset
+        with patch.object(StatisticsManager, '_start_journal'):
+            manager._save_to_storage()
+        assert manager.journal_path.read_bytes() == journal
+
+        events = StatisticsManager(tmp_path)
+        events._ensure_loaded()
+
+        assert len(events.events) == 2
+        assert all(event.type == EventType.RECORDING for event in events.events)
+        assert len(_journal_lines(events)) == 1
+
+    def test_leftover_temp_file_is_ignored(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.flush()
+        (tmp_path / "statistics.json.tmp").write_text('{"events": [', encoding='utf-8')
+
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+
+
+class TestBackgroundWriter:
+    """Tests for non-blocking tracking and the background writer."""
+
+    def test_tracking_does_not_touch_storage(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager._ensure_loaded()
+        with patch.object(StatisticsManager, '_load_from_storage') as load, \
+                patch.object(StatisticsManager, '_append_to_journal') as append, \
+                patch.object(statistics_manager, 'FLUSH_DELAY_SECONDS', 60):
+            manager.track_recording(1.0)
+            manager.track_transcription(1.0, "text")
+
+            load.assert_not_called()
+            append.assert_not_called()
+        manager._closing.set()
+        manager._writer.join(timeout=5)
+
+    def test_writer_batches_events_into_one_write(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        writes = []
+        original = manager._append_to_journal
+        manager._append_to_journal = lambda events: writes.append(len(events)) or original(events)
+
+        for _ in range(5):
+            manager.track_recording(1.0)
+        manager._writer.join(timeout=5)
+
+        assert writes == [5]
+        assert len(_journal_lines(manager)) == 6
+        assert manager._writer is None
+
+    def test_storage_is_loaded_by_writer_thread(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.close()
+
+        loading_threads = []
+        original = StatisticsManager._load_storage_files
+
+        def load(self):
+            loading_threads.append(threading.current_thread().name)
+            original(self)
+
+        with patch.object(StatisticsManager, '_load_storage_files', load):
+            reloaded = StatisticsManager(tmp_path)
+            reloaded._writer.join(timeout=5)
+
+        assert loading_threads == ["StatisticsWriter"]
+        assert reloaded._loaded
+
+    def test_readers_do_not_wait_for_file_writes(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.flush()
+        writing = threading.Event()
+        release = threading.Event()
+
+        def slow_write(path, content):
+            writing.set()
+            release.wait(5)
+
+        with patch.object(StatisticsManager, '_write_atomic', side_effect=slow_write):
+            compaction = threading.Thread(target=manager._save_to_storage)
+            compaction.start()
+            assert writing.wait(5)
+
+            manager.track_recording(2.0)
+            reader = threading.Thread(target=manager.get_statistics, args=(TimePeriod.ALL_TIME,))
+            reader.start()
+            reader.join(timeout=1)
+            blocked = reader.is_alive()
+
+            release.set()
+            compaction.join()
+            reader.join()
+
+        assert not blocked
+        assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 2
+
+    def test_malformed_journal_line_does_not_stop_writing(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.close()
+        with open(manager.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'recording', 'timestamp': '2024-01-01T12:00:00+00:00'}) + '\n')
+            f.write(json.dumps({'type': 'recording', 'timestamp': '2024-01-01T12:00:00',
+                                'duration_seconds': 'long'}) + '\n')
+
+        reloaded = StatisticsManager(tmp_path)
+        reloaded.track_recording(2.0)
+        reloaded._writer.join(timeout=5)
+
+        assert reloaded._writer is None
+        assert json.loads(_journal_lines(reloaded)[-1])['duration_seconds'] == 2.0
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 3
+
+    def test_failed_load_keeps_writer_running(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(1.0)
+        manager.close()
+
+        with patch.object(StatisticsManager, '_read_journal', side_effect=TypeError("bad row")):
+            reloaded = StatisticsManager(tmp_path)
+            reloaded._writer.join(timeout=5)
+
+        assert reloaded._loaded and reloaded._writer is None
+        assert (tmp_path / "statistics.jsonl.backup").exists()
+
+        reloaded.track_recording(2.0)
+        reloaded._writer.join(timeout=5)
+
+        assert json.loads(_journal_lines(reloaded)[-1])['duration_seconds'] == 2.0
+        assert reloaded.get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+        reloaded.close()
+
+    def test_queued_events_are_visible_before_flush(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        with patch.object(statistics_manager, 'FLUSH_DELAY_SECONDS', 60):
+            manager.track_recording(1.0)
+
+            assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+            assert not manager.journal_path.exists()
+
+            manager.close()
+
+        assert StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+
+    def test_concurrent_tracking_loses_no_events(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+
+        def track(count):
+            for _ in range(count):
+                manager.track_silence_removal(0.1)
+                manager.get_statistics(TimePeriod.TODAY)
+
+        threads = [threading.Thread(target=track, args=(200,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        manager.close()
+
+        reloaded = StatisticsManager(tmp_path)
+        assert reloaded.get_statistics(TimePeriod.ALL_TIME).total_removed_silence_seconds == pytest.approx(80.0)
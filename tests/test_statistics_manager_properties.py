@@ -5,6 +5,7 @@ These tests verify universal properties that should hold across all valid inputs
 using the Hypothesis library for property-based testing.
 """
 
+import json
 import tempfile
 from pathlib import Path
 from datetime import datetime
@@ -67,6 +68,7 @@ def test_event_tracking_increments_counters(
         assert len(manager.events) == total_events, (
             f"Expected {total_events} total events, got {len(manager.events)}"
         )
+        manager.close()
 
 
 # Feature: usage-statistics, Property 2: Event Data Persistence
@@ -124,6 +126,7 @@ def test_event_data_persistence(duration: float, text: str, removed_duration: fl
         assert abs(stats.total_removed_silence_seconds - removed_duration) < 0.001, (
             f"Expected removed silence {removed_duration}, got {stats.total_removed_silence_seconds}"
         )
+        manager.close()
 
 
 # Feature: usage-statistics, Property 6: Storage Round-Trip
@@ -245,6 +248,13 @@ def test_storage_round_trip(events):
 
 
 
+def _read_journal_events(manager):
+    """Read event lines (without the header) from the statistics journal."""
+    with open(manager.journal_path, 'r', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return [line for line in lines if 'journal_id' not in line]
+
+
 # Feature: usage-statistics, Property 7: UTF-8 Encoding Support
 @given(
     text=st.one_of(
@@ -280,7 +290,8 @@ def test_utf8_encoding_support(text: str):
             transcribed_text=text
         )
         
-        # Create a new manager and load from storage
+        # Write queued events, then create a new manager and load from storage
+        manager.close()
         manager2 = StatisticsManager(config_dir)
         stats = manager2.get_statistics(TimePeriod.ALL_TIME)
         
@@ -295,13 +306,10 @@ def test_utf8_encoding_support(text: str):
             f"expected {expected_word_count}, got {stats.total_word_count}"
         )
         
-        # Verify the file was actually written with UTF-8 encoding
-        # by reading it directly and checking it contains valid JSON
-        import json
-        with open(manager.storage_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            assert 'events' in data
-            assert len(data['events']) == 1
+        # Verify the journal was actually written with UTF-8 encoding
+        # by reading it directly and checking it contains valid JSON lines
+        events = _read_journal_events(manager)
+        assert len(events) == 1
 
 
 
@@ -323,14 +331,12 @@ def test_event_schema_validation(
     """
     **Validates: Requirements 6.2, 6.3, 6.4**
     
-    Property: For any event stored in statistics.json, the JSON object should contain
+    Property: For any event stored in the statistics journal, the JSON object should contain
     the correct fields for its event type: recording events have (type, timestamp,
     duration_seconds), transcription events have (type, timestamp, duration_seconds,
     character_count, word_count), and silence_removed events have (type, timestamp,
     removed_duration_seconds).
     """
-    import json
-    
     with tempfile.TemporaryDirectory() as tmpdir:
         config_dir = Path(tmpdir)
         manager = StatisticsManager(config_dir)
@@ -348,15 +354,14 @@ def test_event_schema_validation(
         else:  # silence_removed
             manager.track_silence_removal(removed_duration_seconds=removed_duration)
         
-        # Read the JSON file directly
-        with open(manager.storage_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Write queued events and read the journal directly
+        manager.close()
+        events = _read_journal_events(manager)
         
         # Verify structure
-        assert 'events' in data, "JSON should have 'events' key"
-        assert len(data['events']) == 1, "Should have exactly one event"
+        assert len(events) == 1, "Should have exactly one event"
         
-        event_json = data['events'][0]
+        event_json = events[0]
         
         # All events should have type and timestamp
         assert 'type' in event_json, "Event should have 'type' field"
@@ -738,6 +743,7 @@ def test_input_validation(
             f"Audio time should be {expected_audio_time}, got {stats.total_transcribed_audio_time_seconds}"
         assert stats.total_removed_silence_seconds == expected_removed_silence, \
             f"Removed silence should be {expected_removed_silence}, got {stats.total_removed_silence_seconds}"
+        manager.close()
 
 
 
@@ -788,6 +794,7 @@ def test_corrupted_file_handling(corrupted_content):
         manager.track_recording(duration_seconds=10.0)
         stats = manager.get_statistics(TimePeriod.ALL_TIME)
         assert stats.recordings_count == 1, "Should be able to track events after corruption"
+        manager.close()
         
         # Property: Backup file should exist (if original was valid JSON that failed to parse)
         backup_path = storage_path.with_suffix('.json.backup')
@@ -835,8 +842,6 @@ def test_invalid_event_handling(events_data):
     
     This ensures data integrity and robustness.
     """
-    import json
-    
     with tempfile.TemporaryDirectory() as tmpdir:
         config_dir = Path(tmpdir)
         storage_path = config_dir / "statistics.json"
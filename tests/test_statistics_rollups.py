@@ -0,0 +1,192 @@
+"""
+Unit tests for the Statistics Manager per-day rollups.
+
+Covers period boundaries, persistence of rollups next to the event log
+and a query benchmark with 1M synthetic events.
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.statistics_manager import (
+    AggregatedStats,
+    EventType,
+    StatisticsEvent,
+    StatisticsManager,
+    TimePeriod,
+)
+
+
+def _recording(timestamp, duration=1.0):
+    return StatisticsEvent(type=EventType.RECORDING, timestamp=timestamp, duration_seconds=duration)
+
+
+class TestDailyRollups:
+    """Tests for period queries over day buckets."""
+
+    def test_periods_start_at_midnight(self, tmp_path):
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        manager = StatisticsManager(tmp_path)
+        manager.events = [
+            _recording(midnight + timedelta(minutes=1)),
+            _recording(midnight - timedelta(minutes=1)),
+            _recording(midnight - timedelta(days=6)),
+            _recording(midnight - timedelta(days=6, minutes=1)),
+            _recording(midnight - timedelta(days=364)),
+            _recording(midnight - timedelta(days=364, minutes=1)),
+        ]
+        manager._loaded = True
+
+        assert manager.get_statistics(TimePeriod.TODAY).recordings_count == 1
+        assert manager.get_statistics(TimePeriod.LAST_7_DAYS).recordings_count == 3
+        assert manager.get_statistics(TimePeriod.LAST_30_DAYS).recordings_count == 4
+        assert manager.get_statistics(TimePeriod.LAST_365_DAYS).recordings_count == 5
+        assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 6
+
+    @pytest.mark.parametrize("period, days", [
+        (TimePeriod.TODAY, 1),
+        (TimePeriod.LAST_7_DAYS, 7),
+        (TimePeriod.LAST_30_DAYS, 30),
+        (TimePeriod.LAST_365_DAYS, 365),
+    ])
+    def test_period_covers_exactly_n_days(self, tmp_path, period, days):
+        now = datetime.now()
+        manager = StatisticsManager(tmp_path)
+        # One event per calendar day, at the current time of day
+        manager.events = [_recording(now - timedelta(days=offset)) for offset in range(days + 1)]
+        manager._loaded = True
+
+        stats = manager.get_statistics(period)
+
+        # The event from exactly N days ago falls outside the period
+        assert stats.recordings_count == days
+
+    def test_future_events_do_not_extend_the_scan(self, tmp_path):
+        class CountingDict(dict):
+            lookups = 0
+
+            def get(self, key, default=None):
+                CountingDict.lookups += 1
+                return super().get(key, default)
+
+        manager = StatisticsManager(tmp_path)
+        manager.events = [_recording(datetime.now()), _recording(datetime(2999, 1, 1))]
+        manager._loaded = True
+        manager._daily = CountingDict(manager._daily)
+
+        for period in TimePeriod:
+            assert manager.get_statistics(period).recordings_count == 2
+
+        assert CountingDict.lookups <= 1 + 7 + 30 + 365
+
+    def test_tracked_events_update_rollups(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(2.0)
+        manager.track_transcription(2.0, "one two three")
+        manager.track_silence_removal(0.5)
+        manager.close()
+
+        stats = manager.get_statistics(TimePeriod.TODAY)
+
+        assert stats == AggregatedStats(
+            recordings_count=1,
+            transcriptions_count=1,
+            total_recording_time_seconds=2.0,
+            total_transcribed_audio_time_seconds=2.0,
+            total_character_count=13,
+            total_word_count=3,
+            total_removed_silence_seconds=0.5
+        )
+
+    def test_returned_stats_are_copies(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(2.0)
+        manager.close()
+
+        manager.get_statistics(TimePeriod.ALL_TIME).recordings_count = 100
+
+        assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 1
+
+
+class TestRollupPersistence:
+    """Tests for statistics_rollups.json."""
+
+    def test_rollups_are_saved_on_compaction(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(2.0)
+        manager.flush()
+        manager._save_to_storage()
+
+        data = json.loads(manager.rollups_path.read_text(encoding='utf-8'))
+
+        assert data['events'] == 1
+        assert list(data['days']) == [datetime.now().date().isoformat()]
+
+    def test_saved_rollups_are_used_on_load(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(2.0)
+        manager.flush()
+        manager._save_to_storage()
+        manager.track_recording(3.0)
+        manager.flush()
+
+        loaded = StatisticsManager(tmp_path)
+        loaded._rebuild_rollups = None  # must not be needed
+        stats = loaded.get_statistics(TimePeriod.TODAY)
+
+        assert stats.recordings_count == 2
+        assert stats.total_recording_time_seconds == pytest.approx(5.0)
+
+    def test_stale_rollups_are_rebuilt(self, tmp_path):
+        manager = StatisticsManager(tmp_path)
+        manager.track_recording(2.0)
+        manager.flush()
+        manager._save_to_storage()
+        data = json.loads(manager.rollups_path.read_text(encoding='utf-8'))
+        data['events'] = 7
+        manager.rollups_path.write_text(json.dumps(data), encoding='utf-8')
+
+        stats = StatisticsManager(tmp_path).get_statistics(TimePeriod.ALL_TIME)
+
+        assert stats.recordings_count == 1
+
+
+@pytest.mark.benchmark
+class TestRollupBenchmark:
+    """Query time does not depend on the number of events."""
+
+    def test_queries_with_one_million_events(self, tmp_path):
+        now = datetime.now()
+        minutes = 2 * 365 * 24 * 60
+        events = [
+            _recording(now - timedelta(minutes=i * minutes // 1_000_000))
+            for i in range(1_000_000)
+        ]
+
+        manager = StatisticsManager(tmp_path)
+        manager.events = events
+        manager._loaded = True
+
+        small = StatisticsManager(tmp_path)
+        small.events = events[:1000]
+        small._loaded = True
+
+        def query_time(target):
+            best = float("inf")
+            for _ in range(20):
+                started = time.perf_counter()
+                for period in TimePeriod:
+                    target.get_statistics(period)
+                best = min(best, time.perf_counter() - started)
+            return best
+
+        large_time = query_time(manager)
+        small_time = query_time(small)
+
+        assert manager.get_statistics(TimePeriod.ALL_TIME).recordings_count == 1_000_000
+        assert manager.get_statistics(TimePeriod.LAST_365_DAYS).recordings_count < 1_000_000
+        # Both managers scan the same day buckets, whatever the number of events
+        assert large_time < small_time * 5
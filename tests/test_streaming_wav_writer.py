@@ -0,0 +1,107 @@
+"""
+Unit-тесты для StreamingWavWriter.
+
+Тестирует фоновую дозапись WAV файла из AudioBuffer, исправление
+RIFF заголовка при остановке и освобождение памяти буфера.
+"""
+
+import os
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from services.audio_buffer import AudioBuffer
+from services.streaming_wav_writer import StreamingWavWriter
+
+
+def _read_frames(path):
+    with wave.open(str(path), 'rb') as wav_file:
+        params = (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate())
+        data = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+    return params, data
+
+
+class TestStreamingWavWriter:
+    """Тесты StreamingWavWriter."""
+
+    def test_finish_writes_all_samples_and_patches_header(self, tmp_path):
+        """Все сэмплы попадают в файл, заголовок содержит верную длину."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=0.5)
+        path = tmp_path / "stream.wav"
+        writer = StreamingWavWriter(buffer, str(path), flush_interval=0.01)
+        writer.start()
+
+        chunks = [np.full(1024, i, dtype=np.int16) for i in range(20)]
+        for chunk in chunks:
+            buffer.write(chunk.tobytes())
+            time.sleep(0.001)
+
+        result = writer.finish()
+
+        assert result == str(path)
+        params, data = _read_frames(path)
+        assert params == (1, 2, 16000)
+        np.testing.assert_array_equal(data, np.concatenate(chunks))
+
+    def test_flush_happens_during_recording(self, tmp_path):
+        """Данные пишутся на диск до вызова finish()."""
+        buffer = AudioBuffer(sample_rate=16000, initial_seconds=1.0)
+        path = tmp_path / "stream.wav"
+        writer = StreamingWavWriter(buffer, str(path), flush_interval=0.01)
+        writer.start()
+
+        buffer.write(np.ones(4000, dtype=np.int16).tobytes())
+        deadline = time.time() + 2.0
+        while writer.frames_written < 4000 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert writer.frames_written == 4000
+        writer.finish()
+
+    def test_memory_stays_flat_while_streaming(self, tmp_path):
+        """Освобожденные сэмплы не копируются при расширении буфера."""
+        buffer = AudioBuffer(sample_rate=1000, initial_seconds=1.0)
+        path = tmp_path / "stream.wav"
+        writer = StreamingWavWriter(buffer, str(path))
+        writer._wav_file = wave.open(str(path), 'wb')
+        writer._wav_file.setnchannels(1)
+        writer._wav_file.setsampwidth(2)
+        writer._wav_file.setframerate(1000)
+
+        # Синхронная дозапись после каждого чанка имитирует фоновый поток
+        for _ in range(100):
+            buffer.write(np.zeros(256, dtype=np.int16).tobytes())
+            writer._flush()
+
+        assert len(buffer) == 25600
+        assert buffer.capacity == 1000
+        writer.finish()
+
+        _, data = _read_frames(path)
+        assert len(data) == 25600
+
+    def test_released_samples_are_not_readable(self):
+        """Чтение освобожденных сэмплов после расширения вызывает ошибку."""
+        buffer = AudioBuffer(sample_rate=10, initial_seconds=1.0)
+        buffer.write(np.zeros(8, dtype=np.int16).tobytes())
+        buffer.release(8)
+        buffer.write(np.zeros(8, dtype=np.int16).tobytes())
+
+        assert buffer.base == 8
+        with pytest.raises(ValueError):
+            buffer.samples(0)
+        assert len(buffer.samples(8)) == 8
+
+    def test_abort_removes_file(self, tmp_path):
+        """abort() останавливает поток и удаляет частичный файл."""
+        buffer = AudioBuffer(sample_rate=16000)
+        path = tmp_path / "stream.wav"
+        writer = StreamingWavWriter(buffer, str(path), flush_interval=0.01)
+        writer.start()
+        buffer.write(np.ones(1024, dtype=np.int16).tobytes())
+
+        writer.abort()
+
+        assert not os.path.exists(path)
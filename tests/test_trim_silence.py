@@ -0,0 +1,280 @@
+"""
+Тесты векторизованной обрезки тишины (utils.audio_utils).
+
+Прежняя реализация с циклами по чанкам оставлена здесь как эталон
+для сравнения результата и скорости.
+"""
+
+import os
+import time
+import tracemalloc
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from utils import audio_utils
+from utils.audio_utils import _find_sound_segments, _window_rms, trim_silence, trim_silence_pcm
+
+SAMPLE_RATE = 16000
+
+
+def _reference_segments(pcm: bytes, framerate: int, threshold: float, padding_ms: int):
+    """Прежний анализ для моно int16: RMS и сегменты в циклах Python (в чанках)."""
+    chunk_size = 1024
+    mono_data = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32767
+
+    n_chunks = len(mono_data) // chunk_size
+    rms_values = []
+    for i in range(n_chunks):
+        chunk = mono_data[i * chunk_size:(i + 1) * chunk_size]
+        rms_values.append(np.sqrt(np.mean(chunk ** 2)))
+    is_sound = np.array(rms_values) > threshold
+    if not np.any(is_sound):
+        return None
+
+    padding_chunks = max(1, int((padding_ms / 1000.0) * framerate) // chunk_size)
+    segments = []
+    in_sound = False
+    start_chunk = 0
+    for i in range(len(is_sound)):
+        if is_sound[i] and not in_sound:
+            start_chunk = max(0, i - padding_chunks)
+            in_sound = True
+        elif not is_sound[i] and in_sound:
+            segments.append((start_chunk, min(len(is_sound), i + padding_chunks)))
+            in_sound = False
+    if in_sound:
+        segments.append((start_chunk, len(is_sound)))
+
+    merged = []
+    for start, end in segments:
+        if merged and start - merged[-1][1] < padding_chunks * 2:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _reference_trim(pcm: bytes, framerate: int, threshold: float, padding_ms: int):
+    """Прежний trim_silence_pcm для моно int16."""
+    chunk_size = 1024
+    audio_data = np.frombuffer(pcm, dtype=np.int16)
+    merged = _reference_segments(pcm, framerate, threshold, padding_ms)
+    if merged is None:
+        return None
+    return np.concatenate([audio_data[s * chunk_size:e * chunk_size] for s, e in merged]).tobytes()
+
+
+def _tone(seconds: float, amplitude: int = 10000) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude).astype(np.int16)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.int16)
+
+
+def _dictation(minutes: float) -> np.ndarray:
+    """Диктовка: фразы 1-6 с, разделенные паузами 0.2-3 с."""
+    rng = np.random.default_rng(0)
+    parts = []
+    total = 0
+    while total < minutes * 60 * SAMPLE_RATE:
+        phrase = _tone(rng.uniform(1, 6), amplitude=int(rng.uniform(3000, 12000)))
+        pause = (rng.normal(size=int(rng.uniform(0.2, 3) * SAMPLE_RATE)) * 30).astype(np.int16)
+        parts += [phrase, pause]
+        total += len(phrase) + len(pause)
+    return np.concatenate(parts)[:int(minutes * 60 * SAMPLE_RATE)]
+
+
+class TestWindowRms:
+    """Тесты RMS скользящего окна."""
+
+    @pytest.mark.parametrize("window, hop", [(1024, 1024), (400, 160), (320, 480)])
+    def test_matches_direct_computation(self, window, hop):
+        samples = (np.random.default_rng(1).normal(size=20000) * 5000).astype(np.int16)
+
+        rms = _window_rms(samples, 1, window, hop)
+
+        starts = range(0, len(samples) - window + 1, hop)
+        expected = [np.sqrt(np.mean((samples[s:s + window] / 32767.0) ** 2)) for s in starts]
+        np.testing.assert_allclose(rms, expected, rtol=1e-5)
+
+    def test_stereo_and_8bit_are_normalized_like_mono(self):
+        mono = _tone(0.5)
+        stereo = np.repeat(mono, 2).reshape(-1, 2)
+        unsigned = (mono // 256 + 128).astype(np.uint8)
+
+        expected = _window_rms(mono, 1)
+        np.testing.assert_allclose(_window_rms(stereo, 2), expected, rtol=1e-6)
+        np.testing.assert_allclose(_window_rms(unsigned, 1), expected, atol=0.01)
+
+
+class TestVectorizedTrim:
+    """Тесты обрезки тишины."""
+
+    def test_cuts_are_frame_accurate(self):
+        # Звук начинается не на границе окна
+        pcm = np.concatenate([_silence(1.0123), _tone(1.0), _silence(1.0)]).tobytes()
+
+        trimmed, removed = trim_silence_pcm(pcm, SAMPLE_RATE, padding_ms=0, window_size=160, hop_size=80)
+
+        kept = np.frombuffer(trimmed, dtype=np.int16)
+        sound = np.flatnonzero(kept)
+        # Перед и после звука остается меньше одного окна тишины
+        assert sound[0] < 160
+        assert len(kept) - 1 - sound[-1] < 160
+        assert removed == pytest.approx((len(pcm) // 2 - len(kept)) / SAMPLE_RATE)
+
+    def test_short_pauses_are_kept(self):
+        pcm = np.concatenate([_tone(1.0), _silence(0.4), _tone(1.0), _silence(2.0), _tone(1.0)]).tobytes()
+
+        trimmed, removed = trim_silence_pcm(pcm, SAMPLE_RATE, padding_ms=300, window_size=160)
+
+        # Пауза 0.4 с короче двух паддингов и остается, из 2 с удаляется 2 - 0.6
+        assert removed == pytest.approx(1.4, abs=0.02)
+
+    def test_fades_at_cut_points(self):
+        pcm = np.concatenate([_tone(1.0), _silence(2.0), _tone(1.0)]).tobytes()
+
+        plain, _ = trim_silence_pcm(pcm, SAMPLE_RATE, padding_ms=0)
+        faded, _ = trim_silence_pcm(pcm, SAMPLE_RATE, padding_ms=0, fade_ms=10)
+
+        plain = np.frombuffer(plain, dtype=np.int16)
+        faded = np.frombuffer(faded, dtype=np.int16)
+        fade = SAMPLE_RATE // 100
+        boundary = SAMPLE_RATE + 1024 - SAMPLE_RATE % 1024
+        assert len(faded) == len(plain)
+        # Начало файла не разрезано - без fade-in
+        np.testing.assert_array_equal(faded[:fade], plain[:fade])
+        # Перед и после разреза амплитуда плавно спадает к нулю и растет от нуля
+        assert np.abs(faded[boundary - 4:boundary + 4]).max() < 0.01 * np.abs(plain).max()
+        np.testing.assert_array_equal(faded[boundary + fade:-fade], plain[boundary + fade:-fade])
+
+    def test_matches_reference_on_dictation(self):
+        pcm = _dictation(2).tobytes()
+
+        trimmed, _ = trim_silence_pcm(pcm, SAMPLE_RATE, padding_ms=300)
+        reference = _reference_trim(pcm, SAMPLE_RATE, 0.02, 300)
+
+        # Паддинг теперь точный (300 мс), а не округленный до чанков (256 мс)
+        assert abs(len(trimmed) - len(reference)) / len(reference) < 0.05
+
+    def test_trim_silence_file_with_options(self, tmp_path):
+        path = tmp_path / "recording.wav"
+        with wave.open(str(path), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(SAMPLE_RATE)
+            wf.writeframes(np.concatenate([_silence(1.0), _tone(1.0), _silence(1.0)]).tobytes())
+
+        result, removed = trim_silence(str(path), padding_ms=100, window_size=320, hop_size=160, fade_ms=5)
+
+        with wave.open(result, 'rb') as wf:
+            assert wf.getnframes() == pytest.approx(1.2 * SAMPLE_RATE, abs=320)
+        assert removed == pytest.approx(1.8, abs=0.03)
+
+
+def _write_wav(path, samples: np.ndarray, n_channels: int = 1) -> None:
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(n_channels)
+        wf.setsampwidth(samples.itemsize)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(samples.tobytes())
+
+
+def _read_pcm(path) -> bytes:
+    with wave.open(str(path), 'rb') as wf:
+        return wf.readframes(wf.getnframes())
+
+
+class TestStreamingTrim:
+    """Тесты потоковой обрезки WAV файла блоками."""
+
+    @pytest.mark.parametrize("n_channels", [1, 2])
+    def test_matches_in_memory_trim(self, tmp_path, n_channels):
+        samples = _dictation(0.5)
+        if n_channels == 2:
+            samples = np.repeat(samples, 2)
+        path = tmp_path / "recording.wav"
+        _write_wav(path, samples, n_channels)
+        options = dict(padding_ms=200, window_size=400, hop_size=160, fade_ms=5)
+
+        expected, expected_removed = trim_silence_pcm(samples.tobytes(), SAMPLE_RATE, channels=n_channels, **options)
+        # Блоки меньше окна и не кратны шагу - окна переходят через границы блоков
+        with patch.object(audio_utils, 'TRIM_BLOCK_FRAMES', 1000):
+            _, removed = trim_silence(str(path), **options)
+
+        assert expected_removed > 0
+        assert _read_pcm(path) == expected
+        assert removed == pytest.approx(expected_removed)
+
+    def test_silent_file_is_left_unchanged(self, tmp_path):
+        path = tmp_path / "recording.wav"
+        _write_wav(path, _silence(2.0))
+        before = path.read_bytes()
+
+        assert trim_silence(str(path)) == (str(path), 0.0)
+        assert path.read_bytes() == before
+
+    def test_failed_write_keeps_original(self, tmp_path):
+        path = tmp_path / "recording.wav"
+        _write_wav(path, np.concatenate([_silence(1.0), _tone(1.0), _silence(1.0)]))
+        before = path.read_bytes()
+
+        with patch.object(audio_utils.os, 'fsync', side_effect=OSError("disk full")):
+            assert trim_silence(str(path)) == (str(path), 0.0)
+
+        assert path.read_bytes() == before
+        assert os.listdir(tmp_path) == ["recording.wav"]
+
+    @pytest.mark.benchmark
+    def test_memory_does_not_grow_with_file_length(self, tmp_path):
+        def peak_memory(minutes):
+            path = tmp_path / f"{minutes}.wav"
+            _write_wav(path, _dictation(minutes))
+            tracemalloc.start()
+            trim_silence(str(path))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak, path.stat().st_size
+
+        short_peak, short_size = peak_memory(1)
+        long_peak, long_size = peak_memory(10)
+
+        # С длиной растет только массив RMS (8 байт на окно), сами сэмплы
+        # читаются через отображение файла блоками
+        assert long_peak - short_peak < (long_size - short_size) / 50
+        assert long_peak < long_size / 20
+
+
+@pytest.mark.benchmark
+class TestTrimSilenceBenchmark:
+    """Обрезка тишины в 30-минутной записи."""
+
+    def test_thirty_minute_recording(self):
+        pcm = _dictation(30).tobytes()
+        samples = np.frombuffer(pcm, dtype=np.int16)
+
+        def best_of(func, runs):
+            best = float("inf")
+            for _ in range(runs):
+                started = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - started)
+            return best
+
+        def analysis():
+            rms = _window_rms(samples, 1)
+            return _find_sound_segments(rms, len(samples), SAMPLE_RATE, 0.02, 300)
+
+        vectorized = best_of(analysis, runs=3)
+        reference = best_of(lambda: _reference_segments(pcm, SAMPLE_RATE, 0.02, 300), runs=2)
+        vectorized_trim = best_of(lambda: trim_silence_pcm(pcm, SAMPLE_RATE), runs=3)
+        reference_trim = best_of(lambda: _reference_trim(pcm, SAMPLE_RATE, 0.02, 300), runs=2)
+
+        assert vectorized * 10 < reference
+        # Склейка сохраненных сэмплов - копирование памяти, одинаковое в обеих версиях
+        assert vectorized_trim * 4 < reference_trim
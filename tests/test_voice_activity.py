@@ -0,0 +1,213 @@
+"""
+Unit-тесты для VAD бэкендов (services.voice_activity).
+
+Проверяет классификацию речи и шумов спектральным VAD, SilenceDetector
+как VAD бэкенд, шкалу речи SpeechTimeline и стоимость CPU на секунду аудио.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from services.silence_detector import SilenceDetector
+from services.voice_activity import (
+    SpectralVAD,
+    SpeechTimeline,
+    VoiceActivityDetector,
+    create_vad_backend,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _voice(seconds: float, amplitude: float = 0.1) -> np.ndarray:
+    """Гласный звук: гармоники 150 Hz с формантами 500, 1500 и 2500 Hz."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(140 + 20 * np.sin(2 * np.pi * 3 * t)) / SAMPLE_RATE
+
+    def envelope(f):
+        return (0.3 + np.exp(-((f - 500) / 150) ** 2) + 0.7 * np.exp(-((f - 1500) / 200) ** 2)
+                + 0.4 * np.exp(-((f - 2500) / 250) ** 2))
+
+    signal = sum(envelope(k * 150) * np.sin(k * phase) for k in range(1, 25))
+    signal *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+    return signal / np.sqrt(np.mean(signal ** 2)) * amplitude
+
+
+def _fan(seconds: float, amplitude: float = 0.05) -> np.ndarray:
+    """Гул вентилятора: низкочастотный (броуновский) шум."""
+    rng = np.random.default_rng(1)
+    noise = np.cumsum(rng.normal(size=int(seconds * SAMPLE_RATE)))
+    noise -= np.convolve(noise, np.ones(400) / 400, 'same')
+    return noise / np.sqrt(np.mean(noise ** 2)) * amplitude
+
+
+def _keyboard(seconds: float) -> np.ndarray:
+    """Щелчки клавиатуры: короткие широкополосные импульсы 8 раз в секунду."""
+    rng = np.random.default_rng(2)
+    signal = rng.normal(size=int(seconds * SAMPLE_RATE)) * 0.001
+    decay = np.exp(-np.arange(80) / 15)
+    for start in range(0, len(signal) - 80, SAMPLE_RATE // 8):
+        signal[start:start + 80] += rng.normal(size=80) * 0.3 * decay
+    return signal
+
+
+def _pcm(signal: np.ndarray) -> np.ndarray:
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+
+def _process_in_chunks(vad: VoiceActivityDetector, samples: np.ndarray, chunk: int = 1024) -> np.ndarray:
+    return np.concatenate([vad.process(samples[i:i + chunk]) for i in range(0, len(samples), chunk)])
+
+
+class TestSpectralVAD:
+    """Тесты спектрального VAD."""
+
+    def test_voice_is_speech(self):
+        flags = SpectralVAD().process(_pcm(_voice(2.0)))
+
+        assert flags.mean() > 0.95
+
+    @pytest.mark.parametrize("noise", [_fan(2.0), _keyboard(2.0)], ids=["fan", "keyboard"])
+    def test_noise_is_not_speech(self, noise):
+        """Шумы, которые порог RMS по фреймам принимает за речь, спектральный VAD отбрасывает."""
+        samples = _pcm(noise)
+
+        assert SilenceDetector(threshold=0.02, onset_frames=1).process(samples).any()
+        assert not SpectralVAD().process(samples).any()
+
+    def test_voice_over_fan_noise(self):
+        samples = _pcm(np.concatenate([_fan(1.0), _voice(2.0, 0.05) + _fan(2.0), _fan(2.0)]))
+
+        flags = SpectralVAD().process(samples).reshape(5, -1).mean(axis=1)
+
+        assert flags[0] == 0.0
+        assert flags[1] > 0.9 and flags[2] > 0.9
+        # После речи решение удерживается не дольше hangover
+        assert flags[3] <= 8 / 50 and flags[4] == 0.0
+
+    def test_chunked_processing_matches_whole_signal(self):
+        samples = _pcm(np.concatenate([_keyboard(1.0), _voice(1.0), _fan(1.0)]))
+
+        whole = SpectralVAD().process(samples)
+        chunked = _process_in_chunks(SpectralVAD(), samples, chunk=1000)
+
+        np.testing.assert_array_equal(whole, chunked)
+
+    def test_frame_buffer_is_reused(self):
+        vad = SpectralVAD()
+        samples = _pcm(_voice(1.0))
+        vad.process(samples[:1024])
+        buffer = vad._buffer
+
+        _process_in_chunks(vad, samples[1024:])
+
+        assert vad._buffer is buffer
+
+    def test_reset_restores_initial_state(self):
+        vad = SpectralVAD()
+        samples = _pcm(_voice(1.0) + _fan(1.0))
+        first = vad.process(samples)
+        vad.process(_pcm(_voice(0.11)))
+
+        vad.reset()
+
+        np.testing.assert_array_equal(vad.process(samples), first)
+
+
+class TestSilenceDetectorBackend:
+    """Тесты SilenceDetector как VAD бэкенда."""
+
+    def test_frames_use_effective_threshold(self):
+        detector = SilenceDetector(threshold=0.02, onset_frames=1, hangover_frames=0)
+        samples = np.zeros(320 * 3, dtype=np.int16)
+        samples[320:640] = 1000  # RMS 0.03
+
+        np.testing.assert_array_equal(detector.process(samples), [False, True, False])
+
+        detector.background_noise_level = 0.02  # адаптивный порог 0.04
+        np.testing.assert_array_equal(detector.process(samples), [False, False, False])
+
+    def test_keystrokes_are_not_speech(self):
+        """Одиночные громкие фреймы не сбрасывают отсчет тишины."""
+        flags = _process_in_chunks(SilenceDetector(threshold=0.02), _pcm(_keyboard(2.0)))
+
+        assert not flags.any()
+
+    def test_speech_onset_and_hangover(self):
+        detector = SilenceDetector(threshold=0.02, onset_frames=3, hangover_frames=2)
+        samples = np.zeros(320 * 10, dtype=np.int16)
+        samples[320:320 * 5] = 1000  # 4 фрейма с RMS 0.03
+
+        # Последний громкий фрейм и удержание приходятся на второй чанк
+        flags = np.concatenate([detector.process(samples[:320 * 4]), detector.process(samples[320 * 4:])])
+
+        np.testing.assert_array_equal(
+            flags, [False, False, False, True, True, True, True, False, False, False]
+        )
+
+        detector.reset()
+        np.testing.assert_array_equal(detector.process(samples[:320 * 4]), [False, False, False, True])
+
+    def test_update_speech_detects_silence(self):
+        detector = SilenceDetector(silence_duration=1.0, min_speech_duration=0.5)
+
+        assert not detector.update_speech(True, 0.0)
+        assert not detector.update_speech(True, 0.6)
+        assert not detector.update_speech(False, 1.0)
+        assert detector.update_speech(False, 2.0)
+
+    def test_create_vad_backend(self):
+        detector = SilenceDetector()
+
+        assert create_vad_backend("rms", detector) is detector
+        assert isinstance(create_vad_backend("spectral", detector), SpectralVAD)
+        with pytest.raises(ValueError):
+            create_vad_backend("webrtc", detector)
+
+
+class TestSpeechTimeline:
+    """Тесты шкалы речи."""
+
+    def test_segments_are_frame_accurate(self):
+        timeline = SpeechTimeline(frame_samples=320, initial_frames=2)
+        timeline.append(np.array([True, True, False]))
+        timeline.append(np.array([False, True]))
+        timeline.append(np.array([True, False, False, False]))
+
+        assert len(timeline) == 9
+        assert timeline.segments() == [(0, 640), (1280, 1920)]
+        assert timeline.trailing_silence() == pytest.approx(3 * 0.02)
+        assert timeline.has_speech(4, 6)
+        assert not timeline.has_speech(2, 4)
+
+    def test_clear(self):
+        timeline = SpeechTimeline(frame_samples=320)
+        timeline.append(np.array([True]))
+
+        timeline.clear()
+
+        assert len(timeline) == 0
+        assert timeline.segments() == []
+
+
+@pytest.mark.benchmark
+class TestVADBenchmark:
+    """Стоимость CPU на секунду аудио при обработке чанками по 1024 сэмпла."""
+
+    @pytest.mark.parametrize("vad", [SilenceDetector(), SpectralVAD()], ids=["rms", "spectral"])
+    def test_cpu_cost_per_second_of_audio(self, vad):
+        seconds = 60
+        samples = _pcm(np.tile(np.concatenate([_voice(1.0), _fan(1.0), _keyboard(1.0)]), seconds // 3))
+
+        best = float("inf")
+        for _ in range(3):
+            vad.reset()
+            started = time.process_time()
+            _process_in_chunks(vad, samples)
+            best = min(best, time.process_time() - started)
+        cost_ms = best / seconds * 1000
+
+        # Меньше 1% одного ядра
+        assert cost_ms < 10
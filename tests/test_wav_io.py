@@ -0,0 +1,128 @@
+"""
+Unit-тесты для чтения WAV файлов (utils.wav_io).
+
+Проверяет разбор заголовка RIFF в сравнении с модулем wave, отображение
+PCM данных в память, нестандартные чанки и некорректные файлы.
+"""
+
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from services.audio_payload import AudioPayload
+from utils.exceptions import AudioError
+from utils.wav_io import map_wav, read_wav_info
+
+
+def _write_wav(path, samples: np.ndarray, channels: int = 1, sample_rate: int = 16000) -> None:
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(samples.itemsize)
+        wf.setframerate(sample_rate)
+        wf.writeframes(samples.tobytes())
+
+
+def _riff(*chunks: bytes) -> bytes:
+    body = b'WAVE' + b''.join(chunks)
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def _chunk(chunk_id: bytes, data: bytes) -> bytes:
+    return chunk_id + struct.pack('<I', len(data)) + data + b'\0' * (len(data) & 1)
+
+
+def _fmt(format_tag: int = 1, channels: int = 1, sample_rate: int = 16000, bits: int = 16) -> bytes:
+    block = channels * bits // 8
+    return _chunk(b'fmt ', struct.pack('<HHIIHH', format_tag, channels, sample_rate, sample_rate * block, block, bits))
+
+
+class TestReadWavInfo:
+    """Тесты разбора заголовка."""
+
+    @pytest.mark.parametrize("dtype, channels, rate", [
+        (np.int16, 1, 16000), (np.int16, 2, 44100), (np.uint8, 1, 8000), (np.int32, 2, 48000)
+    ])
+    def test_matches_wave_module(self, tmp_path, dtype, channels, rate):
+        path = tmp_path / "audio.wav"
+        _write_wav(path, np.arange(3000 * channels).astype(dtype), channels, rate)
+
+        info = read_wav_info(str(path))
+
+        with wave.open(str(path), 'rb') as wf:
+            assert info.channels == wf.getnchannels()
+            assert info.sample_width == wf.getsampwidth()
+            assert info.sample_rate == wf.getframerate()
+            assert info.n_frames == wf.getnframes()
+        assert info.duration == pytest.approx(3000 / rate)
+
+    def test_extra_chunks_are_skipped(self, tmp_path):
+        path = tmp_path / "audio.wav"
+        samples = np.arange(100, dtype=np.int16)
+        # Нечетный чанк LIST выравнивается байтом заполнения
+        path.write_bytes(_riff(_chunk(b'LIST', b'INFOabc'), _fmt(), _chunk(b'data', samples.tobytes())))
+
+        info, mapped = map_wav(str(path))
+
+        assert info.n_frames == 100
+        np.testing.assert_array_equal(mapped, samples)
+
+    def test_unfinished_header_is_clamped_to_file_size(self, tmp_path):
+        path = tmp_path / "audio.wav"
+        data = np.arange(50, dtype=np.int16).tobytes()
+        # Запись прервана: в заголовке размер данных больше, чем есть в файле
+        path.write_bytes(_riff(_fmt()) + b'data' + struct.pack('<I', 0xFFFFFFFF) + data + b'\0')
+
+        assert read_wav_info(str(path)).n_frames == 50
+
+    @pytest.mark.parametrize("content", [
+        b'not a wav file',
+        _riff(_fmt(format_tag=3, bits=32), _chunk(b'data', b'\0' * 8)),
+        _riff(_chunk(b'data', b'\0' * 8)),
+        _riff(_fmt()),
+    ], ids=["not-riff", "float", "no-fmt", "no-data"])
+    def test_invalid_files(self, tmp_path, content):
+        path = tmp_path / "audio.wav"
+        path.write_bytes(content)
+
+        with pytest.raises(AudioError):
+            read_wav_info(str(path))
+
+
+class TestMapWav:
+    """Тесты отображения PCM данных в память."""
+
+    def test_stereo_view(self, tmp_path):
+        path = tmp_path / "audio.wav"
+        samples = np.arange(2000, dtype=np.int16).reshape(-1, 2)
+        _write_wav(path, samples, channels=2)
+
+        info, mapped = map_wav(str(path))
+
+        assert isinstance(mapped, np.memmap)
+        assert not mapped.flags.writeable
+        np.testing.assert_array_equal(mapped, samples)
+
+    def test_empty_data(self, tmp_path):
+        path = tmp_path / "audio.wav"
+        _write_wav(path, np.zeros(0, dtype=np.int16))
+
+        info, mapped = map_wav(str(path))
+
+        assert info.n_frames == 0
+        assert len(mapped) == 0
+
+
+class TestAudioPayloadFromFile:
+    """AudioPayload читает файлы через wav_io."""
+
+    def test_duration_and_pcm(self, tmp_path):
+        path = tmp_path / "audio.wav"
+        samples = np.arange(8000, dtype=np.int16)
+        _write_wav(path, samples)
+
+        payload = AudioPayload.coerce(str(path))
+
+        assert payload.duration == pytest.approx(0.5)
+        assert payload.load_pcm() == samples.tobytes()
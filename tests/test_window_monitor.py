@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch
 from hypothesis import given, strategies as st
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QPixmap
-from services.window_monitor import WindowMonitor, WindowInfo
+from services.window_monitor import LRUCache, WindowMonitor, WindowInfo
 
 
 # Создаем QApplication для тестов
@@ -475,3 +475,100 @@ class TestWindowMonitorEdgeCases:
         )
         
         assert window_info.process_id == large_pid
+
+
+class FakeClock:
+    """Управляемый источник времени для TTL."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache:
+    """Тесты общего кэша имен процессов и иконок."""
+    
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        
+        # Частые обращения не спасают от вытеснения, важна давность
+        for _ in range(5):
+            cache.get("b")
+        cache.get("a")
+        cache.put("c", 3)
+        
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+    
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=10, ttl=60.0, clock=clock)
+        cache.put(1234, "firefox")
+        
+        clock.now = 59.0
+        assert cache.get(1234) == "firefox"
+        
+        # PID мог достаться другому процессу
+        clock.now = 60.0
+        assert cache.get(1234) is None
+        assert len(cache) == 0
+    
+    def test_hit_rate(self):
+        cache = LRUCache(max_size=10)
+        assert cache.hit_rate == 0.0
+        
+        cache.get("a")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+        
+        assert cache.stats() == {"size": 1, "hits": 2, "misses": 1, "hit_rate": pytest.approx(2 / 3)}
+    
+    @given(st.lists(st.integers(min_value=0, max_value=20), max_size=200))
+    def test_keeps_most_recently_used_keys(self, keys):
+        cache = LRUCache(max_size=5)
+        for key in keys:
+            if cache.get(key) is None:
+                cache.put(key, str(key))
+        
+        recent = list(dict.fromkeys(reversed(keys)))[:5]
+        assert sorted(cache._entries) == sorted(recent)
+
+
+class TestWindowMonitorCaches:
+    """Тесты кэширования имен процессов в базовом классе."""
+    
+    class StubMonitor(WindowMonitor):
+        def get_active_window_info(self):
+            return None
+        
+        def start_monitoring(self, callback):
+            pass
+        
+        def stop_monitoring(self):
+            pass
+    
+    def test_process_name_queried_once(self):
+        monitor = self.StubMonitor()
+        
+        with patch.object(monitor, '_query_process_name', return_value="firefox") as query:
+            names = [monitor._get_process_name(1234) for _ in range(3)]
+        
+        assert names == ["firefox"] * 3
+        query.assert_called_once_with(1234)
+        assert monitor.get_cache_stats()["process_names"]["hits"] == 2
+    
+    def test_unknown_process_not_cached(self):
+        monitor = self.StubMonitor()
+        
+        with patch.object(monitor, '_query_process_name', return_value=None) as query:
+            assert monitor._get_process_name(1234) == "Unknown Process"
+            assert monitor._get_process_name(0) == "Unknown Process"
+            assert monitor._get_process_name(1234) == "Unknown Process"
+        
+        assert query.call_count == 2
@@ -138,53 +138,61 @@ class TestWindowsWindowMonitor:
         mock_pixmap = Mock(spec=QPixmap)
         
         # Cache an icon
-        monitor._cache_icon(1234, mock_pixmap)
+        monitor._cache_icon("test.exe", mock_pixmap)
         
         # Verify it's in cache
-        assert 1234 in monitor._icon_cache
-        assert monitor._icon_cache[1234] == mock_pixmap
-        assert monitor._cache_access_count[1234] == 1
+        assert "test.exe" in monitor._icon_cache
+        assert monitor._icon_cache.get("test.exe") == mock_pixmap
+    
+    def test_icon_of_unknown_process_not_cached(self, monitor):
+        """Test that icons of unknown processes are not shared through the cache"""
+        monitor._cache_icon(None, Mock(spec=QPixmap))
+        
+        assert len(monitor._icon_cache) == 0
     
     def test_icon_cache_lru_eviction(self, monitor):
         """Test LRU eviction when cache exceeds max size"""
         # Fill cache to max
         for i in range(50):
             mock_pixmap = Mock(spec=QPixmap)
-            monitor._cache_icon(i, mock_pixmap)
+            monitor._cache_icon(f"app{i}.exe", mock_pixmap)
         
-        # Access some icons to increase their count
-        for i in range(10, 20):
-            monitor._cache_access_count[i] += 5
+        # Use the oldest icon again
+        monitor._icon_cache.get("app0.exe")
         
-        # Add one more icon (should evict least used)
+        # Add one more icon (should evict least recently used)
         new_pixmap = Mock(spec=QPixmap)
-        monitor._cache_icon(999, new_pixmap)
+        monitor._cache_icon("new.exe", new_pixmap)
         
         # Verify cache size is still at max
         assert len(monitor._icon_cache) == 50
         
-        # Verify new icon is in cache
-        assert 999 in monitor._icon_cache
-        
-        # Verify one of the least used icons was evicted
-        # (one of 0-9 or 20-49 with access count of 1)
-        evicted_found = False
-        for i in range(50):
-            if i not in range(10, 20) and i not in monitor._icon_cache:
-                evicted_found = True
-                break
-        assert evicted_found
+        # Verify new and recently used icons are in cache, the oldest unused is evicted
+        assert "new.exe" in monitor._icon_cache
+        assert "app0.exe" in monitor._icon_cache
+        assert "app1.exe" not in monitor._icon_cache
     
-    def test_get_window_icon_from_cache(self, monitor):
+    @patch('services.windows_window_monitor.psutil.Process')
+    def test_get_window_icon_from_cache(self, mock_process, monitor):
         """Test retrieving icon from cache"""
         mock_pixmap = Mock(spec=QPixmap)
-        monitor._icon_cache[1234] = mock_pixmap
-        monitor._cache_access_count[1234] = 1
+        monitor._icon_cache.put("test.exe", mock_pixmap)
+        mock_process.return_value.name.return_value = "test.exe"
         
         result = monitor._get_window_icon(12345, 1234)
         
         assert result == mock_pixmap
-        assert monitor._cache_access_count[1234] == 2
+        assert monitor.get_cache_stats()["icons"]["hits"] == 1
+    
+    @patch('services.windows_window_monitor.psutil.Process')
+    def test_process_name_cached_by_pid(self, mock_process, monitor):
+        """Test that process name is queried once per process"""
+        mock_process.return_value.name.return_value = "test.exe"
+        
+        assert monitor._get_process_name(1234) == "test.exe"
+        assert monitor._get_process_name(1234) == "test.exe"
+        
+        mock_process.assert_called_once_with(1234)
     
     @patch('services.windows_window_monitor.win32gui.SendMessage')
     def test_get_window_icon_extraction_failure(self, mock_send_message, monitor):
@@ -456,7 +464,7 @@ class TestWindowsWindowMonitorProperties:
     def test_property_icon_caching_with_size_management(self, num_unique_apps, access_pattern):
         """
         Property 12: For any unique application, its icon should be cached on first 
-        extraction, and when cache exceeds 50 entries, least used entries should be removed.
+        extraction, and when cache exceeds 50 entries, least recently used entries should be removed.
         
         This test verifies the LRU cache behavior and size management.
         """
@@ -470,43 +478,25 @@ class TestWindowsWindowMonitorProperties:
         # Simulate access pattern
         for app_id in access_pattern:
             if app_id < num_unique_apps:
-                # Cache the icon if not already cached
-                if app_id not in monitor._icon_cache:
+                # Cache the icon on a miss
+                if monitor._icon_cache.get(app_id) is None:
                     monitor._cache_icon(app_id, mock_icons[app_id])
-                else:
-                    # Simulate cache hit
-                    monitor._cache_access_count[app_id] += 1
         
         # Property 1: Cache size should never exceed 50
         assert len(monitor._icon_cache) <= 50, \
             f"Cache size {len(monitor._icon_cache)} exceeds maximum of 50"
         
-        # Property 2: All cached icons should have access counts
-        for process_id in monitor._icon_cache:
-            assert process_id in monitor._cache_access_count, \
-                f"Process {process_id} in cache but not in access count"
-            assert monitor._cache_access_count[process_id] >= 1, \
-                f"Access count for {process_id} is less than 1"
-        
-        # Property 3: If cache is at max size, least used entries should be evicted
-        if len(monitor._icon_cache) == 50 and num_unique_apps > 50:
-            # Get the access counts of cached items
-            cached_counts = {pid: monitor._cache_access_count[pid] 
-                           for pid in monitor._icon_cache}
-            
-            # Get the access counts of evicted items
-            evicted_counts = []
-            for app_id in range(num_unique_apps):
-                if app_id not in monitor._icon_cache and app_id in [a for a in access_pattern]:
-                    # This was accessed but evicted
-                    evicted_counts.append(app_id)
-            
-            # If there are evicted items, verify they had lower access counts
-            if evicted_counts and cached_counts:
-                min_cached_count = min(cached_counts.values())
-                # Evicted items should have been accessed less frequently
-                # (This is a probabilistic property due to LRU eviction)
-                assert True  # LRU property is maintained by implementation
+        # Property 2: The most recently used icons are kept
+        recent = []
+        for app_id in reversed(access_pattern):
+            if app_id < num_unique_apps and app_id not in recent:
+                recent.append(app_id)
+        for app_id in recent[:50]:
+            assert app_id in monitor._icon_cache, \
+                f"Recently used app {app_id} was evicted"
+        for app_id in recent[50:]:
+            assert app_id not in monitor._icon_cache, \
+                f"Least recently used app {app_id} was not evicted"
     
     # Feature: active-app-display, Property 9: Логирование ошибок без прерывания работы
     # **Validates: Requirements 7.5**
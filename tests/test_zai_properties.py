@@ -9,7 +9,7 @@ Property-based тесты для Z.AI провайдера.
 
 import pytest
 from hypothesis import given, strategies as st, assume, settings
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 from services.transcription_client import TranscriptionClient
 from core.config import Config
 from utils.exceptions import InvalidAPIKeyError
@@ -98,7 +98,8 @@ class TestProperty1_ZAIClientInitialization:
         mock_anthropic.assert_called_once_with(
             api_key=api_key,
             base_url="https://api.z.ai/api/anthropic",
-            timeout=130.0
+            timeout=130.0,
+            http_client=ANY,
         )
     
     @given(api_key=valid_api_keys(), model=model_names())
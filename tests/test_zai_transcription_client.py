@@ -9,7 +9,7 @@ Unit-тесты для Z.AI провайдера в TranscriptionClient.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 from services.transcription_client import TranscriptionClient
 from utils.exceptions import (
     InvalidAPIKeyError,
@@ -47,7 +47,8 @@ class TestZAIClientInitialization:
         mock_anthropic.assert_called_once_with(
             api_key="test_glm_key",
             base_url="https://api.z.ai/api/anthropic",
-            timeout=130.0
+            timeout=130.0,
+            http_client=ANY,
         )
     
     @patch('services.transcription_client.ANTHROPIC_AVAILABLE', True)
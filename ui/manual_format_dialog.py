@@ -51,7 +51,7 @@ class _TranscriptionWorker(QObject):
             from core.config import Config
 
             config_loader = get_config_loader()
-            config = Config.load_from_config()
+            config = Config.snapshot()
 
             # Get transcription provider settings
             provider = config_loader.get("ai_provider.provider", "groq")
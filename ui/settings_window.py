@@ -2837,13 +2837,21 @@ class SettingsWindow(QDialog, StyledWindowMixin):
             item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsSelectable)  # Не выбираемый
             self.recordings_list.addItem(item)
         else:
+            from datetime import datetime
+            from utils.wav_io import read_wav_info
             for recording in recordings:
-                # Получить размер файла
-                size_mb = recording.stat().st_size / (1024 * 1024)
+                stat = recording.stat()
+                size_mb = stat.st_size / (1024 * 1024)
+                
+                # Длительность из заголовка WAV (сэмплы не читаются)
+                try:
+                    duration = read_wav_info(str(recording)).duration
+                    size_str = f"{int(duration // 60)}:{duration % 60:04.1f}  |  {size_mb:.2f} MB"
+                except Exception:
+                    size_str = f"{size_mb:.2f} MB"
                 
                 # Получить время создания
-                from datetime import datetime
-                mtime = datetime.fromtimestamp(recording.stat().st_mtime)
+                mtime = datetime.fromtimestamp(stat.st_mtime)
                 time_str = mtime.strftime("%d.%m.%Y %H:%M:%S")
                 
                 # Проверить наличие транскрипции
@@ -2852,7 +2860,7 @@ class SettingsWindow(QDialog, StyledWindowMixin):
                 
                 # Создать элемент списка
                 transcription_icon = "📝" if has_transcription else ""
-                item_text = f"🎙️ {recording.name}  {transcription_icon}  |  {size_mb:.2f} MB  |  {time_str}"
+                item_text = f"🎙️ {recording.name}  {transcription_icon}  |  {size_str}  |  {time_str}"
                 item = QListWidgetItem(item_text)
                 
                 # Сохранить пути к аудио и транскрипции
@@ -3260,7 +3268,7 @@ class SettingsWindow(QDialog, StyledWindowMixin):
 
         try:
             # Apply formatting/post-processing
-            config = Config.load_from_config()
+            config = Config.snapshot()
             processed_text = self._apply_processing_if_needed(text, config)
 
             # Save transcription
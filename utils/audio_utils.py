@@ -4,16 +4,476 @@
 Содержит функции для обрезки тишины, нормализации и других операций с аудио.
 """
 
+import math
+import os
 import wave
 import numpy as np
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
 from utils.logger import get_logger
+from utils.wav_io import map_wav
 
 logger = get_logger()
 
+# Размер блока потоковой обрезки тишины в фреймах (16 секунд при 16 kHz)
+TRIM_BLOCK_FRAMES = 1 << 18
 
-def trim_silence(audio_file_path: str, threshold: float = 0.02, padding_ms: int = 300) -> Tuple[str, float]:
+
+def _sample_dtype(sampwidth: int) -> type:
+    """
+    Возвращает numpy тип сэмпла для ширины сэмпла WAV.
+    
+    Args:
+        sampwidth: Ширина сэмпла в байтах (1, 2 или 4)
+    
+    Raises:
+        RapidWhisperError: Если ширина сэмпла не поддерживается
+    """
+    if sampwidth == 1:
+        return np.uint8
+    if sampwidth == 2:
+        return np.int16
+    if sampwidth == 4:
+        return np.int32
+    from utils.exceptions import RapidWhisperError
+    raise RapidWhisperError(
+        message=f"Неподдерживаемая ширина сэмпла: {sampwidth}",
+        translation_key="errors.unsupported_sample_width",
+        width=sampwidth
+    )
+
+
+def _decode_frames(frames, sampwidth: int, n_channels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Преобразует сырые PCM фреймы в массив сэмплов и нормализованный моно сигнал.
+    
+    Args:
+        frames: Сырые PCM данные (bytes-like)
+        sampwidth: Ширина сэмпла в байтах (1, 2 или 4)
+        n_channels: Количество каналов
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Сэмплы (фреймы x каналы для стерео) и
+        моно сигнал в диапазоне [-1, 1] для анализа
+    
+    Raises:
+        RapidWhisperError: Если ширина сэмпла не поддерживается
+    """
+    dtype = _sample_dtype(sampwidth)
+    audio_data = np.frombuffer(frames, dtype=dtype)
+    
+    # Если стерео, преобразовать в моно для анализа
+    if n_channels == 2:
+        audio_data = audio_data.reshape(-1, 2)
+        mono_data = audio_data.mean(axis=1)
+    else:
+        mono_data = audio_data
+    
+    # Нормализовать к диапазону [-1, 1]
+    if dtype == np.uint8:
+        mono_data = (mono_data.astype(np.float32) - 128) / 128
+    else:
+        max_val = np.iinfo(dtype).max
+        mono_data = mono_data.astype(np.float32) / max_val
+    
+    return audio_data, mono_data
+
+
+def _chunk_rms(mono_data: np.ndarray, chunk_size: int = 1024) -> np.ndarray:
+    """
+    Вычисляет RMS для каждого полного чанка сигнала.
+    
+    Args:
+        mono_data: Нормализованный моно сигнал
+        chunk_size: Размер чанка в сэмплах
+    
+    Returns:
+        Массив RMS значений (по одному на чанк)
+    """
+    n_chunks = len(mono_data) // chunk_size
+    chunks = mono_data[:n_chunks * chunk_size].reshape(n_chunks, chunk_size)
+    return np.sqrt(np.einsum('ij,ij->i', chunks, chunks, dtype=np.float64) / chunk_size)
+
+
+def _window_rms(
+    audio_data: np.ndarray,
+    n_channels: int,
+    window_size: int = 1024,
+    hop_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Вычисляет нормализованный RMS скользящего окна прямо по целым сэмплам.
+    
+    Сигнал делится на блоки размером НОД(окно, шаг), энергия блоков
+    считается одним einsum без копии сигнала во float, а энергия окон -
+    разностью кумулятивных сумм энергий блоков.
+    
+    Args:
+        audio_data: Сэмплы (фреймы x каналы для стерео) из np.frombuffer
+        n_channels: Количество каналов
+        window_size: Размер окна в фреймах
+        hop_size: Шаг окна в фреймах (по умолчанию равен окну)
+    
+    Returns:
+        Массив RMS значений в диапазоне [0, 1]; окно k начинается с фрейма k * hop_size
+    """
+    hop_size = hop_size or window_size
+    dtype = audio_data.dtype
+    
+    if dtype == np.uint8:
+        mono = audio_data.astype(np.int16) - 128
+        full_scale = 128.0
+    else:
+        mono = audio_data
+        full_scale = float(np.iinfo(dtype).max)
+    if n_channels == 2:
+        # Среднее каналов: сумма в широком типе, деление учтено в масштабе
+        mono = mono.sum(axis=1, dtype=np.int64)
+        full_scale *= 2
+    
+    block = math.gcd(window_size, hop_size)
+    n_blocks = len(mono) // block
+    blocks = mono[:n_blocks * block].reshape(n_blocks, block)
+    # Энергия блока во float32 точна для сравнения с порогом и вдвое быстрее float64
+    energies = np.einsum('ij,ij->i', blocks, blocks, dtype=np.float32, casting='unsafe')
+    
+    window_blocks = window_size // block
+    hop_blocks = hop_size // block
+    if n_blocks < window_blocks:
+        return np.zeros(0)
+    n_windows = (n_blocks - window_blocks) // hop_blocks + 1
+    
+    cumulative = np.zeros(n_blocks + 1)
+    np.cumsum(energies, dtype=np.float64, out=cumulative[1:])
+    starts = np.arange(n_windows) * hop_blocks
+    window_energy = np.maximum(cumulative[starts + window_blocks] - cumulative[starts], 0.0)
+    return np.sqrt(window_energy / window_size) / full_scale
+
+
+def _find_sound_segments(
+    rms_values: np.ndarray,
+    n_frames: int,
+    framerate: int,
+    threshold: float,
+    padding_ms: int,
+    window_size: int = 1024,
+    hop_size: Optional[int] = None
+) -> Optional[List[Tuple[int, int]]]:
+    """
+    Находит сегменты звука (с паддингом), которые нужно сохранить.
+    
+    Границы считаются с точностью до фрейма: звук - это окна громче
+    порога, к каждому участку звука добавляется паддинг, а участки,
+    между которыми после паддинга остается тишина короче двух паддингов,
+    объединяются (короткие паузы между словами не удаляются).
+    
+    Args:
+        rms_values: RMS окон из _window_rms
+        n_frames: Количество фреймов в сигнале
+        framerate: Частота дискретизации
+        threshold: Порог RMS для определения тишины
+        padding_ms: Паддинг в миллисекундах вокруг каждого блока звука
+        window_size: Размер окна в фреймах
+        hop_size: Шаг окна в фреймах (по умолчанию равен окну)
+    
+    Returns:
+        Список диапазонов фреймов (start, end) или None, если обрезать нечего
+    """
+    hop_size = hop_size or window_size
+    
+    if len(rms_values) == 0:
+        logger.warning("Файл слишком короткий для обрезки тишины")
+        return None
+    
+    # Найти все окна выше порога (это звук, не тишина)
+    is_sound = rms_values > threshold
+    
+    if not is_sound.any():
+        logger.warning("Весь файл состоит из тишины, не обрезаем")
+        return None
+    
+    padding = int(padding_ms * framerate / 1000)
+    logger.info(f"Паддинг: {padding} фреймов ({padding * 1000 / framerate:.0f}ms)")
+    
+    # Участки звука: индексы окон, где is_sound меняет значение
+    edges = np.flatnonzero(np.diff(is_sound.astype(np.int8), prepend=0, append=0))
+    first_windows, end_windows = edges[::2], edges[1::2]
+    starts = np.maximum(first_windows * hop_size - padding, 0)
+    ends = np.minimum((end_windows - 1) * hop_size + window_size + padding, n_frames)
+    
+    logger.info(f"Найдено {len(starts)} сегментов звука (до объединения)")
+    
+    # Объединить сегменты если тишина между ними короче padding_ms * 2
+    # Это предотвращает удаление коротких пауз между словами
+    separate = starts[1:] - ends[:-1] >= 2 * padding
+    starts = starts[np.concatenate(([True], separate))]
+    ends = ends[np.concatenate((separate, [True]))]
+    
+    logger.info(f"После объединения: {len(starts)} сегментов")
+    logger.info(f"Минимальная длина тишины для удаления: {2 * padding * 1000 / framerate:.0f}ms")
+    
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _fade(samples: np.ndarray, fade_in: bool) -> np.ndarray:
+    """
+    Возвращает копию сэмплов с линейным fade-in или fade-out.
+    
+    Args:
+        samples: Сэмплы участка фейда (фреймы x каналы для стерео)
+        fade_in: True - нарастание от нуля, False - спад к нулю
+    """
+    ramp = np.linspace(0.0, 1.0, len(samples), endpoint=False)
+    if not fade_in:
+        ramp = ramp[::-1]
+    if samples.ndim == 2:
+        ramp = ramp[:, np.newaxis]
+    center = 128 if samples.dtype == np.uint8 else 0
+    return ((samples.astype(np.float64) - center) * ramp + center).astype(samples.dtype)
+
+
+def _trim_frames(
+    frames,
+    n_channels: int,
+    sampwidth: int,
+    framerate: int,
+    threshold: float,
+    padding_ms: int,
+    window_size: int = 1024,
+    hop_size: Optional[int] = None,
+    fade_ms: int = 0
+) -> Optional[bytes]:
+    """
+    Вырезает тишину из PCM фреймов.
+    
+    Сохраненные сегменты склеиваются одним копированием байтов
+    исходного буфера; копируются и пересчитываются только участки фейдов.
+    
+    Args:
+        frames: Сырые PCM данные (bytes-like)
+        n_channels: Количество каналов
+        sampwidth: Ширина сэмпла в байтах
+        framerate: Частота дискретизации
+        threshold: Порог RMS для определения тишины
+        padding_ms: Паддинг в миллисекундах вокруг каждого блока звука
+        window_size: Размер окна RMS в фреймах
+        hop_size: Шаг окна RMS в фреймах (по умолчанию равен окну)
+        fade_ms: Длина fade-in/fade-out в точках разреза (0 - без фейдов)
+    
+    Returns:
+        PCM данные оставшихся сэмплов или None, если обрезать нечего
+    """
+    audio_data = np.frombuffer(frames, dtype=_sample_dtype(sampwidth))
+    if n_channels == 2:
+        audio_data = audio_data.reshape(-1, 2)
+    
+    rms_values = _window_rms(audio_data, n_channels, window_size, hop_size)
+    segments = _find_sound_segments(
+        rms_values, len(audio_data), framerate, threshold, padding_ms, window_size, hop_size
+    )
+    if segments is None:
+        return None
+    
+    frame_size = n_channels * sampwidth
+    data = memoryview(frames).cast('B')
+    
+    # Склеить все сегменты
+    return b''.join(_kept_pieces(
+        lambda start, end: data[start * frame_size:end * frame_size],
+        segments, len(audio_data), int(fade_ms * framerate / 1000), audio_data.dtype, n_channels
+    ))
+
+
+def _kept_pieces(
+    read: Callable[[int, int], bytes],
+    segments: List[Tuple[int, int]],
+    n_frames: int,
+    fade_frames: int,
+    dtype: type,
+    n_channels: int,
+    block_frames: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Выдает PCM данные сохраняемых сегментов по частям.
+    
+    Args:
+        read: Функция чтения фреймов [start, end) исходного сигнала
+        segments: Диапазоны фреймов (start, end) сохраняемых сегментов
+        n_frames: Количество фреймов в исходном сигнале
+        fade_frames: Длина фейда в точках разреза (0 - без фейдов)
+        dtype: Тип сэмпла
+        n_channels: Количество каналов
+        block_frames: Максимальный размер части в фреймах (None - сегмент целиком)
+    
+    Yields:
+        PCM данные очередной части
+    """
+    def samples(start: int, end: int) -> np.ndarray:
+        data = np.frombuffer(read(start, end), dtype=dtype)
+        return data.reshape(-1, 2) if n_channels == 2 else data
+    
+    for start, end in segments:
+        length = min(fade_frames, (end - start) // 2)
+        head = length if start > 0 else 0
+        tail = length if end < n_frames else 0
+        if head:
+            yield _fade(samples(start, start + head), fade_in=True).tobytes()
+        position, stop = start + head, end - tail
+        while position < stop:
+            step_end = min(stop, position + block_frames) if block_frames else stop
+            yield read(position, step_end)
+            position = step_end
+        if tail:
+            yield _fade(samples(end - tail, end), fade_in=False).tobytes()
+
+
+def _stream_window_rms(
+    samples: np.ndarray,
+    n_channels: int,
+    window_size: int,
+    hop_size: Optional[int],
+    block_frames: int
+) -> np.ndarray:
+    """
+    Вычисляет RMS скользящего окна по блокам сигнала.
+    
+    Для отображенного в память файла в каждый момент читается только
+    один блок (плюс перекрытие окна), а окна совпадают с _window_rms
+    по всему сигналу.
+    
+    Args:
+        samples: Сэмплы (np.memmap или массив)
+        n_channels: Количество каналов
+        window_size: Размер окна в фреймах
+        hop_size: Шаг окна в фреймах (по умолчанию равен окну)
+        block_frames: Размер блока в фреймах
+    
+    Returns:
+        Массив RMS значений окон
+    """
+    hop_size = hop_size or window_size
+    if len(samples) < window_size:
+        return np.zeros(0)
+    n_windows = (len(samples) - window_size) // hop_size + 1
+    block_windows = max(1, block_frames // hop_size)
+    
+    parts = []
+    for first in range(0, n_windows, block_windows):
+        last = min(n_windows, first + block_windows) - 1
+        block = samples[first * hop_size:last * hop_size + window_size]
+        parts.append(_window_rms(block, n_channels, window_size, hop_size))
+    return np.concatenate(parts)
+
+
+def _write_segments(
+    samples: np.ndarray,
+    temp_path: str,
+    n_channels: int,
+    sampwidth: int,
+    framerate: int,
+    segments: List[Tuple[int, int]],
+    fade_ms: int
+) -> int:
+    """
+    Записывает сохраняемые сегменты в новый WAV файл блоками.
+    
+    Args:
+        samples: Сэмплы исходного файла (np.memmap)
+        temp_path: Путь к создаваемому файлу
+        n_channels: Количество каналов
+        sampwidth: Ширина сэмпла в байтах
+        framerate: Частота дискретизации
+        segments: Диапазоны фреймов (start, end) сохраняемых сегментов
+        fade_ms: Длительность фейда в точках разреза в мс
+    
+    Returns:
+        Количество записанных фреймов
+    """
+    def read(start: int, end: int) -> memoryview:
+        return memoryview(samples[start:end]).cast('B')
+    
+    with open(temp_path, 'wb') as f:
+        with wave.open(f, 'wb') as out:
+            out.setnchannels(n_channels)
+            out.setsampwidth(sampwidth)
+            out.setframerate(framerate)
+            for piece in _kept_pieces(
+                read, segments, len(samples), int(fade_ms * framerate / 1000),
+                samples.dtype, n_channels, TRIM_BLOCK_FRAMES
+            ):
+                out.writeframesraw(piece)
+            kept_frames = out.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    return kept_frames
+
+
+def trim_silence_pcm(
+    pcm: bytes,
+    sample_rate: int,
+    threshold: float = 0.02,
+    padding_ms: int = 300,
+    channels: int = 1,
+    sample_width: int = 2,
+    window_size: int = 1024,
+    hop_size: Optional[int] = None,
+    fade_ms: int = 0
+) -> Tuple[bytes, float]:
+    """
+    Удаляет ВСЮ тишину из PCM данных в памяти (без чтения и записи файлов).
+    
+    Args:
+        pcm: Сырые PCM данные
+        sample_rate: Частота дискретизации
+        threshold: Порог RMS для определения тишины (по умолчанию 0.02)
+        padding_ms: Паддинг в миллисекундах вокруг каждого блока звука (по умолчанию 300ms)
+        channels: Количество каналов
+        sample_width: Ширина сэмпла в байтах
+        window_size: Размер окна RMS в фреймах (по умолчанию 1024)
+        hop_size: Шаг окна RMS в фреймах (по умолчанию равен окну)
+        fade_ms: Длина fade-in/fade-out в точках разреза (по умолчанию 0 - без фейдов)
+    
+    Returns:
+        Tuple[bytes, float]: Обрезанные PCM данные (или исходные, если обрезать нечего)
+        и длительность удаленной тишины в секундах
+    """
+    try:
+        logger.info(f"Удаление тишины из аудио в памяти ({len(pcm)} байт)")
+        logger.info(f"Порог: {threshold}, Паддинг: {padding_ms}ms")
+        
+        trimmed_pcm = _trim_frames(
+            pcm, channels, sample_width, sample_rate, threshold, padding_ms,
+            window_size, hop_size, fade_ms
+        )
+        if trimmed_pcm is None:
+            return pcm, 0.0
+        
+        frame_size = channels * sample_width
+        duration_before = len(pcm) / frame_size / sample_rate
+        duration_after = len(trimmed_pcm) / frame_size / sample_rate
+        trimmed_seconds = duration_before - duration_after
+        
+        logger.info(f"Тишина удалена: {trimmed_seconds:.2f} сек удалено")
+        logger.info(f"Длительность: {duration_before:.2f}с -> {duration_after:.2f}с")
+        
+        return trimmed_pcm, trimmed_seconds
+        
+    except Exception as e:
+        logger.error(f"Ошибка удаления тишины: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        # Вернуть исходные данные если не удалось обрезать
+        return pcm, 0.0
+
+
+def trim_silence(
+    audio_file_path: str,
+    threshold: float = 0.02,
+    padding_ms: int = 300,
+    window_size: int = 1024,
+    hop_size: Optional[int] = None,
+    fade_ms: int = 0
+) -> Tuple[str, float]:
     """
     Удаляет ВСЮ тишину из аудио файла (в начале, середине и конце).
     
@@ -21,10 +481,18 @@ def trim_silence(audio_file_path: str, threshold: float = 0.02, padding_ms: int
         audio_file_path: Путь к аудио файлу (WAV)
         threshold: Порог RMS для определения тишины (по умолчанию 0.02)
         padding_ms: Паддинг в миллисекундах перед и после каждого блока тишины (по умолчанию 300ms)
+        window_size: Размер окна RMS в фреймах (по умолчанию 1024)
+        hop_size: Шаг окна RMS в фреймах (по умолчанию равен окну)
+        fade_ms: Длина fade-in/fade-out в точках разреза (по умолчанию 0 - без фейдов)
     
     Returns:
         Tuple[str, float]: Путь к обрезанному файлу (тот же файл, перезаписанный) и длительность удаленной тишины в секундах
     
+    Файл обрабатывается в два прохода блоками по TRIM_BLOCK_FRAMES фреймов:
+    сначала ищутся сегменты звука, затем они дописываются во временный файл
+    рядом с исходным, который атомарно заменяет исходный. Память не зависит
+    от длины записи (кроме массива RMS - одно число на окно).
+    
     Raises:
         Exception: Если не удалось обработать файл
     """
@@ -32,157 +500,41 @@ def trim_silence(audio_file_path: str, threshold: float = 0.02, padding_ms: int
         logger.info(f"Удаление тишины из файла: {audio_file_path}")
         logger.info(f"Порог: {threshold}, Паддинг: {padding_ms}ms")
         
-        # Открыть WAV файл
-        with wave.open(audio_file_path, 'rb') as wf:
-            # Получить параметры
-            n_channels = wf.getnchannels()
-            sampwidth = wf.getsampwidth()
-            framerate = wf.getframerate()
-            n_frames = wf.getnframes()
-            
-            # Прочитать все фреймы
-            frames = wf.readframes(n_frames)
-        
-        # Конвертировать в numpy array
-        if sampwidth == 1:
-            dtype = np.uint8
-        elif sampwidth == 2:
-            dtype = np.int16
-        elif sampwidth == 4:
-            dtype = np.int32
-        else:
-            from utils.exceptions import RapidWhisperError
-            raise RapidWhisperError(
-                message=f"Неподдерживаемая ширина сэмпла: {sampwidth}",
-                translation_key="errors.unsupported_sample_width",
-                width=sampwidth
-            )
-        
-        audio_data = np.frombuffer(frames, dtype=dtype)
+        # Заголовок читается один раз, сэмплы отображаются в память
+        info, samples = map_wav(audio_file_path)
+        n_frames = info.n_frames
+        framerate = info.sample_rate
         
-        # Если стерео, преобразовать в моно для анализа
-        if n_channels == 2:
-            audio_data = audio_data.reshape(-1, 2)
-            mono_data = audio_data.mean(axis=1)
-        else:
-            mono_data = audio_data
-        
-        # Нормализовать к диапазону [-1, 1]
-        if dtype == np.uint8:
-            mono_data = (mono_data.astype(np.float32) - 128) / 128
-        else:
-            max_val = np.iinfo(dtype).max
-            mono_data = mono_data.astype(np.float32) / max_val
-        
-        # Вычислить RMS для каждого чанка (размер чанка = 1024 сэмпла)
-        chunk_size = 1024
-        n_chunks = len(mono_data) // chunk_size
-        
-        if n_chunks == 0:
-            logger.warning("Файл слишком короткий для обрезки тишины")
-            return audio_file_path, 0.0
-        
-        rms_values = []
-        for i in range(n_chunks):
-            chunk = mono_data[i * chunk_size:(i + 1) * chunk_size]
-            rms = np.sqrt(np.mean(chunk ** 2))
-            rms_values.append(rms)
-        
-        rms_values = np.array(rms_values)
-        
-        # Найти все чанки выше порога (это звук, не тишина)
-        is_sound = rms_values > threshold
-        
-        if not np.any(is_sound):
-            logger.warning("Весь файл состоит из тишины, не обрезаем")
-            return audio_file_path, 0.0
-        
-        # Вычислить паддинг в чанках
-        padding_samples = int((padding_ms / 1000.0) * framerate)
-        padding_chunks = max(1, padding_samples // chunk_size)
-        
-        logger.info(f"Паддинг: {padding_chunks} чанков ({padding_chunks * chunk_size / framerate * 1000:.0f}ms)")
-        
-        # Собрать все сегменты звука с паддингом
-        segments = []
-        in_sound = False
-        start_chunk = 0
-        
-        for i in range(len(is_sound)):
-            if is_sound[i] and not in_sound:
-                # Начало звука
-                start_chunk = max(0, i - padding_chunks)  # Добавить паддинг перед звуком
-                in_sound = True
-            elif not is_sound[i] and in_sound:
-                # Конец звука
-                end_chunk = min(len(is_sound), i + padding_chunks)  # Добавить паддинг после звука
-                segments.append((start_chunk, end_chunk))
-                in_sound = False
-        
-        # Если файл заканчивается звуком
-        if in_sound:
-            end_chunk = min(len(is_sound), len(is_sound) + padding_chunks)
-            segments.append((start_chunk, end_chunk))
-        
-        logger.info(f"Найдено {len(segments)} сегментов звука (до объединения)")
-        
-        # Объединить сегменты если расстояние между ними меньше чем padding_ms * 2
-        # Это предотвращает удаление коротких пауз между словами
-        min_silence_chunks = padding_chunks * 2  # Минимальная длина тишины для удаления
-        
-        merged_segments = []
-        for i, (start, end) in enumerate(segments):
-            if i == 0:
-                merged_segments.append([start, end])
-            else:
-                prev_start, prev_end = merged_segments[-1]
-                gap = start - prev_end  # Расстояние между сегментами
-                
-                if gap < min_silence_chunks:
-                    # Тишина слишком короткая - объединяем сегменты
-                    merged_segments[-1][1] = end
-                    logger.debug(f"Объединены сегменты: gap={gap} чанков ({gap * chunk_size / framerate * 1000:.0f}ms)")
-                else:
-                    # Тишина достаточно длинная - оставляем как отдельный сегмент
-                    merged_segments.append([start, end])
-        
-        logger.info(f"После объединения: {len(merged_segments)} сегментов")
-        logger.info(f"Минимальная длина тишины для удаления: {min_silence_chunks * chunk_size / framerate * 1000:.0f}ms")
-        
-        # Объединить все сегменты
-        result_chunks = []
-        for start, end in merged_segments:
-            start_sample = start * chunk_size
-            end_sample = end * chunk_size
-            
-            if n_channels == 2:
-                segment = audio_data[start_sample:end_sample]
-            else:
-                segment = audio_data[start_sample:end_sample]
-            
-            result_chunks.append(segment)
-        
-        if not result_chunks:
-            logger.warning("Не найдено сегментов звука")
+        # Первый проход: RMS окон по блокам
+        rms_values = _stream_window_rms(samples, info.channels, window_size, hop_size, TRIM_BLOCK_FRAMES)
+        segments = _find_sound_segments(
+            rms_values, n_frames, framerate, threshold, padding_ms, window_size, hop_size
+        )
+        if segments is None:
             return audio_file_path, 0.0
         
-        # Склеить все сегменты
-        trimmed_audio = np.concatenate(result_chunks)
+        # Второй проход: сохраненные сегменты дописываются в новый файл
+        temp_path = audio_file_path + '.trim.tmp'
+        try:
+            kept_frames = _write_segments(
+                samples, temp_path, info.channels, info.sample_width, framerate, segments, fade_ms
+            )
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        # Отображение держит файл открытым - закрыть перед заменой
+        del samples
         
-        # Сохранить обрезанный файл
-        with wave.open(audio_file_path, 'wb') as wf:
-            wf.setnchannels(n_channels)
-            wf.setsampwidth(sampwidth)
-            wf.setframerate(framerate)
-            wf.writeframes(trimmed_audio.tobytes())
+        # Заменить исходный файл одной операцией
+        os.replace(temp_path, audio_file_path)
         
         duration_before = n_frames / framerate
-        duration_after = len(trimmed_audio) / framerate
+        duration_after = kept_frames / framerate
         trimmed_seconds = duration_before - duration_after
         
         logger.info(f"Тишина удалена: {trimmed_seconds:.2f} сек удалено")
         logger.info(f"Длительность: {duration_before:.2f}с -> {duration_after:.2f}с")
-        logger.info(f"Сохранено {len(segments)} сегментов звука")
         
         return audio_file_path, trimmed_seconds
         
@@ -192,3 +544,83 @@ def trim_silence(audio_file_path: str, threshold: float = 0.02, padding_ms: int
         logger.error(traceback.format_exc())
         # Вернуть исходный файл если не удалось обрезать
         return audio_file_path, 0.0
+
+
+def contains_sound(
+    pcm: bytes,
+    threshold: float = 0.02,
+    channels: int = 1,
+    sample_width: int = 2
+) -> bool:
+    """
+    Проверяет, есть ли в аудио хотя бы один чанк громче порога.
+    
+    Args:
+        pcm: Сырые PCM данные
+        threshold: Порог RMS для определения тишины
+        channels: Количество каналов
+        sample_width: Ширина сэмпла в байтах
+    
+    Returns:
+        True если в аудио есть звук
+    """
+    if not pcm:
+        return False
+    _, mono_data = _decode_frames(pcm, sample_width, channels)
+    rms_values = _chunk_rms(mono_data)
+    return bool(len(rms_values) and rms_values.max() > threshold)
+
+
+def find_split_points(
+    pcm: bytes,
+    sample_rate: int,
+    max_chunk_seconds: float,
+    threshold: float = 0.02,
+    search_window_seconds: float = 15.0,
+    channels: int = 1,
+    sample_width: int = 2
+) -> List[Tuple[int, bool]]:
+    """
+    Находит точки разбиения длинной записи на части по паузам.
+    
+    Использует тот же RMS анализ по чанкам, что и trim_silence. Для каждой
+    части длиной до max_chunk_seconds точка разреза ищется в последних
+    search_window_seconds - в самом тихом чанке. Если тихого чанка (ниже
+    threshold) нет, разрез проходит по речи на границе части, и вызывающий
+    код должен добавить перекрытие между частями.
+    
+    Args:
+        pcm: Сырые PCM данные
+        sample_rate: Частота дискретизации
+        max_chunk_seconds: Максимальная длина части в секундах
+        threshold: Порог RMS для определения тишины
+        search_window_seconds: Окно поиска паузы перед границей части
+        channels: Количество каналов
+        sample_width: Ширина сэмпла в байтах
+    
+    Returns:
+        Список (индекс фрейма разреза, разрез_в_тишине)
+    """
+    chunk_size = 1024
+    _, mono_data = _decode_frames(pcm, sample_width, channels)
+    rms_values = _chunk_rms(mono_data, chunk_size)
+    
+    chunks_per_part = max(1, int(max_chunk_seconds * sample_rate) // chunk_size)
+    window_chunks = max(1, min(chunks_per_part // 2, int(search_window_seconds * sample_rate) // chunk_size))
+    
+    splits: List[Tuple[int, bool]] = []
+    part_start = 0
+    while len(rms_values) - part_start > chunks_per_part:
+        window_end = part_start + chunks_per_part
+        window_start = window_end - window_chunks
+        quietest = window_start + int(np.argmin(rms_values[window_start:window_end]))
+        if rms_values[quietest] <= threshold:
+            # Резать по середине самого тихого чанка
+            splits.append((quietest * chunk_size + chunk_size // 2, True))
+            part_start = quietest + 1
+        else:
+            # Пауз нет - резать по границе части, чтобы части были максимальной длины
+            splits.append((window_end * chunk_size, False))
+            part_start = window_end
+    
+    return splits
@@ -317,7 +317,7 @@ def _initialize_language():
     
     try:
         from core.config import Config
-        config = Config.load_from_config()
+        config = Config.snapshot()
         _current_language = config.interface_language
     except Exception:
         # If config loading fails, use system language
@@ -0,0 +1,164 @@
+"""
+Чтение WAV файлов без модуля wave.
+
+Заголовок RIFF разбирается один раз: формат и длительность доступны без
+чтения сэмплов, а PCM данные отображаются в память (np.memmap) и
+читаются по мере обращения без копирования всего файла.
+
+Используется всеми путями, которые читают записи с диска: AudioPayload
+(длительность и PCM данные записи в main), обрезка тишины и список
+записей в настройках.
+"""
+
+import os
+import struct
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from utils.exceptions import AudioError
+
+
+# Форматы PCM в поле wFormatTag чанка fmt
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Длина "RIFF" + размер + "WAVE"
+_RIFF_HEADER_SIZE = 12
+# Длина id и размера чанка
+_CHUNK_HEADER_SIZE = 8
+
+
+class WavInfo(NamedTuple):
+    """
+    Формат и расположение PCM данных WAV файла.
+
+    Attributes:
+        path: Путь к файлу
+        channels: Количество каналов
+        sample_width: Ширина сэмпла в байтах
+        sample_rate: Частота дискретизации в Hz
+        n_frames: Количество полных фреймов
+        data_offset: Смещение PCM данных от начала файла в байтах
+    """
+
+    path: str
+    channels: int
+    sample_width: int
+    sample_rate: int
+    n_frames: int
+    data_offset: int
+
+    @property
+    def frame_size(self) -> int:
+        """Размер одного фрейма в байтах."""
+        return self.channels * self.sample_width
+
+    @property
+    def data_size(self) -> int:
+        """Размер PCM данных в байтах."""
+        return self.n_frames * self.frame_size
+
+    @property
+    def duration(self) -> float:
+        """Длительность в секундах."""
+        return self.n_frames / float(self.sample_rate)
+
+    @property
+    def dtype(self) -> type:
+        """numpy тип сэмпла."""
+        from utils.audio_utils import _sample_dtype
+        return _sample_dtype(self.sample_width)
+
+
+def _invalid(path: str, reason: str) -> AudioError:
+    """Создает ошибку разбора WAV файла."""
+    return AudioError(
+        message=f"Некорректный WAV файл {path}: {reason}",
+        translation_key="errors.invalid_wav_file",
+        path=path
+    )
+
+
+def read_wav_info(path: str) -> WavInfo:
+    """
+    Читает формат WAV файла из заголовка RIFF (сэмплы не читаются).
+
+    Размер данных ограничивается фактическим размером файла, поэтому
+    файл с незавершенным заголовком (запись прервана) читается до конца.
+
+    Args:
+        path: Путь к WAV файлу
+
+    Returns:
+        WavInfo с форматом и смещением PCM данных
+
+    Raises:
+        AudioError: Если файл не является PCM WAV
+        OSError: Если файл не удалось прочитать
+    """
+    path = str(path)
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        header = f.read(_RIFF_HEADER_SIZE)
+        if len(header) < _RIFF_HEADER_SIZE or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            raise _invalid(path, "нет заголовка RIFF/WAVE")
+
+        fmt = None
+        position = _RIFF_HEADER_SIZE
+        while position + _CHUNK_HEADER_SIZE <= file_size:
+            f.seek(position)
+            chunk_id, chunk_size = struct.unpack('<4sI', f.read(_CHUNK_HEADER_SIZE))
+            body = position + _CHUNK_HEADER_SIZE
+            if chunk_id == b'fmt ':
+                fmt = f.read(min(chunk_size, 40))
+            elif chunk_id == b'data':
+                if fmt is None or len(fmt) < 16:
+                    raise _invalid(path, "нет чанка fmt перед данными")
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    format_tag = struct.unpack('<H', fmt[24:26])[0]
+                if format_tag != WAVE_FORMAT_PCM:
+                    raise _invalid(path, f"формат {format_tag:#06x} не является PCM")
+                if channels == 0 or sample_rate == 0:
+                    raise _invalid(path, "нулевое количество каналов или частота")
+                sample_width = (bits + 7) // 8
+                data_size = min(chunk_size, file_size - body)
+                return WavInfo(
+                    path=path,
+                    channels=channels,
+                    sample_width=sample_width,
+                    sample_rate=sample_rate,
+                    n_frames=data_size // (channels * sample_width),
+                    data_offset=body
+                )
+            # Чанки выравниваются по четному размеру
+            position = body + chunk_size + (chunk_size & 1)
+
+    raise _invalid(path, "нет чанка data")
+
+
+def map_wav(path: str) -> Tuple[WavInfo, np.ndarray]:
+    """
+    Отображает PCM данные WAV файла в память без копирования.
+
+    Массив только для чтения; стерео имеет форму (n_frames, channels).
+    Файл остается открытым, пока существует массив или его срезы
+    (на Windows такой файл нельзя заменить или удалить).
+
+    Args:
+        path: Путь к WAV файлу
+
+    Returns:
+        Кортеж (WavInfo, массив сэмплов)
+
+    Raises:
+        AudioError: Если файл не является PCM WAV или ширина сэмпла не поддерживается
+    """
+    info = read_wav_info(path)
+    shape = (info.n_frames, info.channels) if info.channels > 1 else (info.n_frames,)
+    if info.n_frames == 0:
+        # mmap не отображает пустые области
+        return info, np.zeros(shape, dtype=info.dtype)
+    samples = np.memmap(info.path, dtype=info.dtype, mode='r', offset=info.data_offset, shape=shape)
+    return info, samples